@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Athena OS 事件日志回放脚本 (Journal Replay)
+
+把 EventJournal 录制的会话重新发布到一个全新的引擎中，用于事故复盘。
+
+- 回放是离线的：不连接 WebSocket，REST Gateway 在回放前关闭，
+  策略发起的下单请求直接失败，不会到达交易所
+- 支持原速（1）、N 倍速（N）和最快速度（max）
+
+录制：在配置中开启 journal.enabled（默认写入 data/journal）
+
+使用方法：
+    python scripts/replay_journal.py --journal data/journal --speed 10
+    python scripts/replay_journal.py --journal data/journal --speed max --config config.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+# 添加项目路径
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.engine import Engine, create_default_config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_speed(value: str):
+    """解析回放速度：'max' 表示最快速度"""
+    if value.lower() == 'max':
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed 必须大于 0，或使用 'max'")
+    return speed
+
+
+def load_replay_config(config_path: str = None) -> dict:
+    """
+    加载回放配置（默认配置 + 可选 JSON 覆盖，如 strategies）
+
+    Args:
+        config_path (str): JSON 配置文件路径
+
+    Returns:
+        dict: 配置字典
+    """
+    config = create_default_config()
+    if config_path:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+
+    # 回放时不再录制，避免把回放事件写回日志
+    config['journal'] = dict(config.get('journal', {}), enabled=False)
+    return config
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Athena OS 事件日志回放")
+    parser.add_argument('--journal', required=True, help="日志目录或分段文件")
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help="回放速度倍数，或 'max'（默认 1）")
+    parser.add_argument('--config', default=None, help="JSON 配置文件（覆盖默认配置，如 strategies）")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    engine = Engine(load_replay_config(args.config))
+    await engine.initialize()
+    try:
+        result = await engine.replay_journal(args.journal, speed=args.speed)
+    finally:
+        await engine.stop()
+
+    status = result.pop('status')
+    print(json.dumps(result, indent=2))
+    print(json.dumps(status, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
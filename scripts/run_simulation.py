@@ -92,6 +92,9 @@ class HealthMonitor:
             # 获取 WebSocket 连接状态
             ws_status = self._get_ws_status()
 
+            # 获取事件总线延迟（本检查周期内）
+            latency_status = self._get_event_bus_latency()
+
             # 获取引擎运行时间
             uptime = time.time() - self.engine.start_time if hasattr(self.engine, 'start_time') else 0
             uptime_hours = uptime / 3600
@@ -107,6 +110,8 @@ class HealthMonitor:
                 f"⏱️  运行时间: {uptime_hours:.2f} 小时 ({uptime:.0f} 秒)",
                 f"🔌 WebSocket 状态:",
                 f"   {ws_status}",
+                f"⏳ EventBus 延迟 (p99 排队/端到端):",
+                f"   {latency_status}",
                 separator
             ]
 
@@ -120,6 +125,29 @@ class HealthMonitor:
         except Exception as e:
             logger.error(f"健康监控异常: {e}", exc_info=True)
 
+    def _get_event_bus_latency(self) -> str:
+        """
+        获取事件总线延迟摘要（快照后清零，统计的是一个检查周期内的延迟）
+
+        Returns:
+            str: 各事件类型的 p99 排队等待 / 端到端延迟
+        """
+        try:
+            event_bus = getattr(self.engine, '_event_bus', None)
+            if event_bus is None or not hasattr(event_bus, 'get_latency_snapshot'):
+                return "❌ 未初始化"
+
+            snapshot = event_bus.get_latency_snapshot(reset=True)
+            parts = [
+                f"{event_type}: {stats['queue_wait']['p99_ms']:.2f}/{stats['end_to_end']['p99_ms']:.2f}ms"
+                for event_type, stats in sorted(snapshot['event_types'].items())
+            ]
+            return " | ".join(parts) if parts else "无事件"
+
+        except Exception as e:
+            logger.error(f"获取 EventBus 延迟失败: {e}")
+            return "❌ 状态检查失败"
+
     def _get_ws_status(self) -> str:
         """
         获取 WebSocket 连接状态
@@ -22,6 +22,7 @@ from typing import List, Optional
 
 from .event_bus import EventBus
 from .event_types import Event, EventType
+from .journal import EventJournal, JournalReplayer
 
 from ..oms.capital_commander import CapitalCommander
 from ..oms.position_manager import PositionManager
@@ -29,9 +30,13 @@ from ..oms.order_manager import OrderManager
 from ..risk.pre_trade import PreTradeCheck
 
 from ..gateways.okx.rest_api import OkxRestGateway
+from ..gateways.okx.book_channels import select_book_channel
 from ..gateways.okx.ws_public_gateway import OkxPublicWsGateway
+from ..gateways.okx.ws_pool import OkxPublicWsPool
+from ..gateways.okx.ws_redundant import OkxRedundantPublicFeed
 from ..gateways.okx.ws_private_gateway import OkxPrivateWsGateway
 from ..market.market_data_manager import MarketDataManager
+from ..market.feed_latency import FeedLatencyTracker
 from ..persistence.persistence_adapter import JsonPersistenceAdapter
 
 from ..strategies.base_strategy import BaseStrategy
@@ -63,6 +68,7 @@ class Engine:
 
         # 组件容器
         self._event_bus: Optional[EventBus] = None
+        self._journal: Optional[EventJournal] = None
         self._capital_commander: Optional[CapitalCommander] = None
         self._position_manager: Optional[PositionManager] = None
         self._order_manager: Optional[OrderManager] = None
@@ -74,6 +80,7 @@ class Engine:
 
         # 市场数据管理器
         self._market_data_manager: Optional[MarketDataManager] = None
+        self._feed_latency: Optional[FeedLatencyTracker] = None
 
         # 🔥 [新增] 持久化适配器
         self._persistence: Optional[JsonPersistenceAdapter] = None
@@ -102,10 +109,38 @@ class Engine:
         logger.info("开始初始化组件...")
 
         # 1. 创建 EventBus
-        self._event_bus = EventBus()
+        # 🔥 [优化] 执行模式：lanes = OMS 与行情事件独立调度，慢 TICK 处理器不阻塞成交
+        event_bus_config = self.config.get('event_bus', {})
+        # 🔥 [优化] 合并：积压时同一 symbol 只保留最新的 BOOK_EVENT
+        # 🔥 [优化] 背压：队列满时丢弃行情，订单/持仓事件使用预留容量
+        self._event_bus = EventBus(
+            maxsize=event_bus_config.get('maxsize', 10000),
+            execution_mode=event_bus_config.get('execution_mode'),
+            conflate_event_types=[
+                EventType(value) for value in event_bus_config.get('conflate_event_types', [])
+            ],
+            backpressure_policies={
+                EventType(value): policy
+                for value, policy in event_bus_config.get('backpressure_policies', {}).items()
+            },
+            reserved_capacity=event_bus_config.get('reserved_capacity'),
+            handler_budget_ms=event_bus_config.get('handler_budget_ms'),
+            offload_slow_handlers=event_bus_config.get('offload_slow_handlers')
+        )
         await self._event_bus.start()
         logger.info("✅ EventBus 已启动")
 
+        # 🔥 [新增] 事件日志（记录所有发布的事件，用于事故回放）
+        journal_config = self.config.get('journal', {})
+        if journal_config.get('enabled', False):
+            self._journal = EventJournal(
+                directory=journal_config.get('path', 'data/journal'),
+                segment_bytes=journal_config.get('segment_bytes', 64 * 1024 * 1024)
+            )
+            await self._journal.start()
+            self._event_bus.attach_journal(self._journal)
+            logger.info(f"✅ EventJournal 已启用: {self._journal.directory}")
+
         # 2. 创建 OMS 组件
         total_capital = self.config.get('total_capital', 10000.0)
 
@@ -151,18 +186,52 @@ class Engine:
             base_url=rest_config.get('base_url', 'https://www.okx.com'),
             use_demo=rest_config.get('use_demo', True),
             timeout=rest_config.get('timeout', 10),
-            event_bus=self._event_bus
+            event_bus=self._event_bus,
+            rate_limit=rest_config.get('rate_limit', True)
         )
         logger.info(f"✅ REST Gateway 已创建: demo={rest_config.get('use_demo', True)}")
 
         # Public WebSocket
+        # 🔥 [新增] 一个连接复用多个交易对（symbol + symbols），运行时可增删
+        # 🔥 [新增] shards > 1 时按推送速率把交易对分散到多个连接（连接池）
+        # 🔥 [新增] redundant=True 时对同一组交易对打开 A/B 两条连接，先到先得合并（不与连接池同时使用）
         public_ws_config = self.config.get('public_ws', {})
-        self._public_ws = OkxPublicWsGateway(
-            symbol=public_ws_config.get('symbol', 'BTC-USDT-SWAP'),
-            ws_url=public_ws_config.get('ws_url'),
-            event_bus=self._event_bus
-        )
-        logger.info("✅ Public WebSocket 已创建")
+
+        # 🔥 [新增] 行情延迟统计：交易所 -> 接收 -> 发布 -> 处理器，按频道和交易对记录直方图
+        feed_latency_config = self.config.get('feed_latency', {})
+        if feed_latency_config.get('enabled', True):
+            self._feed_latency = FeedLatencyTracker()
+            if feed_latency_config.get('clock_sync', False):
+                await self._sync_clock()
+
+        if public_ws_config.get('redundant', False):
+            self._public_ws = OkxRedundantPublicFeed(
+                symbols=[public_ws_config.get('symbol', 'BTC-USDT-SWAP')] + list(public_ws_config.get('symbols') or []),
+                ws_urls=[public_ws_config.get('ws_url'), public_ws_config.get('backup_ws_url')],
+                event_bus=self._event_bus,
+                channels=public_ws_config.get('channels'),
+                latency_tracker=self._feed_latency
+            )
+        elif public_ws_config.get('shards', 1) > 1:
+            self._public_ws = OkxPublicWsPool(
+                symbols=[public_ws_config.get('symbol', 'BTC-USDT-SWAP')] + list(public_ws_config.get('symbols') or []),
+                shards=public_ws_config['shards'],
+                ws_url=public_ws_config.get('ws_url'),
+                event_bus=self._event_bus,
+                channels=public_ws_config.get('channels'),
+                rebalance_interval=public_ws_config.get('rebalance_interval', 30.0),
+                latency_tracker=self._feed_latency
+            )
+        else:
+            self._public_ws = OkxPublicWsGateway(
+                symbol=public_ws_config.get('symbol', 'BTC-USDT-SWAP'),
+                ws_url=public_ws_config.get('ws_url'),
+                event_bus=self._event_bus,
+                symbols=public_ws_config.get('symbols'),
+                channels=public_ws_config.get('channels'),
+                latency_tracker=self._feed_latency
+            )
+        logger.info(f"✅ Public WebSocket 已创建: {len(self._public_ws.symbols)} 个交易对")
 
         # Private WebSocket
         private_ws_config = self.config.get('private_ws', {})
@@ -172,7 +241,8 @@ class Engine:
             passphrase=private_ws_config.get('passphrase', os.getenv('OKX_PASSPHRASE')),
             use_demo=private_ws_config.get('use_demo', True),
             ws_url=private_ws_config.get('ws_url'),
-            event_bus=self._event_bus
+            event_bus=self._event_bus,
+            order_timeout=private_ws_config.get('order_timeout', 1.0)
         )
         logger.info("✅ Private WebSocket 已创建")
 
@@ -194,7 +264,10 @@ class Engine:
             rest_gateway=self._rest_gateway,
             event_bus=self._event_bus,
             pre_trade_check=self._pre_trade_check,
-            capital_commander=self._capital_commander  # 🔧 修复：传入资金指挥官
+            capital_commander=self._capital_commander,  # 🔧 修复：传入资金指挥官
+            private_ws=self._private_ws,
+            order_transport=private_ws_config.get('order_transport', 'rest'),
+            attach_stop_loss=risk_config.get('attach_stop_loss', True)
         )
         logger.info("✅ OrderManager 已初始化（已集成风控和资金检查）")
 
@@ -204,6 +277,9 @@ class Engine:
 
         # 🔥 [关键修复] 6. 创建市场数据管理器（必须在策略加载之前）
         self._market_data_manager = MarketDataManager(event_bus=self._event_bus)
+        if self._public_ws:
+            # 🔥 [新增] 深度查询直接读取公共 WS 维护的全深度订单簿
+            self._market_data_manager.set_book_source(self._public_ws)
         logger.info("✅ MarketDataManager 已初始化")
 
         # 7. 加载 Strategies（现在可以安全注入 MarketDataManager）
@@ -214,6 +290,9 @@ class Engine:
                 self._strategies.append(strategy)
         logger.info(f"✅ 已加载 {len(self._strategies)} 个策略")
 
+        # 🔥 [新增] 按策略声明的订单簿需求选择最便宜的订单簿频道（public_ws.book_channel 可强制指定）
+        await self._select_book_channel(public_ws_config)
+
         # 8. 注册事件处理器
         await self._register_event_handlers()
         logger.info("✅ 事件处理器已注册")
@@ -239,6 +318,46 @@ class Engine:
 
         logger.info("✅ 所有组件初始化完成")
 
+    async def _sync_clock(self):
+        """
+        测量本地与 OKX 服务器的时钟偏移并设置为全局偏移（签名时间戳与行情延迟共用）
+        """
+        from ..utils.auth import set_time_offset
+        from ..utils.time import check_time_sync
+
+        result = await check_time_sync()
+        set_time_offset(result['time_offset'] or 0.0)
+        if self._feed_latency:
+            self._feed_latency.sync_clock()
+        logger.info(f"✅ 时钟偏移已同步: {result['time_offset'] or 0.0:+.3f}s")
+
+    async def _select_book_channel(self, public_ws_config: dict):
+        """
+        选择公共 WS 订阅的订单簿频道
+
+        public_ws.book_channel 显式指定时直接使用；否则取满足全部策略订单簿需求的最便宜频道。
+        未订阅任何订单簿频道（channels 不含订单簿频道）时不做切换。
+
+        Args:
+            public_ws_config (dict): public_ws 配置
+        """
+        if not self._public_ws or self._public_ws.book_channel is None:
+            return
+
+        channel = public_ws_config.get('book_channel')
+        if channel is None:
+            requirements = [
+                strategy.book_requirement for strategy in self._strategies
+                if getattr(strategy, 'book_requirement', None) is not None
+            ]
+            if not requirements:
+                return
+            channel = select_book_channel(requirements)
+
+        if channel != self._public_ws.book_channel:
+            await self._public_ws.set_book_channel(channel)
+        logger.info(f"✅ 订单簿频道: {channel}")
+
     async def _load_strategy(self, strategy_config: dict) -> Optional[BaseStrategy]:
         """
         加载策略
@@ -325,6 +444,9 @@ class Engine:
             self._order_manager.on_order_cancelled
         )
 
+        # 🔥 [新增] 行情延迟统计：作为策略行情处理器的探针，记录事件入队到调用策略的延迟
+        feed_probe = self._feed_latency.on_dispatch if self._feed_latency else None
+
         # 2. ✨ 关键修复：注册策略的事件处理器
         if not self._strategies:
             logger.warning("没有加载任何策略，跳过策略事件注册")
@@ -332,7 +454,10 @@ class Engine:
 
         for strategy in self._strategies:
             # 注册行情事件 (驱动策略核心逻辑)
-            self._event_bus.register(EventType.TICK, strategy.on_tick)
+            self._event_bus.register(EventType.TICK, strategy.on_tick, probe=feed_probe)
+            # 🔥 [新增] 成交聚合模式（TradeParser aggregate）下一帧一个 TRADE_BATCH 事件
+            if hasattr(strategy, 'on_trade_batch'):
+                self._event_bus.register(EventType.TRADE_BATCH, strategy.on_trade_batch, probe=feed_probe)
 
             # 注册成交事件 (驱动持仓更新和挂单管理)
             # 注意：BaseStrategy 通常已经实现了 on_order_filled
@@ -351,7 +476,7 @@ class Engine:
 
             # 🔥 [修复] 注册通用事件处理器（用于监听BOOK_EVENT）
             if hasattr(strategy, 'on_event'):
-                self._event_bus.register(EventType.BOOK_EVENT, strategy.on_event)
+                self._event_bus.register(EventType.BOOK_EVENT, strategy.on_event, probe=feed_probe)
                 logger.debug(f"✅ 策略 {strategy.strategy_id} 已注册 on_event 事件处理器 (BOOK_EVENT)")
 
             logger.info(
@@ -614,12 +739,50 @@ class Engine:
             await self._event_bus.stop()
             logger.info("✅ EventBus 已停止")
 
+        # 🔥 [新增] 关闭事件日志（EventBus 停止后再落盘剩余记录）
+        if self._journal:
+            self._event_bus.detach_journal()
+            await self._journal.stop()
+            self._journal = None
+            logger.info("✅ EventJournal 已关闭")
+
         # 6. 🔥 等待所有异步任务完成（关键）
         logger.info("等待所有异步任务完成...")
         await asyncio.sleep(0.5)
 
         logger.info("✅ 系统已停止")
 
+    async def replay_journal(self, path: str, speed: Optional[float] = 1.0) -> dict:
+        """
+        🔥 [新增] 把事件日志回放到本引擎（需先 initialize，不调用 start）
+
+        回放是离线的：REST Gateway 会先被关闭，策略在回放中发起的下单请求
+        直接失败，不会到达交易所；WebSocket 不连接，只有日志中的事件驱动系统。
+
+        Args:
+            path (str): 日志目录或分段文件
+            speed (Optional[float]): 1.0 = 原速，N = N 倍速，None / 0 = 最快速度
+
+        Returns:
+            dict: 回放结果（见 JournalReplayer.replay）
+        """
+        if self._rest_gateway:
+            await self._rest_gateway.disconnect()
+            logger.info("🔌 [Replay] REST Gateway 已关闭（离线回放）")
+
+        for strategy in self._strategies:
+            await strategy.start()
+
+        self._running = True
+        result = await JournalReplayer(self._event_bus, speed=speed).replay(path)
+
+        # 等待回放的事件全部处理完毕
+        while self._event_bus.qsize() > 0:
+            await asyncio.sleep(0.01)
+
+        result['status'] = self.get_status()
+        return result
+
     async def disable_all_strategies(self):
         """
         🔥 [Guardian] 禁用所有策略（熔断时调用）
@@ -741,7 +904,11 @@ class Engine:
             'capital': self._capital_commander.get_summary() if self._capital_commander else {},
             'positions': self._position_manager.get_summary() if self._position_manager else {},
             'orders': self._order_manager.get_summary() if self._order_manager else {},
-            'strategies': len(self._strategies)
+            'strategies': len(self._strategies),
+            'slow_handlers': self._event_bus.get_slow_handlers(limit=5) if self._event_bus else [],
+            'feed_latency': self._feed_latency.get_stats() if self._feed_latency else {},
+            'order_ack_latency': self._order_manager.get_ack_latency_stats() if self._order_manager else {},
+            'rest_rate_limit': self._rest_gateway.get_rate_limit_stats() if self._rest_gateway else {}
         }
 
     async def __aenter__(self):
@@ -766,22 +933,51 @@ def create_default_config() -> dict:
     return {
         'total_capital': 10000.0,
         'sync_threshold_pct': 0.10,
+        'event_bus': {
+            'maxsize': 10000,
+            'execution_mode': 'lanes',
+            'conflate_event_types': ['book_event'],
+            'reserved_capacity': 1000,  # 只供订单/持仓事件使用的队列容量
+            'backpressure_policies': {},  # 覆盖默认策略，如 {'signal_buy': 'never_drop'}
+            'handler_budget_ms': 5.0,  # 单个处理器执行预算，反复超出时标记为慢处理器
+            'offload_slow_handlers': False  # 慢处理器自动卸载到独立消费任务（订单/持仓处理器除外）
+        },
+        'journal': {
+            'enabled': False,  # 记录所有事件到二进制日志（用于 scripts/replay_journal.py 回放）
+            'path': 'data/journal',
+            'segment_bytes': 64 * 1024 * 1024
+        },
         'sync_cooldown_seconds': 60,
         'rest_gateway': {
             'use_demo': True,
-            'timeout': 10
+            'timeout': 10,
+            'rate_limit': True  # 客户端限频：按接口 / instId 令牌桶，紧急平仓和撤单优先于新开仓和查询
         },
         'public_ws': {
             'symbol': 'BTC-USDT-SWAP',
+            'symbols': [],  # 额外订阅的交易对（与 symbol 共用一个连接）
+            'channels': ['trades', 'books'],
+            'shards': 1,  # > 1 时使用连接池，按推送速率分片
+            'rebalance_interval': 30.0,
+            'redundant': False,  # True 时打开 A/B 两条连接，按 tradeId / seqId 先到先得去重
+            'book_channel': None,  # 订单簿频道（bbo-tbt / books5 / books / books-l2-tbt），None 表示按策略需求自动选择
+            'backup_ws_url': None,  # B 连接的 URL（None 表示与 A 相同的默认 URL）
             'use_demo': True
         },
+        'feed_latency': {
+            'enabled': True,  # 行情延迟直方图（交易所 -> 接收 -> 发布 -> 处理器）
+            'clock_sync': False  # 启动时通过 OKX /public/time 测量时钟偏移
+        },
         'private_ws': {
-            'use_demo': True
+            'use_demo': True,
+            'order_transport': 'ws',  # 下单 / 撤单 / 改单走私有 WebSocket（未登录或超时回退到 REST；省略时默认 rest）
+            'order_timeout': 1.0  # WebSocket 交易操作超时（秒），同时作为请求的 expTime
         },
         'risk': {
             'max_order_amount': 2000.0,
             'max_frequency': 5,
-            'frequency_window': 1.0
+            'frequency_window': 1.0,
+            'attach_stop_loss': True  # 开仓单随下单请求附带止损（attachAlgoOrds），False 时成交后再下止损单
         },
         'strategies': []  # 空列表，由 main.py 根据环境变量动态加载
     }
@@ -9,16 +9,37 @@
 - 类型安全，使用标准事件格式
 - 解耦模块间依赖
 - 🔥 [P0 修复] 支持优先级队列，确保紧急事件实时处理
+- 🔥 [优化] 按优先级分通道（lane）的 FIFO 队列，入队/出队 O(1)，
+  TICK 洪峰不会拖慢 ORDER_FILLED / EMERGENCY_CLOSE 的调度
+- 🔥 [优化] 执行通道（execution lane）：OMS/成交事件与行情事件由独立的调度任务处理，
+  慢 TICK 处理器（如下单 REST 往返）不再阻塞 ORDER_FILLED
+- 🔥 [优化] 可选的事件合并（conflation）：同一 symbol 尚未分发的 BOOK_EVENT
+  被新事件原地替换（latest-value-wins），积压时只处理最新订单簿
+- 🔥 [优化] 批量分发（register_batch）：聚合型处理器一次接收一批同类型事件
+- 🔥 [优化] 预解析分发表：注册时对处理器分类（sync / async / async_inline），
+  同步处理器直接调用，不创建协程；协程处理器（含 async_inline）照常创建协程并 await；
+  分发时不再调用 iscoroutinefunction；
+  处理器都不会挂起（sync / async_inline）的事件在并发执行通道中直接处理，不创建 Task
+- 🔥 [优化] 按事件类型声明背压策略：队列满时行情事件丢弃最旧 / 合并，
+  订单与持仓事件使用预留容量永不丢弃，内部事件阻塞生产者
+- 🔥 [新增] 可选事件日志（journal）：记录每个发布的事件，用于事故回放
+- 🔥 [新增] 慢处理器检测：每个处理器有执行预算，反复超预算的处理器按限定名标记，
+  可选卸载到独立的消费任务，不再阻塞主分发循环
+- 🔥 [优化] 延迟直方图：按事件类型统计排队等待 / 处理 / 端到端耗时，按处理器统计执行耗时，
+  固定内存、O(1) 记录，生产环境可常开
 """
 
 import asyncio
+import dis
 import logging
 import os
-from typing import Callable, Dict, List, Any, Optional
-from collections import defaultdict
-from dataclasses import dataclass, field
-from itertools import count
+import time
+import types
+from typing import Callable, Dict, List, Any, Optional, Iterable, Tuple
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from .event_types import Event, EventType
+from .histogram import LatencyHistogram
 
 logger = logging.getLogger(__name__)
 
@@ -38,38 +59,378 @@ class EventPriority:
     TICK = 10            # 行情数据（最低优先级）
 
 
-# 🔥 [修复] 引入全局计数器，确保相同优先级事件按 FIFO 顺序处理
-_event_counter = count()
+# 优先级 -> 通道名称（用于统计输出）
+_PRIORITY_NAMES: Dict[int, str] = {
+    value: name
+    for name, value in vars(EventPriority).items()
+    if not name.startswith('_') and isinstance(value, int)
+}
 
 
-@dataclass(order=False)
-class PriorityEvent:
+# 🔥 [优化] 处理器类型（注册时分类一次）
+HANDLER_SYNC = 0          # 普通函数：直接调用，不创建协程
+HANDLER_ASYNC = 1         # 协程函数，可能挂起：await
+HANDLER_ASYNC_INLINE = 2  # 协程函数，函数体内没有任何 await：仍然 await，但一定同步完成（不需要 Task）
+
+HANDLER_KIND_NAMES = {
+    HANDLER_SYNC: 'sync',
+    HANDLER_ASYNC: 'async',
+    HANDLER_ASYNC_INLINE: 'async_inline',
+}
+
+# 🔥 [新增] 分发表中已卸载到独立消费任务的处理器（分发时只投递事件，不执行）
+HANDLER_OFFLOADED = 3
+
+# 会让协程挂起的字节码（await / async with / async for）
+_SUSPENDING_OPNAMES = frozenset({
+    'GET_AWAITABLE', 'BEFORE_ASYNC_WITH', 'GET_AITER', 'GET_ANEXT', 'END_ASYNC_FOR'
+})
+
+
+def _classify_handler(handler: Callable) -> int:
     """
-    优先级事件包装器
+    处理器分类
 
-    支持比较（__lt__），以便在 PriorityQueue 中排序
+    协程函数的字节码中没有 await / async with / async for 时，
+    该协程永远不会挂起，归为 HANDLER_ASYNC_INLINE。分发时与 HANDLER_ASYNC 一样创建协程并 await
+    （用 send(None) 直接驱动时 StopIteration 的开销比 await 更大），分类只用于决定事件是否需要 Task。
 
-    🔥 [修复] 添加计数器字段，确保相同优先级事件按 FIFO 处理
+    Args:
+        handler (Callable): 处理函数
 
-    比较顺序：
-    1. priority (数值越小优先级越高)
-    2. counter (确保 FIFO 顺序)
+    Returns:
+        int: HANDLER_SYNC / HANDLER_ASYNC / HANDLER_ASYNC_INLINE
     """
-    priority: int  # 优先级（数值越小优先级越高）
-    event: Event    # 实际事件对象
-    counter: int = field(default_factory=lambda: next(_event_counter))  # 🔥 [修复] 确保相同优先级按 FIFO 处理
+    if not (asyncio.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(
+        getattr(handler, '__call__', None)
+    )):
+        return HANDLER_SYNC
 
-    def __lt__(self, other: 'PriorityEvent') -> bool:
-        """
-        比较方法，用于 PriorityQueue 排序
+    # 只分析真正的字节码，否则按可能挂起处理
+    # （AsyncMock 的 __code__ 是以 CodeType 为 spec 的 Mock，isinstance 检查会通过，因此比较精确类型）
+    code = getattr(getattr(handler, '__func__', handler), '__code__', None)
+    if type(code) is not types.CodeType:
+        return HANDLER_ASYNC
 
-        比较逻辑：
-        1. 先比较 priority（数值越小优先级越高）
-        2. 如果 priority 相同，比较 counter（数值越小越先处理，即 FIFO）
-        """
-        if self.priority != other.priority:
-            return self.priority < other.priority
-        return self.counter < other.counter
+    for instruction in dis.get_instructions(code):
+        if instruction.opname in _SUSPENDING_OPNAMES:
+            return HANDLER_ASYNC
+    return HANDLER_ASYNC_INLINE
+
+
+def _handler_key(handler: Callable) -> Tuple[int, int]:
+    """
+    处理器标识（绑定方法每次访问都会生成新对象，且宿主对象可能不可哈希，因此按 id 标识）
+
+    Args:
+        handler (Callable): 处理函数
+
+    Returns:
+        Tuple[int, int]: (宿主对象 id, 函数 id)
+    """
+    return (id(getattr(handler, '__self__', handler)), id(getattr(handler, '__func__', handler)))
+
+
+@dataclass(frozen=True)
+class ExecutionLaneConfig:
+    """
+    执行通道配置
+
+    每个执行通道拥有独立的调度任务，承接一段连续的优先级。
+
+    Attributes:
+        name (str): 通道名称
+        max_priority (Optional[int]): 承接的最大优先级数值（含），None 表示兜底承接其余优先级
+        concurrency (int): 并发处理上限；大于 1 时不同 symbol 的事件并发处理，
+                           同一 symbol 的事件仍严格按顺序处理
+    """
+    name: str
+    max_priority: Optional[int] = None
+    concurrency: int = 1
+
+
+# 串行模式：单一调度任务按优先级处理所有事件（兼容旧行为）
+SERIAL_EXECUTION_LANES = (
+    ExecutionLaneConfig(name='serial', max_priority=None, concurrency=1),
+)
+
+# 分通道模式：OMS/成交/风控事件与行情事件互不阻塞
+LANED_EXECUTION_LANES = (
+    ExecutionLaneConfig(name='oms', max_priority=EventPriority.ORDER_UPDATE, concurrency=4),
+    ExecutionLaneConfig(name='market_data', max_priority=None, concurrency=4),
+)
+
+EXECUTION_MODES = {
+    'serial': SERIAL_EXECUTION_LANES,
+    'lanes': LANED_EXECUTION_LANES,
+}
+
+
+# 🔥 [新增] 背压策略（队列达到共享容量上限时的处理方式）
+BACKPRESSURE_DROP_OLDEST = 'drop_oldest'  # 丢弃排队中最旧的同类型事件，新事件入队
+BACKPRESSURE_CONFLATE = 'conflate'        # 优先替换同 symbol 的排队事件，否则丢弃最旧的同类型事件
+BACKPRESSURE_NEVER_DROP = 'never_drop'    # 使用预留容量；预留容量也耗尽时仍入队（超出 maxsize）
+BACKPRESSURE_BLOCK = 'block'              # put 等待空间；put_nowait 无法等待，丢弃并计入 errors
+
+BACKPRESSURE_POLICIES = (
+    BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_CONFLATE, BACKPRESSURE_NEVER_DROP, BACKPRESSURE_BLOCK
+)
+
+# 未声明的事件类型（信号、系统事件等内部事件）使用 BACKPRESSURE_BLOCK
+DEFAULT_BACKPRESSURE_POLICIES: Dict[EventType, str] = {
+    # 行情：可丢弃，只关心最新数据
+    EventType.TICK: BACKPRESSURE_DROP_OLDEST,
+    EventType.TRADE_BATCH: BACKPRESSURE_DROP_OLDEST,
+    EventType.BAR: BACKPRESSURE_DROP_OLDEST,
+    EventType.CANDLE_EVENT: BACKPRESSURE_DROP_OLDEST,
+    EventType.BOOK_EVENT: BACKPRESSURE_CONFLATE,
+    EventType.DEPTH: BACKPRESSURE_CONFLATE,
+    # 账户 / 订单：绝不丢弃
+    EventType.POSITION_UPDATE: BACKPRESSURE_NEVER_DROP,
+    EventType.BALANCE_UPDATE: BACKPRESSURE_NEVER_DROP,
+    EventType.ORDER_UPDATE: BACKPRESSURE_NEVER_DROP,
+    EventType.ORDER_FILLED: BACKPRESSURE_NEVER_DROP,
+    EventType.ORDER_CANCELLED: BACKPRESSURE_NEVER_DROP,
+    EventType.ORDER_SUBMITTED: BACKPRESSURE_NEVER_DROP,
+}
+
+# 每种策略的计数项
+_BACKPRESSURE_ACTIONS = {
+    BACKPRESSURE_DROP_OLDEST: ('evicted', 'dropped'),
+    BACKPRESSURE_CONFLATE: ('evicted', 'dropped'),
+    BACKPRESSURE_NEVER_DROP: ('headroom', 'overflow'),
+    BACKPRESSURE_BLOCK: ('blocked', 'dropped'),
+}
+
+
+class _ExecutionLane:
+    """
+    执行通道运行时状态
+
+    - lanes: 该通道负责的优先级通道（按优先级升序）
+    - semaphore: 并发上限
+    - inflight: 正在处理的 symbol -> 等待处理的同 symbol 事件
+    """
+
+    # 同一执行通道内，因 symbol 正在处理而暂存的事件上限；超过后调度任务暂停出队，
+    # 剩余事件留在优先级通道中（仍受队列容量约束）
+    BACKLOG_LIMIT = 256
+
+    def __init__(self, config: ExecutionLaneConfig):
+        self.name = config.name
+        self.max_priority = config.max_priority
+        self.concurrency = max(1, config.concurrency)
+        self.lanes: List['_PriorityLane'] = []
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.inflight: Dict[Any, deque] = {}
+        self.backlogged = 0
+        self.backlog_free = asyncio.Event()
+        self.backlog_free.set()
+        self.runners: set = set()
+        self.dispatched = 0
+        self.pending_batches: List['_BatchSubscription'] = []  # 有待交付事件的批量订阅
+        self.task: Optional[asyncio.Task] = None
+
+    def accepts(self, priority: int) -> bool:
+        """判断该通道是否承接指定优先级"""
+        return self.max_priority is None or priority <= self.max_priority
+
+
+class _BatchSubscription:
+    """
+    批量订阅
+
+    分发时把事件追加到 buffer，满足以下任一条件时一次性交付给处理器：
+    - buffer 达到 max_batch
+    - 最早的事件已等待 max_delay_ns
+    - 所属执行通道已无排队事件（一波突发处理完毕）
+    """
+
+    __slots__ = (
+        'handler', 'is_async', 'max_batch', 'max_delay_ns', 'buffer', 'first_ns', 'executor', 'delivered',
+        'latency'
+    )
+
+    def __init__(self, handler: Callable, max_batch: int, max_delay_ns: int):
+        self.handler = handler
+        self.is_async = _classify_handler(handler) != HANDLER_SYNC
+        self.max_batch = max(1, max_batch)
+        self.max_delay_ns = max_delay_ns
+        self.buffer: List[Event] = []
+        self.first_ns = 0
+        self.executor: Optional[_ExecutionLane] = None
+        self.delivered = 0  # 已交付批次数
+        self.latency = LatencyHistogram()  # 每批次处理耗时
+
+
+class _BatchDelivery:
+    """一次批量交付（在并发执行通道中作为调度单元）"""
+
+    __slots__ = ('subscription', 'events')
+
+    def __init__(self, subscription: _BatchSubscription, events: List[Event]):
+        self.subscription = subscription
+        self.events = events
+
+
+class _EventLatency:
+    """
+    单个事件类型的延迟直方图
+
+    - queue_wait: 入队 -> 开始分发（排队等待）
+    - processing: 依次执行所有处理器的耗时
+    - end_to_end: 入队 -> 所有处理器执行完毕
+    """
+
+    __slots__ = ('queue_wait', 'processing', 'end_to_end')
+
+    def __init__(self):
+        self.queue_wait = LatencyHistogram()
+        self.processing = LatencyHistogram()
+        self.end_to_end = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            'queue_wait': self.queue_wait.snapshot(),
+            'processing': self.processing.snapshot(),
+            'end_to_end': self.end_to_end.snapshot()
+        }
+
+    def reset(self):
+        self.queue_wait.reset()
+        self.processing.reset()
+        self.end_to_end.reset()
+
+
+class _HandlerWorker:
+    """
+    慢处理器的独立消费任务
+
+    主分发循环只把事件追加到 events（O(1)），由独立任务按顺序执行处理器，
+    每处理一个事件让出一次事件循环。队列超过上限时丢弃最旧的事件。
+    """
+
+    __slots__ = ('events', 'maxsize', 'wakeup', 'task', 'busy', 'closed', 'processed', 'dropped')
+
+    def __init__(self, maxsize: int):
+        self.events: deque = deque()
+        self.maxsize = maxsize
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.busy = False
+        self.closed = False  # 恢复为内联执行后，排空剩余事件即退出
+        self.processed = 0
+        self.dropped = 0
+
+    def submit(self, event: Event):
+        """投递事件（O(1)）"""
+        events = self.events
+        events.append(event)
+        if len(events) > self.maxsize:
+            events.popleft()
+            self.dropped += 1
+        if not self.wakeup.is_set():
+            self.wakeup.set()
+
+
+class _HandlerProfile:
+    """
+    单个处理器（事件类型 + 处理器）的执行画像
+
+    - latency: 执行耗时直方图（启用延迟统计时记录）
+    - 超预算统计：SLOW_HANDLER_WINDOW 次调用内超预算 SLOW_HANDLER_STRIKES 次即标记为慢处理器
+    - worker: 卸载到独立消费任务后的工作者
+    - probe: 调用处理器前的探针 probe(event, dispatch_ns)（register 时声明）
+    """
+
+    __slots__ = (
+        'event_type', 'handler', 'kind', 'label', 'budget_ns', 'latency', 'calls', 'overruns',
+        'overrun_ns', 'max_ns', 'window_start', 'window_overruns', 'flagged', 'worker', 'probe'
+    )
+
+    def __init__(self, event_type: EventType, handler: Callable, kind: int, label: str, budget_ns: int):
+        self.event_type = event_type
+        self.handler = handler
+        self.kind = kind
+        self.label = label
+        self.budget_ns = budget_ns
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.overruns = 0        # 累计超预算次数
+        self.overrun_ns = 0      # 超预算调用的累计耗时（排名依据）
+        self.max_ns = 0          # 超预算调用中的最大耗时
+        self.window_start = 0    # 当前统计窗口起始的调用序号
+        self.window_overruns = 0
+        self.flagged = False
+        self.worker: Optional[_HandlerWorker] = None
+        self.probe: Optional[Callable[[Event, int], None]] = None
+
+    def reset(self):
+        self.calls = 0
+        self.overruns = 0
+        self.overrun_ns = 0
+        self.max_ns = 0
+        self.window_start = 0
+        self.window_overruns = 0
+
+    def report(self) -> Dict[str, Any]:
+        worker = self.worker
+        return {
+            'handler': self.label,
+            'budget_ms': self.budget_ns / 1e6,
+            'calls': self.calls,
+            'overruns': self.overruns,
+            'overrun_ms': self.overrun_ns / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'p99_ms': self.latency.percentile(99) / 1e6,
+            'flagged': self.flagged,
+            'offloaded': worker is not None,
+            'queued': len(worker.events) if worker else 0,
+            'dropped': worker.dropped if worker else 0
+        }
+
+
+class _ConflationSlot:
+    """
+    合并槽位
+
+    占据优先级通道中的一个位置；同一 (事件类型, symbol) 的新事件到达时
+    原地替换 event，保持排队位置不变。
+    """
+
+    __slots__ = ('key', 'event')
+
+    def __init__(self, key: Tuple[EventType, Any], event: Event):
+        self.key = key
+        self.event = event
+
+
+class _PriorityLane:
+    """
+    单一优先级的事件通道（FIFO）
+
+    同一优先级的事件按发布顺序排队，入队和出队都是 O(1) 的 deque 操作，
+    不再需要堆排序和 Python 层面的 __lt__ 比较。
+    """
+
+    __slots__ = ('priority', 'name', 'events', 'enqueued', 'peak', 'executor')
+
+    def __init__(self, priority: int, executor: _ExecutionLane):
+        self.priority = priority
+        self.name = _PRIORITY_NAMES.get(priority, f"PRIORITY_{priority}")
+        self.executor = executor
+        self.events: deque = deque()
+        self.enqueued = 0  # 累计入队数量
+        self.peak = 0      # 队列深度峰值
+
+    def push(self, event: Event):
+        """事件入队（O(1)）"""
+        events = self.events
+        events.append(event)
+        self.enqueued += 1
+        if len(events) > self.peak:
+            self.peak = len(events)
 
 
 class EventBus:
@@ -94,23 +455,126 @@ class EventBus:
         ... ))
     """
 
-    def __init__(self):
-        """初始化事件总线"""
+    # 连续处理多少个事件后主动让出一次事件循环（防止 TICK 洪峰饿死 WebSocket 接收任务）
+    DISPATCH_YIELD_INTERVAL = 64
+
+    # 背压丢弃最旧事件时最多扫描的排队事件数
+    EVICT_SCAN_LIMIT = 64
+
+    # 🔥 [新增] 慢处理器判定：SLOW_HANDLER_WINDOW 次调用内超预算 SLOW_HANDLER_STRIKES 次
+    SLOW_HANDLER_STRIKES = 3
+    SLOW_HANDLER_WINDOW = 100
+
+    # 卸载后独立消费任务的队列上限（超过后丢弃最旧事件）
+    WORKER_QUEUE_LIMIT = 10000
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        execution_mode: Optional[str] = None,
+        execution_lanes: Optional[tuple] = None,
+        conflate_event_types: Optional[Iterable[EventType]] = None,
+        backpressure_policies: Optional[Dict[EventType, str]] = None,
+        reserved_capacity: Optional[int] = None,
+        handler_budget_ms: Optional[float] = None,
+        offload_slow_handlers: Optional[bool] = None
+    ):
+        """
+        初始化事件总线
+
+        Args:
+            maxsize (int): 队列容量（所有优先级通道的事件总数上限）
+            execution_mode (Optional[str]): 执行模式 'serial' / 'lanes'，
+                                            None 时读取环境变量 EVENT_BUS_EXECUTION_MODE（默认 serial）
+            execution_lanes (Optional[tuple]): 自定义 ExecutionLaneConfig 列表（优先于 execution_mode）
+            conflate_event_types (Optional[Iterable[EventType]]): 启用合并的事件类型（默认不合并）
+            backpressure_policies (Optional[Dict[EventType, str]]): 覆盖默认背压策略
+                                                                  （见 DEFAULT_BACKPRESSURE_POLICIES）
+            reserved_capacity (Optional[int]): 只允许 never_drop 事件使用的预留容量，默认 maxsize 的 10%
+            handler_budget_ms (Optional[float]): 单个处理器的默认执行预算（毫秒），
+                                                None 时读取环境变量 EVENT_BUS_HANDLER_BUDGET_MS（默认 5）
+            offload_slow_handlers (Optional[bool]): 是否把慢处理器自动卸载到独立消费任务，
+                                                   None 时读取环境变量 EVENT_BUS_OFFLOAD_SLOW_HANDLERS（默认关闭）
+        """
         self._handlers: Dict[EventType, List[Callable]] = defaultdict(list)
-        # 🔥 [P0 修复] 替换为优先级队列
-        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=10000)
+        # 🔥 [优化] 预解析分发表：事件类型 -> ((处理器类型, 处理器, 执行画像), ...)，注册变更时重建
+        self._handler_kinds: Dict[Tuple[int, int], int] = {}
+        self._dispatch_table: Dict[EventType, Tuple[Tuple[int, Callable, _HandlerProfile], ...]] = {}
+        self._handler_profiles: Dict[Tuple[EventType, Tuple[int, int]], _HandlerProfile] = {}
+        self._handler_budgets: Dict[Tuple[EventType, Tuple[int, int]], int] = {}  # 单独声明的预算（纳秒）
+        # 🔥 [新增] 调用处理器前的探针（有探针时入队即打时间戳，与延迟统计开关无关）
+        self._handler_probes: Dict[Tuple[EventType, Tuple[int, int]], Callable[[Event, int], None]] = {}
+        self._suspending_types: set = set()  # 至少有一个处理器可能挂起的事件类型
+        self._batch_handlers: Dict[EventType, List[_BatchSubscription]] = defaultdict(list)
+
+        # 🔥 [优化] 执行通道：每个执行通道一个调度任务
+        if execution_lanes is None:
+            if execution_mode is None:
+                execution_mode = os.getenv('EVENT_BUS_EXECUTION_MODE', 'serial').lower()
+            if execution_mode not in EXECUTION_MODES:
+                logger.warning(f"⚠️ [EventBus] 未知执行模式 {execution_mode}，使用 serial")
+                execution_mode = 'serial'
+            execution_lanes = EXECUTION_MODES[execution_mode]
+        self._executors: List[_ExecutionLane] = sorted(
+            (_ExecutionLane(config) for config in execution_lanes),
+            key=lambda item: float('inf') if item.max_priority is None else item.max_priority
+        )
+        if self._executors[-1].max_priority is not None:
+            raise ValueError("execution_lanes 必须包含一个 max_priority=None 的兜底通道")
+
+        # 🔥 [优化] 按优先级分通道的 FIFO 队列（替代 asyncio.PriorityQueue）
+        # 每个优先级一个 deque，调度时严格按优先级从高到低排空
+        self._maxsize = maxsize
+        self._size = 0
+        self._lanes: Dict[int, _PriorityLane] = {}
+        self._ordered_lanes: List[_PriorityLane] = []  # 按优先级升序（数值越小越先处理）
+        for priority in sorted(_PRIORITY_NAMES):
+            self._get_lane(priority)
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        # 🔥 [新增] 背压策略：非 never_drop 事件只能使用 maxsize - reserved_capacity 的共享容量
+        if reserved_capacity is None:
+            reserved_capacity = maxsize // 10
+        if not 0 <= reserved_capacity < maxsize:
+            raise ValueError(f"reserved_capacity 必须在 [0, {maxsize}) 范围内: {reserved_capacity}")
+        self._reserved_capacity = reserved_capacity
+        self._shared_limit = maxsize - reserved_capacity
+        self._policies: Dict[EventType, str] = dict(DEFAULT_BACKPRESSURE_POLICIES)
+        for event_type, policy in (backpressure_policies or {}).items():
+            self.set_backpressure_policy(event_type, policy)
+        self._backpressure_stats: Dict[str, Dict[str, int]] = {
+            policy: {action: 0 for action in actions} for policy, actions in _BACKPRESSURE_ACTIONS.items()
+        }
+
+        # 🔥 [优化] 事件合并（按 (事件类型, symbol) 保留一个待分发槽位）
+        self._conflated_types: set = set()
+        self._pending_slots: Dict[Tuple[EventType, Any], _ConflationSlot] = {}
+        self._conflation_stats: Dict[str, int] = defaultdict(int)
+        for event_type in conflate_event_types or ():
+            self.enable_conflation(event_type)
+
+        # 🔥 [新增] 事件日志（可选 sink，见 attach_journal）
+        self._journal = None
+
+        # 🔥 [新增] 慢处理器检测（始终开启，与延迟直方图开关无关）
+        if handler_budget_ms is None:
+            handler_budget_ms = float(os.getenv('EVENT_BUS_HANDLER_BUDGET_MS', '5'))
+        if offload_slow_handlers is None:
+            offload_slow_handlers = os.getenv('EVENT_BUS_OFFLOAD_SLOW_HANDLERS', 'false').lower() == 'true'
+        self._handler_budget_ns = int(handler_budget_ms * 1e6)
+        self.offload_slow_handlers = offload_slow_handlers
+
         self._running: bool = False
-        self._task: Optional[asyncio.Task] = None
         self._stats = {
             'published': 0,
             'processed': 0,
             'errors': 0
         }
-        # 🔥 [新增] 性能监控
-        self._latency_stats: Dict[str, List[float]] = {}
-        self._max_latency_samples = 1000  # 最多保留 1000 个延迟样本
+        # 🔥 [优化] 延迟直方图（固定内存，替代逐条保存的延迟列表）
+        self._latency: Dict[EventType, _EventLatency] = {}
 
-        # 🔥 [优化] 从环境变量读取性能监控开关
+        # 🔥 [优化] 从环境变量读取性能监控开关（默认关闭；开启后延迟写入直方图）
         self.enable_latency_tracking = os.getenv(
             'EVENT_BUS_ENABLE_LATENCY_TRACKING', 'false'
         ).lower() == 'true'
@@ -120,17 +584,26 @@ class EventBus:
         self.CRITICAL_LATENCY_MS = 100.0  # 从 50ms 调整到 100ms
 
         if self.enable_latency_tracking:
-            logger.info("📊 [EventBus] 性能监控已启用（开发模式）")
+            logger.info("📊 [EventBus] 延迟直方图已启用")
         else:
-            logger.info("🚀 [EventBus] 性能监控已关闭（生产模式）")
-
-    def register(self, event_type: EventType, handler: Callable):
+            logger.info("🚀 [EventBus] 延迟直方图已关闭")
+
+    def register(
+        self,
+        event_type: EventType,
+        handler: Callable,
+        budget_ms: Optional[float] = None,
+        probe: Optional[Callable[[Event, int], None]] = None
+    ):
         """
         注册事件处理器
 
         Args:
             event_type (EventType): 事件类型
             handler (Callable): 处理函数，签名：async def handler(event: Event)
+            budget_ms (Optional[float]): 该处理器的执行预算（毫秒），None 使用总线默认预算
+            probe (Optional[Callable]): 每次调用该处理器前同步调用 probe(event, dispatch_ns)，
+                dispatch_ns 为调用处理器时的 time.monotonic_ns（如统计入队 -> 策略处理器的延迟）
 
         Example:
             >>> async def on_tick(event: Event):
@@ -138,7 +611,18 @@ class EventBus:
             >>> event_bus.register(EventType.TICK, on_tick)
         """
         self._handlers[event_type].append(handler)
-        logger.debug(f"注册处理器: {event_type} -> {handler.__name__}")
+        key = _handler_key(handler)
+        # 每次注册都重新分类：id 在对象回收后可能被新处理器复用，不能沿用旧分类
+        self._handler_kinds[key] = _classify_handler(handler)
+        if budget_ms is not None:
+            self._handler_budgets[(event_type, key)] = int(budget_ms * 1e6)
+        if probe is not None:
+            self._handler_probes[(event_type, key)] = probe
+        self._rebuild_dispatch_table(event_type)
+        logger.debug(
+            f"注册处理器: {event_type} -> {handler.__name__} "
+            f"({HANDLER_KIND_NAMES[self._handler_kinds[key]]})"
+        )
 
     def unregister(self, event_type: EventType, handler: Callable):
         """
@@ -150,13 +634,109 @@ class EventBus:
         """
         if handler in self._handlers[event_type]:
             self._handlers[event_type].remove(handler)
+            self._rebuild_dispatch_table(event_type)
+            # 处理器不再注册在任何事件类型下时移除分类
+            key = _handler_key(handler)
+            if not any(_handler_key(h) == key for handlers in self._handlers.values() for h in handlers):
+                self._handler_kinds.pop(key, None)
             logger.debug(f"取消注册处理器: {event_type} -> {handler.__name__}")
 
+    def _rebuild_dispatch_table(self, event_type: EventType):
+        """
+        重建事件类型的分发表（不可变 tuple，分发时直接遍历）
+
+        Args:
+            event_type (EventType): 事件类型
+        """
+        handlers = self._handlers.get(event_type)
+        keys = [_handler_key(handler) for handler in handlers or ()]
+
+        # 保留仍在注册中的处理器的执行画像，移除已注销处理器的画像（其独立消费任务排空后退出）
+        for profile_key in [k for k in self._handler_profiles if k[0] == event_type and k[1] not in keys]:
+            profile = self._handler_profiles.pop(profile_key)
+            self._handler_budgets.pop(profile_key, None)
+            self._handler_probes.pop(profile_key, None)
+            if profile.worker:
+                self._close_worker(profile)
+
+        if handlers:
+            entries = []
+            for key, handler in zip(keys, handlers):
+                profile = self._handler_profiles.get((event_type, key))
+                if profile is None:
+                    profile = self._handler_profiles[(event_type, key)] = _HandlerProfile(
+                        event_type,
+                        handler,
+                        self._handler_kinds[key],
+                        self._handler_label(event_type, handler),
+                        self._handler_budgets.get((event_type, key), self._handler_budget_ns)
+                    )
+                profile.probe = self._handler_probes.get((event_type, key))
+                entries.append((HANDLER_OFFLOADED if profile.worker else profile.kind, handler, profile))
+            entries = tuple(entries)
+            self._dispatch_table[event_type] = entries
+            if any(kind == HANDLER_ASYNC for kind, _, _ in entries):
+                self._suspending_types.add(event_type)
+            else:
+                self._suspending_types.discard(event_type)
+        else:
+            self._dispatch_table.pop(event_type, None)
+            self._suspending_types.discard(event_type)
+
+    def register_batch(
+        self,
+        event_type: EventType,
+        handler: Callable,
+        max_batch: int = 50,
+        max_delay_us: int = 500
+    ):
+        """
+        注册批量事件处理器
+
+        处理器一次接收一批同类型事件（按分发顺序），适合只把事件折叠进
+        运行状态的聚合型消费者。可与 register 注册的逐事件处理器共存。
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理函数，签名：async def handler(events: List[Event])
+            max_batch (int): 单批最大事件数
+            max_delay_us (int): 单批最早事件的最大等待时间（微秒）；
+                                执行通道空闲时会立即交付，不会额外等待
+
+        Example:
+            >>> async def on_ticks(events: List[Event]):
+            ...     print(len(events))
+            >>> event_bus.register_batch(EventType.TICK, on_ticks, max_batch=50)
+        """
+        self._batch_handlers[event_type].append(
+            _BatchSubscription(handler, max_batch, max_delay_us * 1000)
+        )
+        logger.debug(
+            f"注册批量处理器: {event_type} -> {handler.__name__} "
+            f"(max_batch={max_batch}, max_delay_us={max_delay_us})"
+        )
+
+    def unregister_batch(self, event_type: EventType, handler: Callable):
+        """
+        取消注册批量事件处理器（未交付的事件被丢弃）
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理函数
+        """
+        subscriptions = self._batch_handlers.get(event_type, [])
+        for subscription in list(subscriptions):
+            if subscription.handler == handler:
+                subscriptions.remove(subscription)
+                if subscription.executor and subscription in subscription.executor.pending_batches:
+                    subscription.executor.pending_batches.remove(subscription)
+                logger.debug(f"取消注册批量处理器: {event_type} -> {handler.__name__}")
+
     async def put(self, event: Event, priority: int = EventPriority.TICK):
         """
         发布事件（异步，支持优先级）
 
-        将事件放入优先级队列，由后台任务处理。
+        将事件放入对应优先级通道，由后台任务处理。队列已满时等待空间。
 
         Args:
             event (Event): 要发布的事件
@@ -177,19 +757,28 @@ class EventBus:
             ...     source="order_manager"
             ... ), priority=EventPriority.ORDER_FILLED)
         """
-        try:
-            # 🔥 [P0 修复] 包装为 PriorityEvent
-            priority_event = PriorityEvent(priority=priority, event=event)
-            await self._queue.put(priority_event)
-            self._stats['published'] += 1
+        if self._journal is not None:
+            self._journal.record(event, priority)
 
-            # 只在 DEBUG 级别记录详细日志
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(f"发布事件: {event.type.value} (优先级={priority}) from {event.source}")
+        if event.type in self._conflated_types and self._conflate(event):
+            return
 
-        except asyncio.QueueFull:
-            logger.error(f"事件队列已满，丢弃事件: {event.type}")
-            self._stats['errors'] += 1
+        if self._size >= self._shared_limit:
+            policy = self._policies.get(event.type, BACKPRESSURE_BLOCK)
+            if policy == BACKPRESSURE_BLOCK:
+                # 队列已满时等待消费者腾出空间（与 asyncio.Queue.put 语义一致）
+                self._backpressure_stats[policy]['blocked'] += 1
+                while self._size >= self._shared_limit:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+            elif not self._apply_backpressure(event, priority, policy):
+                return
+
+        self._enqueue(event, priority)
+
+        # 只在 DEBUG 级别记录详细日志
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"发布事件: {event.type.value} (优先级={priority}) from {event.source}")
 
     def put_nowait(self, event: Event, priority: int = EventPriority.TICK):
         """
@@ -199,28 +788,389 @@ class EventBus:
             event (Event): 要发布的事件
             priority (int): 优先级（默认 TICK 优先级）
         """
-        try:
-            # 🔥 [P0 修复] 包装为 PriorityEvent
-            priority_event = PriorityEvent(priority=priority, event=event)
-            self._queue.put_nowait(priority_event)
-            self._stats['published'] += 1
+        if self._journal is not None:
+            self._journal.record(event, priority)
+
+        # 合并：替换同 symbol 的待分发事件，不占用新的队列容量
+        if event.type in self._conflated_types and self._conflate(event):
+            return
+
+        if self._size >= self._shared_limit and not self._apply_backpressure(
+            event, priority, self._policies.get(event.type, BACKPRESSURE_BLOCK)
+        ):
+            return
+
+        self._enqueue(event, priority)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"发布事件(非阻塞): {event.type.value} (优先级={priority}) from {event.source}")
+
+    def attach_journal(self, journal):
+        """
+        挂载事件日志：此后每个发布的事件（合并、背压处理之前）都会被记录
+
+        Args:
+            journal: EventJournal 实例（需已 start）
+        """
+        self._journal = journal
+        logger.info("📼 [EventBus] 事件日志已挂载")
+
+    def detach_journal(self):
+        """卸载事件日志"""
+        self._journal = None
+
+    def set_handler_budget(self, event_type: EventType, handler: Callable, budget_ms: float):
+        """
+        调整已注册处理器的执行预算
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理函数
+            budget_ms (float): 执行预算（毫秒）
+        """
+        key = (event_type, _handler_key(handler))
+        self._handler_budgets[key] = int(budget_ms * 1e6)
+        profile = self._handler_profiles.get(key)
+        if profile is not None:
+            profile.budget_ns = self._handler_budgets[key]
+
+    def offload_handler(self, event_type: EventType, handler: Callable) -> bool:
+        """
+        把处理器卸载到独立消费任务（主分发循环不再等待它执行完毕）
+
+        处理器仍按事件顺序执行，但与同一事件的其他处理器不再同步。
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理函数
+
+        Returns:
+            bool: 是否找到该处理器
+        """
+        profile = self._handler_profiles.get((event_type, _handler_key(handler)))
+        if profile is None:
+            logger.warning(f"⚠️ [EventBus] 卸载失败，处理器未注册: {self._handler_label(event_type, handler)}")
+            return False
+        if profile.worker is None:
+            self._offload(profile)
+        return True
+
+    def restore_handler(self, event_type: EventType, handler: Callable) -> bool:
+        """
+        把已卸载的处理器恢复为在主分发循环中执行
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理函数
+
+        Returns:
+            bool: 处理器此前是否已被卸载
+        """
+        profile = self._handler_profiles.get((event_type, _handler_key(handler)))
+        if profile is None or profile.worker is None:
+            return False
+        self._close_worker(profile)
+        profile.flagged = False
+        profile.window_start = profile.calls
+        profile.window_overruns = 0
+        self._rebuild_dispatch_table(event_type)
+        logger.info(f"🐢 [EventBus] 处理器已恢复内联执行: {profile.label}")
+        return True
+
+    def _offload(self, profile: _HandlerProfile):
+        """创建独立消费任务并重建分发表"""
+        profile.worker = _HandlerWorker(self.WORKER_QUEUE_LIMIT)
+        if self._running:
+            profile.worker.task = asyncio.create_task(self._worker_loop(profile, profile.worker))
+        self._rebuild_dispatch_table(profile.event_type)
+        logger.warning(f"🐢 [EventBus] 慢处理器已卸载到独立消费任务: {profile.label}")
+
+    @staticmethod
+    def _close_worker(profile: _HandlerProfile):
+        """关闭独立消费任务（排空已投递的事件后退出）"""
+        worker = profile.worker
+        profile.worker = None
+        worker.closed = True
+        worker.wakeup.set()
+
+    def _record_overrun(self, profile: _HandlerProfile, elapsed_ns: int):
+        """
+        记录一次超预算执行（冷路径）
+
+        Args:
+            profile (_HandlerProfile): 处理器执行画像
+            elapsed_ns (int): 本次执行耗时（纳秒）
+        """
+        profile.overruns += 1
+        profile.overrun_ns += elapsed_ns
+        if elapsed_ns > profile.max_ns:
+            profile.max_ns = elapsed_ns
 
+        if profile.calls - profile.window_start > self.SLOW_HANDLER_WINDOW:
+            profile.window_start = profile.calls
+            profile.window_overruns = 0
+        profile.window_overruns += 1
+
+        if profile.flagged or profile.window_overruns < self.SLOW_HANDLER_STRIKES:
+            return
+
+        profile.flagged = True
+        logger.warning(
+            f"🐢 [EventBus] 慢处理器: {profile.label} 在 {self.SLOW_HANDLER_WINDOW} 次调用内 "
+            f"{profile.window_overruns} 次超过预算 {profile.budget_ns / 1e6:.1f}ms "
+            f"(本次 {elapsed_ns / 1e6:.2f}ms)"
+        )
+
+        # 订单 / 持仓等 never_drop 事件的处理器依赖与其他处理器的先后顺序，不自动卸载
+        if (
+            self.offload_slow_handlers
+            and profile.worker is None
+            and self.get_backpressure_policy(profile.event_type) != BACKPRESSURE_NEVER_DROP
+        ):
+            self._offload(profile)
+
+    def set_backpressure_policy(self, event_type: EventType, policy: str):
+        """
+        设置事件类型的背压策略
+
+        Args:
+            event_type (EventType): 事件类型
+            policy (str): BACKPRESSURE_DROP_OLDEST / CONFLATE / NEVER_DROP / BLOCK
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"未知背压策略: {policy}，可选: {BACKPRESSURE_POLICIES}")
+        self._policies[event_type] = policy
+
+    def get_backpressure_policy(self, event_type: EventType) -> str:
+        """
+        获取事件类型的背压策略
+
+        Args:
+            event_type (EventType): 事件类型
+
+        Returns:
+            str: 背压策略（未声明的类型为 BACKPRESSURE_BLOCK）
+        """
+        return self._policies.get(event_type, BACKPRESSURE_BLOCK)
+
+    def _apply_backpressure(self, event: Event, priority: int, policy: str) -> bool:
+        """
+        共享容量已满时按策略处理新事件（不等待）
+
+        Args:
+            event (Event): 新事件
+            priority (int): 优先级
+            policy (str): 背压策略
+
+        Returns:
+            bool: True 表示新事件可以入队
+        """
+        counters = self._backpressure_stats[policy]
+
+        if policy == BACKPRESSURE_NEVER_DROP:
+            if self._size >= self._maxsize:
+                counters['overflow'] += 1
+                logger.warning(f"⚠️ [EventBus] 预留容量耗尽，{event.type.value} 超额入队 (队列={self._size})")
+            else:
+                counters['headroom'] += 1
+            return True
+
+        if policy != BACKPRESSURE_BLOCK:
+            lane = self._lanes.get(priority) or self._get_lane(priority)
+            if self._evict_oldest(lane, event, policy == BACKPRESSURE_CONFLATE):
+                counters['evicted'] += 1
+                return True
+            counters['dropped'] += 1
             if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(f"发布事件(非阻塞): {event.type.value} (优先级={priority}) from {event.source}")
+                logger.debug(f"事件队列已满，丢弃事件: {event.type.value}")
+            return False
 
-        except asyncio.QueueFull:
-            logger.error(f"事件队列已满，丢弃事件: {event.type}")
-            self._stats['errors'] += 1
+        counters['dropped'] += 1
+        logger.error(f"事件队列已满，丢弃事件: {event.type}")
+        self._stats['errors'] += 1
+        return False
+
+    def _evict_oldest(self, lane: _PriorityLane, event: Event, same_symbol: bool) -> bool:
+        """
+        从通道头部丢弃最旧的同类型事件（只扫描前 EVICT_SCAN_LIMIT 个，保证开销有界）
+
+        Args:
+            lane (_PriorityLane): 新事件将进入的通道
+            event (Event): 新事件
+            same_symbol (bool): 优先丢弃同 symbol 的事件（合并语义）
+
+        Returns:
+            bool: 是否丢弃了一个排队事件
+        """
+        event_type = event.type
+        symbol = self._ordering_key(event) if same_symbol else None
+        victim = None
+        for index, item in enumerate(lane.events):
+            if index >= self.EVICT_SCAN_LIMIT:
+                break
+            queued = item.event if item.__class__ is _ConflationSlot else item
+            if queued.type is not event_type:
+                continue
+            if victim is None:
+                victim = index
+                if not same_symbol:
+                    break
+            if self._ordering_key(queued) == symbol:
+                victim = index
+                break
+
+        if victim is None:
+            return False
+
+        item = lane.events[victim]
+        del lane.events[victim]
+        if item.__class__ is _ConflationSlot:
+            del self._pending_slots[item.key]
+        self._size -= 1
+        return True
+
+    def _get_lane(self, priority: int) -> _PriorityLane:
+        """
+        获取优先级通道（不存在时创建并按优先级插入）
+
+        Args:
+            priority (int): 优先级
+
+        Returns:
+            _PriorityLane: 对应的通道
+        """
+        lane = self._lanes.get(priority)
+        if lane is None:
+            executor = next(item for item in self._executors if item.accepts(priority))
+            lane = _PriorityLane(priority, executor)
+            self._lanes[priority] = lane
+            self._ordered_lanes.append(lane)
+            self._ordered_lanes.sort(key=lambda item: item.priority)
+            executor.lanes.append(lane)
+            executor.lanes.sort(key=lambda item: item.priority)
+        return lane
+
+    def enable_conflation(self, event_type: EventType):
+        """
+        启用事件合并（latest-value-wins）
+
+        同一 symbol 的事件在被分发前再次发布时，原地替换排队中的旧事件。
+        适用于只关心最新状态的事件（如 BOOK_EVENT）。
+
+        Args:
+            event_type (EventType): 事件类型
+        """
+        self._conflated_types.add(event_type)
+        logger.info(f"📉 [EventBus] 已启用事件合并: {event_type.value}")
+
+    def disable_conflation(self, event_type: EventType):
+        """
+        关闭事件合并（已排队的合并槽位仍会正常分发）
+
+        Args:
+            event_type (EventType): 事件类型
+        """
+        self._conflated_types.discard(event_type)
+
+    def _conflate(self, event: Event) -> bool:
+        """
+        尝试用新事件替换排队中的同 symbol 事件
+
+        Args:
+            event (Event): 新事件
+
+        Returns:
+            bool: True 表示已原地替换，无需再入队
+        """
+        slot = self._pending_slots.get((event.type, self._ordering_key(event)))
+        if slot is None:
+            return False
+
+        if self.enable_latency_tracking or self._handler_probes:
+            event.enqueued_ns = time.monotonic_ns()
+        slot.event = event
+        self._stats['published'] += 1
+        self._conflation_stats[event.type.value] += 1
+        return True
+
+    def _enqueue(self, event: Event, priority: int):
+        """
+        事件入队（调用方已保证队列未满）
+
+        Args:
+            event (Event): 事件
+            priority (int): 优先级
+        """
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = self._get_lane(priority)
+
+        if self.enable_latency_tracking or self._handler_probes:
+            event.enqueued_ns = time.monotonic_ns()
+
+        if event.type in self._conflated_types:
+            key = (event.type, self._ordering_key(event))
+            slot = _ConflationSlot(key, event)
+            self._pending_slots[key] = slot
+            lane.push(slot)
+        else:
+            lane.push(event)
+        self._size += 1
+        self._stats['published'] += 1
+
+        wakeup = lane.executor.wakeup
+        if not wakeup.is_set():
+            wakeup.set()
+
+    def _dequeue(self, executor: Optional[_ExecutionLane] = None) -> Optional[Event]:
+        """
+        取出下一个事件（严格按优先级从高到低，同优先级 FIFO）
+
+        Args:
+            executor (Optional[_ExecutionLane]): 只从该执行通道负责的优先级中取，None 表示全部
+
+        Returns:
+            Optional[Event]: 事件，队列为空时返回 None
+        """
+        lanes = executor.lanes if executor is not None else self._ordered_lanes
+        for lane in lanes:
+            if lane.events:
+                self._size -= 1
+                if not self._not_full.is_set():
+                    self._not_full.set()
+                item = lane.events.popleft()
+                if item.__class__ is _ConflationSlot:
+                    # 槽位出队后，后续同 symbol 事件重新排队
+                    del self._pending_slots[item.key]
+                    return item.event
+                return item
+        return None
+
+    def qsize(self) -> int:
+        """
+        获取当前排队事件总数
+
+        Returns:
+            int: 所有通道中的事件数量
+        """
+        return self._size
 
     async def start(self):
-        """启动事件总线（开始后台处理任务）"""
+        """启动事件总线（每个执行通道启动一个后台调度任务）"""
         if self._running:
             logger.warning("事件总线已在运行")
             return
 
         self._running = True
-        self._task = asyncio.create_task(self._process_loop())
-        logger.info("事件总线已启动")
+        for executor in self._executors:
+            executor.task = asyncio.create_task(self._process_loop(executor))
+        for profile in self._handler_profiles.values():
+            if profile.worker and profile.worker.task is None:
+                profile.worker.task = asyncio.create_task(self._worker_loop(profile, profile.worker))
+        logger.info(
+            f"事件总线已启动: 执行通道="
+            f"{[(executor.name, executor.concurrency) for executor in self._executors]}"
+        )
 
     async def stop(self):
         """停止事件总线"""
@@ -229,99 +1179,339 @@ class EventBus:
 
         self._running = False
 
-        # 等待队列处理完成
-        while not self._queue.empty():
+        # 等待队列、正在处理的事件、未交付的批次和独立消费任务中的事件完成
+        while self._size > 0 or any(
+            executor.inflight or executor.pending_batches for executor in self._executors
+        ) or any(
+            profile.worker.events or profile.worker.busy
+            for profile in self._handler_profiles.values() if profile.worker
+        ):
             await asyncio.sleep(0.1)
 
-        if self._task:
-            self._task.cancel()
+        tasks = [executor.task for executor in self._executors if executor.task]
+        tasks += [
+            profile.worker.task for profile in self._handler_profiles.values()
+            if profile.worker and profile.worker.task
+        ]
+        for task in tasks:
+            task.cancel()
             try:
-                await self._task
+                await task
             except asyncio.CancelledError:
                 pass
+        for executor in self._executors:
+            executor.task = None
+        for profile in self._handler_profiles.values():
+            if profile.worker:
+                profile.worker.task = None
 
         logger.info("事件总线已停止")
 
-    async def _process_loop(self):
-        """后台处理循环"""
-        while self._running:
+    async def _process_loop(self, executor: _ExecutionLane):
+        """
+        执行通道的后台调度循环
+
+        🔥 [优化] 直接从优先级通道取事件：队列非空时不创建任何 Future/Timer，
+        队列为空时才挂起等待。连续处理 DISPATCH_YIELD_INTERVAL 个事件后
+        主动让出一次事件循环，避免 TICK 洪峰期间饿死其他协程。
+
+        Args:
+            executor (_ExecutionLane): 执行通道
+        """
+        processed_since_yield = 0
+        # 🔥 [关键] 停止时仍需排空队列（stop() 会等待队列清空后再取消任务）
+        while True:
             try:
-                # 获取事件（超时 1 秒，以便检查 _running 标志）
-                # 🔥 [P0 修复] 获取 PriorityEvent 并解包
-                priority_event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                await self._process_event(priority_event.event)
+                event = self._dequeue(executor)
+
+                if event is None:
+                    processed_since_yield = 0
+                    if executor.pending_batches:
+                        # 一波突发处理完毕，立即交付所有未满的批次
+                        await self._flush_batches(executor, force=True)
+                        continue
+                    executor.wakeup.clear()
+                    await executor.wakeup.wait()
+                    continue
+
+                executor.dispatched += 1
+
+                subscriptions = self._batch_handlers.get(event.type)
+                if subscriptions:
+                    await self._buffer_batch(executor, subscriptions, event)
+
+                if executor.concurrency == 1:
+                    # 串行通道：直接在调度任务中处理，无额外 Task 开销
+                    await self._process_event(event)
+                else:
+                    key = self._ordering_key(event)
+                    if event.type not in self._suspending_types and key not in executor.inflight:
+                        # 处理器都不会挂起：直接处理，不创建 Task（同 symbol 无在途事件，顺序不受影响）
+                        await self._process_event(event)
+                    else:
+                        await self._schedule(executor, event, key)
 
-            except asyncio.TimeoutError:
-                continue
+                if executor.pending_batches:
+                    await self._flush_batches(executor, force=False)
+
+                processed_since_yield += 1
+                if processed_since_yield >= self.DISPATCH_YIELD_INTERVAL:
+                    processed_since_yield = 0
+                    await asyncio.sleep(0)
 
             except asyncio.CancelledError:
                 # 🔥 [修复] 处理取消异常，正常退出循环
-                logger.debug("事件处理循环被取消")
+                logger.debug(f"事件处理循环被取消: {executor.name}")
                 break
 
             except Exception as e:
                 # 🔥 [修复] 增强异常处理，确保单个事件处理失败不会让整个循环退出
-                logger.error(f"事件处理循环错误: {e}", exc_info=True)
+                logger.error(f"事件处理循环错误 ({executor.name}): {e}", exc_info=True)
                 # 继续循环，不退出
                 continue
 
+    @staticmethod
+    def _ordering_key(event: Event) -> Any:
+        """
+        获取事件的顺序键（同一键的事件严格按顺序处理）
+
+        Args:
+            event (Event): 事件
+
+        Returns:
+            Any: symbol，没有 symbol 的事件共享 None 键
+        """
+        data = event.data
+        if data:
+            try:
+                return data.get('symbol')
+            except AttributeError:
+                return None
+        return None
+
+    async def _buffer_batch(
+        self,
+        executor: _ExecutionLane,
+        subscriptions: List[_BatchSubscription],
+        event: Event
+    ):
+        """
+        把事件追加到批量订阅的缓冲区，缓冲区满时立即交付
+
+        Args:
+            executor (_ExecutionLane): 当前执行通道
+            subscriptions (List[_BatchSubscription]): 该事件类型的批量订阅
+            event (Event): 事件
+        """
+        for subscription in subscriptions:
+            buffer = subscription.buffer
+            if not buffer:
+                subscription.first_ns = time.perf_counter_ns()
+                subscription.executor = executor
+                executor.pending_batches.append(subscription)
+            buffer.append(event)
+            if len(buffer) >= subscription.max_batch:
+                await self._flush_batch(subscription)
+
+    async def _flush_batches(self, executor: _ExecutionLane, force: bool):
+        """
+        交付执行通道中到期（或全部）的批次
+
+        Args:
+            executor (_ExecutionLane): 执行通道
+            force (bool): True 交付全部批次，False 只交付等待超过 max_delay 的批次
+        """
+        now_ns = 0 if force else time.perf_counter_ns()
+        for subscription in list(executor.pending_batches):
+            if force or now_ns - subscription.first_ns >= subscription.max_delay_ns:
+                await self._flush_batch(subscription)
+
+    async def _flush_batch(self, subscription: _BatchSubscription):
+        """
+        交付一个批次
+
+        串行通道中直接调用处理器；并发通道中以订阅本身为顺序键调度，
+        保证同一批量处理器不会并发执行。
+
+        Args:
+            subscription (_BatchSubscription): 批量订阅
+        """
+        executor = subscription.executor
+        events = subscription.buffer
+        subscription.buffer = []
+        executor.pending_batches.remove(subscription)
+
+        delivery = _BatchDelivery(subscription, events)
+        if executor.concurrency == 1:
+            await self._deliver_batch(delivery)
+        else:
+            await self._schedule(executor, delivery, subscription)
+
+    async def _deliver_batch(self, delivery: _BatchDelivery):
+        """
+        调用批量处理器
+
+        Args:
+            delivery (_BatchDelivery): 批量交付
+        """
+        subscription = delivery.subscription
+        handler = subscription.handler
+        tracking = self.enable_latency_tracking
+        if tracking:
+            start_ns = time.monotonic_ns()
+        try:
+            if subscription.is_async:
+                await handler(delivery.events)
+            else:
+                handler(delivery.events)
+            subscription.delivered += 1
+
+        except Exception as e:
+            logger.error(
+                f"批量处理器错误 ({handler.__name__}, {len(delivery.events)} 个事件): {e}",
+                exc_info=True
+            )
+            self._stats['errors'] += 1
+
+            last_event = delivery.events[-1]
+            if last_event.type != EventType.ERROR:
+                self.put_nowait(Event(
+                    type=EventType.ERROR,
+                    data={
+                        'original_event': last_event,
+                        'handler': handler.__name__,
+                        'batch_size': len(delivery.events),
+                        'error': str(e)
+                    },
+                    source="event_bus"
+                ))
+
+        self._stats['processed'] += 1
+        if tracking:
+            subscription.latency.record(time.monotonic_ns() - start_ns)
+
+    async def _schedule(self, executor: _ExecutionLane, item: Any, key: Any):
+        """
+        在并发执行通道中调度事件（或批量交付）
+
+        - 同一键已在处理中：追加到该键的待处理队列，保证顺序
+        - 否则占用一个并发名额，启动处理任务
+
+        Args:
+            executor (_ExecutionLane): 执行通道
+            item (Any): Event 或 _BatchDelivery
+            key (Any): 顺序键（symbol 或批量订阅）
+        """
+        backlog = executor.inflight.get(key)
+        if backlog is not None:
+            backlog.append(item)
+            executor.backlogged += 1
+            if executor.backlogged >= executor.BACKLOG_LIMIT:
+                executor.backlog_free.clear()
+                await executor.backlog_free.wait()
+            return
+
+        await executor.semaphore.acquire()
+        executor.inflight[key] = deque()
+        runner = asyncio.create_task(self._run_ordered(executor, key, item))
+        executor.runners.add(runner)
+        runner.add_done_callback(executor.runners.discard)
+
+    async def _run_ordered(self, executor: _ExecutionLane, key: Any, item: Any):
+        """
+        按顺序处理同一键的事件，直到该键的待处理队列清空
+
+        Args:
+            executor (_ExecutionLane): 执行通道
+            key (Any): 顺序键
+            item (Any): 第一个 Event 或 _BatchDelivery
+        """
+        try:
+            backlog = executor.inflight[key]
+            while True:
+                if item.__class__ is _BatchDelivery:
+                    await self._deliver_batch(item)
+                else:
+                    await self._process_event(item)
+                if not backlog:
+                    break
+                item = backlog.popleft()
+                executor.backlogged -= 1
+                if not executor.backlog_free.is_set() and executor.backlogged < executor.BACKLOG_LIMIT:
+                    executor.backlog_free.set()
+        finally:
+            executor.inflight.pop(key, None)
+            executor.semaphore.release()
+
     async def _process_event(self, event: Event):
         """
         处理单个事件（性能优化版本）
 
-        调用所有注册的处理器。
+        调用所有注册的处理器。相邻处理器共用一次计时，每个处理器只多一次
+        monotonic_ns 调用；超过预算时进入慢处理器统计（冷路径）。
 
         Args:
-            event (Event): 要处理的事件（已从 PriorityEvent 解包）
+            event (Event): 要处理的事件
         """
-        # 🔥 [优化] 只在启用监控时计时
-        if self.enable_latency_tracking:
-            import time
-            start_time = time.perf_counter()
+        start_ns = handler_start_ns = time.monotonic_ns()
+        # 🔥 [优化] 只在启用监控时记录直方图
+        tracking = self.enable_latency_tracking
+        if tracking:
+            latency = self._latency.get(event.type)
+            if latency is None:
+                latency = self._latency[event.type] = _EventLatency()
+            enqueued_ns = event.enqueued_ns or start_ns
+            latency.queue_wait.record(start_ns - enqueued_ns)
+
+        entries = self._dispatch_table.get(event.type)
+
+        if not entries:
+            return  # 移除不必要的 debug 日志
 
-        handlers = self._handlers.get(event.type, [])
+        # 调用所有处理器（按注册时解析的类型分发）
+        for kind, handler, profile in entries:
+            if kind == HANDLER_OFFLOADED:
+                # 🔥 [新增] 慢处理器：交给独立消费任务，不等待
+                profile.worker.submit(event)
+                handler_start_ns = time.monotonic_ns()
+                continue
 
-        if not handlers:
-            return  # 移除不必要的 debug 日志
+            probe = profile.probe
+            if probe is not None:
+                probe(event, handler_start_ns)
 
-        # 调用所有处理器
-        for handler in handlers:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
+                if kind == HANDLER_SYNC:
                     handler(event)
+                else:
+                    # async / async_inline：创建协程并 await
+                    await handler(event)
 
             except Exception as e:
-                logger.error(
-                    f"处理器错误 ({handler.__name__}): {e}",
-                    exc_info=True
-                )
-                self._stats['errors'] += 1
-
-                # 发布错误事件（避免无限循环）
-                if event.type != EventType.ERROR:
-                    error_event = Event(
-                        type=EventType.ERROR,
-                        data={
-                            'original_event': event,
-                            'handler': handler.__name__,
-                            'error': str(e)
-                        },
-                        source="event_bus"
-                    )
-                    self.put_nowait(error_event)
+                self._on_handler_error(event, handler, e)
 
             # 🔥 [修复] 无论成功还是失败，都增加 processed 计数
             self._stats['processed'] += 1
 
+            now_ns = time.monotonic_ns()
+            elapsed_ns = now_ns - handler_start_ns
+            handler_start_ns = now_ns
+            profile.calls += 1
+            if tracking:
+                profile.latency.record(elapsed_ns)
+            if elapsed_ns > profile.budget_ns:
+                self._record_overrun(profile, elapsed_ns)
+
         # 🔥 [优化] 性能监控逻辑（只在启用时执行）
-        if not self.enable_latency_tracking:
-            return  # 直接返回，节省 15-20ms
+        if not tracking:
+            return
 
-        processing_time_ms = (time.perf_counter() - start_time) * 1000.0
+        processing_ns = handler_start_ns - start_ns
+        latency.processing.record(processing_ns)
+        latency.end_to_end.record(handler_start_ns - enqueued_ns)
 
-        # 只在超过严重阈值时记录
+        # 只在超过阈值时记录日志
+        processing_time_ms = processing_ns / 1e6
         if processing_time_ms > self.CRITICAL_LATENCY_MS:
             logger.error(
                 f"⚠️ [EventBus] 事件处理延迟过高: "
@@ -333,19 +1523,90 @@ class EventBus:
                 f"{event.type.value}={processing_time_ms:.2f}ms"
             )
 
-        # 🔥 [优化] 简化统计记录（移除列表存储）
-        event_type_str = event.type.value
-        if event_type_str not in self._latency_stats:
-            self._latency_stats[event_type_str] = []
+    def _on_handler_error(self, event: Event, handler: Callable, e: Exception):
+        """
+        处理器异常：记录日志、计数，并发布错误事件
 
-        self._latency_stats[event_type_str].append(processing_time_ms)
+        Args:
+            event (Event): 正在处理的事件
+            handler (Callable): 出错的处理器
+            e (Exception): 异常
+        """
+        logger.error(
+            f"处理器错误 ({handler.__name__}): {e}",
+            exc_info=True
+        )
+        self._stats['errors'] += 1
+
+        # 发布错误事件（避免无限循环）
+        if event.type != EventType.ERROR:
+            error_event = Event(
+                type=EventType.ERROR,
+                data={
+                    'original_event': event,
+                    'handler': handler.__name__,
+                    'error': str(e)
+                },
+                source="event_bus"
+            )
+            self.put_nowait(error_event)
 
-        # 🔥 [优化] 限制列表长度（简化版）
-        if len(self._latency_stats[event_type_str]) > self._max_latency_samples:
-            self._latency_stats[event_type_str] = \
-                self._latency_stats[event_type_str][-100:]  # 只保留最近 100 个
+    async def _worker_loop(self, profile: _HandlerProfile, worker: _HandlerWorker):
+        """
+        慢处理器的独立消费循环
+
+        按投递顺序执行处理器，每个事件后让出一次事件循环，
+        避免慢处理器连续占用事件循环。
 
-    def get_stats(self) -> Dict[str, int]:
+        Args:
+            profile (_HandlerProfile): 处理器执行画像
+            worker (_HandlerWorker): 工作者
+        """
+        handler = profile.handler
+        is_sync = profile.kind == HANDLER_SYNC
+        while True:
+            try:
+                if not worker.events:
+                    worker.busy = False
+                    if worker.closed:
+                        break
+                    worker.wakeup.clear()
+                    await worker.wakeup.wait()
+                    continue
+
+                worker.busy = True
+                event = worker.events.popleft()
+                start_ns = time.monotonic_ns()
+                if profile.probe is not None:
+                    profile.probe(event, start_ns)
+                try:
+                    if is_sync:
+                        handler(event)
+                    else:
+                        await handler(event)
+                except Exception as e:
+                    self._on_handler_error(event, handler, e)
+
+                self._stats['processed'] += 1
+                worker.processed += 1
+                elapsed_ns = time.monotonic_ns() - start_ns
+                profile.calls += 1
+                if self.enable_latency_tracking:
+                    profile.latency.record(elapsed_ns)
+                if elapsed_ns > profile.budget_ns:
+                    self._record_overrun(profile, elapsed_ns)
+
+                await asyncio.sleep(0)
+
+            except asyncio.CancelledError:
+                logger.debug(f"独立消费任务被取消: {profile.label}")
+                break
+
+            except Exception as e:
+                logger.error(f"独立消费任务错误 ({profile.label}): {e}", exc_info=True)
+                continue
+
+    def get_stats(self) -> Dict[str, Any]:
         """
         获取统计信息
 
@@ -356,8 +1617,119 @@ class EventBus:
             'published': self._stats['published'],
             'processed': self._stats['processed'],
             'errors': self._stats['errors'],
-            'queue_size': self._queue.qsize(),
-            'handlers': sum(len(handlers) for handlers in self._handlers.values())
+            'queue_size': self._size,
+            'conflated': sum(self._conflation_stats.values()),
+            'backpressure': self.get_backpressure_stats(),
+            'handlers': sum(len(handlers) for handlers in self._handlers.values()),
+            'handler_kinds': self.get_handler_kinds(),
+            'batch_handlers': self.get_batch_stats(),
+            'lanes': self.get_lane_stats(),
+            'execution_lanes': self.get_execution_lane_stats(),
+            'slow_handlers': self.get_slow_handlers()
+        }
+
+    def get_handler_kinds(self) -> Dict[str, int]:
+        """
+        获取已注册处理器的分类统计
+
+        Returns:
+            Dict[str, int]: 处理器类型名称 -> 注册数量
+        """
+        counts = {name: 0 for name in HANDLER_KIND_NAMES.values()}
+        for entries in self._dispatch_table.values():
+            for _, _, profile in entries:
+                counts[HANDLER_KIND_NAMES[profile.kind]] += 1
+        return counts
+
+    def get_slow_handlers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取慢处理器排行（按超预算调用的累计耗时降序）
+
+        Args:
+            limit (int): 最多返回的处理器数量
+
+        Returns:
+            List[Dict[str, Any]]: [{handler, budget_ms, calls, overruns, overrun_ms, max_ms, p99_ms,
+                                    flagged, offloaded, queued, dropped}, ...]
+        """
+        offenders = sorted(
+            (profile for profile in self._handler_profiles.values() if profile.overruns),
+            key=lambda profile: profile.overrun_ns,
+            reverse=True
+        )
+        return [profile.report() for profile in offenders[:limit]]
+
+    def get_batch_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取批量处理器统计
+
+        Returns:
+            Dict[str, Dict[str, int]]: "事件类型:处理器" -> {delivered, pending}
+        """
+        return {
+            f"{event_type.value}:{subscription.handler.__name__}": {
+                'delivered': subscription.delivered,
+                'pending': len(subscription.buffer)
+            }
+            for event_type, subscriptions in self._batch_handlers.items()
+            for subscription in subscriptions
+        }
+
+    def get_backpressure_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取背压策略计数
+
+        Returns:
+            Dict[str, Dict[str, int]]: 策略 -> 动作 -> 次数
+                - drop_oldest / conflate: evicted（丢弃排队事件）, dropped（丢弃新事件）
+                - never_drop: headroom（使用预留容量）, overflow（超出 maxsize）
+                - block: blocked（put 等待）, dropped（put_nowait 丢弃）
+        """
+        return {policy: dict(counters) for policy, counters in self._backpressure_stats.items()}
+
+    def get_conflation_stats(self) -> Dict[str, int]:
+        """
+        获取事件合并统计
+
+        Returns:
+            Dict[str, int]: 事件类型 -> 被合并（替换）的事件数量
+        """
+        return dict(self._conflation_stats)
+
+    def get_execution_lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取执行通道统计
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 通道名称 -> {concurrency, priorities, depth, in_flight, backlog, dispatched}
+        """
+        return {
+            executor.name: {
+                'concurrency': executor.concurrency,
+                'priorities': [lane.priority for lane in executor.lanes],
+                'depth': sum(len(lane.events) for lane in executor.lanes),
+                'in_flight': len(executor.inflight),
+                'backlog': executor.backlogged,
+                'dispatched': executor.dispatched
+            }
+            for executor in self._executors
+        }
+
+    def get_lane_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取各优先级通道的深度统计
+
+        Returns:
+            Dict[str, Dict[str, int]]: 通道名称 -> {priority, depth, peak, enqueued}
+        """
+        return {
+            lane.name: {
+                'priority': lane.priority,
+                'depth': len(lane.events),
+                'peak': lane.peak,
+                'enqueued': lane.enqueued
+            }
+            for lane in self._ordered_lanes
         }
 
     def reset_stats(self):
@@ -367,6 +1739,17 @@ class EventBus:
             'processed': 0,
             'errors': 0
         }
+        for lane in self._ordered_lanes:
+            lane.enqueued = 0
+            lane.peak = len(lane.events)
+        for executor in self._executors:
+            executor.dispatched = 0
+        self._conflation_stats.clear()
+        for counters in self._backpressure_stats.values():
+            for action in counters:
+                counters[action] = 0
+        for profile in self._handler_profiles.values():
+            profile.reset()
         logger.info("事件总线统计已重置")
 
     def clear_handlers(self, event_type: Optional[EventType] = None):
@@ -378,9 +1761,22 @@ class EventBus:
         """
         if event_type:
             self._handlers[event_type].clear()
+            self._rebuild_dispatch_table(event_type)
+            for subscription in list(self._batch_handlers.get(event_type, [])):
+                self.unregister_batch(event_type, subscription.handler)
             logger.info(f"已清除 {event_type} 的处理器")
         else:
             self._handlers.clear()
+            self._dispatch_table.clear()
+            for profile in self._handler_profiles.values():
+                if profile.worker:
+                    self._close_worker(profile)
+            self._handler_profiles.clear()
+            self._handler_budgets.clear()
+            self._suspending_types.clear()
+            for executor in self._executors:
+                executor.pending_batches.clear()
+            self._batch_handlers.clear()
             logger.info("已清除所有处理器")
 
     def is_running(self) -> bool:
@@ -409,50 +1805,140 @@ class EventBus:
             'errors': stats['errors']
         }
 
+    def _find_latency_type(self, event_type: str) -> Optional[EventType]:
+        """
+        按事件类型字符串查找已有延迟统计的 EventType
+
+        Args:
+            event_type (str): 事件类型值（如 'tick'）
+
+        Returns:
+            Optional[EventType]: 找不到时返回 None
+        """
+        for etype in self._latency:
+            if etype.value == event_type:
+                return etype
+        return None
+
     def get_latency_stats(self, event_type: Optional[str] = None) -> Dict:
         """
-        获取延迟统计信息
+        获取处理耗时统计信息（兼容旧接口，数据来自 processing 直方图）
 
         Args:
             event_type: 事件类型，None 表示全部
 
         Returns:
-            Dict: 统计信息
+            Dict: 统计信息 {event_type, count, avg_ms, max_ms, min_ms, p50_ms, p90_ms, p99_ms, p999_ms}
         """
         if event_type:
-            latencies = self._latency_stats.get(event_type, [])
-            if not latencies:
+            etype = self._find_latency_type(event_type)
+            if etype is None or self._latency[etype].processing.count == 0:
                 return {}
 
-            return {
-                'event_type': event_type,
-                'count': len(latencies),
-                'avg_ms': sum(latencies) / len(latencies),
-                'max_ms': max(latencies),
-                'min_ms': min(latencies),
-                'p99_ms': sorted(latencies)[int(len(latencies) * 0.99)] if len(latencies) > 0 else 0.0
-            }
+            stats = {'event_type': event_type}
+            stats.update(self._latency[etype].processing.snapshot())
+            return stats
         else:
             # 返回所有事件类型的统计
             return {
-                etype: self.get_latency_stats(etype)
-                for etype in self._latency_stats.keys()
+                etype.value: self.get_latency_stats(etype.value)
+                for etype, latency in self._latency.items()
+                if latency.processing.count
+            }
+
+    def get_latency_snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        获取延迟直方图快照（供 Guardian / HealthMonitor 定期轮询）
+
+        Args:
+            reset (bool): 快照后清空直方图（按轮询周期统计区间延迟）
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {
+                'event_types': 事件类型 -> {queue_wait, processing, end_to_end},
+                'handlers': "事件类型:处理器" -> 执行耗时（批量处理器为每批次耗时）
             }
+        """
+        event_types = {
+            etype.value: latency.snapshot()
+            for etype, latency in self._latency.items()
+            if latency.queue_wait.count
+        }
+
+        # 同名处理器（同一类的多个实例）合并统计
+        grouped: Dict[str, List[LatencyHistogram]] = defaultdict(list)
+        for event_type, entries in self._dispatch_table.items():
+            for _, _, profile in entries:
+                if profile.latency.count and profile.latency not in grouped[profile.label]:
+                    grouped[profile.label].append(profile.latency)
+        for event_type, subscriptions in self._batch_handlers.items():
+            for subscription in subscriptions:
+                if subscription.latency.count:
+                    grouped[self._handler_label(event_type, subscription.handler)].append(subscription.latency)
+
+        handlers = {}
+        for label, histograms in grouped.items():
+            if not histograms:
+                continue
+            merged = histograms[0]
+            if len(histograms) > 1:
+                merged = LatencyHistogram()
+                for histogram in histograms:
+                    merged.merge(histogram)
+            handlers[label] = merged.snapshot()
+
+        if reset:
+            self._reset_all_latency()
+
+        return {'event_types': event_types, 'handlers': handlers}
+
+    @staticmethod
+    def _handler_label(event_type: EventType, handler: Callable) -> str:
+        """
+        处理器统计名称
+
+        Args:
+            event_type (EventType): 事件类型
+            handler (Callable): 处理器
+
+        Returns:
+            str: "事件类型:处理器限定名"
+        """
+        return f"{event_type.value}:{getattr(handler, '__qualname__', handler.__name__)}"
 
     def reset_latency_stats(self, event_type: Optional[str] = None):
         """
-        重置延迟统计信息
+        重置延迟统计信息（直方图原地清零，不释放桶数组）
 
         Args:
             event_type: 事件类型，None 表示重置全部
         """
         if event_type:
-            self._latency_stats.pop(event_type, None)
+            etype = self._find_latency_type(event_type)
+            if etype is not None:
+                self._latency[etype].reset()
+            for (latency_type, _), profile in self._handler_profiles.items():
+                if latency_type.value == event_type:
+                    profile.latency.reset()
+            for latency_type, subscriptions in self._batch_handlers.items():
+                if latency_type.value == event_type:
+                    for subscription in subscriptions:
+                        subscription.latency.reset()
             logger.info(f"📊 [EventBus] 已重置 {event_type} 的延迟统计")
         else:
-            self._latency_stats.clear()
+            self._reset_all_latency()
             logger.info("📊 [EventBus] 已重置所有延迟统计")
 
+    def _reset_all_latency(self):
+        """清零所有延迟直方图（不打印日志，供周期性快照使用）"""
+        for latency in self._latency.values():
+            latency.reset()
+        for profile in self._handler_profiles.values():
+            profile.latency.reset()
+        for subscriptions in self._batch_handlers.values():
+            for subscription in subscriptions:
+                subscription.latency.reset()
+
 
 # 全局单例（可选）
 _global_event_bus: Optional[EventBus] = None
@@ -7,12 +7,14 @@
 - 标准化事件格式，确保模块间通信一致
 - 类型安全，使用枚举和类定义
 - 轻量级，避免序列化开销
+- 🔥 [优化] Event 与高频负载（TickEvent / BookEvent / TradeBatchEvent）使用 __slots__，减少每个 Tick 的内存分配
 """
 
+import time
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Any, Optional
-from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 
 class EventType(Enum):
@@ -20,6 +22,7 @@ class EventType(Enum):
 
     # 市场数据事件
     TICK = "tick"                    # 单笔交易 Tick
+    TRADE_BATCH = "trade_batch"      # 一帧内的成交聚合（TradeParser 聚合模式）
     BAR = "bar"                      # K线数据（OHLCV）
     DEPTH = "depth"                   # 订单簿深度
     BOOK_EVENT = "book_event"         # 订单簿事件
@@ -45,18 +48,27 @@ class EventType(Enum):
     SHUTDOWN = "shutdown"              # 关闭事件
 
 
-@dataclass
+_monotonic_ns = time.monotonic_ns
+
+
 class Event:
     """
     标准事件格式
 
     所有模块间通信都使用此格式。
 
+    🔥 [优化] 使用 __slots__，不再在构造时调用 datetime.now()：
+    接收时间记录为 time.monotonic_ns() 整数，可直接做延迟计算；
+    timestamp（datetime）改为按需换算的兼容属性。
+
     Attributes:
         type (EventType): 事件类型
-        data (dict): 事件数据（具体内容取决于事件类型）
-        timestamp (datetime): 事件时间戳
+        data (dict): 事件数据（dict，或 TICK / BOOK_EVENT 的 dict 兼容有类型负载）
+        timestamp (datetime): 事件时间戳（兼容属性，由 received_ns 换算）
         source (str): 事件来源（如 "ws_public", "rest_api", "strategy_vulture"）
+        received_ns (int): 接收时间（time.monotonic_ns）
+        exchange_ts (int): 交易所时间戳（毫秒，0 表示未知）
+        enqueued_ns (int): 进入事件总线队列的时间（time.monotonic_ns，由 EventBus 填写）
 
     Example:
         >>> event = Event(
@@ -65,31 +77,284 @@ class Event:
         ...     source="ws_public"
         ... )
     """
-    type: EventType
-    data: dict
-    timestamp: datetime = field(default_factory=datetime.now)
-    source: str = "unknown"
 
+    __slots__ = ('type', 'data', 'source', 'received_ns', 'exchange_ts', 'enqueued_ns', '_timestamp')
+
+    def __init__(
+        self,
+        type: EventType,
+        data: Any,
+        timestamp: Optional[datetime] = None,
+        source: str = "unknown",
+        received_ns: int = 0,
+        exchange_ts: int = 0
+    ):
+        self.type = type
+        self.data = data
+        self.source = source
+        self.received_ns = received_ns or _monotonic_ns()
+        self.exchange_ts = exchange_ts
+        self.enqueued_ns = 0
+        if timestamp is not None:
+            self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> datetime:
+        """事件时间戳（datetime，兼容旧接口；未显式指定时由 received_ns 换算为本地时间）"""
+        try:
+            return self._timestamp
+        except AttributeError:
+            age_ns = _monotonic_ns() - self.received_ns
+            self._timestamp = datetime.now() - timedelta(microseconds=age_ns / 1000)
+            return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+
+    def __repr__(self) -> str:
+        return f"Event(type={self.type}, data={self.data!r}, source={self.source!r})"
+
+
+class EventPayload:
+    """
+    有类型的事件负载基类（dict 兼容）
 
-@dataclass
-class TickEvent:
+    子类用 __slots__ 声明字段，FIELDS 给出字段顺序。为了让读取 event.data 的
+    处理器在迁移期间无需修改，提供 dict 风格的访问：
+    - data['price'] / data.get('price', 0) / 'price' in data / dict(data)
+    - 值为 None 的字段视为缺失（与旧 dict 中不存在该键的行为一致）
+    - 写入非字段键（如策略注入的 'order_book'）保存到按需创建的 extra 字典
     """
-    Tick 事件数据
+
+    __slots__ = ('_extra',)
+
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None or (self._extra is not None and key in self._extra)
+
+    def keys(self) -> List[str]:
+        keys = [name for name in self.FIELDS if getattr(self, name) is not None]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def values(self) -> List[Any]:
+        return [self[key] for key in self.keys()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (EventPayload, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def to_dict(self) -> dict:
+        """转换为普通 dict（序列化、日志等场景）"""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+class TickEvent(EventPayload):
+    """
+    Tick 事件数据（TICK 事件的有类型负载）
 
     Attributes:
         symbol (str): 交易对
         price (float): 价格
         size (float): 数量
-        side (str): 方向（buy/sell）
+        side (str): 方向（buy/sell），Ticker 推送时为 None
+        timestamp (int): 交易所时间戳（毫秒）
+        usdt_value (float): 成交金额（price * size），Ticker 推送时为 None
         trade_id (str): 交易 ID
-        timestamp (datetime): 时间戳
     """
-    symbol: str
-    price: float
-    size: float
-    side: str
-    trade_id: Optional[str] = None
-    timestamp: Optional[datetime] = None
+
+    __slots__ = ('symbol', 'price', 'size', 'side', 'timestamp', 'usdt_value', 'trade_id')
+
+    FIELDS = ('symbol', 'price', 'size', 'side', 'timestamp', 'usdt_value', 'trade_id')
+
+    def __init__(
+        self,
+        symbol: str,
+        price: float,
+        size: float,
+        side: Optional[str] = None,
+        trade_id: Optional[str] = None,
+        timestamp: int = 0,
+        usdt_value: Optional[float] = None
+    ):
+        self.symbol = symbol
+        self.price = price
+        self.size = size
+        self.side = side
+        self.timestamp = timestamp
+        self.usdt_value = usdt_value
+        self.trade_id = trade_id
+        self._extra = None
+
+
+class BookEvent(EventPayload):
+    """
+    订单簿事件数据（BOOK_EVENT 事件的有类型负载）
+
+    Attributes:
+        symbol (str): 交易对
+        best_bid (float): 买一价
+        best_ask (float): 卖一价
+        bids (list): 买单 [(price, size), ...]
+        asks (list): 卖单 [(price, size), ...]
+        timestamp (int): 交易所时间戳（毫秒），未知时为 None
+    """
+
+    __slots__ = ('symbol', 'best_bid', 'best_ask', 'bids', 'asks', 'timestamp')
+
+    FIELDS = ('symbol', 'best_bid', 'best_ask', 'bids', 'asks', 'timestamp')
+
+    def __init__(
+        self,
+        symbol: str,
+        best_bid: float,
+        best_ask: float,
+        bids: list,
+        asks: list,
+        timestamp: Optional[int] = None
+    ):
+        self.symbol = symbol
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        self.bids = bids
+        self.asks = asks
+        self.timestamp = timestamp
+        self._extra = None
+
+
+class TradeBatchEvent(EventPayload):
+    """
+    成交聚合事件数据（TRADE_BATCH 事件的有类型负载）
+
+    OKX 一帧 trades 推送聚合为一个事件，附带预计算的统计量，
+    消费者可一次折叠整批成交，不必逐笔唤醒。
+
+    Attributes:
+        symbol (str): 交易对
+        trades (list): 逐笔成交 [TickEvent, ...]（按推送顺序）
+        count (int): 成交笔数
+        buy_notional (float): 主动买成交额（Σ price * size）
+        sell_notional (float): 主动卖成交额
+        buy_size (float): 主动买成交量
+        sell_size (float): 主动卖成交量
+        vwap (float): 成交量加权均价
+        last_price (float): 最后一笔成交价
+        timestamp (int): 最后一笔成交的交易所时间戳（毫秒）
+    """
+
+    __slots__ = ('symbol', 'trades', 'count', 'buy_notional', 'sell_notional', 'buy_size', 'sell_size',
+                 'vwap', 'last_price', 'timestamp')
+
+    FIELDS = ('symbol', 'trades', 'count', 'buy_notional', 'sell_notional', 'buy_size', 'sell_size',
+              'vwap', 'last_price', 'timestamp')
+
+    def __init__(
+        self,
+        symbol: str,
+        trades: list,
+        count: int,
+        buy_notional: float,
+        sell_notional: float,
+        buy_size: float,
+        sell_size: float,
+        vwap: float,
+        last_price: float,
+        timestamp: int = 0
+    ):
+        self.symbol = symbol
+        self.trades = trades
+        self.count = count
+        self.buy_notional = buy_notional
+        self.sell_notional = sell_notional
+        self.buy_size = buy_size
+        self.sell_size = sell_size
+        self.vwap = vwap
+        self.last_price = last_price
+        self.timestamp = timestamp
+        self._extra = None
+
+    @classmethod
+    def from_ticks(cls, symbol: str, trades: List['TickEvent']) -> 'TradeBatchEvent':
+        """
+        由逐笔成交构造聚合事件（调用方保证 trades 非空）
+
+        Args:
+            symbol (str): 交易对
+            trades (List[TickEvent]): 逐笔成交
+
+        Returns:
+            TradeBatchEvent: 聚合事件
+        """
+        buy_notional = sell_notional = buy_size = sell_size = 0.0
+        for trade in trades:
+            if trade.side == 'buy':
+                buy_notional += trade.usdt_value
+                buy_size += trade.size
+            else:
+                sell_notional += trade.usdt_value
+                sell_size += trade.size
+        total_size = buy_size + sell_size
+        last = trades[-1]
+        return cls(
+            symbol=symbol,
+            trades=trades,
+            count=len(trades),
+            buy_notional=buy_notional,
+            sell_notional=sell_notional,
+            buy_size=buy_size,
+            sell_size=sell_size,
+            vwap=(buy_notional + sell_notional) / total_size if total_size > 0 else last.price,
+            last_price=last.price,
+            timestamp=last.timestamp
+        )
 
 
 @dataclass
@@ -0,0 +1,210 @@
+"""
+延迟直方图工具模块
+Latency Histogram Utilities for Athena Trader
+
+HDR 风格的对数分桶直方图：
+- 固定内存：桶数量只由精度和量程决定，与样本数量无关
+- O(1) 记录：一次 bit_length + 移位定位桶，无排序、无列表追加
+- 百分位查询：遍历一次桶数组（约 1000 个桶），适合监控任务定期轮询
+
+分桶方式：按 2 的幂划分区间，每个区间再线性划分为 2^sub_bucket_bits 个子桶，
+相对误差上限为 1 / 2^sub_bucket_bits（默认 5 位，约 3%）。
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+class LatencyHistogram:
+    """
+    对数分桶延迟直方图（单位：纳秒）
+
+    Example:
+        >>> histogram = LatencyHistogram()
+        >>> histogram.record(1_500_000)  # 1.5ms
+        >>> histogram.percentile(99)
+        1500000
+    """
+
+    __slots__ = ('sub_bucket_bits', 'max_value_ns', 'counts', 'count', 'total_ns', 'min_ns', 'max_ns',
+                 '_max_index')
+
+    DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+    def __init__(self, sub_bucket_bits: int = 5, max_value_ns: int = 60_000_000_000):
+        """
+        初始化直方图
+
+        Args:
+            sub_bucket_bits (int): 每个 2 的幂区间的子桶位数（精度），默认 5（约 3% 误差）
+            max_value_ns (int): 可区分的最大值（纳秒），超过的样本计入最高桶，默认 60 秒
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value_ns = max_value_ns
+        self._max_index = self._index(max_value_ns)
+        self.counts: List[int] = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def _index(self, value: int) -> int:
+        """
+        计算样本所在的桶
+
+        Args:
+            value (int): 样本值（非负整数）
+
+        Returns:
+            int: 桶索引
+        """
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+        return (shift << self.sub_bucket_bits) + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """
+        计算桶的上界（该桶内样本的最大可能值）
+
+        Args:
+            index (int): 桶索引
+
+        Returns:
+            int: 上界（纳秒）
+        """
+        if index < (2 << self.sub_bucket_bits):
+            return index
+        shift = (index >> self.sub_bucket_bits) - 1
+        mantissa = index - (shift << self.sub_bucket_bits)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ns: int):
+        """
+        记录一个样本（O(1)，桶定位内联以减少方法调用）
+
+        Args:
+            value_ns (int): 延迟（纳秒），负值按 0 计
+        """
+        if value_ns <= 0:
+            value_ns = 0
+            index = 0
+        elif value_ns > self.max_value_ns:
+            index = self._max_index
+        else:
+            bits = self.sub_bucket_bits
+            shift = value_ns.bit_length() - bits - 1
+            index = value_ns if shift <= 0 else (shift << bits) + (value_ns >> shift)
+        self.counts[index] += 1
+
+        if self.count:
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+            elif value_ns < self.min_ns:
+                self.min_ns = value_ns
+        else:
+            self.min_ns = self.max_ns = value_ns
+        self.count += 1
+        self.total_ns += value_ns
+
+    def percentiles(self, percentiles: Iterable[float]) -> Dict[float, int]:
+        """
+        一次遍历计算多个百分位
+
+        Args:
+            percentiles (Iterable[float]): 百分位列表（0-100）
+
+        Returns:
+            Dict[float, int]: 百分位 -> 值（纳秒，桶上界，不超过实际最大值）
+        """
+        targets = sorted(percentiles)
+        results = {p: 0 for p in targets}
+        if self.count == 0 or not targets:
+            return results
+
+        # 每个百分位需要的累计样本数（向上取整，至少 1 个）
+        thresholds = [max(1, math.ceil(p * self.count / 100.0 - 1e-9)) for p in targets]
+        position = 0
+        cumulative = 0
+        for index, bucket in enumerate(self.counts):
+            if not bucket:
+                continue
+            cumulative += bucket
+            # 最高桶包含超出量程的样本，直接报告实际最大值
+            value = self.max_ns if index == self._max_index else min(self._upper_bound(index), self.max_ns)
+            while position < len(targets) and cumulative >= thresholds[position]:
+                results[targets[position]] = value
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+    def percentile(self, percentile: float) -> int:
+        """
+        查询单个百分位
+
+        Args:
+            percentile (float): 百分位（0-100）
+
+        Returns:
+            int: 值（纳秒），无样本时返回 0
+        """
+        return self.percentiles((percentile,))[percentile]
+
+    @property
+    def mean_ns(self) -> float:
+        """平均值（纳秒）"""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        合并另一个直方图（两者必须使用相同的精度和量程）
+
+        Args:
+            other (LatencyHistogram): 另一个直方图
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits or other.max_value_ns != self.max_value_ns:
+            raise ValueError("只能合并相同精度和量程的直方图")
+        if other.count == 0:
+            return
+
+        counts = self.counts
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                counts[index] += bucket
+
+        if self.count == 0:
+            self.min_ns = other.min_ns
+            self.max_ns = other.max_ns
+        else:
+            self.min_ns = min(self.min_ns, other.min_ns)
+            self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        获取统计快照（毫秒）
+
+        Returns:
+            Dict[str, float]: {count, avg_ms, min_ms, max_ms, p50_ms, p90_ms, p99_ms, p999_ms}
+        """
+        values = self.percentiles(self.DEFAULT_PERCENTILES)
+        return {
+            'count': self.count,
+            'avg_ms': self.mean_ns / 1e6,
+            'min_ms': self.min_ns / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'p50_ms': values[50.0] / 1e6,
+            'p90_ms': values[90.0] / 1e6,
+            'p99_ms': values[99.0] / 1e6,
+            'p999_ms': values[99.9] / 1e6
+        }
+
+    def reset(self):
+        """清空所有样本（保留已分配的桶数组大小）"""
+        self.counts = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
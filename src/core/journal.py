@@ -0,0 +1,543 @@
+"""
+事件日志 (Event Journal)
+
+记录流经 EventBus 的每一个事件，用于事故复盘和确定性回放。
+
+设计原则：
+- 热路径只做序列化 + 追加到内存缓冲区（几微秒），不做任何文件 IO
+- 后台写入任务批量落盘（文件写入在线程池中执行，不阻塞事件循环）
+- 紧凑的二进制格式：分段文件（segment），每条记录带长度前缀
+- 写入跟不上时丢弃记录并计数，绝不阻塞交易主流程
+- 每次 start() 是一个新会话（session）：received_ns 是进程内的单调时钟，只在同一会话内可比较，
+  回放跨会话时重新锚定节奏
+
+文件格式（小端）：
+    segment  := MAGIC(4) VERSION(u16) session(u64) record*
+    record   := length(u32) seq(u64) received_ns(i64) exchange_ts(i64) priority(i32)
+                type_len(u8) source_len(u16) type source payload
+    payload  := pickle((kind, data))，kind=0 为原始 data，其余为有类型负载的编号
+    session  := 会话开始时的墙钟时间（time.time_ns），同一会话切换的分段共用一个 session
+
+VERSION 1 的分段没有 session 字段，读取时每个分段视为独立会话。
+
+⚠️ payload 使用 pickle 编码，只能回放自己生成的日志文件。
+"""
+
+import asyncio
+import logging
+import operator
+import os
+import pickle
+import struct
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .event_types import Event, EventType, EventPayload, TickEvent, BookEvent, TradeBatchEvent
+
+logger = logging.getLogger(__name__)
+
+
+JOURNAL_MAGIC = b'ATHJ'
+JOURNAL_VERSION = 2
+SEGMENT_SUFFIX = '.journal'
+
+_SEGMENT_PREFIX = struct.Struct('<4sH')
+_SEGMENT_HEADER = struct.Struct('<4sHQ')
+_RECORD_HEADER = struct.Struct('<IQqqiBH')
+_RECORD_LENGTH = struct.Struct('<I')
+
+_PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# 有类型负载编号（只能追加，不能调整顺序，否则旧日志无法解码）
+_PAYLOAD_TYPES: Tuple[Optional[type], ...] = (None, TickEvent, BookEvent, TradeBatchEvent)
+_PAYLOAD_CODES: Dict[type, Tuple[int, Any]] = {
+    payload_type: (code, operator.attrgetter(*payload_type.FIELDS))
+    for code, payload_type in enumerate(_PAYLOAD_TYPES)
+    if payload_type is not None
+}
+
+
+def _encode_payload(data: Any) -> bytes:
+    """
+    序列化事件负载
+
+    有类型负载按字段元组编码（比直接 pickle __slots__ 对象更快、更小）。
+
+    Args:
+        data (Any): event.data
+
+    Returns:
+        bytes: 编码结果
+    """
+    codec = _PAYLOAD_CODES.get(data.__class__)
+    if codec is None:
+        return pickle.dumps((0, data), _PICKLE_PROTOCOL)
+    code, getter = codec
+    if data._extra:
+        return pickle.dumps((code, getter(data), data._extra), _PICKLE_PROTOCOL)
+    return pickle.dumps((code, getter(data)), _PICKLE_PROTOCOL)
+
+
+def _decode_payload(raw: bytes) -> Any:
+    """
+    反序列化事件负载
+
+    Args:
+        raw (bytes): 编码结果
+
+    Returns:
+        Any: event.data
+    """
+    decoded = pickle.loads(raw)
+    code = decoded[0]
+    if code == 0:
+        return decoded[1]
+
+    payload_type = _PAYLOAD_TYPES[code]
+    payload: EventPayload = payload_type(**dict(zip(payload_type.FIELDS, decoded[1])))
+    if len(decoded) > 2:
+        for key, value in decoded[2].items():
+            payload[key] = value
+    return payload
+
+
+class JournalRecord:
+    """日志中的一条事件记录（session 相同的记录之间 received_ns 才可比较）"""
+
+    __slots__ = ('seq', 'received_ns', 'exchange_ts', 'priority', 'event_type', 'source', 'data', 'session')
+
+    def __init__(
+        self,
+        seq: int,
+        received_ns: int,
+        exchange_ts: int,
+        priority: int,
+        event_type: EventType,
+        source: str,
+        data: Any,
+        session: int = 0
+    ):
+        self.seq = seq
+        self.received_ns = received_ns
+        self.exchange_ts = exchange_ts
+        self.priority = priority
+        self.event_type = event_type
+        self.source = source
+        self.data = data
+        self.session = session
+
+    def to_event(self) -> Event:
+        """
+        重建事件（接收时间为当前时间，交易所时间戳保持原值）
+
+        Returns:
+            Event: 新事件
+        """
+        return Event(type=self.event_type, data=self.data, source=self.source, exchange_ts=self.exchange_ts)
+
+
+class EventJournal:
+    """
+    事件日志写入器（EventBus 的可选 sink）
+
+    Example:
+        >>> journal = EventJournal("data/journal")
+        >>> await journal.start()
+        >>> event_bus.attach_journal(journal)
+        >>> ...
+        >>> event_bus.detach_journal()
+        >>> await journal.stop()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        flush_interval: float = 0.05,
+        flush_bytes: int = 256 * 1024,
+        max_buffer_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        初始化事件日志
+
+        Args:
+            directory (str): 日志目录（每个分段一个文件）
+            segment_bytes (int): 单个分段文件的大小上限，超过后切换新分段
+            flush_interval (float): 后台写入间隔（秒）
+            flush_bytes (int): 缓冲区达到该大小时立即唤醒写入任务
+            max_buffer_bytes (int): 缓冲区上限（写入跟不上时丢弃新记录）
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_buffer_bytes = max_buffer_bytes
+
+        self._seq = 0
+        self._session = 0
+        self._buffer: List[bytes] = []
+        self._buffer_bytes = 0
+        self._buffer_first_seq = 0
+        self._type_bytes: Dict[EventType, bytes] = {
+            event_type: event_type.value.encode() for event_type in EventType
+        }
+        self._source_bytes: Dict[str, bytes] = {}
+
+        self._file = None
+        self._segment_size = 0
+        self._segments: List[str] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self._stats = {
+            'recorded': 0,
+            'written': 0,
+            'bytes_written': 0,
+            'dropped': 0,
+            'unpicklable': 0,
+            'write_errors': 0
+        }
+
+    def record(self, event: Event, priority: int):
+        """
+        记录一个已发布的事件（热路径：序列化 + 追加到内存缓冲区）
+
+        Args:
+            event (Event): 事件
+            priority (int): 发布优先级
+        """
+        if not self._running:
+            return
+
+        if self._buffer_bytes >= self.max_buffer_bytes:
+            self._stats['dropped'] += 1
+            return
+
+        try:
+            payload = _encode_payload(event.data)
+        except Exception:
+            # 无法序列化的负载（如包含锁、协程的 dict）只保留 repr
+            payload = pickle.dumps((0, repr(event.data)), _PICKLE_PROTOCOL)
+            self._stats['unpicklable'] += 1
+
+        type_bytes = self._type_bytes[event.type]
+        source_bytes = self._source_bytes.get(event.source)
+        if source_bytes is None:
+            source_bytes = self._source_bytes[event.source] = event.source.encode()[:0xFFFF]
+
+        self._seq += 1
+        if not self._buffer:
+            self._buffer_first_seq = self._seq
+        record = _RECORD_HEADER.pack(
+            _RECORD_HEADER.size - 4 + len(type_bytes) + len(source_bytes) + len(payload),
+            self._seq,
+            event.received_ns,
+            event.exchange_ts,
+            priority,
+            len(type_bytes),
+            len(source_bytes)
+        ) + type_bytes + source_bytes + payload
+        self._buffer.append(record)
+        self._buffer_bytes += len(record)
+        self._stats['recorded'] += 1
+
+        if self._buffer_bytes >= self.flush_bytes and not self._wakeup.is_set():
+            self._wakeup.set()
+
+    async def start(self):
+        """启动后台写入任务（开始一个新会话，之后的记录写入新分段）"""
+        if self._running:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._seq = self._last_seq_on_disk()
+        self._session = time.time_ns()
+        self._wakeup = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._writer_loop())
+        logger.info(f"📼 [EventJournal] 已启动: {self.directory} (起始序号={self._seq + 1})")
+
+    async def stop(self):
+        """停止写入任务（先把缓冲区全部落盘）"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+        if self._file:
+            await asyncio.get_running_loop().run_in_executor(None, self._file.close)
+            self._file = None
+        logger.info(
+            f"📼 [EventJournal] 已停止: 记录 {self._stats['recorded']} 条，"
+            f"写入 {self._stats['bytes_written']} 字节，丢弃 {self._stats['dropped']} 条"
+        )
+
+    async def _writer_loop(self):
+        """
+        后台写入循环：定时或缓冲区达到阈值时落盘
+
+        停止时（_running=False）先写完剩余缓冲区再退出，
+        保证同一时刻只有一个线程在写文件。
+        """
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self._flush()
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception as e:
+                logger.error(f"📼 [EventJournal] 写入循环错误: {e}", exc_info=True)
+
+        await self._flush()
+
+    async def _flush(self):
+        """交换缓冲区并在线程池中写入文件"""
+        if not self._buffer:
+            return
+
+        chunk = b''.join(self._buffer)
+        count = len(self._buffer)
+        first_seq = self._buffer_first_seq
+        self._buffer = []
+        self._buffer_bytes = 0
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_chunk, chunk, first_seq)
+            self._stats['written'] += count
+            self._stats['bytes_written'] += len(chunk)
+        except Exception as e:
+            self._stats['write_errors'] += 1
+            logger.error(f"📼 [EventJournal] 写入失败，丢失 {count} 条记录: {e}")
+
+    def _write_chunk(self, chunk: bytes, first_seq: int):
+        """
+        写入一批记录（线程池中执行）
+
+        Args:
+            chunk (bytes): 连续的记录
+            first_seq (int): 第一条记录的序号（新分段以此命名）
+        """
+        if self._file is None or self._segment_size >= self.segment_bytes:
+            if self._file is not None:
+                self._file.close()
+            path = os.path.join(self.directory, f"events-{first_seq:012d}{SEGMENT_SUFFIX}")
+            self._file = open(path, 'ab')
+            self._file.write(_SEGMENT_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self._session))
+            self._segment_size = _SEGMENT_HEADER.size
+            self._segments.append(path)
+
+        self._file.write(chunk)
+        self._file.flush()
+        self._segment_size += len(chunk)
+
+    def _last_seq_on_disk(self) -> int:
+        """
+        读取目录中已有日志的最后序号（追加写入时序号连续）
+
+        Returns:
+            int: 最后序号，没有日志时为 0
+        """
+        segments = list_segments(self.directory)
+        last_seq = 0
+        if segments:
+            for record in read_journal(segments[-1], decode_payload=False):
+                last_seq = record.seq
+        return last_seq
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取日志统计
+
+        Returns:
+            Dict[str, Any]: recorded / written / bytes_written / dropped / unpicklable / write_errors / buffered
+        """
+        stats = dict(self._stats)
+        stats['buffered'] = len(self._buffer)
+        stats['segments'] = list(self._segments)
+        return stats
+
+
+def list_segments(path: str) -> List[str]:
+    """
+    列出日志分段文件（按序号排序）
+
+    Args:
+        path (str): 日志目录或单个分段文件
+
+    Returns:
+        List[str]: 分段文件路径
+    """
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path) if name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def read_journal(path: str, decode_payload: bool = True) -> Iterator[JournalRecord]:
+    """
+    按序号顺序读取日志
+
+    末尾不完整的记录（进程崩溃时写了一半）会被跳过。
+    记录的 session 取自分段头（VERSION 1 的分段按分段序号编号）。
+
+    Args:
+        path (str): 日志目录或单个分段文件
+        decode_payload (bool): 是否反序列化负载（False 时 data 为原始字节）
+
+    Yields:
+        JournalRecord: 事件记录
+    """
+    for index, segment in enumerate(list_segments(path)):
+        with open(segment, 'rb') as f:
+            data = f.read()
+
+        if len(data) < _SEGMENT_PREFIX.size:
+            continue
+        magic, version = _SEGMENT_PREFIX.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC or version not in (1, JOURNAL_VERSION):
+            logger.warning(f"📼 [EventJournal] 跳过无法识别的分段: {segment}")
+            continue
+        if version == 1:
+            session, offset = index, _SEGMENT_PREFIX.size
+        elif len(data) < _SEGMENT_HEADER.size:
+            continue
+        else:
+            session, offset = _SEGMENT_HEADER.unpack_from(data, 0)[2], _SEGMENT_HEADER.size
+
+        end = len(data)
+        while offset + _RECORD_HEADER.size <= end:
+            (length, seq, received_ns, exchange_ts, priority,
+             type_len, source_len) = _RECORD_HEADER.unpack_from(data, offset)
+            record_end = offset + _RECORD_LENGTH.size + length
+            if record_end > end:
+                logger.warning(f"📼 [EventJournal] 分段末尾记录不完整，已忽略: {segment} (seq={seq})")
+                break
+
+            cursor = offset + _RECORD_HEADER.size
+            event_type = EventType(data[cursor:cursor + type_len].decode())
+            cursor += type_len
+            source = data[cursor:cursor + source_len].decode()
+            cursor += source_len
+            raw_payload = data[cursor:record_end]
+
+            yield JournalRecord(
+                seq=seq,
+                received_ns=received_ns,
+                exchange_ts=exchange_ts,
+                priority=priority,
+                event_type=event_type,
+                source=source,
+                data=_decode_payload(raw_payload) if decode_payload else raw_payload,
+                session=session
+            )
+            offset = record_end
+
+
+class JournalReplayer:
+    """
+    日志回放驱动
+
+    按原始发布顺序把日志中的事件重新发布到事件总线：
+    - speed=1.0：按原始时间间隔（接收时间 received_ns 的差值）回放
+    - speed=N：N 倍速
+    - speed=None 或 0：最快速度（仍受事件总线背压约束）
+
+    received_ns 是录制进程的单调时钟，不同会话（进程重启）之间不可比较：
+    会话切换时重新锚定节奏，新会话的第一个事件立即发布（不回放重启间隔）。
+    """
+
+    # 最快速度回放时，每发布多少个事件让出一次事件循环
+    YIELD_INTERVAL = 256
+
+    def __init__(self, event_bus, speed: Optional[float] = 1.0):
+        """
+        初始化回放驱动
+
+        Args:
+            event_bus: 目标事件总线
+            speed (Optional[float]): 回放速度倍数，None / 0 表示最快速度
+        """
+        self.event_bus = event_bus
+        self.speed = speed if speed and speed > 0 else None
+
+    async def replay(self, path: str, start_seq: int = 0, end_seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        回放日志
+
+        Args:
+            path (str): 日志目录或分段文件
+            start_seq (int): 起始序号（含）
+            end_seq (Optional[int]): 结束序号（含），None 表示到末尾
+
+        Returns:
+            Dict[str, Any]: {events, first_seq, last_seq, sessions, duration_s,
+                recorded_span_s（各会话录制时长之和）}
+        """
+        published = 0
+        first_seq = last_seq = 0
+        sessions = 0
+        session = None
+        anchor_ns = anchor_received_ns = last_received_ns = 0
+        recorded_span_ns = 0
+        started = time.monotonic_ns()
+
+        for record in read_journal(path):
+            if record.seq < start_seq:
+                continue
+            if end_seq is not None and record.seq > end_seq:
+                break
+
+            if published == 0 or record.session != session:
+                # 新会话：重新锚定节奏
+                if published == 0:
+                    first_seq = record.seq
+                    started = time.monotonic_ns()
+                else:
+                    recorded_span_ns += last_received_ns - anchor_received_ns
+                session = record.session
+                sessions += 1
+                anchor_ns = time.monotonic_ns()
+                anchor_received_ns = record.received_ns
+            elif self.speed is not None:
+                target_ns = anchor_ns + (record.received_ns - anchor_received_ns) / self.speed
+                delay_ns = target_ns - time.monotonic_ns()
+                if delay_ns > 0:
+                    await asyncio.sleep(delay_ns / 1e9)
+
+            await self.event_bus.put(record.to_event(), priority=record.priority)
+            published += 1
+            last_seq = record.seq
+            last_received_ns = record.received_ns
+
+            if self.speed is None and published % self.YIELD_INTERVAL == 0:
+                await asyncio.sleep(0)
+
+        if published:
+            recorded_span_ns += last_received_ns - anchor_received_ns
+
+        result = {
+            'events': published,
+            'first_seq': first_seq,
+            'last_seq': last_seq,
+            'sessions': sessions,
+            'duration_s': (time.monotonic_ns() - started) / 1e9,
+            'recorded_span_s': recorded_span_ns / 1e9
+        }
+        logger.info(
+            f"📼 [JournalReplayer] 回放完成: {published} 个事件 "
+            f"(seq {first_seq}-{last_seq}), 耗时 {result['duration_s']:.2f}s, "
+            f"原始时长 {result['recorded_span_s']:.2f}s"
+        )
+        return result
@@ -0,0 +1,76 @@
+"""
+OKX 订单簿频道 (Order Book Channels)
+
+OKX 公共 WebSocket 提供多档深度 / 推送频率不同的订单簿频道，全部由 BookParser 解析，
+推送同一种 BOOK_EVENT（MarketDataManager 与策略无需区分来源频道）：
+
+| 频道          | 档位 | 推送间隔 | 推送方式          |
+|---------------|------|----------|-------------------|
+| bbo-tbt       | 1    | 10ms     | 每次推送都是快照  |
+| books5        | 5    | 100ms    | 每次推送都是快照  |
+| books         | 400  | 100ms    | 快照 + 增量       |
+| books-l2-tbt  | 400  | 10ms     | 快照 + 增量（OKX 要求 VIP 等级） |
+
+策略通过 BookRequirement(depth, latency) 声明所需深度和延迟等级，
+select_book_channel() 选出满足全部声明的最便宜频道（单条推送档位最少，其次推送最少）。
+"""
+
+from typing import Iterable, NamedTuple
+
+# 延迟等级 -> 可接受的最大推送间隔（ms）
+LATENCY_TIERS = {
+    'tick': 10,       # 逐笔（tick-by-tick）
+    'standard': 100,  # 100ms 聚合推送
+}
+
+
+class BookRequirement(NamedTuple):
+    """消费者（策略）对订单簿的需求"""
+    depth: int                  # 需要读取的档位数
+    latency: str = 'standard'   # 延迟等级（见 LATENCY_TIERS）
+
+
+class BookChannelSpec(NamedTuple):
+    """订单簿频道规格"""
+    depth: int          # 最大档位数
+    interval_ms: int    # 推送间隔（ms）
+    incremental: bool   # 是否为快照 + 增量推送（需要 seqId 连续性与 checksum 校验）
+
+
+# 按成本从低到高排列（select_book_channel 选第一个满足要求的频道）
+BOOK_CHANNELS = {
+    'bbo-tbt': BookChannelSpec(depth=1, interval_ms=10, incremental=False),
+    'books5': BookChannelSpec(depth=5, interval_ms=100, incremental=False),
+    'books': BookChannelSpec(depth=400, interval_ms=100, incremental=True),
+    'books-l2-tbt': BookChannelSpec(depth=400, interval_ms=10, incremental=True),
+}
+
+
+def select_book_channel(requirements: Iterable[BookRequirement]) -> str:
+    """
+    选择满足所有消费者要求的最便宜订单簿频道
+
+    Args:
+        requirements (Iterable[BookRequirement]): 各消费者的订单簿需求
+
+    Returns:
+        str: 频道名称（没有任何需求时返回 'books'）
+
+    Raises:
+        ValueError: 未知的延迟等级，或没有频道能同时满足全部需求
+    """
+    depth = 0
+    interval_ms = max(LATENCY_TIERS.values())
+    for requirement in requirements:
+        if requirement.latency not in LATENCY_TIERS:
+            raise ValueError(f"未知的延迟等级: {requirement.latency}，可选: {list(LATENCY_TIERS)}")
+        depth = max(depth, requirement.depth)
+        interval_ms = min(interval_ms, LATENCY_TIERS[requirement.latency])
+
+    if depth == 0:
+        return 'books'
+
+    for channel, spec in BOOK_CHANNELS.items():
+        if spec.depth >= depth and spec.interval_ms <= interval_ms:
+            return channel
+    raise ValueError(f"没有订单簿频道满足 depth={depth}, 推送间隔<={interval_ms}ms")
@@ -2,15 +2,30 @@
 OKX 数据模型
 
 使用 Pydantic 进行数据验证和类型安全
+
+🔥 [优化] 行情热路径（trades / books）默认不再经过 Pydantic，
+直接把字符串字段转换为 float / int 并做结构检查；
+设置 OKX_STRICT_PARSING=true（或 Parser 的 strict=True）时启用本模块的严格校验，用于调试。
 """
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import List, Optional
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
+def strict_parsing_enabled() -> bool:
+    """
+    是否启用严格（Pydantic）解析
+
+    Returns:
+        bool: 环境变量 OKX_STRICT_PARSING 为 true 时返回 True（默认关闭）
+    """
+    return os.getenv('OKX_STRICT_PARSING', 'false').lower() == 'true'
+
+
 class TradeModel(BaseModel):
     """交易数据模型"""
     model_config = ConfigDict(extra='allow')  # 允许额外字段（向下兼容）
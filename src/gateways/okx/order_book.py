@@ -0,0 +1,193 @@
+"""
+OKX 增量 L2 订单簿 (Incremental L2 Order Book)
+
+维护 OKX books 频道的全深度订单簿：
+- 先应用 snapshot，再逐条应用 update（size=0 表示删除该档位）
+- 每侧按价格有序：dict 保存档位，有序数组保存价格（bisect 定位），
+  修改已有档位 O(1)，新增 / 删除档位 O(log n) 查找 + 一次内存移动
+- 保留 OKX 原始价格 / 数量字符串，用于 CRC32 校验和
+- seqId / prevSeqId 连续性检查，由 BookParser 在断档或校验失败时触发重新订阅
+
+校验和算法（OKX 文档）：
+    取买卖各前 25 档，按 bid1_px:bid1_sz:ask1_px:ask1_sz:bid2_px:... 交替拼接
+    （某一侧不足 25 档时只拼接另一侧），对字符串做 CRC32，结果按有符号 32 位整数比较。
+"""
+
+import zlib
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 参与校验和计算的档位数
+CHECKSUM_LEVELS = 25
+
+
+def _signed_crc32(text: str) -> int:
+    """CRC32（有符号 32 位整数，与 OKX 推送的 checksum 一致）"""
+    value = zlib.crc32(text.encode())
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+class L2OrderBook:
+    """
+    单个交易对的全深度订单簿
+
+    档位值为 (价格字符串, 数量字符串, 数量)；买盘在有序数组中保存负价格，
+    两侧都按"最优价在前"升序排列。
+    """
+
+    __slots__ = (
+        'symbol', '_bids', '_asks', '_bid_keys', '_ask_keys',
+        'seq_id', 'timestamp', 'synced', 'updates', '_version', '_top_cache'
+    )
+
+    def __init__(self, symbol: str):
+        """
+        初始化订单簿
+
+        Args:
+            symbol (str): 交易对
+        """
+        self.symbol = symbol
+        self._bids: Dict[float, Tuple[str, str, float]] = {}
+        self._asks: Dict[float, Tuple[str, str, float]] = {}
+        self._bid_keys: List[float] = []  # -price 升序（最高买价在前）
+        self._ask_keys: List[float] = []  # price 升序（最低卖价在前）
+        self.seq_id = -1
+        self.timestamp = 0
+        self.synced = False  # 收到 snapshot 后为 True；断档后重置为 False
+        self.updates = 0
+        self._version = 0
+        self._top_cache: Optional[Tuple[int, int, tuple]] = None
+
+    def reset(self):
+        """清空订单簿（等待新的 snapshot）"""
+        self._bids.clear()
+        self._asks.clear()
+        self._bid_keys.clear()
+        self._ask_keys.clear()
+        self.seq_id = -1
+        self.synced = False
+        self._version += 1
+        self._top_cache = None
+
+    def apply_snapshot(self, bids: Iterable[Sequence[str]], asks: Iterable[Sequence[str]], seq_id: int = -1,
+                       timestamp: int = 0):
+        """
+        应用全量快照
+
+        Args:
+            bids (Iterable[Sequence[str]]): [[px, sz, ...], ...]
+            asks (Iterable[Sequence[str]]): [[px, sz, ...], ...]
+            seq_id (int): 快照的 seqId
+            timestamp (int): 交易所时间戳（毫秒）
+        """
+        self.reset()
+        self._apply_side(self._bids, self._bid_keys, bids, -1.0)
+        self._apply_side(self._asks, self._ask_keys, asks, 1.0)
+        self.seq_id = seq_id
+        self.timestamp = timestamp
+        self.synced = True
+
+    def apply_update(self, bids: Iterable[Sequence[str]], asks: Iterable[Sequence[str]], seq_id: int = -1,
+                     timestamp: int = 0):
+        """
+        应用增量更新（调用方负责 seqId 连续性检查）
+
+        Args:
+            bids (Iterable[Sequence[str]]): 变化的买盘档位，sz 为 "0" 表示删除
+            asks (Iterable[Sequence[str]]): 变化的卖盘档位
+            seq_id (int): 本次更新的 seqId
+            timestamp (int): 交易所时间戳（毫秒）
+        """
+        self._apply_side(self._bids, self._bid_keys, bids, -1.0)
+        self._apply_side(self._asks, self._ask_keys, asks, 1.0)
+        self.seq_id = seq_id
+        self.timestamp = timestamp
+        self.updates += 1
+        self._version += 1
+
+    @staticmethod
+    def _apply_side(levels: Dict[float, Tuple[str, str, float]], keys: List[float],
+                    changes: Iterable[Sequence[str]], sign: float):
+        """
+        应用单侧档位变化
+
+        Args:
+            levels: 价格 -> (价格字符串, 数量字符串, 数量)
+            keys: 有序价格数组（买盘为负价格）
+            changes: [[px, sz, ...], ...]
+            sign (float): 买盘 -1.0，卖盘 1.0
+        """
+        for change in changes:
+            px = change[0]
+            sz = change[1]
+            price = float(px)
+            size = float(sz)
+            if size == 0.0:
+                if levels.pop(price, None) is not None:
+                    del keys[bisect_left(keys, price * sign)]
+            else:
+                if price not in levels:
+                    insort(keys, price * sign)
+                levels[price] = (px, sz, size)
+
+    # ==================== 读取 ====================
+
+    @property
+    def best_bid(self) -> float:
+        return -self._bid_keys[0] if self._bid_keys else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return self._ask_keys[0] if self._ask_keys else 0.0
+
+    @property
+    def depth(self) -> Tuple[int, int]:
+        """(买盘档位数, 卖盘档位数)"""
+        return len(self._bid_keys), len(self._ask_keys)
+
+    def top(self, levels: int) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """
+        前 N 档视图（O(N)，同一版本内重复读取直接返回缓存）
+
+        Args:
+            levels (int): 档位数
+
+        Returns:
+            Tuple[List, List]: ([(price, size), ...] 买盘, [(price, size), ...] 卖盘)
+        """
+        cache = self._top_cache
+        if cache is not None and cache[0] == self._version and cache[1] == levels:
+            return cache[2]
+
+        bids = self._bids
+        asks = self._asks
+        result = (
+            [(-key, bids[-key][2]) for key in self._bid_keys[:levels]],
+            [(key, asks[key][2]) for key in self._ask_keys[:levels]]
+        )
+        self._top_cache = (self._version, levels, result)
+        return result
+
+    def checksum(self) -> int:
+        """
+        计算 OKX 校验和（前 25 档，买卖交替拼接）
+
+        Returns:
+            int: 有符号 32 位 CRC32
+        """
+        bid_keys = self._bid_keys[:CHECKSUM_LEVELS]
+        ask_keys = self._ask_keys[:CHECKSUM_LEVELS]
+        bids = self._bids
+        asks = self._asks
+        parts = []
+        for i in range(max(len(bid_keys), len(ask_keys))):
+            if i < len(bid_keys):
+                level = bids[-bid_keys[i]]
+                parts.append(level[0])
+                parts.append(level[1])
+            if i < len(ask_keys):
+                level = asks[ask_keys[i]]
+                parts.append(level[0])
+                parts.append(level[1])
+        return _signed_crc32(':'.join(parts))
@@ -0,0 +1,296 @@
+"""
+OKX 下单参数构造 (Order Request Parameters)
+
+REST 网关和私有 WebSocket 网关共用的下单 / 改单请求体构造和撤单容错：
+两条通道发出的请求体完全一致，WebSocket 下单未确认时等到请求的 expTime（加时钟偏移余量）过去，
+再按同一个 clOrdId 查询订单，确认订单未到达交易所后再用同一个 clOrdId 通过 REST 重发。
+
+🔥 [新增] 开仓单可附带止损 / 止盈（attachAlgoOrds）：开仓单成交时交易所自动生成止损单，
+不需要等成交推送后再单独下止损单。
+"""
+
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ...core.event_types import Event, EventType
+
+logger = logging.getLogger(__name__)
+
+# OKX V5 API 支持的下单字段白名单（注意：不包含 'tag' 和 'strategy_id'）
+OKX_ORDER_FIELDS = frozenset((
+    'instId', 'tdMode', 'side', 'ordType', 'sz', 'px',
+    'reduceOnly', 'clOrdId', 'ccy', 'attachAlgoOrds'
+))
+
+STOP_ORDER_TYPES = ('stop_market', 'stop_limit')
+
+# 撤单失败但订单已结束（已成交 / 已撤销 / 不存在）的错误码，视为撤单成功
+# 51400: Cancellation failed as the order has been filled, canceled or does not exist
+# 51401: Order has been canceled
+# 51402: Order does not exist
+CANCEL_DONE_CODES = frozenset(('51400', '51401', '51402'))
+
+# 查询订单：51603 Order does not exist
+ORDER_NOT_FOUND_CODE = '51603'
+
+# WebSocket 请求未确认时，查询订单前在 expTime 之后再等待的时钟偏移余量（秒）
+EXP_TIME_MARGIN = 0.5
+
+# clOrdId 序号（同一毫秒内批量下单时保证唯一）
+_cl_ord_seq = itertools.count()
+
+
+def format_price(price: float) -> str:
+    """
+    价格格式化：保留 4 位小数并去掉末尾的 0 和小数点
+
+    Args:
+        price (float): 价格
+
+    Returns:
+        str: OKX 要求的字符串价格
+    """
+    price_str = f"{price:.4f}".rstrip('0').rstrip('.')
+    return price_str or '0'
+
+
+def new_cl_ord_id(strategy_id: str = 'manual') -> str:
+    """
+    生成 Client Order ID（用于标识策略来源）
+
+    clOrdId 限制：1-32 位字符，必须是纯字母数字。
+    格式：策略 ID 前缀（最多 4 位）+ 毫秒时间戳后 8 位 + 3 位序号（同一毫秒内批量下单不重复）。
+
+    Args:
+        strategy_id (str): 策略 ID
+
+    Returns:
+        str: clOrdId
+    """
+    prefix = strategy_id[:4].lower()
+    ts_suffix = str(int(time.time() * 1000))[-8:]
+    return f"{prefix}{ts_suffix}{next(_cl_ord_seq) % 1000:03d}"
+
+
+def build_order_body(
+    symbol: str,
+    side: str,
+    order_type: str,
+    size: float,
+    price: Optional[float] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    构造下单请求体（/api/v5/trade/order 与 WebSocket order 操作共用）
+
+    Args:
+        symbol (str): 交易对
+        side (str): 方向（buy/sell）
+        order_type (str): 订单类型（market/limit/ioc/stop_market/stop_limit）
+        size (float): 数量
+        price (float): 价格
+        **kwargs: 其他参数（白名单内的字段原样透传）
+
+    Returns:
+        dict: 请求体
+    """
+    # 1. 确保 ordType 小写（OKX V5 API 需要 market/limit）
+    ord_type_lower = order_type.lower() if order_type else 'market'
+
+    # 2. 确保 sz 是整数（SWAP/FUTURES 合约必须整数）
+    size_int = int(size) if size is not None else 1
+    if size_int < 1:
+        logger.warning(f"⚠️  size {size} 小于 1，强制设为 1")
+        size_int = 1
+
+    body = {
+        'instId': symbol,
+        'tdMode': 'cross',  # ✅ 必须有
+        'side': side,
+        'sz': str(size_int)  # ✅ 必须是字符串
+    }
+
+    # ✅ 处理止损单（stop_market / stop_limit）
+    if order_type in STOP_ORDER_TYPES:
+        # OKX V5 使用 conditional 订单类型实现止损
+        body['ordType'] = 'conditional'
+        body['slTriggerType'] = 'last'  # 使用最新价触发
+        body['slOrdPx'] = str(price) if price else ''  # ✅ 必须是字符串
+
+        # ✅ 条件单必须指定 posSide（持仓方向）
+        # side='sell' + 止损 → 多头止损 → posSide='long'
+        # side='buy' + 止损 → 空头止损 → posSide='short'
+        body['posSide'] = 'long' if side == 'sell' else 'short'
+
+        if order_type == 'stop_limit':
+            # 止损限价单：设置限价价格
+            tp_price = kwargs.get('tp_price')
+            if tp_price:
+                body['tpOrdPx'] = str(tp_price)  # ✅ 必须是字符串
+
+        logger.info(f"🛡️  止损单: slOrdPx={price}, posSide={body['posSide']}, ordType=conditional")
+    else:
+        # 普通订单（market/limit/ioc）
+        body['ordType'] = ord_type_lower
+
+        # limit/ioc 订单需要价格
+        if order_type in ['limit', 'ioc'] and price:
+            body['px'] = format_price(price)
+            logger.debug(f"价格格式化: {price} -> {body['px']}")
+
+    body['clOrdId'] = new_cl_ord_id(kwargs.get('strategy_id', 'manual'))
+
+    # 添加额外参数，但只保留 OKX API 支持的字段（调用方传入的 clOrdId 覆盖生成值）
+    for key, value in kwargs.items():
+        if key in OKX_ORDER_FIELDS:
+            body[key] = value
+
+    logger.debug(f"🏷️  clOrdId: {body['clOrdId']} (strategy_id={kwargs.get('strategy_id', 'manual')})")
+    return body
+
+
+def build_attach_algo(
+    algo_cl_ord_id: str,
+    stop_loss_price: Optional[float] = None,
+    take_profit_price: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    🔥 [新增] 构造开仓单附带的止损 / 止盈（attachAlgoOrds 字段）
+
+    触发后按市价执行（slOrdPx / tpOrdPx = -1），使用最新价触发，与成交后单独下的止损单一致。
+
+    Args:
+        algo_cl_ord_id (str): 附带止损 / 止盈的 clOrdId（attachAlgoClOrdId，用于关联和改单）
+        stop_loss_price (Optional[float]): 止损触发价
+        take_profit_price (Optional[float]): 止盈触发价
+
+    Returns:
+        list: attachAlgoOrds 字段值
+    """
+    attach = {'attachAlgoClOrdId': algo_cl_ord_id}
+    if stop_loss_price:
+        attach['slTriggerPx'] = format_price(stop_loss_price)
+        attach['slOrdPx'] = '-1'
+        attach['slTriggerPxType'] = 'last'
+    if take_profit_price:
+        attach['tpTriggerPx'] = format_price(take_profit_price)
+        attach['tpOrdPx'] = '-1'
+        attach['tpTriggerPxType'] = 'last'
+    return [attach]
+
+
+def build_amend_body(
+    order_id: str,
+    symbol: str,
+    new_size: Optional[float] = None,
+    new_price: Optional[float] = None,
+    new_stop_loss_price: Optional[float] = None,
+    attach_algo_cl_ord_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    构造改单请求体（/api/v5/trade/amend-order 与 WebSocket amend-order 操作共用）
+
+    Args:
+        order_id (str): 订单 ID
+        symbol (str): 交易对
+        new_size (Optional[float]): 新数量（合约张数，None 表示不改）
+        new_price (Optional[float]): 新价格（None 表示不改）
+        new_stop_loss_price (Optional[float]): 附带止损的新触发价（需要 attach_algo_cl_ord_id）
+        attach_algo_cl_ord_id (Optional[str]): 下单时附带止损的 attachAlgoClOrdId
+
+    Returns:
+        dict: 请求体
+
+    Raises:
+        ValueError: 没有指定任何修改
+    """
+    amend_stop_loss = new_stop_loss_price is not None and attach_algo_cl_ord_id is not None
+    if new_size is None and new_price is None and not amend_stop_loss:
+        raise ValueError("改单必须指定 new_size、new_price 或 new_stop_loss_price")
+
+    body = {'instId': symbol, 'ordId': order_id}
+    if new_size is not None:
+        body['newSz'] = str(max(int(new_size), 1))
+    if new_price is not None:
+        body['newPx'] = format_price(new_price)
+    if amend_stop_loss:
+        body['attachAlgoOrds'] = [{
+            'attachAlgoClOrdId': attach_algo_cl_ord_id,
+            'newSlTriggerPx': format_price(new_stop_loss_price)
+        }]
+    return body
+
+
+def order_ack_event(
+    order_data: Dict[str, Any],
+    symbol: str,
+    side: str,
+    order_type: str,
+    size: float,
+    price: Optional[float],
+    source: str
+) -> Event:
+    """
+    下单确认后发布的 ORDER_UPDATE 事件
+
+    Args:
+        order_data (dict): 交易所返回的订单数据（ordId / clOrdId / sCode / sMsg）
+        symbol (str): 交易对
+        side (str): 方向
+        order_type (str): 订单类型
+        size (float): 数量
+        price (Optional[float]): 价格
+        source (str): 事件来源（okx_rest / okx_ws_private）
+
+    Returns:
+        Event: ORDER_UPDATE 事件
+    """
+    return Event(
+        type=EventType.ORDER_UPDATE,
+        data={
+            'order_id': order_data.get('ordId'),
+            'symbol': symbol,
+            'side': side,
+            'order_type': order_type,
+            'price': float(price) if price else 0.0,
+            'size': float(size),
+            'status': 'live',
+            'raw': order_data
+        },
+        source=source
+    )
+
+
+def tolerate_cancel_error(error_msg: str, order_id: str, symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    撤单容错：订单已成交或不存在时视为撤单成功
+
+    错误码 1: All operations failed（所有操作失败）
+    错误码 51402: Order does not exist（订单不存在）
+    这些错误表示订单可能已经成交或不存在，返回成功，避免策略因为撤单失败而卡死。
+
+    Args:
+        error_msg (str): 异常信息
+        order_id (str): 订单 ID
+        symbol (str): 交易对
+
+    Returns:
+        Optional[dict]: 可容忍时返回伪造的撤单响应，否则 None（调用方继续抛出）
+    """
+    if '1' in error_msg and 'All operations failed' in error_msg:
+        logger.warning(
+            f"⚠️ 撤单返回 'All operations failed'，订单可能已成交或不存在。"
+            f"order_id={order_id}, symbol={symbol}"
+        )
+        return {'ordId': order_id, 'sCode': '1', 'sMsg': 'Order may be filled or not exist'}
+
+    if '51402' in error_msg:
+        logger.warning(
+            f"⚠️ 订单不存在 (51402)，可能已成交。"
+            f"order_id={order_id}, symbol={symbol}"
+        )
+        return {'ordId': order_id, 'sCode': '51402', 'sMsg': 'Order does not exist'}
+
+    return None
@@ -1,118 +1,220 @@
 """
 Book Parser - 处理 Order Book 数据
 
-负责解析 OKX 的 Book WebSocket 消息，推送到事件总线。
+负责解析 OKX 的 Book WebSocket 消息，维护增量订单簿并推送到事件总线。
 
-🔥 [防御性解析] 使用 Pydantic 模型验证数据格式
-- 即使 OKX API 增加额外字段，也不会崩溃
-- 自动类型转换和范围检查
-- 清晰的验证错误信息
+🔥 [优化] 增量订单簿（L2OrderBook）
+- action=snapshot 重建订单簿，action=update 按档位增量更新（sz=0 删除档位）
+- prevSeqId 与本地 seqId 不连续视为断档；checksum 不一致视为订单簿损坏
+- 断档 / 校验失败时清空订单簿、暂停推送，并通过 on_resync 回调重新订阅以获取新快照
+- 未携带 action 的推送（如 books5）按快照处理
+
+🔥 [优化] 快速解析（默认）：档位字符串直接转换为 float，格式错误时按订单簿损坏处理
+🔥 [防御性解析] 严格模式（strict=True 或 OKX_STRICT_PARSING=true）先用 Pydantic 模型验证每条推送
 """
 
 import logging
-from typing import Optional, Dict, Any, List, Tuple
-from ....core.event_types import Event, EventType
-from ..models import BookLevelModel, BookDataModel
+import time
+from typing import Optional, Dict, Any, Callable, Awaitable
+from ....core.event_types import Event, EventType, BookEvent
+from ..order_book import L2OrderBook
+from ..models import BookDataModel, strict_parsing_enabled
 
 logger = logging.getLogger(__name__)
 
 
 class BookParser:
     """
-    Order Book 数据解析器（Pydantic 版本）
+    Order Book 数据解析器（增量订单簿版本）
 
     负责：
-    - 解析 Order Book 数据（使用 Pydantic 验证）
-    - 推送 BOOK_EVENT 事件到事件总线
+    - 应用 snapshot / update，维护全深度订单簿
+    - seqId 连续性与 CRC32 校验和验证
+    - 推送前 N 档 BOOK_EVENT 事件到事件总线
     """
 
-    def __init__(self, symbol: str, event_bus):
+    SOURCE = "book_parser"
+
+    def __init__(self, symbol: str, event_bus, depth: int = 5, validate_checksum: bool = True,
+                 strict: Optional[bool] = None):
         """
         初始化 Book Parser
 
         Args:
             symbol (str): 交易对
             event_bus: 事件总线实例
+            depth (int): BOOK_EVENT 中推送的档位数
+            validate_checksum (bool): 是否验证 OKX checksum
+            strict (Optional[bool]): 是否使用 Pydantic 严格校验，None 时读取环境变量 OKX_STRICT_PARSING
         """
         self.symbol = symbol
         self.event_bus = event_bus
-
-    async def process(self, data: dict) -> Optional[Dict[str, Any]]:
+        self.depth = depth
+        self.validate_checksum = validate_checksum
+        self.strict = strict_parsing_enabled() if strict is None else strict
+        self.book = L2OrderBook(symbol)
+
+        # 断档 / 校验失败时的重新订阅回调（由网关设置）
+        self.on_resync: Optional[Callable[[], Awaitable[Any]]] = None
+
+        # 🔥 [新增] 行情延迟直方图（FeedLatency，由网关设置，None 表示不统计）
+        self.latency = None
+
+        self._stats = {
+            'snapshots': 0,
+            'updates': 0,
+            'seq_gaps': 0,
+            'checksum_errors': 0,
+            'resyncs': 0,
+            'invalid': 0,
+            'dropped': 0
+        }
+
+    async def process(self, data: dict, received_ns: int = 0) -> Optional[Dict[str, Any]]:
         """
-        处理 Order Book 数据（Pydantic 验证版本）
+        处理 Order Book 数据
 
         Args:
-            data (dict): 解析后的 JSON 数据，格式：{"arg": {"channel": "books", "instId": "BTC-USDT-SWAP"}, "data": [...]}
+            data (dict): 解析后的 JSON 数据，格式：
+                {"arg": {...}, "action": "snapshot"|"update", "data": [{"bids", "asks", "ts", "checksum", "seqId", "prevSeqId"}]}
+            received_ns (int): 收到 WebSocket 帧的时间（time.monotonic_ns），0 表示当前时间
 
         Returns:
-            Optional[Dict[str, Any]]: 处理后的数据，返回 None 或标准化的 Order Book 数据
+            Optional[Dict[str, Any]]: 始终返回 None（数据通过事件总线推送）
         """
+        received_ns = received_ns or time.monotonic_ns()
         try:
-            # 取 book 数据
             book_data = data.get("data", [])
 
             if not isinstance(book_data, list) or len(book_data) == 0:
                 logger.debug(f"Book 数据为空或格式不正确: {book_data}")
                 return None
 
-            # 取最新的订单簿数据
-            book = book_data[0]  # OKX 返回的是数组，取第一个
+            action = data.get("action", "snapshot")
+            book = self.book
+
+            for entry in book_data:
+                ts = entry.get('ts', '')
+                exchange_ts = int(ts) if isinstance(ts, str) and ts.isdigit() else 0
+                seq_id = int(entry.get('seqId', -1))
+
+                if self.strict and not self._validate_strict(entry):
+                    self._stats['invalid'] += 1
+                    await self._resync(f"数据校验失败: seqId={seq_id}")
+                    return None
+
+                if action == "update":
+                    if not book.synced:
+                        # 等待重新订阅后的快照
+                        self._stats['dropped'] += 1
+                        continue
+                    prev_seq_id = int(entry.get('prevSeqId', -1))
+                    if prev_seq_id != book.seq_id:
+                        self._stats['seq_gaps'] += 1
+                        await self._resync(f"seqId 断档: prevSeqId={prev_seq_id}, 本地 seqId={book.seq_id}")
+                        return None
+                    apply = book.apply_update
+                    self._stats['updates'] += 1
+                else:
+                    apply = book.apply_snapshot
+                    self._stats['snapshots'] += 1
+
+                try:
+                    apply(entry.get('bids', ()), entry.get('asks', ()), seq_id, exchange_ts)
+                except (ValueError, TypeError, IndexError) as e:
+                    # 档位可能已部分应用，订单簿不再可信
+                    self._stats['invalid'] += 1
+                    await self._resync(f"档位格式错误: {e}")
+                    return None
+
+                checksum = entry.get('checksum')
+                if self.validate_checksum and checksum is not None and book.checksum() != int(checksum):
+                    self._stats['checksum_errors'] += 1
+                    await self._resync(f"checksum 不一致: seqId={seq_id}")
+                    return None
+
+                self._publish(exchange_ts, received_ns)
+
+        except Exception as e:
+            logger.error(f"Book 处理异常: {e}, 原始数据: {data}", exc_info=True)
+            return None
+
+    def _validate_strict(self, entry: dict) -> bool:
+        """
+        严格模式：使用 Pydantic 模型验证一条推送（任何档位被丢弃都视为无效）
+
+        Args:
+            entry (dict): data 数组中的一项
 
-            # 🔥 [防御性解析] 使用 Pydantic 验证
+        Returns:
+            bool: 是否通过验证
+        """
+        bids = entry.get('bids', [])
+        asks = entry.get('asks', [])
+        try:
+            model = BookDataModel(asks=asks, bids=bids, timestamp=entry.get('ts', ''))
+        except Exception as e:
+            logger.warning(f"⚠️ [BookParser] Pydantic 验证失败: {e}, 原始数据: {entry}")
+            return False
+        if len(model.bids) != len(bids) or len(model.asks) != len(asks):
+            logger.warning(f"⚠️ [BookParser] 存在无法解析的档位, 原始数据: {entry}")
+            return False
+        return True
+
+    def _publish(self, exchange_ts: int, received_ns: int):
+        """推送前 N 档 BOOK_EVENT"""
+        if not self.event_bus:
+            return
+
+        bids, asks = self.book.top(self.depth)
+        best_bid = bids[0][0] if bids else 0.0
+        best_ask = asks[0][0] if asks else 0.0
+
+        # 🔥 [优化] 有类型负载（__slots__），仍支持 data.get('bids') 等 dict 访问
+        event = Event(
+            type=EventType.BOOK_EVENT,
+            data=BookEvent(
+                symbol=self.symbol,
+                best_bid=best_bid,
+                best_ask=best_ask,
+                bids=bids,  # ✅ 标准化格式：[(price_float, size_float), ...]
+                asks=asks,  # ✅ 标准化格式：[(price_float, size_float), ...]
+                timestamp=exchange_ts or None
+            ),
+            source=self.SOURCE,
+            received_ns=received_ns,
+            exchange_ts=exchange_ts
+        )
+        self.event_bus.put_nowait(event)
+        if self.latency is not None:
+            self.latency.on_publish(exchange_ts, received_ns)
+
+    async def _resync(self, reason: str):
+        """
+        清空订单簿并请求重新订阅（获取新快照）
+
+        Args:
+            reason (str): 触发原因
+        """
+        self.book.reset()
+        self._stats['resyncs'] += 1
+        logger.warning(f"⚠️ [BookParser] {self.symbol} 订单簿失效（{reason}），重新订阅")
+
+        if self.on_resync is not None:
             try:
-                # 将原始数据转换为 Pydantic 模型
-                book_model = BookDataModel(
-                    asks=book.get('asks', []),
-                    bids=book.get('bids', []),
-                    timestamp=book.get('ts', '')
-                )
+                await self.on_resync()
             except Exception as e:
-                # Pydantic 验证失败，记录警告但继续处理
-                logger.warning(f"⚠️ [BookParser] Pydantic 验证失败: {e}, 原始数据: {book}")
-                return None
+                logger.error(f"重新订阅失败: {e}")
 
-            # 提取已验证的数据
-            bids = book_model.bids[:5]  # 只保留前5档
-            asks = book_model.asks[:5]  # 只保留前5档
-
-            # 转换为标准化格式 [[price, size], ...]
-            standardized_bids: List[Tuple[float, float]] = []
-            standardized_asks: List[Tuple[float, float]] = []
-
-            for level in bids:
-                standardized_bids.append((level.price, level.size))
-
-            for level in asks:
-                standardized_asks.append((level.price, level.size))
-
-            # 买一价（买单第一档的价格）
-            best_bid = standardized_bids[0][0] if standardized_bids else 0.0
-            # 卖一价（卖单第一档的价格）
-            best_ask = standardized_asks[0][0] if standardized_asks else 0.0
-
-            # 高频订单簿数据不记录详细日志
-            logger.debug(
-                f"Order Book: best_bid={best_bid:.6f}, best_ask={best_ask:.6f}, "
-                f"bids={len(standardized_bids)}, asks={len(standardized_asks)}"
-            )
-
-            # 推送 BOOK_EVENT 事件到事件总线（标准化后的数据）
-            if self.event_bus:
-                from ....core.event_types import Event, EventType
-
-                event = Event(
-                    type=EventType.BOOK_EVENT,
-                    data={
-                        'symbol': self.symbol,
-                        'best_bid': best_bid,
-                        'best_ask': best_ask,
-                        'bids': standardized_bids,  # ✅ 标准化格式：[(price_float, size_float), ...]
-                        'asks': standardized_asks   # ✅ 标准化格式：[(price_float, size_float), ...]
-                    },
-                    source="book_parser"
-                )
-                self.event_bus.put_nowait(event)
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取订单簿统计
 
-        except Exception as e:
-            logger.error(f"Book 处理异常: {e}, 原始数据: {data}", exc_info=True)
-            return None
+        Returns:
+            dict: 快照 / 更新 / 断档 / 校验失败计数，以及当前深度与 seqId
+        """
+        stats = dict(self._stats)
+        stats['depth'] = self.book.depth
+        stats['seq_id'] = self.book.seq_id
+        stats['synced'] = self.book.synced
+        return stats
@@ -5,6 +5,7 @@ Candle Parser - 处理 K线数据
 """
 
 import logging
+import time
 from typing import Optional, Dict, Any
 from ....core.event_types import Event, EventType
 
@@ -20,6 +21,8 @@ class CandleParser:
     - 推送 CANDLE_EVENT 事件到事件总线
     """
 
+    SOURCE = "candle_parser"
+
     def __init__(self, symbol: str, event_bus):
         """
         初始化 Candle Parser
@@ -30,17 +33,20 @@ class CandleParser:
         """
         self.symbol = symbol
         self.event_bus = event_bus
+        self.latency = None  # 🔥 [新增] 行情延迟直方图（FeedLatency，由网关设置；K 线 ts 为开盘时间，只统计本地延迟）
 
-    async def process(self, data: dict) -> Optional[Dict[str, Any]]:
+    async def process(self, data: dict, received_ns: int = 0) -> Optional[Dict[str, Any]]:
         """
         处理 Candle 数据
 
         Args:
             data (dict): 解析后的 JSON 数据，格式：{"arg": {"channel": "candles", "instId": "BTC-USDT-SWAP"}, "data": [...]}
+            received_ns (int): 收到 WebSocket 帧的时间（time.monotonic_ns），0 表示当前时间
 
         Returns:
             Optional[Dict[str, Any]]: 处理后的数据，返回 None 或标准化的 Candle 数据
         """
+        received_ns = received_ns or time.monotonic_ns()
         try:
             # 提取 candles 数据数组
             candles_data = data.get("data", [])
@@ -96,9 +102,12 @@ class CandleParser:
                             'close': close_price,
                             'volume': volume
                         },
-                        source="candle_parser"
+                        source=self.SOURCE,
+                        received_ns=received_ns
                     )
                     self.event_bus.put_nowait(event)
+                    if self.latency is not None:
+                        self.latency.on_publish(0, received_ns)
 
             logger.debug(f"已处理 {len(candles_data[:50])} 根 K 线数据")
 
@@ -5,8 +5,9 @@ Ticker Parser - 处理 Ticker 数据
 """
 
 import logging
+import time
 from typing import Optional, Dict, Any
-from ....core.event_types import Event, EventType
+from ....core.event_types import Event, EventType, TickEvent
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,8 @@ class TickerParser:
     - 推送 TICK 事件到事件总线
     """
 
+    SOURCE = "ticker_parser"
+
     def __init__(self, symbol: str, event_bus):
         """
         初始化 Ticker Parser
@@ -30,17 +33,20 @@ class TickerParser:
         """
         self.symbol = symbol
         self.event_bus = event_bus
+        self.latency = None  # 🔥 [新增] 行情延迟直方图（FeedLatency，由网关设置）
 
-    async def process(self, data: dict) -> Optional[Dict[str, Any]]:
+    async def process(self, data: dict, received_ns: int = 0) -> Optional[Dict[str, Any]]:
         """
         处理 Ticker 数据
 
         Args:
             data (dict): 解析后的 JSON 数据
+            received_ns (int): 收到 WebSocket 帧的时间（time.monotonic_ns），0 表示当前时间
 
         Returns:
             Optional[Dict[str, Any]]: 处理后的数据，返回 None 或标准化的 Ticker 数据
         """
+        received_ns = received_ns or time.monotonic_ns()
         try:
             # 提取 ticker 数据
             ticker_data = data.get("data", {})
@@ -70,19 +76,21 @@ class TickerParser:
 
             # 推送 TICK 事件到事件总线
             if self.event_bus:
-                from ....core.event_types import Event, EventType
-
                 event = Event(
                     type=EventType.TICK,
-                    data={
-                        'symbol': self.symbol,
-                        'price': price,
-                        'size': volume,
-                        'timestamp': timestamp
-                    },
-                    source="ticker_parser"
+                    data=TickEvent(
+                        symbol=self.symbol,
+                        price=price,
+                        size=volume,
+                        timestamp=timestamp
+                    ),
+                    source=self.SOURCE,
+                    received_ns=received_ns,
+                    exchange_ts=timestamp
                 )
                 self.event_bus.put_nowait(event)
+                if self.latency is not None:
+                    self.latency.on_publish(timestamp, received_ns)
 
             logger.debug(f"已处理 Ticker 数据: price={price:.4f}, volume={volume:.2f}")
 
@@ -3,41 +3,51 @@ Trade Parser - 处理交易数据逻辑
 
 负责解析 OKX 的 Trade WebSocket 消息，推送到事件总线。
 
-🔥 [防御性解析] 使用 Pydantic 模型验证数据格式
-- 即使 OKX API 增加额外字段，也不会崩溃
-- 自动类型转换和范围检查
-- 清晰的验证错误信息
+🔥 [优化] 快速解析（默认）：字符串字段直接转换为 float / int，只做结构和范围检查
+🔥 [优化] 聚合模式（aggregate=True 或 OKX_TRADE_AGGREGATION=true）：一帧推送只发布一个 TRADE_BATCH 事件，
+附带逐笔成交和预计算的买卖成交额、VWAP、最新价、笔数，事件总线每帧只唤醒一次处理器
+🔥 [防御性解析] 严格模式（strict=True 或 OKX_STRICT_PARSING=true）使用 Pydantic 模型验证，
+用于调试数据格式问题
 """
 
 import logging
 import os
+import time
 from typing import Optional, Dict, Any
-from ....core.event_types import Event, EventType
-from ..models import TradeModel
+from ....core.event_types import Event, EventType, TickEvent, TradeBatchEvent
+from ..models import TradeModel, strict_parsing_enabled
 
 logger = logging.getLogger(__name__)
 
 
 class TradeParser:
     """
-    Trade 数据解析器（Pydantic 版本）
+    Trade 数据解析器
 
     负责：
-    - 解析 Trade 数据（使用 Pydantic 验证）
+    - 解析 Trade 数据（快速解析，严格模式下使用 Pydantic 验证）
     - 计算 USDT 价值
-    - 推送 TICK 事件到事件总线
+    - 推送 TICK 事件（或聚合模式下的 TRADE_BATCH 事件）到事件总线
     """
 
-    def __init__(self, symbol: str, event_bus):
+    SOURCE = "trade_parser"
+
+    def __init__(self, symbol: str, event_bus, strict: Optional[bool] = None, aggregate: Optional[bool] = None):
         """
         初始化 Trade Parser
 
         Args:
             symbol (str): 交易对
             event_bus: 事件总线实例
+            strict (Optional[bool]): 是否使用 Pydantic 严格校验，None 时读取环境变量 OKX_STRICT_PARSING
+            aggregate (Optional[bool]): 是否每帧发布一个 TRADE_BATCH 事件，None 时读取环境变量 OKX_TRADE_AGGREGATION
         """
         self.symbol = symbol
         self.event_bus = event_bus
+        self.strict = strict_parsing_enabled() if strict is None else strict
+        if aggregate is None:
+            aggregate = os.getenv('OKX_TRADE_AGGREGATION', 'false').lower() == 'true'
+        self.aggregate = aggregate
 
         # 🔥 [修复] 从环境变量读取大单日志阈值
         # 默认值: 500000 USDT (BTC 约 0.56 BTC)
@@ -49,48 +59,66 @@ class TradeParser:
             logger.warning(f"配置读取失败，使用默认值 500000 USDT: {e}")
             self.big_order_threshold = 500000.0
 
-    async def process(self, data: dict) -> Optional[Dict[str, Any]]:
+        # 🔥 [新增] 行情延迟直方图（FeedLatency，由网关设置，None 表示不统计）
+        self.latency = None
+
+    async def process(self, data: dict, received_ns: int = 0) -> Optional[Dict[str, Any]]:
         """
-        处理 Trade 数据（Pydantic 验证版本）
+        处理 Trade 数据
 
         Args:
             data (dict): 解析后的 JSON 数据，格式：{"arg": {"channel": "trades", "instId": "BTC-USDT-SWAP"}, "data": [...]}
+            received_ns (int): 收到 WebSocket 帧的时间（time.monotonic_ns），0 表示当前时间
 
         Returns:
             Optional[Dict[str, Any]]: 处理后的数据，返回 None 或标准化的交易数据
         """
+        received_ns = received_ns or time.monotonic_ns()
+        latency = self.latency
         try:
             # 提取 trades 数据数组
             trades_data = data.get("data", [])
 
-            # 🔥 [调试] 打印前3条数据，诊断数据格式问题
-            if trades_data and len(trades_data) > 0:
+            # 🔥 [调试] 打印前3条数据，诊断数据格式问题（未开启 DEBUG 时不格式化）
+            if trades_data and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"接收到 Trade 数据样本: {trades_data[:3]}")
 
             if not isinstance(trades_data, list) or len(trades_data) == 0:
                 logger.debug(f"Trade 数据为空或格式不正确: {trades_data}")
                 return None
 
+            # 聚合模式下整帧只发布一个事件，不再限制笔数
+            batch = [] if self.aggregate else None
+            limit = len(trades_data) if self.aggregate else 50
+
             # 处理每笔交易
-            for trade_item in trades_data[:50]:  # 限制最多处理 50 笔交易（高频场景）
+            for trade_item in trades_data[:limit]:  # 逐笔模式最多处理 50 笔交易（高频场景）
                 try:
-                    # 🔥 [防御性解析] 尝试使用 Pydantic 验证字典格式
                     if isinstance(trade_item, dict):
-                        # 使用 Pydantic 模型验证
-                        trade_model = TradeModel(
-                            instId=trade_item.get('instId', self.symbol),
-                            tradeId=trade_item.get('tradeId', ''),
-                            price=float(trade_item.get('px', 0)),
-                            size=float(trade_item.get('sz', 0)),
-                            side=trade_item.get('side', ''),
-                            timestamp=int(trade_item.get('ts', 0))
-                        )
-
-                        # 验证通过，提取数据
-                        price = trade_model.price
-                        size = trade_model.size
-                        timestamp = trade_model.timestamp
-                        side = trade_model.side
+                        if self.strict:
+                            # 🔥 [防御性解析] 严格模式：使用 Pydantic 模型验证
+                            trade_model = TradeModel(
+                                instId=trade_item.get('instId', self.symbol),
+                                tradeId=trade_item.get('tradeId', ''),
+                                price=float(trade_item.get('px', 0)),
+                                size=float(trade_item.get('sz', 0)),
+                                side=trade_item.get('side', ''),
+                                timestamp=int(trade_item.get('ts', 0))
+                            )
+
+                            # 验证通过，提取数据
+                            price = trade_model.price
+                            size = trade_model.size
+                            timestamp = trade_model.timestamp
+                            side = trade_model.side
+                            trade_id = trade_model.tradeId
+                        else:
+                            # 🔥 [优化] 快速解析：缺字段 / 非数字时抛出异常，由下方统一记录并跳过
+                            price = float(trade_item['px'])
+                            size = float(trade_item['sz'])
+                            timestamp = int(trade_item['ts'])
+                            side = trade_item['side']
+                            trade_id = trade_item.get('tradeId', '')
 
                     # 解析数组格式（旧格式）
                     elif isinstance(trade_item, list) and len(trade_item) >= 4:
@@ -102,6 +130,7 @@ class TradeParser:
                             continue
                         timestamp = int(trade_item[3])  # ts
                         side = str(trade_item[4])  # side
+                        trade_id = None
                     else:
                         logger.debug(f"Trade 数据格式未知: {trade_item}")
                         continue
@@ -132,28 +161,50 @@ class TradeParser:
                     # 大单日志已移到策略中，只在满足所有开仓条件时才打印
                     # 这里只推送 TICK 事件
 
-                    # 推送 TICK 事件到事件总线（用于 Maker 策略的入场检测）
-                    if self.event_bus:
-                        event = Event(
+                    # 🔥 [优化] 有类型负载（__slots__），仍支持 data.get('price') 等 dict 访问
+                    tick = TickEvent(
+                        symbol=self.symbol,
+                        price=price,
+                        size=size,
+                        side=side,
+                        trade_id=trade_id,
+                        timestamp=timestamp,
+                        usdt_value=usdt_value
+                    )
+
+                    if batch is not None:
+                        batch.append(tick)
+                    elif self.event_bus:
+                        # 推送 TICK 事件到事件总线（用于 Maker 策略的入场检测）
+                        self.event_bus.put_nowait(Event(
                             type=EventType.TICK,
-                            data={
-                                'symbol': self.symbol,
-                                'price': price,
-                                'size': size,
-                                'side': side,
-                                'timestamp': timestamp,
-                                'usdt_value': usdt_value
-                            },
-                            source="trade_parser"
-                        )
-                        self.event_bus.put_nowait(event)
+                            data=tick,
+                            source=self.SOURCE,
+                            received_ns=received_ns,
+                            exchange_ts=timestamp
+                        ))
+                        if latency is not None:
+                            latency.on_publish(timestamp, received_ns)
 
                 except Exception as e:
-                    # 🔥 [防御性解析] Pydantic 验证失败时，记录警告但继续处理
+                    # 🔥 [防御性解析] 解析 / 验证失败时，记录警告但继续处理
                     logger.warning(f"⚠️ [TradeParser] 单笔交易解析失败: {e}, 数据: {trade_item}")
                     continue
 
-            logger.debug(f"已处理 {len(trades_data[:50])} 笔 Trade 数据")
+            # 🔥 [优化] 聚合模式：整帧一个 TRADE_BATCH 事件
+            if batch and self.event_bus:
+                self.event_bus.put_nowait(Event(
+                    type=EventType.TRADE_BATCH,
+                    data=TradeBatchEvent.from_ticks(self.symbol, batch),
+                    source=self.SOURCE,
+                    received_ns=received_ns,
+                    exchange_ts=batch[-1].timestamp
+                ))
+                if latency is not None:
+                    latency.on_publish(batch[-1].timestamp, received_ns)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"已处理 {len(trades_data[:limit])} 笔 Trade 数据")
 
         except Exception as e:
             logger.error(f"处理 Trade 数据异常: {e}", exc_info=True)
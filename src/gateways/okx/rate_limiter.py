@@ -0,0 +1,271 @@
+"""
+OKX REST 客户端限频 (Client-side Rate Limiter)
+
+按 OKX V5 的接口限频规则为每个接口（OKX 按交易对限频的接口再按 instId）维护令牌桶，
+请求先取令牌再发送，避免触发 50011 (Too Many Requests) 后订单丢失。
+
+令牌不足时请求按优先级排队：
+- EMERGENCY：紧急平仓、止损等保护性订单
+- CANCEL：撤单
+- ENTRY：新开仓、改单
+- QUERY：查询（余额、持仓、订单状态、K 线等）
+
+同一个令牌桶内高优先级请求先于低优先级请求得到令牌（同优先级先到先得），
+每个请求的排队时间按优先级和接口记录到直方图。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ...core.histogram import LatencyHistogram
+
+
+class RequestPriority(IntEnum):
+    """请求优先级（数值越小越先得到令牌）"""
+    EMERGENCY = 0
+    CANCEL = 1
+    ENTRY = 2
+    QUERY = 3
+
+
+class EndpointLimit(NamedTuple):
+    """接口限频规则：window 秒内最多 limit 个令牌"""
+    limit: int
+    window: float = 2.0
+    per_instrument: bool = False  # OKX 按 UserID + instId 限频
+    priority: RequestPriority = RequestPriority.QUERY  # 调用方未指定时的默认优先级
+
+
+# OKX V5 接口限频（批量接口按订单数计令牌）
+OKX_ENDPOINT_LIMITS: Dict[Tuple[str, str], EndpointLimit] = {
+    ('POST', '/api/v5/trade/order'): EndpointLimit(60, per_instrument=True, priority=RequestPriority.ENTRY),
+    ('POST', '/api/v5/trade/batch-orders'): EndpointLimit(300, priority=RequestPriority.ENTRY),
+    ('POST', '/api/v5/trade/cancel-order'): EndpointLimit(60, per_instrument=True, priority=RequestPriority.CANCEL),
+    ('POST', '/api/v5/trade/cancel-batch-orders'): EndpointLimit(300, priority=RequestPriority.CANCEL),
+    ('POST', '/api/v5/trade/amend-order'): EndpointLimit(60, per_instrument=True, priority=RequestPriority.ENTRY),
+    ('POST', '/api/v5/trade/amend-batch-orders'): EndpointLimit(300, priority=RequestPriority.ENTRY),
+    ('POST', '/api/v5/trade/cancel-algos'): EndpointLimit(20, priority=RequestPriority.CANCEL),
+    ('GET', '/api/v5/trade/orders-algo-pending'): EndpointLimit(20),
+    ('GET', '/api/v5/trade/order'): EndpointLimit(60, per_instrument=True),
+    ('GET', '/api/v5/trade/orders-pending'): EndpointLimit(60),
+    ('GET', '/api/v5/account/balance'): EndpointLimit(10),
+    ('GET', '/api/v5/account/positions'): EndpointLimit(10),
+    ('POST', '/api/v5/account/set-leverage'): EndpointLimit(20),
+    ('GET', '/api/v5/market/candles'): EndpointLimit(40),
+    ('GET', '/api/v5/public/instruments'): EndpointLimit(20),
+}
+
+# 未列出的接口
+DEFAULT_LIMIT = EndpointLimit(10)
+
+
+class TokenBucket:
+    """
+    令牌桶 + 优先级等待队列
+
+    令牌按 rate 持续补充，最多 capacity 个；令牌不足时请求进入按 (优先级, 到达顺序) 排序的堆，
+    由定时器在令牌足够时按顺序唤醒。
+    """
+
+    __slots__ = ('capacity', 'rate', 'tokens', '_updated', '_waiters', '_timer')
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate  # 每秒补充的令牌数
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, cost: float, priority: int, seq: int) -> bool:
+        """
+        取令牌（不足时排队）
+
+        Args:
+            cost (float): 令牌数（超过容量时按容量计）
+            priority (int): 优先级
+            seq (int): 到达顺序（同优先级先到先得）
+
+        Returns:
+            bool: 是否排队等待过
+        """
+        cost = min(cost, self.capacity)
+        self._refill()
+        if not self._waiters and self.tokens >= cost:
+            self.tokens -= cost
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, seq, cost, future))
+        self._drain()
+        await future
+        return True
+
+    def penalize(self):
+        """交易所返回限频错误：清空令牌（之后的请求等待令牌重新补充）"""
+        self._refill()
+        self.tokens = 0.0
+
+    def _drain(self):
+        """按优先级唤醒令牌足够的等待者，剩余等待者安排定时器"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._refill()
+        while self._waiters:
+            priority, seq, cost, future = self._waiters[0]
+            if future.done():  # 等待方已取消
+                heapq.heappop(self._waiters)
+                continue
+            if self.tokens < cost:
+                delay = (cost - self.tokens) / self.rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+                return
+            heapq.heappop(self._waiters)
+            self.tokens -= cost
+            future.set_result(None)
+
+    @property
+    def queued(self) -> int:
+        """排队中的请求数"""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+
+class RateLimiter:
+    """
+    OKX REST 限频器
+
+    Example:
+        >>> limiter = RateLimiter()
+        >>> await limiter.acquire('POST', '/api/v5/trade/cancel-order', inst_id='BTC-USDT-SWAP')
+        >>> limiter.get_stats()['wait_by_priority']['CANCEL']['p99_ms']
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[Tuple[str, str], EndpointLimit]] = None,
+        headroom: float = 0.9
+    ):
+        """
+        初始化限频器
+
+        Args:
+            limits: 接口限频规则（None 使用 OKX_ENDPOINT_LIMITS）
+            headroom (float): 实际使用的限额比例（留余量给时钟误差和其他客户端）
+        """
+        self.limits = OKX_ENDPOINT_LIMITS if limits is None else limits
+        self.headroom = headroom
+        self._buckets: Dict[Tuple[str, str, Optional[str]], TokenBucket] = {}
+        self._seq = itertools.count()
+
+        # 统计
+        self._wait_by_priority = {p: LatencyHistogram() for p in RequestPriority}
+        self._wait_by_endpoint: Dict[str, LatencyHistogram] = {}
+        self._requests = 0
+        self._queued = 0
+        self._rate_limited = 0
+
+    def limit_for(self, method: str, endpoint: str) -> EndpointLimit:
+        """
+        获取接口的限频规则
+
+        Args:
+            method (str): GET / POST
+            endpoint (str): 接口路径（不含查询参数）
+
+        Returns:
+            EndpointLimit: 限频规则
+        """
+        return self.limits.get((method, endpoint), DEFAULT_LIMIT)
+
+    def _bucket(self, method: str, endpoint: str, inst_id: Optional[str]) -> TokenBucket:
+        limit = self.limit_for(method, endpoint)
+        key = (method, endpoint, inst_id if limit.per_instrument else None)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity = max(limit.limit * self.headroom, 1.0)
+            bucket = self._buckets[key] = TokenBucket(capacity, capacity / limit.window)
+        return bucket
+
+    async def acquire(
+        self,
+        method: str,
+        endpoint: str,
+        inst_id: Optional[str] = None,
+        cost: float = 1,
+        priority: Optional[RequestPriority] = None
+    ) -> float:
+        """
+        发送请求前取令牌（令牌不足时按优先级排队）
+
+        Args:
+            method (str): GET / POST
+            endpoint (str): 接口路径
+            inst_id (Optional[str]): 交易对（按 instId 限频的接口使用）
+            cost (float): 令牌数（批量接口为订单数）
+            priority (Optional[RequestPriority]): 优先级（None 使用接口默认优先级）
+
+        Returns:
+            float: 排队时间（秒）
+        """
+        if priority is None:
+            priority = self.limit_for(method, endpoint).priority
+        bucket = self._bucket(method, endpoint, inst_id)
+
+        start_ns = time.monotonic_ns()
+        queued = await bucket.acquire(cost, priority, next(self._seq))
+        waited_ns = time.monotonic_ns() - start_ns
+
+        self._requests += 1
+        if queued:
+            self._queued += 1
+        self._wait_by_priority[priority].record(waited_ns)
+        histogram = self._wait_by_endpoint.get(endpoint)
+        if histogram is None:
+            histogram = self._wait_by_endpoint[endpoint] = LatencyHistogram()
+        histogram.record(waited_ns)
+        return waited_ns / 1e9
+
+    def on_rate_limited(self, method: str, endpoint: str, inst_id: Optional[str] = None):
+        """
+        交易所仍返回限频错误（50011 / HTTP 429）：清空该接口令牌
+
+        Args:
+            method (str): GET / POST
+            endpoint (str): 接口路径
+            inst_id (Optional[str]): 交易对
+        """
+        self._rate_limited += 1
+        self._bucket(method, endpoint, inst_id).penalize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取限频统计
+
+        Returns:
+            Dict[str, Any]: 请求数、排队数、交易所限频次数、按优先级 / 接口的排队时间（毫秒）
+        """
+        return {
+            'requests': self._requests,
+            'queued': self._queued,
+            'queued_now': sum(bucket.queued for bucket in self._buckets.values()),
+            'rate_limited': self._rate_limited,
+            'wait_by_priority': {
+                priority.name: histogram.snapshot()
+                for priority, histogram in self._wait_by_priority.items() if histogram.count
+            },
+            'wait_by_endpoint': {
+                endpoint: histogram.snapshot()
+                for endpoint, histogram in self._wait_by_endpoint.items() if histogram.count
+            }
+        }
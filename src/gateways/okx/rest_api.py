@@ -19,12 +19,16 @@ OKX REST API 网关 (Unified Gateway)
 
 import json
 import logging
-import time
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout, ClientError
 from .auth import OkxSigner
+from .order_params import (
+    CANCEL_DONE_CODES, ORDER_NOT_FOUND_CODE, STOP_ORDER_TYPES, build_amend_body, build_order_body, order_ack_event,
+    tolerate_cancel_error
+)
+from .rate_limiter import RateLimiter, RequestPriority
 from ..base_gateway import RestGateway
 from ...core.event_types import Event, EventType
 
@@ -49,6 +53,11 @@ class OkxRestGateway(RestGateway):
         ...     print(balance)
     """
 
+    # 🔥 [新增] 批量下单 / 撤单 / 改单接口单次请求最多 20 个订单
+    BATCH_LIMIT = 20
+    # 撤销策略委托（cancel-algos）单次请求最多 10 个
+    ALGO_CANCEL_LIMIT = 10
+
     def __init__(
         self,
         api_key: str,
@@ -57,7 +66,9 @@ class OkxRestGateway(RestGateway):
         base_url: str = "https://www.okx.com",
         use_demo: bool = False,
         timeout: int = 10,
-        event_bus=None
+        event_bus=None,
+        rate_limit: bool = True,
+        rate_limit_retries: int = 2
     ):
         """
         初始化 OKX REST 网关
@@ -70,6 +81,8 @@ class OkxRestGateway(RestGateway):
             use_demo (bool): 是否使用模拟交易
             timeout (int): 请求超时时间（秒）
             event_bus: 事件总线实例
+            rate_limit (bool): 启用客户端限频（按接口 / instId 令牌桶，按优先级排队）
+            rate_limit_retries (int): 交易所仍返回限频错误时的重试次数
         """
         super().__init__(
             name="okx_rest",
@@ -87,6 +100,10 @@ class OkxRestGateway(RestGateway):
         self.session: Optional[ClientSession] = None
         self._closed = False
 
+        # 🔥 [新增] 客户端限频
+        self._rate_limiter: Optional[RateLimiter] = RateLimiter() if rate_limit else None
+        self.rate_limit_retries = rate_limit_retries
+
         logger.info(
             f"OkxRestGateway 初始化: base_url={self.base_url}, "
             f"use_demo={use_demo}, timeout={timeout}s"
@@ -211,17 +228,24 @@ class OkxRestGateway(RestGateway):
         self,
         method: str,
         endpoint: str,
-        data: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None
+        data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        batch: bool = False,
+        priority: Optional[RequestPriority] = None
     ) -> Dict[str, Any]:
         """
         发送 HTTP 请求（内部方法）
 
+        启用限频时先取令牌（令牌不足按优先级排队），取到令牌后再签名发送；
+        交易所仍返回限频错误（50011 / HTTP 429）时清空该接口令牌并重新排队，最多重试 rate_limit_retries 次。
+
         Args:
             method (str): 请求方法（GET/POST）
             endpoint (str): API 端点
-            data (dict): POST 数据
+            data (dict | list): POST 数据（批量接口为订单列表）
             params (dict): GET 参数
+            batch (bool): 批量接口（部分失败时返回逐单结果，不抛异常）
+            priority (Optional[RequestPriority]): 限频排队优先级（None 使用接口默认优先级）
 
         Returns:
             dict: API 响应
@@ -229,8 +253,6 @@ class OkxRestGateway(RestGateway):
         if self._closed:
             raise RuntimeError("ClientSession 已关闭")
 
-        session = await self._get_session()
-
         # 构造请求路径
         request_path = endpoint
         if params:
@@ -240,16 +262,57 @@ class OkxRestGateway(RestGateway):
                 query_string = urlencode(clean_params, safe=',')
                 request_path = f"{endpoint}?{query_string}"
 
-        # 生成请求头
         body_str = ""
         if data:
             body_str = json.dumps(data, separators=(',', ':'))
+
+        if self._rate_limiter is None:
+            return await self._send_request(method, request_path, body_str, batch)
+
+        # 限频键：按 instId 限频的接口取请求中的 instId；批量接口按订单数计令牌
+        inst_id = (data if isinstance(data, dict) else params or {}).get('instId')
+        cost = len(data) if isinstance(data, list) else 1
+
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire(method, endpoint, inst_id, cost, priority)
+            try:
+                return await self._send_request(method, request_path, body_str, batch)
+            except (ValueError, ClientError) as e:
+                if attempt >= self.rate_limit_retries or not self._is_rate_limited(e):
+                    raise
+                attempt += 1
+                self._rate_limiter.on_rate_limited(method, endpoint, inst_id)
+                logger.warning(f"⏳ 触发交易所限频，重新排队 ({attempt}/{self.rate_limit_retries}): {method} {endpoint}")
+
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        """交易所限频错误（50011 Too Many Requests / HTTP 429）"""
+        message = str(error)
+        return 'API 错误: 50011' in message or 'HTTP 错误 429' in message
+
+    async def _send_request(self, method: str, request_path: str, body_str: str, batch: bool) -> Dict[str, Any]:
+        """
+        签名并发送一次 HTTP 请求
+
+        Args:
+            method (str): 请求方法（GET/POST）
+            request_path (str): 请求路径（含查询参数）
+            body_str (str): 请求体
+            batch (bool): 批量接口
+
+        Returns:
+            dict: API 响应
+        """
+        session = await self._get_session()
+
+        # 生成请求头（取到令牌之后再签名，排队不会让时间戳过期）
         headers = self._get_headers(method, request_path, body_str)
 
         try:
             if method == "GET":
                 async with session.get(request_path, headers=headers, timeout=self.timeout) as response:
-                    return await self._parse_response(response)
+                    return await self._parse_response(response, batch)
             elif method == "POST":
                 async with session.post(
                     request_path,
@@ -257,7 +320,7 @@ class OkxRestGateway(RestGateway):
                     headers=headers,
                     timeout=self.timeout
                 ) as response:
-                    return await self._parse_response(response)
+                    return await self._parse_response(response, batch)
             else:
                 raise ValueError(f"不支持的 HTTP 方法: {method}")
 
@@ -268,12 +331,13 @@ class OkxRestGateway(RestGateway):
             logger.error(f"未知错误: {e}")
             raise
 
-    async def _parse_response(self, response) -> Dict[str, Any]:
+    async def _parse_response(self, response, batch: bool = False) -> Dict[str, Any]:
         """
         解析 API 响应
 
         Args:
             response: aiohttp 响应对象
+            batch (bool): 批量接口（code=1 全部失败 / code=2 部分失败时返回逐单结果）
 
         Returns:
             dict: 解析后的数据
@@ -294,6 +358,13 @@ class OkxRestGateway(RestGateway):
             logger.error(error_msg)
             raise ClientError(error_msg)
 
+        if batch and response_data.get('code') in ('1', '2') and response_data.get('data'):
+            logger.warning(
+                f"⚠️ 批量请求部分失败: code={response_data.get('code')}, "
+                f"msg={response_data.get('msg')}"
+            )
+            return response_data
+
         if response_data.get('code') != '0':
             error_code = response_data.get('code')
             error_msg = response_data.get('msg') or 'Unknown error'
@@ -401,102 +472,22 @@ class OkxRestGateway(RestGateway):
             dict: 订单响应
         """
         try:
-            # 构造订单数据
-            # 1. 确保 ordType 小写（OKX V5 API 需要 market/limit）
-            ord_type_lower = order_type.lower() if order_type else 'market'
-
-            # 2. 确保 sz 是整数（SWAP/FUTURES 合约必须整数）
-            size_int = int(size) if size is not None else 1
-            if size_int < 1:
-                logger.warning(f"⚠️  size {size} 小于 1，强制设为 1")
-                size_int = 1
-
-            # 确保所有数值参数都是字符串（OKX API 要求）
-            size_str = str(size_int)
-
-            body = {
-                'instId': symbol,
-                'tdMode': 'cross',  # ✅ 必须有
-                'side': side,
-                'sz': size_str  # ✅ 必须是字符串
-            }
-
-            # ✅ 处理止损单（stop_market / stop_limit）
-            if order_type in ['stop_market', 'stop_limit']:
-                # OKX V5 使用 conditional 订单类型实现止损
-                body['ordType'] = 'conditional'
-                body['slTriggerType'] = 'last'  # 使用最新价触发
-                body['slOrdPx'] = str(price) if price else ''  # ✅ 必须是字符串
-
-                # ✅ 条件单必须指定 posSide（持仓方向）
-                # side='sell' + 止损 → 多头止损 → posSide='long'
-                # side='buy' + 止损 → 空头止损 → posSide='short'
-                if side == 'sell':
-                    body['posSide'] = 'long'  # 多头止损（卖出平仓）
-                else:
-                    body['posSide'] = 'short'  # 空头止损（买入平仓）
-
-                if order_type == 'stop_limit':
-                    # 止损限价单：设置限价价格
-                    tp_price = kwargs.get('tp_price')
-                    if tp_price:
-                        body['tpOrdPx'] = str(tp_price)  # ✅ 必须是字符串
-
-                logger.info(f"🛡️  止损单: slOrdPx={price}, posSide={body['posSide']}, ordType=conditional")
-            else:
-                # 普通订单（market/limit/ioc）
-                body['ordType'] = ord_type_lower
-
-                # limit/ioc 订单需要价格
-                if order_type in ['limit', 'ioc'] and price:
-                    # ✅ 价格格式化：去掉多余的小数位
-                    if price:
-                        # 方法1：使用 f-string 限制小数位
-                        # 对于 SOL，保留 2 位小数通常足够
-                        price_str = f"{price:.4f}"
-                        # 去掉末尾的 0 和小数点
-                        price_str = price_str.rstrip('0').rstrip('.')
-                        if not price_str:
-                            price_str = '0'
-                        body['px'] = price_str
-                        logger.debug(f"价格格式化: {price} -> {price_str}")
-
-            # 生成 Client Order ID (clOrdId) 用于标识策略来源
-            # clOrdId 限制：1-32 位字符，必须是纯字母数字
-            if 'clOrdId' not in body:
-                strategy_id = kwargs.get('strategy_id', 'manual')
-                # 取策略 ID 前缀（最多 4 位）
-                prefix = strategy_id[:4].lower()
-                # 加上时间戳后缀（确保唯一性）
-                ts_suffix = str(int(time.time() * 1000))[-8:]
-                # ✅ 去掉下划线，确保是纯字母数字
-                body['clOrdId'] = f"{prefix}{ts_suffix}"
-                logger.debug(f"🏷️  生成 clOrdId: {body['clOrdId']} (strategy_id={strategy_id})")
-
-            # 添加额外参数，但只保留 OKX API 支持的字段
-            # OKX V5 API 支持的下单字段白名单
-            okx_order_fields = {
-                'instId', 'tdMode', 'side', 'ordType', 'sz', 'px',
-                'reduceOnly', 'clOrdId', 'ccy'
-            }
-
-            # 过滤：只保留 OKX API 支持的字段
-            # 注意：不包含 'tag' 和 'strategy_id'
-            for key in list(kwargs.keys()):
-                if key in okx_order_fields:
-                    body[key] = kwargs[key]
-
-            # ✅ 只对普通订单移除 posSide
-            # 条件单必须有 posSide（在上面已经设置）
-            if order_type not in ['stop_market', 'stop_limit']:
-                body.pop('posSide', None)
+            # 构造订单数据（与私有 WebSocket 下单共用）
+            body = build_order_body(symbol, side, order_type, size, price, **kwargs)
 
             logger.info(f"下单: {body}")
 
+            # 紧急平仓和止损等保护性订单优先于新开仓取得限频令牌
+            protective = (
+                kwargs.get('is_emergency_close') or kwargs.get('reduce_only') or kwargs.get('reduceOnly')
+                or order_type in STOP_ORDER_TYPES
+            )
+
             response = await self._request(
                 "POST",
                 "/api/v5/trade/order",
-                data=body
+                data=body,
+                priority=RequestPriority.EMERGENCY if protective else None
             )
 
             data_list = response.get('data', [])
@@ -505,20 +496,7 @@ class OkxRestGateway(RestGateway):
 
                 # 发布订单更新事件
                 if self._event_bus:
-                    event = Event(
-                        type=EventType.ORDER_UPDATE,
-                        data={
-                            'order_id': order_data.get('ordId'),
-                            'symbol': symbol,
-                            'side': side,
-                            'order_type': order_type,
-                            'price': float(price) if price else 0.0,
-                            'size': float(size),
-                            'status': 'live',
-                            'raw': order_data
-                        },
-                        source="okx_rest"
-                    )
+                    event = order_ack_event(order_data, symbol, side, order_type, size, price, "okx_rest")
                     await self.publish_event(event, priority=5)  # ORDER_UPDATE 优先级
 
                 return order_data
@@ -572,28 +550,10 @@ class OkxRestGateway(RestGateway):
             return {}
 
         except ValueError as e:
-            # 🔥 修复：增强撤单容错处理
-            # 捕获特定的 API 错误码
-            error_msg = str(e)
-
-            # 错误码 1: All operations failed（所有操作失败）
-            # 错误码 51402: Order does not exist（订单不存在）
-            # 这些错误表示订单可能已经成交或不存在，可以视为撤单成功
-            if '1' in error_msg and 'All operations failed' in error_msg:
-                logger.warning(
-                    f"⚠️ 撤单返回 'All operations failed'，订单可能已成交或不存在。"
-                    f"order_id={order_id}, symbol={symbol}"
-                )
-                # 返回成功，避免策略因为撤单失败而卡死
-                return {'ordId': order_id, 'sCode': '1', 'sMsg': 'Order may be filled or not exist'}
-
-            if '51402' in error_msg:
-                logger.warning(
-                    f"⚠️ 订单不存在 (51402)，可能已成交。"
-                    f"order_id={order_id}, symbol={symbol}"
-                )
-                # 返回成功，避免策略因为撤单失败而卡死
-                return {'ordId': order_id, 'sCode': '51402', 'sMsg': 'Order does not exist'}
+            # 🔥 修复：增强撤单容错处理（订单已成交或不存在视为撤单成功）
+            tolerated = tolerate_cancel_error(str(e), order_id, symbol)
+            if tolerated is not None:
+                return tolerated
 
             # 其他错误继续抛出
             logger.error(f"撤单失败: {e}")
@@ -602,6 +562,230 @@ class OkxRestGateway(RestGateway):
             logger.error(f"撤单失败: {e}")
             raise
 
+    async def amend_order(
+        self,
+        order_id: str,
+        symbol: str,
+        new_size: Optional[float] = None,
+        new_price: Optional[float] = None,
+        new_stop_loss_price: Optional[float] = None,
+        attach_algo_cl_ord_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        🔥 [新增] 改单（修改未成交订单的价格 / 数量）
+
+        改单结果通过私有 WebSocket orders 频道推送（amendResult），这里不发布事件。
+
+        Args:
+            order_id (str): 订单 ID
+            symbol (str): 交易对
+            new_size (Optional[float]): 新数量
+            new_price (Optional[float]): 新价格
+            new_stop_loss_price (Optional[float]): 附带止损的新触发价
+            attach_algo_cl_ord_id (Optional[str]): 下单时附带止损的 attachAlgoClOrdId
+
+        Returns:
+            dict: 改单响应（ordId / clOrdId / reqId / sCode / sMsg）
+        """
+        try:
+            body = build_amend_body(order_id, symbol, new_size, new_price, new_stop_loss_price, attach_algo_cl_ord_id)
+
+            response = await self._request(
+                "POST",
+                "/api/v5/trade/amend-order",
+                data=body
+            )
+
+            data_list = response.get('data', [])
+            return data_list[0] if data_list else {}
+
+        except Exception as e:
+            logger.error(f"改单失败: {e}")
+            raise
+
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        获取客户端限频统计（排队时间按优先级 / 接口）
+
+        Returns:
+            dict: 限频统计，未启用限频时为空
+        """
+        return self._rate_limiter.get_stats() if self._rate_limiter else {}
+
+    # ========== 🔥 [新增] 批量接口 ==========
+
+    async def _batch_request(
+        self,
+        endpoint: str,
+        bodies: List[Dict[str, Any]],
+        key: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        按 BATCH_LIMIT（或 limit）分块并发发送批量请求，逐单映射结果
+
+        结果按 key（clOrdId / ordId）与请求对应，顺序与 bodies 一致；
+        整块请求失败（网络错误 / 限频）时，该块每个订单返回 sCode='-1'。
+
+        Args:
+            endpoint (str): 批量接口
+            bodies (list): 请求体列表
+            key (str): 结果匹配字段
+            limit (Optional[int]): 每块数量（None 使用 BATCH_LIMIT）
+
+        Returns:
+            list: 逐单结果（ordId / clOrdId / sCode / sMsg）
+        """
+        limit = limit or self.BATCH_LIMIT
+        chunks = [bodies[i:i + limit] for i in range(0, len(bodies), limit)]
+        responses = await asyncio.gather(
+            *(self._request("POST", endpoint, data=chunk, batch=True) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        results = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, BaseException):
+                logger.error(f"批量请求失败 ({endpoint}, {len(chunk)} 个订单): {response}")
+                results.extend({key: body.get(key, ''), 'sCode': '-1', 'sMsg': str(response)} for body in chunk)
+                continue
+
+            by_key = {item.get(key): item for item in response.get('data', [])}
+            for body in chunk:
+                results.append(by_key.get(body.get(key)) or {
+                    key: body.get(key, ''), 'sCode': '-1', 'sMsg': 'Missing from batch response'
+                })
+        return results
+
+    async def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量下单（/api/v5/trade/batch-orders，自动按 20 个分块）
+
+        Args:
+            orders (list): 订单列表，每项为 place_order 的参数
+                {'symbol', 'side', 'order_type', 'size', 'price', ...其他参数}
+
+        Returns:
+            list: 逐单结果（与 orders 顺序一致），sCode='0' 表示成功
+        """
+        bodies = [
+            build_order_body(o['symbol'], o['side'], o['order_type'], o['size'], o.get('price'),
+                             **{k: v for k, v in o.items() if k not in ('symbol', 'side', 'order_type', 'size', 'price')})
+            for o in orders
+        ]
+        logger.info(f"批量下单: {len(bodies)} 个订单")
+
+        results = await self._batch_request("/api/v5/trade/batch-orders", bodies, 'clOrdId')
+
+        if self._event_bus:
+            for order, result in zip(orders, results):
+                if result.get('sCode') == '0':
+                    event = order_ack_event(result, order['symbol'], order['side'], order['order_type'],
+                                            order['size'], order.get('price'), "okx_rest")
+                    await self.publish_event(event, priority=5)  # ORDER_UPDATE 优先级
+        return results
+
+    async def cancel_batch_orders(self, orders: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        批量撤单（/api/v5/trade/cancel-batch-orders，自动按 20 个分块）
+
+        订单已成交 / 已撤销 / 不存在（CANCEL_DONE_CODES）视为撤单成功，与 cancel_order 一致。
+
+        Args:
+            orders (list): [{'order_id': ..., 'symbol': ...}, ...]
+
+        Returns:
+            list: 逐单结果（与 orders 顺序一致），sCode='0' 或 CANCEL_DONE_CODES 表示订单已不在挂单中
+        """
+        bodies = [{'instId': o['symbol'], 'ordId': o['order_id']} for o in orders]
+        logger.info(f"批量撤单: {len(bodies)} 个订单")
+
+        results = await self._batch_request("/api/v5/trade/cancel-batch-orders", bodies, 'ordId')
+
+        for order, result in zip(orders, results):
+            s_code = result.get('sCode')
+            if s_code in CANCEL_DONE_CODES:
+                logger.warning(f"⚠️ 订单已结束 ({s_code})，视为撤单成功: order_id={order['order_id']}")
+            elif s_code == '0' and self._event_bus:
+                event = Event(
+                    type=EventType.ORDER_CANCELLED,
+                    data={
+                        'order_id': order['order_id'],
+                        'symbol': order['symbol'],
+                        'raw': result
+                    },
+                    source="okx_rest"
+                )
+                await self.publish_event(event, priority=5)  # ORDER_CANCELLED 优先级
+        return results
+
+    async def amend_batch_orders(self, amends: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量改单（/api/v5/trade/amend-batch-orders，自动按 20 个分块）
+
+        Args:
+            amends (list): [{'order_id', 'symbol', 'new_size', 'new_price'}, ...]（new_size / new_price 可省略）
+
+        Returns:
+            list: 逐单结果（与 amends 顺序一致），sCode='0' 表示交易所已受理
+        """
+        bodies = [
+            build_amend_body(a['order_id'], a['symbol'], a.get('new_size'), a.get('new_price'))
+            for a in amends
+        ]
+        logger.info(f"批量改单: {len(bodies)} 个订单")
+        return await self._batch_request("/api/v5/trade/amend-batch-orders", bodies, 'ordId')
+
+    async def cancel_all_orders(self, symbol: Optional[str] = None) -> int:
+        """
+        撤销交易所上的所有挂单（熔断时由 Guardian 调用）
+
+        Args:
+            symbol (Optional[str]): 交易对（None 表示所有交易对）
+
+        Returns:
+            int: 已不在挂单中的订单数量
+        """
+        active_orders = await self.fetch_active_orders(symbol)
+        if not active_orders:
+            return 0
+
+        results = await self.cancel_batch_orders([
+            {'order_id': o['ordId'], 'symbol': o['instId']} for o in active_orders
+        ])
+        return sum(1 for r in results if r.get('sCode') == '0' or r.get('sCode') in CANCEL_DONE_CODES)
+
+    async def fetch_pending_algo_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        🔥 [新增] 查询未触发的止损 / 止盈策略委托（包括开仓单附带止损成交后生成的委托）
+
+        Args:
+            symbol (Optional[str]): 交易对（None 表示所有交易对）
+
+        Returns:
+            list: 策略委托列表（algoId / algoClOrdId / instId / ordType / slTriggerPx 等）
+        """
+        params = {'ordType': 'conditional,oco'}
+        if symbol:
+            params['instId'] = symbol
+
+        response = await self._request("GET", "/api/v5/trade/orders-algo-pending", params=params)
+        return response.get('data', [])
+
+    async def cancel_algo_orders(self, algos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        🔥 [新增] 撤销策略委托（/api/v5/trade/cancel-algos，自动按 10 个分块）
+
+        Args:
+            algos (list): [{'algo_id', 'symbol'}, ...]
+
+        Returns:
+            list: 逐单结果（与 algos 顺序一致），sCode='0' 表示成功
+        """
+        bodies = [{'instId': a['symbol'], 'algoId': a['algo_id']} for a in algos]
+        logger.info(f"撤销策略委托: {len(bodies)} 个")
+        return await self._batch_request("/api/v5/trade/cancel-algos", bodies, 'algoId', limit=self.ALGO_CANCEL_LIMIT)
+
     async def get_order_status(self, order_id: str, symbol: str) -> Dict[str, Any]:
         """
         查询订单状态
@@ -629,6 +813,37 @@ class OkxRestGateway(RestGateway):
             logger.error(f"查询订单状态失败: {e}")
             return {}
 
+    async def get_order_by_cl_ord_id(self, symbol: str, cl_ord_id: str) -> Optional[Dict[str, Any]]:
+        """
+        🔥 [新增] 按 clOrdId 查询订单（WebSocket 下单未确认时判断订单是否已到达交易所）
+
+        与 get_order_status 不同，查询失败时抛出异常而不是返回空结果：
+        调用方需要区分"订单不存在"和"状态未知"。
+
+        Args:
+            symbol (str): 交易对
+            cl_ord_id (str): Client Order ID
+
+        Returns:
+            Optional[dict]: 订单数据（ordId / state / accFillSz 等），订单不存在时返回 None
+
+        Raises:
+            ValueError / ClientError: 查询失败
+        """
+        try:
+            response = await self._request(
+                "GET",
+                "/api/v5/trade/order",
+                params={'instId': symbol, 'clOrdId': cl_ord_id}
+            )
+        except ValueError as e:
+            if f"API 错误: {ORDER_NOT_FOUND_CODE}" in str(e):
+                return None
+            raise
+
+        data_list = response.get('data', [])
+        return data_list[0] if data_list else None
+
     async def fetch_active_orders(self, symbol: str = None) -> list:
         """
         🔥 [新增] 查询活动订单（原子对账）
@@ -25,6 +25,8 @@ from datetime import datetime
 import aiohttp
 from aiohttp import ClientSession, WSMessage, ClientError, ClientWebSocketResponse
 
+from .ws_codec import get_decoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +41,7 @@ class WsBaseGateway:
     - 资源清理
     """
 
-    def __init__(self, name: str, ws_url: Optional[str] = None, event_bus=None):
+    def __init__(self, name: str, ws_url: Optional[str] = None, event_bus=None, json_decoder: Optional[str] = None):
         """
         初始化 WebSocket 基类
 
@@ -47,6 +49,7 @@ class WsBaseGateway:
             name (str): 网关名称
             ws_url (str): WebSocket URL
             event_bus: 事件总线（可选）
+            json_decoder (Optional[str]): JSON 解码后端 auto/orjson/json，None 时读取环境变量 OKX_JSON_DECODER
         """
         self.name = name
         self._ws_url = ws_url
@@ -77,14 +80,25 @@ class WsBaseGateway:
         self._max_backoff = 60.0  # 最大退避时间（秒）
 
         # 心跳管理
-        self._last_heartbeat = 0
         self._heartbeat_interval = 20  # 心跳间隔（秒）
         self._heartbeat_task = None
 
         # 🔥 新增：看门狗（Watchdog）- 防止假死
-        self._last_msg_time = 0  # 最后收到消息的时间（包括 ping、pong 和数据推送）
+        self._last_msg_ns = 0  # 最后收到消息的时间（time.monotonic_ns，包括 pong 和数据推送，按唤醒更新）
         self._watchdog_timeout = 60  # 🔥 [不坏金身] 看门狗超时时间提高到 60 秒（更宽松）
 
+        # 🔥 [新增] 接收循环统计（用于连接池分片的容量评估）
+        self._rx_messages = 0     # 收到的帧数
+        self._rx_bytes = 0        # 收到的字节数
+        self._rx_busy_ns = 0      # 处理帧的累计耗时（接收循环不在读 socket 的时间）
+        self._rx_max_busy_ns = 0  # 单次唤醒最大处理耗时
+        self._rx_wakeups = 0      # 接收循环唤醒次数（一次唤醒处理全部已缓冲的帧）
+        self._rx_received_ns = 0  # 当前帧的接收时间（time.monotonic_ns，子类 _on_message 读取）
+
+        # 🔥 [新增] 可插拔 JSON 解码（子类的 _on_message 使用 self._loads）
+        self._json_decoder, self._loads = get_decoder(json_decoder)
+        self._sniff_discarded = 0  # 预判频道后未解码直接丢弃的帧数
+
         self._logger.info(f"WebSocket 基类初始化: {name}, url={ws_url}")
 
     def is_connected(self) -> bool:
@@ -121,16 +135,15 @@ class WsBaseGateway:
                     self._session = ClientSession()
 
                 # 建立连接（aiohttp）
-                self._ws = await self._session.ws_connect(
-                    self._ws_url,
-                    receive_timeout=30.0
-                )
+                # 🔥 [优化] 不设置 receive_timeout：否则 aiohttp 每次 receive() 都创建超时上下文，
+                # 连接假死由心跳任务的看门狗检测
+                self._ws = await self._session.ws_connect(self._ws_url)
 
                 self._connected = True
                 self._running = True
 
                 # 🔥 修复：初始化看门狗时间戳（连接成功时立即更新）
-                self._last_msg_time = time.time()
+                self._last_msg_ns = time.monotonic_ns()
 
                 # 🔥 关键修复：在连接成功后，启动消息接收任务
                 self._receive_task = asyncio.create_task(self._message_loop())
@@ -266,19 +279,24 @@ class WsBaseGateway:
 
         核心特性：
         - 持续接收 WebSocket 消息，直到系统主动关闭
-        - 更新看门狗时间戳（每次收到消息都更新）
+        - 🔥 [优化] receive() 不再包一层 wait_for（每帧创建 / 取消一个定时器），
+          连接存活完全由心跳任务的看门狗判断
+        - 🔥 [优化] 一次唤醒处理完已缓冲的全部帧：时钟读取和看门狗时间戳按唤醒更新，而不是按帧
         - 拦截心跳响应 "pong"，避免 JSON 解析错误
         - 任何异常都触发重连，但接收循环永不停止
         - 无限递归：使用 while True + 异常捕获 + 触发重连
 
         修复内容：
         - 连接错误时自动触发重连，而不是停止循环
-        - 超时错误时也触发重连
         - 任何未捕获异常都记录完整堆栈并触发重连
         - 消息接收循环永不停止，除非系统主动关闭
         """
         self._logger.info("📨 [消息接收循环] 已启动（不坏金身模式）")
 
+        monotonic_ns = time.monotonic_ns
+        TEXT = aiohttp.WSMsgType.TEXT
+        BINARY = aiohttp.WSMsgType.BINARY
+
         # 🔥 无限递归消息接收循环（永不停止）
         while True:
             try:
@@ -288,41 +306,51 @@ class WsBaseGateway:
                     break
 
                 # 检查 WebSocket 是否有效
-                if self._ws is None or self._ws.closed:
+                ws = self._ws
+                if ws is None or ws.closed:
                     self._logger.warning("📨 [消息接收循环] WebSocket 未连接，等待重连...")
                     await asyncio.sleep(5)
                     continue
 
-                # 🔥 接收消息（带超时）
-                msg = await asyncio.wait_for(
-                    self._ws.receive(),
-                    timeout=30.0
-                )
-
-                # 🔥 更新看门狗时间戳（每次收到消息都更新）
-                # 包括 ping、pong 和数据推送
-                self._last_msg_time = time.time()
-
-                # 更新最后心跳时间（兼容旧代码）
-                self._last_heartbeat = time.time()
-
-                # 🔥 拦截心跳响应 "pong"
-                # OKX 服务器回复的心跳响应是纯文本字符串 "pong"，而不是 JSON 格式
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    data = msg.data
-                    if data == 'pong':
-                        self._logger.debug("💓 [心跳响应] 收到 pong")
-                        continue  # 直接跳过，不进行 JSON 解析和子类处理
-
-                # 处理消息
-                await self._on_message(msg)
-
-            except asyncio.TimeoutError:
-                self._logger.warning("📨 [超时] 接收消息超时 30 秒，触发重连")
-                # 超时触发重连，但消息接收循环继续运行
-                await self.disconnect()
-                await asyncio.sleep(5)
-                continue
+                # 🔥 接收消息（只在没有缓冲帧时挂起；无超时定时器，假死由看门狗处理）
+                msg = await ws.receive()
+
+                # 🔥 每次唤醒只读一次时钟：同一批缓冲帧共用接收时间，同时作为看门狗时间戳
+                self._rx_received_ns = received_ns = monotonic_ns()
+                self._last_msg_ns = received_ns
+                self._rx_wakeups += 1
+                # aiohttp 的帧队列（len() 为已缓冲的帧数），取不到时每次唤醒只处理一帧
+                reader = getattr(ws, '_reader', None)
+
+                while True:
+                    self._rx_messages += 1
+                    msg_type = msg.type
+                    if msg_type is TEXT:
+                        data = msg.data
+                        self._rx_bytes += len(data)
+                        # 🔥 拦截心跳响应 "pong"
+                        # OKX 服务器回复的心跳响应是纯文本字符串 "pong"，而不是 JSON 格式
+                        if data == 'pong':
+                            self._logger.debug("💓 [心跳响应] 收到 pong")
+                        else:
+                            await self._on_message(msg)
+                    elif msg_type is BINARY:
+                        self._rx_bytes += len(msg.data)
+                        await self._on_message(msg)
+                    else:
+                        # CLOSE / CLOSED / ERROR：交给子类记录，回到外层检查连接状态
+                        await self._on_message(msg)
+                        break
+
+                    # 🔥 [优化] 已缓冲的帧直接处理（此时 receive() 不会挂起，不回到事件循环）
+                    if reader is None or not len(reader):
+                        break
+                    msg = await ws.receive()
+
+                busy_ns = monotonic_ns() - received_ns
+                self._rx_busy_ns += busy_ns
+                if busy_ns > self._rx_max_busy_ns:
+                    self._rx_max_busy_ns = busy_ns
 
             except asyncio.CancelledError:
                 self._logger.info("📨 [消息接收循环] 任务被取消（系统关闭），退出")
@@ -385,7 +413,7 @@ class WsBaseGateway:
 
                 # 🔥 [看门狗] 检查最后收到消息的时间
                 # 如果超过 60 秒没有收到任何消息（包括 ping、pong 和数据推送），强制重连
-                time_since_last_msg = time.time() - self._last_msg_time
+                time_since_last_msg = (time.monotonic_ns() - self._last_msg_ns) / 1e9
                 if time_since_last_msg > self._watchdog_timeout:
                     self._logger.error(
                         f"💓 [看门狗触发] {time_since_last_msg:.1f}秒未收到任何数据，"
@@ -545,6 +573,33 @@ class WsBaseGateway:
         if self._event_bus:
             self._event_bus.put_nowait(event, priority=priority)
 
+    def get_receive_stats(self) -> Dict[str, int]:
+        """
+        🔥 [新增] 获取接收循环累计统计（调用方按时间差计算速率）
+
+        Returns:
+            Dict[str, int]: {messages, wakeups, bytes, busy_ns, max_busy_ns}
+        """
+        return {
+            'messages': self._rx_messages,
+            'wakeups': self._rx_wakeups,
+            'bytes': self._rx_bytes,
+            'busy_ns': self._rx_busy_ns,
+            'max_busy_ns': self._rx_max_busy_ns
+        }
+
+    @property
+    def last_heartbeat(self) -> float:
+        """
+        最后收到消息的时间（Unix 时间戳，秒；由单调时钟换算，接收循环不读墙钟）
+
+        Returns:
+            float: 时间戳，从未收到消息时为 0
+        """
+        if not self._last_msg_ns:
+            return 0.0
+        return time.time() - (time.monotonic_ns() - self._last_msg_ns) / 1e9
+
     @property
     def reconnect_count(self) -> int:
         """
@@ -566,7 +621,9 @@ class WsBaseGateway:
             'connected': self.is_connected(),
             'url': self._ws_url,
             'reconnect_attempt': self._reconnect_attempt,
-            'last_heartbeat': self._last_heartbeat
+            'last_heartbeat': self.last_heartbeat,
+            'json_decoder': self._json_decoder,
+            'sniff_discarded': self._sniff_discarded
         }
 
 
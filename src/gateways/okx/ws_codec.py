@@ -0,0 +1,91 @@
+"""
+OKX WebSocket 帧解码 (Frame Decoding)
+
+- 可插拔 JSON 解码后端：安装了 orjson 时默认使用 orjson，否则回退到标准库 json
+  （环境变量 OKX_JSON_DECODER=auto|orjson|json）
+- 字节级频道预判（sniff）：OKX 推送帧以 {"arg":{"channel":"...","instId":"..."} 开头，
+  只用 str.find 从前缀中取出 channel / instId，未订阅或不关心的频道在完整解码前直接丢弃；
+  前缀不符合预期时返回 None，由调用方走完整解码路径，不会误丢消息
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 可用的解码后端：名称 -> loads(str) 函数
+DECODERS: Dict[str, Callable[[Any], Any]] = {'json': json.loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+# json.JSONDecodeError 和 orjson.JSONDecodeError 都是 ValueError 的子类
+DecodeError = ValueError
+
+_ARG_PREFIX = '{"arg":{"channel":"'
+_ARG_PREFIX_LEN = len(_ARG_PREFIX)
+_INST_ID_KEY = '"instId":"'
+_INST_ID_KEY_LEN = len(_INST_ID_KEY)
+
+
+def get_decoder(name: Optional[str] = None) -> Tuple[str, Callable[[Any], Any]]:
+    """
+    选择 JSON 解码后端
+
+    Args:
+        name (Optional[str]): 'auto' / 'orjson' / 'json'，None 时读取环境变量 OKX_JSON_DECODER（默认 auto）
+
+    Returns:
+        Tuple[str, Callable]: (实际使用的后端名称, loads 函数)
+
+    Raises:
+        ValueError: 未知的后端名称
+    """
+    if name is None:
+        name = os.getenv('OKX_JSON_DECODER', 'auto')
+    name = name.lower()
+
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in DECODERS else 'json'
+    elif name == 'orjson' and 'orjson' not in DECODERS:
+        logger.warning("orjson 未安装，回退到标准库 json")
+        name = 'json'
+    elif name not in DECODERS:
+        raise ValueError(f"不支持的 JSON 解码后端: {name}，可选: auto, {', '.join(DECODERS)}")
+
+    return name, DECODERS[name]
+
+
+def sniff_arg(raw: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    从原始帧前缀中提取推送的 (channel, instId)
+
+    Args:
+        raw (str): WebSocket 文本帧
+
+    Returns:
+        Optional[Tuple[str, Optional[str]]]: 推送帧返回 (channel, instId 或 None)；
+            事件响应（subscribe / login / error 等）或格式不符时返回 None
+    """
+    if not raw.startswith(_ARG_PREFIX):
+        return None
+    end = raw.find('"', _ARG_PREFIX_LEN)
+    if end < 0:
+        return None
+    channel = raw[_ARG_PREFIX_LEN:end]
+
+    # instId 只在 arg 对象内查找（arg 中没有嵌套对象）
+    arg_end = raw.find('}', end)
+    if arg_end < 0:
+        return None
+    key = raw.find(_INST_ID_KEY, end, arg_end)
+    if key < 0:
+        return channel, None
+    start = key + _INST_ID_KEY_LEN
+    return channel, raw[start:raw.find('"', start)]
@@ -0,0 +1,438 @@
+"""
+OKX 公共 WebSocket 连接池 (Public WebSocket Pool)
+
+把公共行情订阅分散到多个 WebSocket 连接（分片 / shard）上：
+- 每个分片是一个独立的 OkxPublicWsGateway（独立的接收循环、心跳和重连）
+- 初始按顺序轮询分配交易对；运行时按实测推送速率再平衡，热点分片的交易对迁移到最空闲的分片
+- 某个分片重连时只有它自己的交易对重新订阅，其他分片不受影响
+- 按分片统计推送速率、字节速率和接收循环繁忙度，用于评估连接池大小
+
+迁移交易对时先在原分片取消订阅，再在目标分片订阅（break-before-make），
+迁移期间约一个往返时间内的推送会丢失，但不会出现重复的成交推送。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .order_book import L2OrderBook
+from .ws_public_gateway import OkxPublicWsGateway
+
+logger = logging.getLogger(__name__)
+
+
+class _ShardSample:
+    """分片计数器快照（两次快照之差即为区间速率）"""
+
+    __slots__ = ('time_ns', 'messages', 'bytes', 'busy_ns', 'symbol_messages')
+
+    def __init__(self, shard: OkxPublicWsGateway):
+        stats = shard.get_receive_stats()
+        self.time_ns = time.monotonic_ns()
+        self.messages = stats['messages']
+        self.bytes = stats['bytes']
+        self.busy_ns = stats['busy_ns']
+        self.symbol_messages = shard.get_symbol_message_counts()
+
+
+class OkxPublicWsPool:
+    """
+    OKX 公共 WebSocket 连接池
+
+    接口与 OkxPublicWsGateway 保持一致（connect / disconnect / add_symbols /
+    remove_symbols / on_book_update / get_status），Engine 可直接替换使用。
+
+    Example:
+        >>> pool = OkxPublicWsPool(symbols, shards=4, event_bus=bus)
+        >>> await pool.connect()
+        >>> pool.get_shard_stats()
+    """
+
+    # 单次再平衡最多迁移的交易对数量（避免集中重订阅）
+    MAX_MOVES_PER_REBALANCE = 2
+
+    # 最热分片低于该速率（推送/秒）时不做再平衡
+    MIN_REBALANCE_RATE = 10.0
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        shards: int = 2,
+        ws_url: Optional[str] = None,
+        event_bus=None,
+        channels: Optional[Iterable[str]] = None,
+        rebalance_interval: float = 30.0,
+        hot_ratio: float = 1.5,
+        latency_tracker=None
+    ):
+        """
+        初始化连接池
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            shards (int): 最大连接数（不超过交易对数量）
+            ws_url (Optional[str]): WebSocket URL
+            event_bus: 事件总线
+            channels (Optional[Iterable[str]]): 每个交易对订阅的频道
+            rebalance_interval (float): 采样与再平衡间隔（秒），0 表示不自动再平衡
+            hot_ratio (float): 分片速率超过平均值的倍数时视为热点
+            latency_tracker: 行情延迟统计（FeedLatencyTracker，所有分片共用）
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            raise ValueError("连接池至少需要一个交易对")
+
+        self.symbol = symbols[0]
+        self.max_shards = max(1, shards)
+        self.rebalance_interval = rebalance_interval
+        self.hot_ratio = hot_ratio
+        self._ws_url = ws_url
+        self._event_bus = event_bus
+        self._channels = tuple(channels) if channels else None
+        self._latency_tracker = latency_tracker
+
+        # 初始分配：按顺序轮询
+        shard_count = min(self.max_shards, len(symbols))
+        assignment: List[List[str]] = [symbols[i::shard_count] for i in range(shard_count)]
+        self._shards: List[OkxPublicWsGateway] = [self._create_shard(i, group) for i, group in enumerate(assignment)]
+        self._owner: Dict[str, int] = {
+            symbol: index for index, group in enumerate(assignment) for symbol in group
+        }
+
+        self._samples: List[_ShardSample] = [_ShardSample(shard) for shard in self._shards]
+        self._shard_rates: List[Dict[str, float]] = [{} for _ in self._shards]
+        self._symbol_rates: Dict[str, float] = {}
+        self._moves = 0
+        self._started = False
+        self._rebalance_task: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"OkxPublicWsPool 初始化: {len(symbols)} 个交易对, {shard_count} 个分片 "
+            f"(最大 {self.max_shards}), 再平衡间隔 {rebalance_interval}s"
+        )
+
+    def _create_shard(
+        self, index: int, symbols: List[str], channels: Optional[Iterable[str]] = None
+    ) -> OkxPublicWsGateway:
+        return OkxPublicWsGateway(
+            ws_url=self._ws_url,
+            event_bus=self._event_bus,
+            symbols=symbols,
+            channels=channels or self._channels,
+            name=f"okx_ws_public_{index}",
+            latency_tracker=self._latency_tracker
+        )
+
+    # ==================== 连接管理 ====================
+
+    async def connect(self) -> bool:
+        """
+        并发连接所有分片，并启动再平衡任务
+
+        Returns:
+            bool: 是否全部连接成功
+        """
+        self._started = True
+        results = await asyncio.gather(*(shard.connect() for shard in self._shards))
+        self._samples = [_ShardSample(shard) for shard in self._shards]
+        if self.rebalance_interval > 0 and self._rebalance_task is None:
+            self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+        connected = sum(1 for result in results if result)
+        logger.info(f"OkxPublicWsPool 已连接 {connected}/{len(self._shards)} 个分片")
+        return connected == len(self._shards)
+
+    async def disconnect(self):
+        """停止再平衡任务并断开所有分片"""
+        self._started = False
+        if self._rebalance_task:
+            self._rebalance_task.cancel()
+            try:
+                await self._rebalance_task
+            except asyncio.CancelledError:
+                pass
+            self._rebalance_task = None
+        await asyncio.gather(*(shard.disconnect() for shard in self._shards))
+
+    def is_connected(self) -> bool:
+        """所有分片都已连接"""
+        return all(shard.is_connected() for shard in self._shards)
+
+    @property
+    def reconnect_count(self) -> int:
+        """🔥 [Guardian] 所有分片的重连次数之和"""
+        return sum(shard.reconnect_count for shard in self._shards)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._owner)
+
+    # ==================== 订阅管理 ====================
+
+    def _shard_loads(self) -> List[Tuple[float, int]]:
+        """各分片负载：(推送速率, 交易对数量)"""
+        loads = [[0.0, 0] for _ in self._shards]
+        for symbol, index in self._owner.items():
+            loads[index][0] += self._symbol_rates.get(symbol, 0.0)
+            loads[index][1] += 1
+        return [tuple(load) for load in loads]
+
+    async def add_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        追加交易对：分配到负载最低的分片（未达到最大连接数时优先新建分片）
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            channels (Optional[Iterable[str]]): 频道
+
+        Returns:
+            int: 新增的订阅数
+        """
+        added = 0
+        for symbol in symbols:
+            index = self._owner.get(symbol)
+            if index is None:
+                if len(self._shards) < self.max_shards:
+                    index = len(self._shards)
+                    shard = self._create_shard(index, [symbol], channels)
+                    self._shards.append(shard)
+                    self._samples.append(_ShardSample(shard))
+                    self._shard_rates.append({})
+                    self._owner[symbol] = index
+                    if self._started:
+                        await shard.connect()
+                    added += len(shard.channels)
+                    continue
+                loads = self._shard_loads()
+                index = min(range(len(self._shards)), key=lambda i: loads[i])
+                self._owner[symbol] = index
+            added += await self._shards[index].add_symbols([symbol], channels)
+        return added
+
+    async def remove_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        移除交易对（只影响所属分片）
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            channels (Optional[Iterable[str]]): 频道，None 表示全部频道
+
+        Returns:
+            int: 移除的订阅数
+        """
+        removed = 0
+        for symbol in symbols:
+            index = self._owner.get(symbol)
+            if index is None:
+                continue
+            shard = self._shards[index]
+            removed += await shard.remove_symbols([symbol], channels)
+            if symbol not in shard.get_subscriptions():
+                del self._owner[symbol]
+                self._symbol_rates.pop(symbol, None)
+        return removed
+
+    @property
+    def book_channel(self) -> Optional[str]:
+        return self._shards[0].book_channel
+
+    async def set_book_channel(self, channel: str) -> int:
+        """
+        在所有分片上切换订单簿频道（之后新建的分片也使用新频道）
+
+        Args:
+            channel (str): 订单簿频道（见 BOOK_CHANNELS）
+
+        Returns:
+            int: 切换了频道的交易对数量
+        """
+        switched = 0
+        for shard in self._shards:
+            switched += await shard.set_book_channel(channel)
+        self._channels = self._shards[0].channels
+        return switched
+
+    # ==================== 采样与再平衡 ====================
+
+    def sample(self):
+        """
+        采样各分片计数器，更新区间速率（推送/秒、字节/秒、繁忙度）
+        """
+        for index, shard in enumerate(self._shards):
+            previous = self._samples[index]
+            current = _ShardSample(shard)
+            elapsed_s = (current.time_ns - previous.time_ns) / 1e9
+            if elapsed_s <= 0:
+                continue
+
+            messages = current.messages - previous.messages
+            self._shard_rates[index] = {
+                'msg_rate': messages / elapsed_s,
+                'bytes_rate': (current.bytes - previous.bytes) / elapsed_s,
+                'busy_ratio': (current.busy_ns - previous.busy_ns) / (elapsed_s * 1e9),
+                'avg_busy_us': (current.busy_ns - previous.busy_ns) / messages / 1e3 if messages else 0.0
+            }
+            for symbol, count in current.symbol_messages.items():
+                self._symbol_rates[symbol] = (count - previous.symbol_messages.get(symbol, 0)) / elapsed_s
+            self._samples[index] = current
+
+    def plan_moves(self) -> List[Tuple[str, int, int]]:
+        """
+        根据最近一次采样的交易对速率规划迁移
+
+        每次把最热分片中速率最接近两分片差值一半的交易对迁移到最冷分片，
+        直到没有分片超过平均速率的 hot_ratio 倍或达到 MAX_MOVES_PER_REBALANCE。
+
+        Returns:
+            List[Tuple[str, int, int]]: [(交易对, 源分片, 目标分片), ...]
+        """
+        if len(self._shards) < 2:
+            return []
+
+        owner = dict(self._owner)
+        loads = [0.0] * len(self._shards)
+        for symbol, index in owner.items():
+            loads[index] += self._symbol_rates.get(symbol, 0.0)
+
+        moves = []
+        for _ in range(self.MAX_MOVES_PER_REBALANCE):
+            hot = max(range(len(loads)), key=lambda i: loads[i])
+            cool = min(range(len(loads)), key=lambda i: loads[i])
+            mean = sum(loads) / len(loads)
+            if loads[hot] < self.MIN_REBALANCE_RATE or loads[hot] <= self.hot_ratio * mean:
+                break
+
+            candidates = [symbol for symbol, index in owner.items() if index == hot]
+            if len(candidates) < 2:
+                break
+
+            gap = loads[hot] - loads[cool]
+            best = None
+            for symbol in candidates:
+                rate = self._symbol_rates.get(symbol, 0.0)
+                if 0 < rate < gap and (best is None or abs(gap / 2 - rate) < abs(gap / 2 - best[1])):
+                    best = (symbol, rate)
+            if best is None:
+                break
+
+            symbol, rate = best
+            owner[symbol] = cool
+            loads[hot] -= rate
+            loads[cool] += rate
+            moves.append((symbol, hot, cool))
+        return moves
+
+    async def rebalance(self) -> int:
+        """
+        采样并执行再平衡
+
+        Returns:
+            int: 迁移的交易对数量
+        """
+        self.sample()
+        moves = self.plan_moves()
+        for symbol, source, target in moves:
+            channels = self._shards[source].get_subscriptions().get(symbol)
+            await self._shards[source].remove_symbols([symbol])
+            await self._shards[target].add_symbols([symbol], channels or None)
+            self._owner[symbol] = target
+            self._moves += 1
+            logger.info(
+                f"🔀 [OkxPublicWsPool] 再平衡: {symbol} "
+                f"({self._symbol_rates.get(symbol, 0.0):.1f} msg/s) 分片 {source} -> {target}"
+            )
+        return len(moves)
+
+    async def _rebalance_loop(self):
+        """周期性采样与再平衡"""
+        while True:
+            try:
+                await asyncio.sleep(self.rebalance_interval)
+                await self.rebalance()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"🔀 [OkxPublicWsPool] 再平衡异常: {e}", exc_info=True)
+
+    # ==================== 统计 ====================
+
+    def get_shard_stats(self) -> List[Dict[str, Any]]:
+        """
+        获取各分片统计（速率来自最近一次采样区间）
+
+        Returns:
+            List[Dict[str, Any]]: [{name, connected, symbols, msg_rate, bytes_rate, busy_ratio,
+                                    avg_busy_us, max_busy_ms, messages, reconnects}, ...]
+        """
+        stats = []
+        for index, shard in enumerate(self._shards):
+            receive = shard.get_receive_stats()
+            rates = self._shard_rates[index]
+            stats.append({
+                'name': shard.name,
+                'connected': shard.is_connected(),
+                'symbols': len(shard.get_subscriptions()),
+                'msg_rate': rates.get('msg_rate', 0.0),
+                'bytes_rate': rates.get('bytes_rate', 0.0),
+                'busy_ratio': rates.get('busy_ratio', 0.0),
+                'avg_busy_us': rates.get('avg_busy_us', 0.0),
+                'max_busy_ms': receive['max_busy_ns'] / 1e6,
+                'messages': receive['messages'],
+                'reconnects': shard.reconnect_count
+            })
+        return stats
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取连接池状态
+
+        Returns:
+            dict: 状态信息
+        """
+        return {
+            'connected': self.is_connected(),
+            'shards': len(self._shards),
+            'symbols': len(self._owner),
+            'moves': self._moves,
+            'shard_stats': self.get_shard_stats()
+        }
+
+    # ==================== 订单簿缓存（兼容 OkxPublicWsGateway） ====================
+
+    def on_book_update(self, event):
+        """BOOK_EVENT 处理器：交给交易对所属分片更新订单簿缓存"""
+        index = self._owner.get(event.data.get('symbol'))
+        if index is not None:
+            self._shards[index].on_book_update(event)
+
+    def get_order_book(self, symbol: Optional[str] = None) -> Dict[str, list]:
+        """
+        获取交易对的订单簿缓存
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Dict[str, list]: {'bids': [...], 'asks': [...]}
+        """
+        symbol = symbol or self.symbol
+        index = self._owner.get(symbol)
+        if index is None:
+            return {'bids': [], 'asks': []}
+        return self._shards[index].get_order_book(symbol)
+
+    def get_l2_book(self, symbol: Optional[str] = None) -> Optional[L2OrderBook]:
+        """
+        获取交易对的全深度增量订单簿（由所属分片维护）
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Optional[L2OrderBook]: 未订阅 books 频道时返回 None
+        """
+        symbol = symbol or self.symbol
+        index = self._owner.get(symbol)
+        if index is None:
+            return None
+        return self._shards[index].get_l2_book(symbol)
@@ -9,6 +9,7 @@ OKX 私有 WebSocket 网关 (Private WebSocket Gateway)
 - 自动重连机制（指数退避）
 - 签名鉴权
 - 登录确认机制（修复订阅失败问题）
+- 🔥 [新增] WebSocket 下单 / 撤单 / 改单（按请求 id 关联响应，超时抛出 asyncio.TimeoutError）
 
 设计原则：
 - 使用标准事件格式
@@ -25,17 +26,35 @@ import asyncio
 import json
 import logging
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime, timezone
 import aiohttp
 from aiohttp import WSMessage, ClientError
 from ...core.event_types import Event, EventType
 from .ws_base import WsBaseGateway
 from .auth import OkxSigner
+from .ws_codec import DecodeError, sniff_arg
+from .order_params import build_amend_body, build_order_body, order_ack_event, tolerate_cancel_error
+from ...utils.auth import get_time_offset
 
 logger = logging.getLogger(__name__)
 
 
+class OrderOpUnconfirmed(ConnectionError):
+    """
+    交易请求已发出，但连接在收到响应前断开（请求可能已被交易所执行）
+
+    断连时请求可能还在路上：expTime 之前交易所仍可能执行它，调用方查询订单前必须等到 exp_time_ms 之后。
+
+    Attributes:
+        exp_time_ms (Optional[int]): 请求的 expTime（交易所时间，毫秒）
+    """
+
+    def __init__(self, reason: str, exp_time_ms: Optional[int] = None):
+        super().__init__(reason)
+        self.exp_time_ms = exp_time_ms
+
+
 class OkxPrivateWsGateway(WsBaseGateway):
     """
     OKX 私有 WebSocket 网关（修复版）
@@ -67,6 +86,12 @@ class OkxPrivateWsGateway(WsBaseGateway):
     # 新的 (标准模拟盘): "wss://wspap.okx.com:8443/ws/v5/private"
     WS_URL_DEMO = "wss://wspap.okx.com:8443/ws/v5/private"
 
+    # _process_data 处理的推送频道（其他频道的推送在解码前丢弃）
+    HANDLED_CHANNELS = frozenset(('orders', 'positions'))
+
+    # 🔥 [新增] 交易操作（响应带请求 id，无 arg 频道）
+    ORDER_OPS = frozenset(('order', 'cancel-order', 'amend-order'))
+
     def __init__(
         self,
         api_key: str,
@@ -74,7 +99,8 @@ class OkxPrivateWsGateway(WsBaseGateway):
         passphrase: str,
         use_demo: bool = False,
         ws_url: Optional[str] = None,
-        event_bus=None
+        event_bus=None,
+        order_timeout: float = 1.0
     ):
         """
         初始化私有 WebSocket 网关
@@ -86,6 +112,8 @@ class OkxPrivateWsGateway(WsBaseGateway):
             use_demo (bool): 是否使用模拟盘
             ws_url (Optional[str]): WebSocket URL
             event_bus: 事件总线实例
+            order_timeout (float): 交易操作等待响应的超时（秒），同时作为请求的 expTime，
+                超时后交易所不再执行该请求，调用方可以安全回退到 REST
         """
         # 根据 env 选择 URL
         if ws_url:
@@ -116,6 +144,12 @@ class OkxPrivateWsGateway(WsBaseGateway):
         # 🔥 新增：防止重复警告的标志
         self._disconnect_logged = False
 
+        # 🔥 [新增] 交易操作：请求 id -> 等待响应的 Future
+        self.order_timeout = order_timeout
+        self._pending_ops: Dict[str, asyncio.Future] = {}
+        self._op_seq = 0
+        self._op_timeouts = 0
+
         logger.info(
             f"OkxPrivateWsGateway 初始化: use_demo={use_demo}, "
             f"ws_url={final_url}"
@@ -138,6 +172,8 @@ class OkxPrivateWsGateway(WsBaseGateway):
         logger.info("⏹ 停止私有 WebSocket...")
         # 委托给基类（自动清理所有资源）
         await super().disconnect()
+        self._is_logged_in = False
+        self._fail_pending_ops("私有 WebSocket 已断开")
 
     # is_connected() 已由基类实现，无需重写
 
@@ -263,7 +299,12 @@ class OkxPrivateWsGateway(WsBaseGateway):
         """
         try:
             if message.type == aiohttp.WSMsgType.TEXT:
-                data = json.loads(message.data)
+                # 🔥 [优化] 不处理的频道在完整解码前丢弃
+                sniffed = sniff_arg(message.data)
+                if sniffed is not None and sniffed[0] not in self.HANDLED_CHANNELS:
+                    self._sniff_discarded += 1
+                    return
+                data = self._loads(message.data)
                 await self._process_data(data)
 
             elif message.type == aiohttp.WSMsgType.ERROR:
@@ -275,11 +316,12 @@ class OkxPrivateWsGateway(WsBaseGateway):
                 self._is_logged_in = False
                 self._login_completed = False
                 self._subscribe_completed = False
+                self._fail_pending_ops("私有 WebSocket 连接关闭")
 
             else:
                 logger.debug(f"未处理的消息类型: {message.type}")
 
-        except json.JSONDecodeError as e:
+        except DecodeError as e:
             logger.error(f"❌ JSON 解析失败: {e}")
         except Exception as e:
             logger.error(f"❌ 消息处理异常: {e}")
@@ -292,6 +334,11 @@ class OkxPrivateWsGateway(WsBaseGateway):
             data (dict): 解析后的 JSON 数据
         """
         try:
+            # 🔥 [新增] 交易操作响应（按请求 id 唤醒等待方）
+            if "id" in data and data.get("op") in self.ORDER_OPS:
+                self._resolve_op(data)
+                return
+
             # 处理登录响应
             if "event" in data:
                 if data["event"] == "login":
@@ -425,12 +472,228 @@ class OkxPrivateWsGateway(WsBaseGateway):
         连接成功后的钩子（自动登录和订阅）
         """
         logger.info("✅ WebSocket 连接成功，准备登录...")
+        # 重连后必须重新登录才能交易
+        self._is_logged_in = False
+        self._fail_pending_ops("私有 WebSocket 已重连")
         try:
             # 发送登录包
             await self._send_login()
         except Exception as e:
             logger.error(f"❌ 登录失败: {e}")
 
+    # ==================== 🔥 [新增] WebSocket 交易操作 ====================
+
+    def is_trading_ready(self) -> bool:
+        """
+        是否可以通过 WebSocket 交易（已连接且已登录）
+
+        Returns:
+            bool: 可以交易
+        """
+        return self.is_connected() and self._is_logged_in
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        size: float,
+        price: Optional[float] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        下单（op=order，请求体与 REST 下单一致）
+
+        Args:
+            symbol (str): 交易对
+            side (str): 方向（buy/sell）
+            order_type (str): 订单类型（market/limit/ioc）
+            size (float): 数量
+            price (float): 价格
+            timeout (Optional[float]): 超时（秒），None 使用 order_timeout
+            **kwargs: 其他参数（clOrdId / reduceOnly 等）
+
+        Returns:
+            dict: 订单响应（ordId / clOrdId / sCode / sMsg）
+
+        Raises:
+            asyncio.TimeoutError: 超时未收到响应
+            ConnectionError: 未登录或连接断开
+            ValueError: 交易所拒绝
+        """
+        body = build_order_body(symbol, side, order_type, size, price, **kwargs)
+        logger.info(f"WS 下单: {body}")
+
+        order_data = await self._send_op("order", body, timeout)
+
+        # 发布订单更新事件（与 REST 下单一致）
+        if self._event_bus and order_data:
+            event = order_ack_event(order_data, symbol, side, order_type, size, price, "okx_ws_private")
+            await self.publish_event(event, priority=5)  # ORDER_UPDATE 优先级
+
+        return order_data
+
+    async def cancel_order(self, order_id: str, symbol: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        撤单（op=cancel-order）
+
+        订单已成交或不存在（错误码 1 / 51402）视为撤单成功，与 REST 撤单一致。
+
+        Args:
+            order_id (str): 订单 ID
+            symbol (str): 交易对
+            timeout (Optional[float]): 超时（秒），None 使用 order_timeout
+
+        Returns:
+            dict: 撤单响应
+        """
+        try:
+            order_data = await self._send_op("cancel-order", {'instId': symbol, 'ordId': order_id}, timeout)
+        except ValueError as e:
+            tolerated = tolerate_cancel_error(str(e), order_id, symbol)
+            if tolerated is not None:
+                return tolerated
+            logger.error(f"WS 撤单失败: {e}")
+            raise
+
+        if self._event_bus and order_data:
+            event = Event(
+                type=EventType.ORDER_CANCELLED,
+                data={
+                    'order_id': order_id,
+                    'symbol': symbol,
+                    'raw': order_data
+                },
+                source="okx_ws_private"
+            )
+            await self.publish_event(event, priority=5)  # ORDER_CANCELLED 优先级
+
+        return order_data
+
+    async def amend_order(
+        self,
+        order_id: str,
+        symbol: str,
+        new_size: Optional[float] = None,
+        new_price: Optional[float] = None,
+        timeout: Optional[float] = None,
+        new_stop_loss_price: Optional[float] = None,
+        attach_algo_cl_ord_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        改单（op=amend-order）
+
+        Args:
+            order_id (str): 订单 ID
+            symbol (str): 交易对
+            new_size (Optional[float]): 新数量
+            new_price (Optional[float]): 新价格
+            timeout (Optional[float]): 超时（秒），None 使用 order_timeout
+            new_stop_loss_price (Optional[float]): 附带止损的新触发价
+            attach_algo_cl_ord_id (Optional[str]): 下单时附带止损的 attachAlgoClOrdId
+
+        Returns:
+            dict: 改单响应（ordId / clOrdId / reqId / sCode / sMsg）
+        """
+        body = build_amend_body(order_id, symbol, new_size, new_price, new_stop_loss_price, attach_algo_cl_ord_id)
+        return await self._send_op("amend-order", body, timeout)
+
+    async def _send_op(self, op: str, args: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        发送交易操作并等待同 id 的响应
+
+        请求带 expTime（本地时间 + 时钟偏移 + 超时）：超时后交易所不会再执行这个请求。
+
+        Args:
+            op (str): order / cancel-order / amend-order
+            args (dict): 请求体
+            timeout (Optional[float]): 超时（秒）
+
+        Returns:
+            dict: 响应 data[0]
+
+        Raises:
+            asyncio.TimeoutError: 超时未收到响应（请求可能已被执行）
+            OrderOpUnconfirmed: 请求已发出但连接断开（请求可能已被执行，exp_time_ms 为请求的 expTime）
+            ConnectionError: 未登录或发送失败（请求未发出）
+            ValueError: 交易所拒绝（code != 0）
+        """
+        if not self.is_trading_ready():
+            raise ConnectionError("私有 WebSocket 未登录，无法交易")
+
+        timeout = self.order_timeout if timeout is None else timeout
+        self._op_seq += 1
+        req_id = str(self._op_seq)
+        exp_time = int((time.time() + get_time_offset() + timeout) * 1000)
+        request = {"id": req_id, "op": op, "expTime": str(exp_time), "args": [args]}
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_ops[req_id] = future
+        try:
+            if not await self.send_message(json.dumps(request, separators=(',', ':'))):
+                raise ConnectionError(f"私有 WebSocket 发送 {op} 失败")
+            response = await asyncio.wait_for(future, timeout)
+        except OrderOpUnconfirmed as e:
+            e.exp_time_ms = exp_time
+            raise
+        except asyncio.TimeoutError:
+            self._op_timeouts += 1
+            logger.warning(f"⏱️ WS {op} 超时 ({timeout:.2f}s): id={req_id}, args={args}")
+            raise
+        finally:
+            self._pending_ops.pop(req_id, None)
+
+        data_list = response.get('data') or []
+        order_data = data_list[0] if data_list else {}
+        code = response.get('code')
+        if code != '0':
+            error_msg = response.get('msg') or 'Unknown error'
+            logger.error(f"🔴 WS {op} 错误: {response}")
+            raise ValueError(
+                f"API 错误: {code} - {error_msg} "
+                f"(sCode={order_data.get('sCode')}, sMsg={order_data.get('sMsg')})"
+            )
+        return order_data
+
+    def _resolve_op(self, data: dict):
+        """
+        交易操作响应：唤醒等待同 id 的请求（超时后到达的响应直接丢弃）
+
+        Args:
+            data (dict): 响应
+        """
+        future = self._pending_ops.pop(data["id"], None)
+        if future is None or future.done():
+            logger.debug(f"丢弃无人等待的 WS {data.get('op')} 响应: id={data['id']}")
+            return
+        future.set_result(data)
+
+    def _fail_pending_ops(self, reason: str):
+        """
+        连接断开：所有等待中的请求立即以 OrderOpUnconfirmed 失败（调用方不必等超时）
+
+        Args:
+            reason (str): 原因
+        """
+        pending, self._pending_ops = self._pending_ops, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(OrderOpUnconfirmed(reason))
+
+    def get_order_entry_stats(self) -> Dict[str, int]:
+        """
+        获取 WebSocket 交易操作统计
+
+        Returns:
+            Dict[str, int]: {requests, pending, timeouts}
+        """
+        return {
+            'requests': self._op_seq,
+            'pending': len(self._pending_ops),
+            'timeouts': self._op_timeouts
+        }
+
     # 消息循环已由基类实现，无需重写
 
     # 重连机制已由基类实现（指数退避），无需重写
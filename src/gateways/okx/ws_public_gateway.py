@@ -6,6 +6,9 @@ OKX 公共 WebSocket 网关（Parser 版本）
 关键特性：
 - 继承 WsBaseGateway 基类（修复重连风暴）
 - 使用独立 Parser 处理数据（Trade、Ticker、Book、Candle）
+- 🔥 [新增] 多交易对复用：一个连接订阅任意数量的 instId，
+  按推送中的 arg.instId 路由到该交易对的 Parser，运行时增删交易对无需重连
+- 🔥 [新增] 订单簿频道可选（bbo-tbt / books5 / books / books-l2-tbt），按消费者需求切换
 - 推送 TICK 事件到事件总线
 - 自动重连机制（指数退避）
 - 心跳保活
@@ -22,13 +25,16 @@ OKX 公共 WebSocket 网关（Parser 版本）
 import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Union
 from datetime import datetime
 import aiohttp
 from aiohttp import ClientSession, WSMessage, ClientError, ClientWebSocketResponse
 
 from src.core.event_types import Event, EventType
 from src.gateways.okx.ws_base import WsBaseGateway
+from .book_channels import BOOK_CHANNELS
+from .order_book import L2OrderBook
+from .ws_codec import DecodeError, sniff_arg
 
 # 导入 Parser
 from .parsers.trade_parser import TradeParser
@@ -45,19 +51,57 @@ class OkxPublicWsGateway(WsBaseGateway):
 
     实时接收市场数据流，推送标准 TICK 事件到事件总线。
     使用独立 Parser 处理数据（Trade、Ticker、Book、Candle），降低耦合度。
+
+    🔥 [新增] 一个连接复用多个交易对：每个 instId 拥有独立的 Parser 状态，
+    推送按 (channel, instId) 路由；重连后自动重新订阅当前全部交易对。
+
+    Example:
+        >>> gateway = OkxPublicWsGateway(symbols=['BTC-USDT-SWAP', 'ETH-USDT-SWAP'], event_bus=bus)
+        >>> await gateway.connect()
+        >>> await gateway.add_symbols(['SOL-USDT-SWAP'])     # 运行时追加，无需重连
+        >>> await gateway.remove_symbols(['ETH-USDT-SWAP'])  # 运行时移除
     """
 
     # OKX Public WebSocket URL
     WS_URL_PRODUCTION = "wss://ws.okx.com:8443/ws/v5/public"
 
-    def __init__(self, symbol: str, ws_url: Optional[str] = None, event_bus=None):
+    # 默认订阅的频道
+    DEFAULT_CHANNELS = ('trades', 'books')
+
+    # 频道 -> Parser 类（所有订单簿频道共用 BookParser）
+    CHANNEL_PARSERS = {
+        'trades': TradeParser,
+        'tickers': TickerParser,
+        'candles': CandleParser,
+        **{channel: BookParser for channel in BOOK_CHANNELS},
+    }
+
+    # 单条订阅消息最多携带的 args 数量（OKX 限制单条消息 64KB）
+    SUBSCRIBE_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        symbol: Optional[str] = None,
+        ws_url: Optional[str] = None,
+        event_bus=None,
+        symbols: Optional[Iterable[str]] = None,
+        channels: Optional[Iterable[str]] = None,
+        name: str = "okx_ws_public",
+        json_decoder: Optional[str] = None,
+        latency_tracker=None
+    ):
         """
         初始化公共 WebSocket 网关
 
         Args:
-            symbol (str): 交易对
+            symbol (str): 主交易对（兼容单交易对用法）
             ws_url (str): WebSocket URL
             event_bus: 事件总线（可选）
+            symbols (Optional[Iterable[str]]): 初始订阅的交易对列表（与 symbol 合并）
+            channels (Optional[Iterable[str]]): 每个交易对订阅的频道，默认 DEFAULT_CHANNELS
+            name (str): 网关名称（连接池中区分分片）
+            json_decoder (Optional[str]): JSON 解码后端 auto/orjson/json，None 时读取环境变量 OKX_JSON_DECODER
+            latency_tracker: 行情延迟统计（FeedLatencyTracker），None 表示不统计
         """
         # 确定 WebSocket URL（公共数据始终使用实盘 URL）
         if ws_url:
@@ -67,29 +111,172 @@ class OkxPublicWsGateway(WsBaseGateway):
 
         # 调用父类初始化
         super().__init__(
-            name="okx_ws_public",
+            name=name,
             ws_url=final_url,
-            event_bus=event_bus
+            event_bus=event_bus,
+            json_decoder=json_decoder
         )
 
-        self.symbol = symbol
+        initial_symbols = list(dict.fromkeys(([symbol] if symbol else []) + list(symbols or [])))
+        if not initial_symbols:
+            raise ValueError("至少需要一个交易对（symbol 或 symbols）")
+
+        # 主交易对（兼容旧代码中的 self.symbol）
+        self.symbol = initial_symbols[0]
+        self.channels = tuple(channels or self.DEFAULT_CHANNELS)
+        for channel in self.channels:
+            self._check_channel(channel)
+
+        # 🔥 [新增] instId -> 已订阅频道；instId -> {频道: Parser}（每个交易对独立的 Parser 状态）
+        self._subscriptions: Dict[str, set] = {}
+        self._parsers: Dict[str, Dict[str, Any]] = {}
+        self._symbol_messages: Dict[str, int] = {}  # instId -> 收到的推送数（连接池按此分片）
+        self._unrouted = 0  # 找不到路由的推送（如取消订阅后仍在途的推送）
+        self._arbiter = None  # 冗余行情仲裁器（OkxRedundantPublicFeed），None 表示直接交给 Parser
+        self._latency_tracker = latency_tracker
 
-        # 初始化 Parser（无状态）
-        self.trade_parser = TradeParser(symbol, event_bus)
-        self.ticker_parser = TickerParser(symbol, event_bus)
-        self.book_parser = BookParser(symbol, event_bus)
-        self.candle_parser = CandleParser(symbol, event_bus)
+        for inst_id in initial_symbols:
+            self._track(inst_id, self.channels)
 
-        # 订单簿深度数据（用于 Maker 策略）
-        self._order_book = {
-            'bids': [],  # 买单 [[price, size, ...], ...]
-            'asks': []   # 卖单 [[price, size, ...], ...]
-        }
+        # 订单簿深度数据（用于 Maker 策略），按交易对缓存
+        self._order_books: Dict[str, Dict[str, list]] = {}
 
         logger.info(
-            f"OkxPublicWsGateway 初始化: symbol={symbol}, url={final_url}"
+            f"OkxPublicWsGateway 初始化: symbols={len(initial_symbols)} "
+            f"({', '.join(initial_symbols[:5])}{'...' if len(initial_symbols) > 5 else ''}), "
+            f"channels={list(self.channels)}, url={final_url}"
         )
 
+    # ==================== 兼容属性（主交易对） ====================
+
+    @property
+    def trade_parser(self) -> TradeParser:
+        return self._get_parser(self.symbol, 'trades')
+
+    @property
+    def ticker_parser(self) -> TickerParser:
+        return self._get_parser(self.symbol, 'tickers')
+
+    @property
+    def book_parser(self) -> BookParser:
+        return self._book_parser(self.symbol) or self._get_parser(self.symbol, 'books')
+
+    @property
+    def candle_parser(self) -> CandleParser:
+        return self._get_parser(self.symbol, 'candles')
+
+    @property
+    def _order_book(self) -> Dict[str, list]:
+        """主交易对的订单簿缓存"""
+        return self._order_books.get(self.symbol, {'bids': [], 'asks': []})
+
+    @property
+    def symbols(self) -> List[str]:
+        """当前订阅的交易对"""
+        return list(self._subscriptions)
+
+    # ==================== 路由表 ====================
+
+    def _check_channel(self, channel: str):
+        if channel not in self.CHANNEL_PARSERS:
+            raise ValueError(f"不支持的频道: {channel}，可选: {list(self.CHANNEL_PARSERS)}")
+
+    def _get_parser(self, inst_id: str, channel: str):
+        """
+        获取（必要时创建）交易对的 Parser
+
+        Args:
+            inst_id (str): 交易对
+            channel (str): 频道
+
+        Returns:
+            Parser 实例
+        """
+        parsers = self._parsers.setdefault(inst_id, {})
+        parser = parsers.get(channel)
+        if parser is None:
+            parser = parsers[channel] = self.CHANNEL_PARSERS[channel](inst_id, self._event_bus)
+            if self._latency_tracker is not None:
+                # 🔥 [新增] 每个 (频道, 交易对) 独立的延迟直方图
+                parser.latency = self._latency_tracker.stream(channel, inst_id, source=parser.SOURCE)
+            if channel in BOOK_CHANNELS:
+                # 🔥 [新增] 订单簿断档 / 校验失败时重新订阅该交易对，获取新快照（冗余模式下由仲裁器选择连接）
+                parser.on_resync = lambda: (self._arbiter or self).resubscribe(inst_id, channel)
+        return parser
+
+    def _book_parser(self, inst_id: str) -> Optional[BookParser]:
+        """交易对当前订阅的订单簿频道的 Parser（未订阅时返回 None）"""
+        for channel, parser in self._parsers.get(inst_id, {}).items():
+            if channel in BOOK_CHANNELS:
+                return parser
+        return None
+
+    def _track(self, inst_id: str, channels: Iterable[str]) -> List[str]:
+        """
+        记录订阅并创建路由（不发送消息）
+
+        Returns:
+            List[str]: 新增的频道
+        """
+        subscribed = self._subscriptions.setdefault(inst_id, set())
+        self._symbol_messages.setdefault(inst_id, 0)
+        added = [channel for channel in channels if channel not in subscribed]
+        for channel in added:
+            self._get_parser(inst_id, channel)
+            subscribed.add(channel)
+        return added
+
+    def _untrack(self, inst_id: str, channels: Iterable[str]) -> List[str]:
+        """
+        移除订阅和路由（不发送消息）
+
+        Returns:
+            List[str]: 实际移除的频道
+        """
+        subscribed = self._subscriptions.get(inst_id)
+        if not subscribed:
+            return []
+        removed = [channel for channel in channels if channel in subscribed]
+        parsers = self._parsers.get(inst_id, {})
+        for channel in removed:
+            subscribed.discard(channel)
+            parsers.pop(channel, None)
+        if not subscribed:
+            del self._subscriptions[inst_id]
+            self._parsers.pop(inst_id, None)
+            self._symbol_messages.pop(inst_id, None)
+            self._order_books.pop(inst_id, None)
+        return removed
+
+    @staticmethod
+    def _channel_arg(channel: str, inst_id: str) -> Dict[str, str]:
+        """构造订阅参数"""
+        if channel == 'candles':
+            return {"channel": "candles", "instId": inst_id, "instType": "SPOT"}
+        return {"channel": channel, "instId": inst_id}
+
+    async def _send_op(self, op: str, args: List[Dict[str, str]]) -> bool:
+        """
+        分批发送 subscribe / unsubscribe 请求
+
+        Args:
+            op (str): 'subscribe' / 'unsubscribe'
+            args (List[Dict[str, str]]): 订阅参数
+
+        Returns:
+            bool: 是否全部发送成功
+        """
+        ok = True
+        for i in range(0, len(args), self.SUBSCRIBE_BATCH_SIZE):
+            json_str = json.dumps({"op": op, "args": args[i:i + self.SUBSCRIBE_BATCH_SIZE]}, separators=(',', ':'))
+            logger.debug(f"发送 {op} 消息: {json_str}")
+            # 使用基类的 send_message 方法
+            if await self.send_message(json_str) is False:
+                ok = False
+        return ok
+
+    # ==================== 连接管理 ====================
+
     async def connect(self) -> bool:
         """
         连接到 WebSocket（委托给基类）
@@ -105,75 +292,183 @@ class OkxPublicWsGateway(WsBaseGateway):
         """
         await super().disconnect()
 
-    async def subscribe(self, channels: list, symbol: Optional[str] = None):
+    # ==================== 订阅管理 ====================
+
+    async def add_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        🔥 [新增] 运行时追加交易对（已连接时立即订阅，无需重连）
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            channels (Optional[Iterable[str]]): 频道，默认使用网关的 channels
+
+        Returns:
+            int: 新增的订阅数（交易对 x 频道）
+        """
+        channels = tuple(channels or self.channels)
+        for channel in channels:
+            self._check_channel(channel)
+
+        args = []
+        for inst_id in symbols:
+            for channel in self._track(inst_id, channels):
+                args.append(self._channel_arg(channel, inst_id))
+
+        if args and self.is_connected():
+            await self._send_op("subscribe", args)
+        if args:
+            logger.info(f"追加订阅 {len(args)} 个频道，当前交易对数: {len(self._subscriptions)}")
+        return len(args)
+
+    async def remove_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        🔥 [新增] 运行时移除交易对（已连接时立即取消订阅，不影响其他交易对）
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            channels (Optional[Iterable[str]]): 频道，None 表示该交易对的全部频道
+
+        Returns:
+            int: 移除的订阅数（交易对 x 频道）
+        """
+        args = []
+        for inst_id in symbols:
+            inst_channels = channels if channels is not None else list(self._subscriptions.get(inst_id, ()))
+            for channel in self._untrack(inst_id, inst_channels):
+                args.append(self._channel_arg(channel, inst_id))
+
+        if args and self.is_connected():
+            await self._send_op("unsubscribe", args)
+        if args:
+            logger.info(f"取消订阅 {len(args)} 个频道，当前交易对数: {len(self._subscriptions)}")
+        return len(args)
+
+    async def subscribe(self, channels: list, symbol: Optional[Union[str, Iterable[str]]] = None):
         """
         订阅频道
 
         Args:
             channels (list): 频道列表
-            symbol (str): 交易对（可选）
+            symbol (Optional[Union[str, Iterable[str]]]): 交易对或交易对列表，None 表示全部已跟踪的交易对
         """
         try:
-            args = []
-            for channel in channels:
-                if channel == 'trades':
-                    args.append({
-                        "channel": "trades",
-                        "instId": self.symbol
-                    })
-                elif channel == 'books':
-                    args.append({
-                        "channel": "books",
-                        "instId": self.symbol
-                    })
-                elif channel == 'candles':
-                    args.append({
-                        "channel": "candles",
-                        "instId": self.symbol,
-                        "instType": "SPOT"
-                    })
-
-            subscribe_msg = {
-                "op": "subscribe",
-                "args": args
-            }
-
-            json_str = json.dumps(subscribe_msg, separators=(',', ':'))
-
-            logger.info(f"发送订阅消息: {json_str}")
+            if symbol is None:
+                targets = list(self._subscriptions)
+            elif isinstance(symbol, str):
+                targets = [symbol]
+            else:
+                targets = list(symbol)
 
-            # 使用基类的 send_message 方法
-            await self.send_message(json_str)
+            channels = [channel for channel in channels if channel in self.CHANNEL_PARSERS]
+            args = []
+            for inst_id in targets:
+                self._track(inst_id, channels)
+                args.extend(self._channel_arg(channel, inst_id) for channel in channels)
 
-            logger.info(f"已发送订阅请求: {self.symbol}")
+            await self._send_op("subscribe", args)
+            logger.info(f"已发送订阅请求: {len(targets)} 个交易对, 频道={channels}")
 
         except Exception as e:
             logger.error(f"订阅频道失败: {e}")
             raise
 
-    async def unsubscribe(self, channels: list, symbol: Optional[str] = None):
+    async def unsubscribe(self, channels: list, symbol: Optional[Union[str, Iterable[str]]] = None):
         """
         取消订阅
 
         Args:
             channels (list): 频道列表
-            symbol (str): 交易对（可选）
+            symbol (Optional[Union[str, Iterable[str]]]): 交易对或交易对列表，None 表示全部已跟踪的交易对
         """
         try:
-            unsubscribe_msg = {
-                "op": "unsubscribe",
-                "args": [self.symbol]
-            }
+            if symbol is None:
+                targets = list(self._subscriptions)
+            elif isinstance(symbol, str):
+                targets = [symbol]
+            else:
+                targets = list(symbol)
+            await self.remove_symbols(targets, channels)
 
-            json_str = json.dumps(unsubscribe_msg, separators=(',', ':'))
+        except Exception as e:
+            logger.error(f"取消订阅失败: {e}")
 
-            # 使用基类的 send_message 方法
-            await self.send_message(json_str)
+    async def resubscribe(self, inst_id: str, channel: str) -> bool:
+        """
+        重新订阅单个频道（unsubscribe + subscribe，OKX 会重新推送快照）
 
-            logger.info(f"已发送取消订阅请求: {self.symbol}")
+        Args:
+            inst_id (str): 交易对
+            channel (str): 频道
 
-        except Exception as e:
-            logger.error(f"取消订阅失败: {e}")
+        Returns:
+            bool: 是否发送成功（未连接时返回 False，重连后会自动重新订阅）
+        """
+        if channel not in self._subscriptions.get(inst_id, ()):
+            return False
+        if not self.is_connected():
+            return False
+        arg = [self._channel_arg(channel, inst_id)]
+        logger.info(f"重新订阅 {channel}: {inst_id}")
+        if not await self._send_op("unsubscribe", arg):
+            return False
+        return await self._send_op("subscribe", arg)
+
+    @property
+    def book_channel(self) -> Optional[str]:
+        """默认订阅的订单簿频道（channels 中不含订单簿频道时为 None）"""
+        return next((channel for channel in self.channels if channel in BOOK_CHANNELS), None)
+
+    async def set_book_channel(self, channel: str) -> int:
+        """
+        切换订单簿频道（已订阅其他订单簿频道的交易对改订新频道，之后新增的交易对也使用新频道）
+
+        先订阅新频道再取消旧频道；未连接时只更新路由表，连接后统一订阅。
+
+        Args:
+            channel (str): 订单簿频道（见 BOOK_CHANNELS）
+
+        Returns:
+            int: 切换了频道的交易对数量
+
+        Raises:
+            ValueError: 不是订单簿频道
+        """
+        if channel not in BOOK_CHANNELS:
+            raise ValueError(f"不是订单簿频道: {channel}，可选: {list(BOOK_CHANNELS)}")
+
+        others = [c for c in self.channels if c not in BOOK_CHANNELS]
+        self.channels = tuple(others + [channel])
+
+        subscribe_args, unsubscribe_args = [], []
+        for inst_id, subscribed in list(self._subscriptions.items()):
+            stale = [c for c in subscribed if c in BOOK_CHANNELS and c != channel]
+            if not stale:
+                continue
+            # 先登记新频道，避免移除旧频道时交易对被整体清理
+            subscribe_args.extend(self._channel_arg(c, inst_id) for c in self._track(inst_id, [channel]))
+            unsubscribe_args.extend(self._channel_arg(c, inst_id) for c in self._untrack(inst_id, stale))
+
+        if subscribe_args and self.is_connected():
+            await self._send_op("subscribe", subscribe_args)
+            await self._send_op("unsubscribe", unsubscribe_args)
+        if subscribe_args:
+            logger.info(f"订单簿频道已切换为 {channel}: {len(subscribe_args)} 个交易对")
+        return len(subscribe_args)
+
+    async def _dispatch(self, parser, inst_id: str, channel: str, data: dict):
+        """
+        把推送交给 Parser；冗余行情模式下先交给仲裁器去重
+
+        Args:
+            parser: 本连接上该 (instId, channel) 的 Parser
+            inst_id (str): 交易对
+            channel (str): 频道
+            data (dict): 解码后的推送
+        """
+        if self._arbiter is not None:
+            await self._arbiter.on_push(self, inst_id, channel, data)
+        else:
+            await parser.process(data, self._rx_received_ns)
 
     # 重写基类的 _on_message 方法，使用 Parser 分发数据
     async def _on_message(self, message: WSMessage):
@@ -184,30 +479,49 @@ class OkxPublicWsGateway(WsBaseGateway):
         """
         try:
             if message.type == aiohttp.WSMsgType.TEXT:
-                logger.debug(f"收到文本消息: {message.data[:200]}...")
-                data = json.loads(message.data)
+                raw = message.data
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"收到文本消息: {raw[:200]}...")
+
+                # 🔥 [优化] 先从帧前缀预判 (channel, instId)：没有路由的推送不做完整解码
+                sniffed = sniff_arg(raw)
+                if sniffed is not None:
+                    channel, inst_id = sniffed
+                    parser = self._parsers.get(inst_id, {}).get(channel)
+                    if parser is None:
+                        self._unrouted += 1
+                        self._sniff_discarded += 1
+                        return
+                    data = self._loads(raw)
+                    if "data" in data:
+                        self._symbol_messages[inst_id] += 1
+                        await self._dispatch(parser, inst_id, channel, data)
+                    return
+
+                data = self._loads(raw)
 
                 # 检查是否为订阅响应
                 if "event" in data:
                     if data["event"] == "subscribe":
-                        logger.info(f"订阅成功: {data.get('arg', {})}")
+                        logger.debug(f"订阅成功: {data.get('arg', {})}")
+                    elif data["event"] == "unsubscribe":
+                        logger.debug(f"取消订阅成功: {data.get('arg', {})}")
                     elif data["event"] == "error":
                         logger.error(f"OKX API 错误: {data}")
                     return
 
-                # 分发数据给对应的 Parser
+                # 🔥 [新增] 按 (instId, channel) 路由给该交易对的 Parser
                 if "data" in data:
-                    # 获取 channel
                     arg_data = data.get("arg", {})
-                    channel = arg_data.get("channel", "")
-
-                    # 根据 channel 分发给对应的 Parser
-                    if channel == "trades":
-                        await self.trade_parser.process(data)
-                    elif channel == "books":
-                        await self.book_parser.process(data)
-                    elif channel == "candles":
-                        await self.candle_parser.process(data)
+                    inst_id = arg_data.get("instId")
+                    channel = arg_data.get("channel")
+                    parser = self._parsers.get(inst_id, {}).get(channel)
+                    if parser is None:
+                        self._unrouted += 1
+                        logger.debug(f"未订阅的推送，忽略: {arg_data}")
+                        return
+                    self._symbol_messages[inst_id] += 1
+                    await self._dispatch(parser, inst_id, channel, data)
 
             elif message.type == aiohttp.WSMsgType.ERROR:
                 logger.error(f"WebSocket 错误: {message.data}")
@@ -218,7 +532,7 @@ class OkxPublicWsGateway(WsBaseGateway):
             else:
                 logger.debug(f"未处理的消息类型: {message.type}")
 
-        except json.JSONDecodeError as e:
+        except DecodeError as e:
             logger.error(f"JSON 解析失败: {e}")
         except Exception as e:
             logger.error(f"消息处理异常: {e}")
@@ -235,11 +549,14 @@ class OkxPublicWsGateway(WsBaseGateway):
         """
         try:
             data = event.data
+            symbol = data.get('symbol') or self.symbol
+            if symbol not in self._subscriptions:
+                return
             bids = data.get('bids', [])
             asks = data.get('asks', [])
 
-            # 更新本地订单簿缓存
-            self._order_book = {
+            # 更新本地订单簿缓存（按交易对）
+            self._order_books[symbol] = {
                 'bids': bids,
                 'asks': asks
             }
@@ -249,7 +566,7 @@ class OkxPublicWsGateway(WsBaseGateway):
             best_ask_value = float(asks[0][0]) if asks and len(asks) > 0 else 0.0
 
             logger.debug(
-                f"📊 [OrderBook 更新] best_bid={best_bid_value:.6f}, "
+                f"📊 [OrderBook 更新] {symbol} best_bid={best_bid_value:.6f}, "
                 f"best_ask={best_ask_value:.6f}, "
                 f"bids={len(bids)}, asks={len(asks)}"
             )
@@ -257,14 +574,79 @@ class OkxPublicWsGateway(WsBaseGateway):
         except Exception as e:
             logger.error(f"更新订单簿失败: {e}", exc_info=True)
 
+    def get_order_book(self, symbol: Optional[str] = None) -> Dict[str, list]:
+        """
+        获取交易对的订单簿缓存
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Dict[str, list]: {'bids': [...], 'asks': [...]}
+        """
+        return self._order_books.get(symbol or self.symbol, {'bids': [], 'asks': []})
+
+    def get_l2_book(self, symbol: Optional[str] = None) -> Optional[L2OrderBook]:
+        """
+        获取交易对的本地订单簿（当前订阅的订单簿频道维护）
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Optional[L2OrderBook]: 未订阅订单簿频道时返回 None
+        """
+        parser = self._book_parser(symbol or self.symbol)
+        return parser.book if parser is not None else None
+
+    def get_subscriptions(self) -> Dict[str, List[str]]:
+        """
+        获取当前订阅
+
+        Returns:
+            Dict[str, List[str]]: instId -> 频道列表
+        """
+        return {inst_id: sorted(channels) for inst_id, channels in self._subscriptions.items()}
+
+    def get_symbol_message_counts(self) -> Dict[str, int]:
+        """
+        获取各交易对累计收到的推送数
+
+        Returns:
+            Dict[str, int]: instId -> 推送数
+        """
+        return dict(self._symbol_messages)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取连接状态（含订阅信息）
+
+        Returns:
+            dict: 状态信息
+        """
+        status = super().get_status()
+        status['symbols'] = len(self._subscriptions)
+        status['subscriptions'] = sum(len(channels) for channels in self._subscriptions.values())
+        status['unrouted'] = self._unrouted
+        status['book_resyncs'] = sum(
+            parser.get_stats()['resyncs']
+            for parsers in self._parsers.values()
+            for channel, parser in parsers.items() if channel in BOOK_CHANNELS
+        )
+        return status
+
     # 重写基类的 _on_connected 方法，订阅频道
     async def _on_connected(self):
         """
-        连接成功后的钩子（自动订阅频道）
+        连接成功后的钩子（重新订阅全部交易对的全部频道）
         """
-        logger.info("WebSocket 连接成功，准备订阅频道...")
+        logger.info(f"WebSocket 连接成功，准备订阅 {len(self._subscriptions)} 个交易对...")
         try:
-            # 订阅 trades 和 order_book 频道
-            await self.subscribe(['trades', 'books'])
+            args = [
+                self._channel_arg(channel, inst_id)
+                for inst_id, channels in self._subscriptions.items()
+                for channel in sorted(channels)
+            ]
+            await self._send_op("subscribe", args)
         except Exception as e:
             logger.error(f"订阅频道失败: {e}")
@@ -0,0 +1,407 @@
+"""
+OKX 冗余公共行情 (Redundant A/B Public Feeds)
+
+对同一组交易对同时打开两条（或更多）独立的公共 WebSocket 连接，按"先到先得"合并：
+- trades：按 tradeId 去重，每笔成交只有最先到达的副本交给 Parser
+- books：按 seqId 去重，只转发比已转发 seqId 更新的推送（每条连接内部有序，
+  因此合并后的增量序列仍然连续）；订单簿未同步时快照总是转发
+- 其他频道（tickers / candles）没有序号，只采用主连接（第一条）的推送
+
+单条连接的延迟尖峰或静默卡死对策略不可见：另一条连接的副本会先到。
+所有 Parser 状态（含增量订单簿）只在主连接上维护一份，备用连接只作为传输通道。
+
+按连接统计：推送数、抢先次数（win）、重复次数、胜率，以及落后副本相对首个副本的延迟分布。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...core.histogram import LatencyHistogram
+from .book_channels import BOOK_CHANNELS
+from .order_book import L2OrderBook
+from .ws_public_gateway import OkxPublicWsGateway
+
+logger = logging.getLogger(__name__)
+
+
+class _RecentKeys:
+    """有界的最近到达记录：键 -> (首次到达时间 ns, 连接序号)，超出容量时淘汰最旧的键"""
+
+    __slots__ = ('capacity', '_order', '_first')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._order = deque()
+        self._first: Dict[Any, Tuple[int, int]] = {}
+
+    def get(self, key) -> Optional[Tuple[int, int]]:
+        return self._first.get(key)
+
+    def add(self, key, arrival_ns: int, feed: int):
+        if len(self._order) >= self.capacity:
+            self._first.pop(self._order.popleft(), None)
+        self._order.append(key)
+        self._first[key] = (arrival_ns, feed)
+
+
+class _FeedStats:
+    """单条连接的仲裁统计"""
+
+    __slots__ = ('pushes', 'wins', 'duplicates', 'lag', 'last_push_ns')
+
+    def __init__(self):
+        self.pushes = 0       # 进入仲裁的推送数
+        self.wins = 0         # 最先到达的条目数（成交笔数 / 订单簿序号）
+        self.duplicates = 0   # 落后到达（被丢弃）的条目数
+        self.lag = LatencyHistogram()  # 落后副本相对首个副本的延迟（ns）
+        self.last_push_ns = 0
+
+
+class OkxRedundantPublicFeed:
+    """
+    OKX 冗余公共行情（A/B 连接先到先得合并）
+
+    接口与 OkxPublicWsGateway 保持一致（connect / disconnect / add_symbols /
+    remove_symbols / on_book_update / get_order_book / get_status），Engine 可直接替换使用。
+
+    Example:
+        >>> feed = OkxRedundantPublicFeed(['BTC-USDT-SWAP'], event_bus=bus)
+        >>> await feed.connect()
+        >>> feed.get_feed_stats()
+    """
+
+    # 每个交易对记住的最近 tradeId / seqId 数量（足以覆盖两条连接之间的最大延迟差）
+    RECENT_KEYS = 4096
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        ws_urls: Optional[Iterable[Optional[str]]] = None,
+        event_bus=None,
+        channels: Optional[Iterable[str]] = None,
+        feeds: int = 2,
+        latency_tracker=None
+    ):
+        """
+        初始化冗余行情
+
+        Args:
+            symbols (Iterable[str]): 交易对列表
+            ws_urls (Optional[Iterable[Optional[str]]]): 每条连接的 URL（None 表示默认实盘 URL），
+                                                          长度决定连接数；未指定时使用 feeds 条默认 URL
+            event_bus: 事件总线
+            channels (Optional[Iterable[str]]): 每个交易对订阅的频道
+            feeds (int): 未指定 ws_urls 时的连接数（至少 2）
+            latency_tracker: 行情延迟统计（FeedLatencyTracker，只有主连接的 Parser 发布事件）
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            raise ValueError("冗余行情至少需要一个交易对")
+        urls = list(ws_urls) if ws_urls else [None] * max(2, feeds)
+        if len(urls) < 2:
+            raise ValueError("冗余行情至少需要两条连接")
+
+        self._feeds: List[OkxPublicWsGateway] = [
+            OkxPublicWsGateway(
+                ws_url=url,
+                event_bus=event_bus,
+                symbols=symbols,
+                channels=channels,
+                name=f"okx_ws_public_{chr(ord('a') + index)}",
+                latency_tracker=latency_tracker if index == 0 else None
+            )
+            for index, url in enumerate(urls)
+        ]
+        self._feed_index: Dict[int, int] = {id(feed): index for index, feed in enumerate(self._feeds)}
+        for feed in self._feeds:
+            feed._arbiter = self
+
+        # 主连接：唯一维护 Parser 状态的连接
+        self._primary = self._feeds[0]
+        self.symbol = self._primary.symbol
+        self.channels = self._primary.channels
+
+        self._stats: List[_FeedStats] = [_FeedStats() for _ in self._feeds]
+        self._trade_ids: Dict[str, _RecentKeys] = {}   # instId -> 最近 tradeId
+        self._book_seqs: Dict[str, _RecentKeys] = {}   # instId -> 最近转发的 seqId
+        self._book_last_seq: Dict[str, int] = {}       # instId -> 已转发的最大 seqId
+
+        logger.info(
+            f"OkxRedundantPublicFeed 初始化: {len(symbols)} 个交易对, {len(self._feeds)} 条连接"
+        )
+
+    # ==================== 连接管理 ====================
+
+    async def connect(self) -> bool:
+        """
+        并发连接所有连接
+
+        Returns:
+            bool: 至少一条连接成功即返回 True
+        """
+        results = await asyncio.gather(*(feed.connect() for feed in self._feeds))
+        connected = sum(1 for result in results if result)
+        logger.info(f"OkxRedundantPublicFeed 已连接 {connected}/{len(self._feeds)} 条连接")
+        return connected > 0
+
+    async def disconnect(self):
+        """断开所有连接"""
+        await asyncio.gather(*(feed.disconnect() for feed in self._feeds))
+
+    def is_connected(self) -> bool:
+        """任一连接可用即视为已连接"""
+        return any(feed.is_connected() for feed in self._feeds)
+
+    @property
+    def reconnect_count(self) -> int:
+        """🔥 [Guardian] 所有连接的重连次数之和"""
+        return sum(feed.reconnect_count for feed in self._feeds)
+
+    @property
+    def symbols(self) -> List[str]:
+        return self._primary.symbols
+
+    # ==================== 订阅管理 ====================
+
+    async def add_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        在所有连接上追加交易对
+
+        Returns:
+            int: 新增的订阅数（按单条连接计）
+        """
+        symbols = list(symbols)
+        results = [await feed.add_symbols(symbols, channels) for feed in self._feeds]
+        return results[0]
+
+    async def remove_symbols(self, symbols: Iterable[str], channels: Optional[Iterable[str]] = None) -> int:
+        """
+        在所有连接上移除交易对
+
+        Returns:
+            int: 移除的订阅数（按单条连接计）
+        """
+        symbols = list(symbols)
+        results = [await feed.remove_symbols(symbols, channels) for feed in self._feeds]
+        for symbol in symbols:
+            if symbol not in self._primary.get_subscriptions():
+                self._trade_ids.pop(symbol, None)
+                self._book_seqs.pop(symbol, None)
+                self._book_last_seq.pop(symbol, None)
+        return results[0]
+
+    async def resubscribe(self, inst_id: str, channel: str) -> bool:
+        """
+        重新订阅以获取新快照（依次尝试各连接，成功一条即可）
+
+        Args:
+            inst_id (str): 交易对
+            channel (str): 频道
+
+        Returns:
+            bool: 是否发送成功
+        """
+        if channel in BOOK_CHANNELS:
+            self._book_last_seq.pop(inst_id, None)
+        for feed in self._feeds:
+            if await feed.resubscribe(inst_id, channel):
+                return True
+        return False
+
+    @property
+    def book_channel(self) -> Optional[str]:
+        return self._primary.book_channel
+
+    async def set_book_channel(self, channel: str) -> int:
+        """
+        在所有连接上切换订单簿频道（各频道的 seqId 互不相关，清空去重状态）
+
+        Returns:
+            int: 切换了频道的交易对数量（按单条连接计）
+        """
+        results = [await feed.set_book_channel(channel) for feed in self._feeds]
+        self.channels = self._primary.channels
+        self._book_seqs.clear()
+        self._book_last_seq.clear()
+        return results[0]
+
+    # ==================== 仲裁 ====================
+
+    async def on_push(self, feed: OkxPublicWsGateway, inst_id: str, channel: str, data: dict):
+        """
+        连接收到推送时的回调（由 OkxPublicWsGateway._dispatch 调用）
+
+        Args:
+            feed (OkxPublicWsGateway): 收到推送的连接
+            inst_id (str): 交易对
+            channel (str): 频道
+            data (dict): 解码后的推送
+        """
+        index = self._feed_index[id(feed)]
+        now_ns = time.monotonic_ns()
+        stats = self._stats[index]
+        stats.pushes += 1
+        stats.last_push_ns = now_ns
+
+        if channel == 'trades':
+            data = self._admit_trades(index, inst_id, data, now_ns)
+        elif channel in BOOK_CHANNELS:
+            data = self._admit_book(index, inst_id, data, now_ns)
+        elif index != 0:
+            # 没有序号的频道只采用主连接
+            return
+
+        if data is None:
+            return
+        parser = self._primary._parsers.get(inst_id, {}).get(channel)
+        if parser is not None:
+            await parser.process(data, feed._rx_received_ns)
+
+    def _record_duplicate(self, index: int, first: Optional[Tuple[int, int]], now_ns: int):
+        """记录一次落后到达"""
+        stats = self._stats[index]
+        stats.duplicates += 1
+        if first is not None and first[1] != index:
+            stats.lag.record(now_ns - first[0])
+
+    def _admit_trades(self, index: int, inst_id: str, data: dict, now_ns: int) -> Optional[dict]:
+        """
+        按 tradeId 去重
+
+        Returns:
+            Optional[dict]: 只包含首次到达成交的推送，全部重复时返回 None
+        """
+        seen = self._trade_ids.get(inst_id)
+        if seen is None:
+            seen = self._trade_ids[inst_id] = _RecentKeys(self.RECENT_KEYS)
+
+        trades = data.get('data') or []
+        fresh = []
+        for trade in trades:
+            trade_id = trade.get('tradeId') if isinstance(trade, dict) else None
+            if trade_id is None:
+                fresh.append(trade)
+                continue
+            first = seen.get(trade_id)
+            if first is not None:
+                self._record_duplicate(index, first, now_ns)
+                continue
+            seen.add(trade_id, now_ns, index)
+            self._stats[index].wins += 1
+            fresh.append(trade)
+
+        if not fresh:
+            return None
+        if len(fresh) == len(trades):
+            return data
+        return dict(data, data=fresh)
+
+    def _admit_book(self, index: int, inst_id: str, data: dict, now_ns: int) -> Optional[dict]:
+        """
+        按 seqId 去重（每条推送只有一项 data）
+
+        Returns:
+            Optional[dict]: 需要转发时返回原推送，否则 None
+        """
+        entries = data.get('data') or []
+        if len(entries) != 1:
+            return data if index == 0 else None
+        seq_id = int(entries[0].get('seqId', -1))
+        if seq_id < 0:
+            # 没有序号（如 books5），只采用主连接
+            return data if index == 0 else None
+
+        recent = self._book_seqs.get(inst_id)
+        if recent is None:
+            recent = self._book_seqs[inst_id] = _RecentKeys(self.RECENT_KEYS)
+
+        last_seq = self._book_last_seq.get(inst_id, -1)
+        if seq_id <= last_seq:
+            snapshot = data.get('action', 'snapshot') == 'snapshot'
+            book = self._primary.get_l2_book(inst_id)
+            if not (snapshot and book is not None and not book.synced):
+                self._record_duplicate(index, recent.get(seq_id), now_ns)
+                return None
+
+        self._book_last_seq[inst_id] = seq_id
+        if recent.get(seq_id) is None:
+            recent.add(seq_id, now_ns, index)
+        self._stats[index].wins += 1
+        return data
+
+    # ==================== 统计 ====================
+
+    def get_feed_stats(self) -> List[Dict[str, Any]]:
+        """
+        获取各连接的仲裁统计
+
+        Returns:
+            List[Dict[str, Any]]: [{name, connected, pushes, wins, duplicates, win_rate,
+                                    lag_p50_ms, lag_p99_ms, lag_max_ms, last_push_age_s, reconnects}, ...]
+        """
+        now_ns = time.monotonic_ns()
+        result = []
+        for feed, stats in zip(self._feeds, self._stats):
+            contested = stats.wins + stats.duplicates
+            result.append({
+                'name': feed.name,
+                'connected': feed.is_connected(),
+                'pushes': stats.pushes,
+                'wins': stats.wins,
+                'duplicates': stats.duplicates,
+                'win_rate': stats.wins / contested if contested else 0.0,
+                'lag_p50_ms': stats.lag.percentile(50) / 1e6 if stats.lag.count else 0.0,
+                'lag_p99_ms': stats.lag.percentile(99) / 1e6 if stats.lag.count else 0.0,
+                'lag_max_ms': stats.lag.max_ns / 1e6,
+                'last_push_age_s': (now_ns - stats.last_push_ns) / 1e9 if stats.last_push_ns else None,
+                'reconnects': feed.reconnect_count
+            })
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取冗余行情状态
+
+        Returns:
+            dict: 状态信息
+        """
+        return {
+            'connected': self.is_connected(),
+            'feeds': len(self._feeds),
+            'feeds_connected': sum(1 for feed in self._feeds if feed.is_connected()),
+            'symbols': len(self.symbols),
+            'feed_stats': self.get_feed_stats()
+        }
+
+    # ==================== 订单簿缓存（兼容 OkxPublicWsGateway） ====================
+
+    def on_book_update(self, event):
+        """BOOK_EVENT 处理器：订单簿缓存只在主连接上维护"""
+        self._primary.on_book_update(event)
+
+    def get_order_book(self, symbol: Optional[str] = None) -> Dict[str, list]:
+        """
+        获取交易对的订单簿缓存
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Dict[str, list]: {'bids': [...], 'asks': [...]}
+        """
+        return self._primary.get_order_book(symbol)
+
+    def get_l2_book(self, symbol: Optional[str] = None) -> Optional[L2OrderBook]:
+        """
+        获取交易对的全深度增量订单簿（主连接维护）
+
+        Args:
+            symbol (Optional[str]): 交易对，None 表示主交易对
+
+        Returns:
+            Optional[L2OrderBook]: 未订阅 books 频道时返回 None
+        """
+        return self._primary.get_l2_book(symbol)
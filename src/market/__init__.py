@@ -5,9 +5,12 @@
 """
 
 from .market_data_manager import MarketDataManager, OrderBookSnapshot, TickerSnapshot
+from .feed_latency import FeedLatency, FeedLatencyTracker
 
 __all__ = [
     'MarketDataManager',
     'OrderBookSnapshot',
-    'TickerSnapshot'
+    'TickerSnapshot',
+    'FeedLatency',
+    'FeedLatencyTracker'
 ]
@@ -0,0 +1,165 @@
+"""
+行情延迟统计 (Market Data Feed Latency)
+
+测量每条行情推送从交易所到策略的三段延迟，按 (频道, 交易对) 记录到固定内存的对数直方图：
+
+- exchange_to_receive：交易所时间戳（OKX ts）-> 本地收到 WebSocket 帧（墙钟，经时钟偏移校正）
+- receive_to_publish：收到帧 -> Parser 发布事件到事件总线（单调时钟）
+- publish_to_handler：事件入队 -> 事件总线调用策略处理器（单调时钟，每个策略处理器记一个样本）
+
+时钟偏移校正：本地墙钟加上 src.utils.auth.get_time_offset()（check_time_sync 测得、
+set_time_offset 设置的 OKX 服务器时间偏差）后再与交易所时间戳比较；偏移变化后调用 sync_clock()。
+校正后仍为负的样本（时钟漂移）按 0 计入直方图，并单独计数。
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.event_types import Event
+from ..core.histogram import LatencyHistogram
+from ..utils.auth import get_time_offset
+
+_monotonic_ns = time.monotonic_ns
+_time_ns = time.time_ns
+
+
+class FeedLatency:
+    """单个 (频道, 交易对) 的延迟直方图（Parser 持有引用，热路径无字典查找）"""
+
+    __slots__ = ('channel', 'symbol', 'exchange_to_receive', 'receive_to_publish', 'publish_to_handler',
+                 'clock_skew', '_tracker')
+
+    def __init__(self, channel: str, symbol: str, tracker: 'FeedLatencyTracker'):
+        self.channel = channel
+        self.symbol = symbol
+        self.exchange_to_receive = LatencyHistogram()
+        self.receive_to_publish = LatencyHistogram()
+        self.publish_to_handler = LatencyHistogram()
+        self.clock_skew = 0  # 校正后交易所时间戳仍晚于本地收到时间的样本数
+        self._tracker = tracker
+
+    def on_publish(self, exchange_ts: int, received_ns: int):
+        """
+        Parser 发布事件后调用
+
+        收到帧时的墙钟时间由单调时钟差值换算（接收循环只需记录一次单调时钟）。
+
+        Args:
+            exchange_ts (int): 交易所时间戳（毫秒，0 表示未知）
+            received_ns (int): 收到帧的时间（time.monotonic_ns）
+        """
+        now_ns = _monotonic_ns()
+        since_receive_ns = now_ns - received_ns
+        self.receive_to_publish.record(since_receive_ns)
+        if exchange_ts:
+            received_wall_ns = _time_ns() - since_receive_ns + self._tracker.clock_offset_ns
+            delay_ns = received_wall_ns - exchange_ts * 1_000_000
+            if delay_ns < 0:
+                self.clock_skew += 1
+            self.exchange_to_receive.record(delay_ns)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取统计快照（毫秒）
+
+        Returns:
+            Dict[str, Any]: 三段延迟的直方图快照和时钟漂移样本数
+        """
+        return {
+            'exchange_to_receive': self.exchange_to_receive.snapshot(),
+            'receive_to_publish': self.receive_to_publish.snapshot(),
+            'publish_to_handler': self.publish_to_handler.snapshot(),
+            'clock_skew': self.clock_skew
+        }
+
+    def reset(self):
+        """清空样本"""
+        self.exchange_to_receive.reset()
+        self.receive_to_publish.reset()
+        self.publish_to_handler.reset()
+        self.clock_skew = 0
+
+
+class FeedLatencyTracker:
+    """
+    行情延迟统计中心
+
+    网关为每个 (频道, 交易对) 的 Parser 分配一个 FeedLatency；
+    on_dispatch 作为策略处理器的探针（EventBus.register 的 probe）在调用策略前执行，
+    按 (事件来源, 交易对) 找到对应直方图记录 publish_to_handler。
+
+    Example:
+        >>> tracker = FeedLatencyTracker()
+        >>> parser.latency = tracker.stream('trades', 'BTC-USDT-SWAP', source='trade_parser')
+        >>> bus.register(EventType.TICK, strategy.on_tick, probe=tracker.on_dispatch)
+        >>> tracker.get_stats()['trades']['BTC-USDT-SWAP']['exchange_to_receive']['p99_ms']
+    """
+
+    def __init__(self):
+        self._streams: Dict[Tuple[str, str], FeedLatency] = {}
+        self._by_source: Dict[Tuple[str, str], FeedLatency] = {}
+        self.clock_offset_ns = 0
+        self.sync_clock()
+
+    def sync_clock(self) -> float:
+        """
+        重新读取全局时钟偏移（set_time_offset 之后调用）
+
+        Returns:
+            float: 当前时钟偏移（秒）
+        """
+        offset = get_time_offset()
+        self.clock_offset_ns = int(offset * 1e9)
+        return offset
+
+    def stream(self, channel: str, symbol: str, source: Optional[str] = None) -> FeedLatency:
+        """
+        获取（必要时创建）(频道, 交易对) 的延迟直方图
+
+        Args:
+            channel (str): 频道
+            symbol (str): 交易对
+            source (Optional[str]): 该频道发布的事件的 source，用于 on_dispatch 匹配
+
+        Returns:
+            FeedLatency: 延迟直方图
+        """
+        key = (channel, symbol)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = FeedLatency(channel, symbol, self)
+        if source is not None:
+            self._by_source[(source, symbol)] = stream
+        return stream
+
+    def on_dispatch(self, event: Event, dispatch_ns: int):
+        """
+        事件总线探针：记录事件入队到调用策略处理器的延迟
+
+        Args:
+            event (Event): 行情事件（TICK / TRADE_BATCH / BOOK_EVENT）
+            dispatch_ns (int): 调用策略处理器的时间（time.monotonic_ns）
+        """
+        if not event.enqueued_ns:
+            return
+        stream = self._by_source.get((event.source, event.data.get('symbol')))
+        if stream is not None:
+            stream.publish_to_handler.record(dispatch_ns - event.enqueued_ns)
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        获取所有频道 / 交易对的延迟统计
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: 频道 -> 交易对 -> 统计快照
+        """
+        stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (channel, symbol), stream in self._streams.items():
+            if stream.receive_to_publish.count or stream.publish_to_handler.count:
+                stats.setdefault(channel, {})[symbol] = stream.snapshot()
+        return stats
+
+    def reset(self):
+        """清空所有样本（保留直方图，Parser 持有的引用继续有效）"""
+        for stream in self._streams.values():
+            stream.reset()
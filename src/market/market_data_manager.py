@@ -2,7 +2,7 @@
 MarketDataManager - 统一行情数据管理中心
 
 职责：
-- 订阅 BOOK_EVENT 和 TICK_EVENT
+- 订阅 BOOK_EVENT、TICK_EVENT 和 TRADE_BATCH
 - 维护全局最新的 L2 OrderBook 和 Ticker 状态
 - 提供只读快照给策略和组件
 - 线程安全（asyncio.Lock）
@@ -12,7 +12,7 @@ MarketDataManager - 统一行情数据管理中心
 import copy  # 🔧 [新增] 用于深拷贝，防止数据被外部修改
 import asyncio
 import time
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import time as time_module
 
@@ -69,6 +69,9 @@ class MarketDataManager:
         # 订单簿状态（按 symbol 索引）
         self._order_books: Dict[str, Dict] = {}  # {symbol: {'bids': ..., 'asks': ...}}
 
+        # 🔥 [新增] 全深度订单簿来源（公共 WS 网关 / 连接池，提供 get_l2_book）
+        self._book_source = None
+
         # 行情状态（按 symbol 索引）
         self._tickers: Dict[str, Dict] = {}  # {symbol: {...}}
 
@@ -88,8 +91,11 @@ class MarketDataManager:
     def _subscribe_to_events(self):
         """订阅 BOOK_EVENT 和 TICK"""
         self._event_bus.register(EventType.BOOK_EVENT, self._on_book_event)
-        self._event_bus.register(EventType.TICK, self._on_tick_event)
-        logger.info("📊 MarketDataManager 已订阅 BOOK_EVENT 和 TICK")
+        # 🔥 [优化] TICK 只折叠为每个 symbol 的最新价，使用批量分发（一批只写一次）
+        self._event_bus.register_batch(EventType.TICK, self._on_tick_batch, max_batch=50)
+        # 🔥 [新增] 聚合模式下一帧成交只有一个 TRADE_BATCH 事件
+        self._event_bus.register(EventType.TRADE_BATCH, self._on_trade_batch)
+        logger.info("📊 MarketDataManager 已订阅 BOOK_EVENT、TICK 和 TRADE_BATCH")
 
     async def _on_book_event(self, event: Event):
         """
@@ -154,6 +160,41 @@ class MarketDataManager:
 
         logger.debug(f"📊 [MarketDataManager] 更新 Ticker: {symbol}")
 
+    def _on_tick_batch(self, events: List[Event]):
+        """
+        批量处理 Tick 事件（同一批中每个 symbol 只保留最后一笔）
+
+        Args:
+            events: TICK_EVENT 列表（按分发顺序）
+        """
+        latest: Dict[str, dict] = {}
+        for event in events:
+            data = event.data
+            symbol = data.get('symbol')
+            if symbol:
+                latest[symbol] = data
+
+        for symbol, data in latest.items():
+            self._tickers[symbol] = {
+                'last_price': float(data.get('price', 0)),
+                'timestamp': data.get('timestamp', 0) / 1000.0
+            }
+
+    def _on_trade_batch(self, event: Event):
+        """
+        处理成交聚合事件（整帧只写一次最新价）
+
+        Args:
+            event: TRADE_BATCH 事件
+        """
+        data = event.data
+        symbol = data.get('symbol')
+        if symbol:
+            self._tickers[symbol] = {
+                'last_price': float(data.get('last_price', 0)),
+                'timestamp': data.get('timestamp', 0) / 1000.0
+            }
+
     def get_order_book_snapshot(self, symbol: str) -> Optional[OrderBookSnapshot]:
         """
         获取订单簿快照（只读，不可变）
@@ -259,10 +300,22 @@ class MarketDataManager:
             'timestamp': order_book.get('timestamp')
         }
 
+    def set_book_source(self, source):
+        """
+        🔥 [新增] 设置全深度订单簿来源
+
+        Args:
+            source: 提供 get_l2_book(symbol) 的对象（OkxPublicWsGateway / OkxPublicWsPool）
+        """
+        self._book_source = source
+
     def get_order_book_depth(self, symbol: str, levels: int = 3) -> Dict:
         """
         获取订单簿深度（用于流动性保护）
 
+        🔥 [优化] 有全深度订单簿时直接读取其前 N 档视图（不受 BOOK_EVENT 档位数限制，
+        同一版本内重复读取走缓存）；否则退回 BOOK_EVENT 缓存，只切片不构造完整快照
+
         Args:
             symbol: 交易对
             levels: 档位数量
@@ -270,18 +323,21 @@ class MarketDataManager:
         Returns:
             Dict: {'bids': [...], 'asks': [...]}
         """
-        snapshot = self.get_order_book_snapshot(symbol)
+        if self._book_source is not None:
+            book = self._book_source.get_l2_book(symbol)
+            if book is not None and book.synced:
+                bids, asks = book.top(levels)
+                return {'bids': list(bids), 'asks': list(asks)}
+
+        order_book = self._order_books.get(symbol)
 
-        if not snapshot:
+        if not order_book:
             return {'bids': [], 'asks': []}
 
         # 截取指定档位
-        bids = snapshot.bids[:levels]
-        asks = snapshot.asks[:levels]
-
         return {
-            'bids': [(p, s) for p, s in bids],
-            'asks': [(p, s) for p, s in asks]
+            'bids': [(float(b[0]), float(b[1])) for b in order_book['bids'][:levels]],
+            'asks': [(float(a[0]), float(a[1])) for a in order_book['asks'][:levels]]
         }
 
     def get_latency_stats(self) -> Dict:
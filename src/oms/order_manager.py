@@ -2,12 +2,19 @@
 订单管理器
 """
 
+import asyncio
 import logging
 import time
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from dataclasses import dataclass
 from ..core.event_types import Event, EventType
+from ..core.histogram import LatencyHistogram
 from ..gateways.base_gateway import RestGateway
+from ..gateways.okx.order_params import (
+    CANCEL_DONE_CODES, EXP_TIME_MARGIN, STOP_ORDER_TYPES, build_attach_algo, new_cl_ord_id
+)
+from ..gateways.okx.ws_private_gateway import OrderOpUnconfirmed
+from ..utils.auth import get_time_offset
 from ..risk.pre_trade import PreTradeCheck
 from ..risk.risk_guardian import RiskGuardian
 
@@ -29,6 +36,8 @@ class Order:
     raw: dict = None
     stop_loss_order_id: str = None  # 关联的止损订单 ID
     stop_loss_price: Optional[float] = None  # 🔥 修复：保存止损价格，防止成交回调中丢失
+    attach_algo_cl_ord_id: Optional[str] = None  # 🔥 [新增] 下单时附带的止损 / 止盈（attachAlgoClOrdId）
+    attach_algo_id: Optional[str] = None  # 🔥 [新增] 交易所分配的附带止损 / 止盈 ID（attachAlgoId，来自订单推送）
 
 
 class OrderManager:
@@ -36,16 +45,25 @@ class OrderManager:
     订单管理器
 
     负责订单生命周期的管理，包括下单、撤单和状态跟踪。
-    硬止损策略：订单成交后立即发送止损订单到交易所。
+    硬止损策略：🔥 [优化] 开仓单提供 stop_loss_price 时随下单请求附带止损（attachAlgoOrds），
+    成交即受保护；未附带止损的订单仍在成交后立即发送止损订单到交易所。
+
+    🔥 [新增] 下单 / 撤单 / 改单可走私有 WebSocket（transport='ws'）：
+    WebSocket 未登录、超时或断开时自动回退到 REST；两条通道的确认延迟分别记录到直方图。
     """
 
+    TRANSPORTS = ('rest', 'ws')
+
     def __init__(
         self,
         rest_gateway: RestGateway,
         event_bus=None,
         pre_trade_check: Optional[PreTradeCheck] = None,
         capital_commander=None,
-        risk_guardian: Optional[RiskGuardian] = None
+        risk_guardian: Optional[RiskGuardian] = None,
+        private_ws=None,
+        order_transport: str = 'rest',
+        attach_stop_loss: bool = True
     ):
         """
         初始化订单管理器
@@ -56,12 +74,27 @@ class OrderManager:
             pre_trade_check (PreTradeCheck): 交易前检查器（已弃用，使用 risk_guardian）
             capital_commander: 资金指挥官（用于购买力检查）
             risk_guardian (RiskGuardian): 风控守卫（统一风控入口）
+            private_ws: 私有 WebSocket 网关（OkxPrivateWsGateway，用于 WebSocket 交易）
+            order_transport (str): 默认交易通道（rest / ws），每次调用可用 transport 参数覆盖
+            attach_stop_loss (bool): 开仓单是否附带止损 / 止盈（False 时成交后再下止损单）
         """
+        if order_transport not in self.TRANSPORTS:
+            raise ValueError(f"未知的交易通道: {order_transport}，可选: {self.TRANSPORTS}")
+
         self._rest_gateway = rest_gateway
         self._event_bus = event_bus
         self._pre_trade_check = pre_trade_check or PreTradeCheck()  # 保留兼容性
         self._capital_commander = capital_commander
         self._risk_guardian = risk_guardian  # 🔥 新增：统一风控入口
+        self._private_ws = private_ws
+        self.order_transport = order_transport
+        self.attach_stop_loss = attach_stop_loss
+
+        # 🔥 [新增] 确认延迟 {transport: {op: LatencyHistogram}}，op = place / cancel / amend
+        self._ack_latency: Dict[str, Dict[str, LatencyHistogram]] = {t: {} for t in self.TRANSPORTS}
+        self._ws_fallbacks = 0
+        self._ws_reconciled = 0  # WebSocket 下单未确认、查询发现订单已在交易所的次数
+        self.exp_time_margin = EXP_TIME_MARGIN  # 未确认请求在 expTime 之后再等待的余量（秒）
 
         # 本地订单 {order_id: Order}
         self._orders: Dict[str, Order] = {}
@@ -75,6 +108,9 @@ class OrderManager:
         # 止损订单映射 {open_order_id: stop_loss_order_id}
         self._stop_loss_orders: Dict[str, str] = {}
 
+        # 🔥 [新增] 已生效的附带止损 {symbol: {open_order_id: 开仓订单}}（持仓归零时撤销）
+        self._attached_stop_losses: Dict[str, Dict[str, Order]] = {}
+
         # 订阅事件
         if self._event_bus:
             self._event_bus.register(EventType.ORDER_UPDATE, self.on_order_update)
@@ -93,10 +129,227 @@ class OrderManager:
         price: Optional[float] = None,
         strategy_id: str = "default",
         stop_loss_price: Optional[float] = None,
+        transport: Optional[str] = None,
         **kwargs
     ) -> Optional[Order]:
         """
         提交订单（已修复市价单日志崩溃问题）
+
+        transport 为 None 时使用 order_transport；走 WebSocket 时预先生成 clOrdId：
+        超时 / 断连未确认时等到 expTime 过去后按 clOrdId 查询订单，订单未到达交易所才用同一个 clOrdId 回退到 REST。
+        """
+        # 交易前风控（价格 / 名义价值 / RiskGuardian 或 PreTradeCheck + 资金检查）
+        size = self._validate_order(symbol, side, order_type, size, price, strategy_id, stop_loss_price, kwargs)
+        if size is None:
+            return None
+
+        # 调用 Gateway 下单
+        order_kwargs = dict(
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            size=size,
+            price=price,
+            strategy_id=strategy_id,
+            stop_loss_price=stop_loss_price,
+            **kwargs
+        )
+        if self._use_ws(transport):
+            order_kwargs.setdefault('clOrdId', new_cl_ord_id(strategy_id))
+        attach_algo_cl_ord_id = self._attach_protection(order_kwargs)
+        response = await self._send(
+            'place', transport,
+            lambda: self._private_ws.place_order(**order_kwargs),
+            lambda: self._rest_gateway.place_order(**order_kwargs),
+            reconcile=lambda: self._find_unconfirmed_order(symbol, order_kwargs['clOrdId'])
+        )
+
+        order = self._track_submitted(response, symbol, side, order_type, size, price, strategy_id, stop_loss_price,
+                                      attach_algo_cl_ord_id)
+        if order and response.get('state') == 'filled':
+            # 未确认期间已成交：成交推送先于本地订单到达，没有触发止损，补走成交处理
+            await self.on_order_filled(Event(
+                type=EventType.ORDER_FILLED,
+                data={
+                    'order_id': order.order_id,
+                    'symbol': symbol,
+                    'side': side,
+                    'filled_size': order.filled_size,
+                    'status': 'filled',
+                    'raw': response
+                },
+                source="order_manager"
+            ))
+        return order
+
+    async def _find_unconfirmed_order(self, symbol: str, cl_ord_id: str) -> Optional[Dict[str, Any]]:
+        """
+        🔥 [新增] WebSocket 下单未确认：按 clOrdId 查询订单是否已到达交易所
+
+        调用前 _send 已等到请求的 expTime（加时钟偏移余量）过去：交易所不再执行这个请求，查询结果不会再变化。
+        交易所只在第一笔订单未结束时拒绝重复的 clOrdId：订单已挂单或已成交时直接重发会得到
+        51016 拒绝（挂单无人跟踪）或重复下单（已成交），所以必须先查询。
+
+        Args:
+            symbol (str): 交易对
+            cl_ord_id (str): Client Order ID
+
+        Returns:
+            Optional[dict]: 订单已到达时返回下单响应格式的数据（ordId / clOrdId / fillSz / state），
+                未到达返回 None（可以回退到 REST）
+
+        Raises:
+            Exception: 查询失败（订单状态未知，不回退到 REST）
+        """
+        order = await self._rest_gateway.get_order_by_cl_ord_id(symbol, cl_ord_id)
+        if not order:
+            return None
+
+        logger.warning(
+            f"⚠️ WS 下单未确认，但订单已在交易所: clOrdId={cl_ord_id}, "
+            f"ordId={order.get('ordId')}, state={order.get('state')}"
+        )
+        return {
+            'ordId': order.get('ordId'),
+            'clOrdId': cl_ord_id,
+            'fillSz': order.get('accFillSz') or '0',
+            'state': order.get('state'),
+            'sCode': '0',
+            'sMsg': ''
+        }
+
+    async def submit_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Optional[Order]]:
+        """
+        🔥 [新增] 批量下单（挂单组合 / 多交易对调仓）
+
+        每个订单单独过交易前风控，通过的订单合并为 batch-orders 请求（每 20 个一次请求），
+        结果逐单映射回本地订单。
+
+        Args:
+            orders (list): 订单列表，每项为 submit_order 的参数
+                {'symbol', 'side', 'order_type', 'size', 'price', 'strategy_id', 'stop_loss_price', ...}
+
+        Returns:
+            List[Optional[Order]]: 与 orders 顺序一致，风控拒绝或交易所拒绝的订单为 None
+        """
+        submitted: List[Optional[Order]] = [None] * len(orders)
+        accepted = []  # (下标, 下单参数)
+        for index, spec in enumerate(orders):
+            params = dict(spec)
+            params.setdefault('price', None)
+            params.setdefault('strategy_id', 'default')
+            params.setdefault('stop_loss_price', None)
+            extra = {k: v for k, v in params.items()
+                     if k not in ('symbol', 'side', 'order_type', 'size', 'price', 'strategy_id', 'stop_loss_price')}
+
+            size = self._validate_order(params['symbol'], params['side'], params['order_type'], params['size'],
+                                        params['price'], params['strategy_id'], params['stop_loss_price'], extra)
+            if size is None:
+                continue
+            params['size'] = size
+            params['attach_algo_cl_ord_id'] = self._attach_protection(params)
+            accepted.append((index, params))
+
+        if not accepted:
+            return submitted
+
+        start_ns = time.monotonic_ns()
+        results = await self._rest_gateway.place_batch_orders([
+            {k: v for k, v in params.items() if k != 'attach_algo_cl_ord_id'} for _, params in accepted
+        ])
+        self._record_ack('rest', 'place_batch', start_ns)
+
+        for (index, params), result in zip(accepted, results):
+            if result.get('sCode') != '0':
+                logger.error(
+                    f"下单失败: {params['symbol']} {params['side']} {params['size']:.4f} - "
+                    f"sCode={result.get('sCode')}, sMsg={result.get('sMsg')}"
+                )
+                continue
+            submitted[index] = self._track_submitted(
+                result, params['symbol'], params['side'], params['order_type'], params['size'],
+                params['price'], params['strategy_id'], params['stop_loss_price'], params['attach_algo_cl_ord_id']
+            )
+
+        logger.info(f"批量下单完成: 成功 {sum(1 for o in submitted if o)}/{len(orders)}")
+        return submitted
+
+    async def amend_batch_orders(self, amends: List[Dict[str, Any]]) -> List[bool]:
+        """
+        🔥 [新增] 批量改单
+
+        Args:
+            amends (list): [{'order_id', 'symbol', 'new_size', 'new_price'}, ...]
+
+        Returns:
+            List[bool]: 与 amends 顺序一致，交易所是否受理
+        """
+        accepted = [a for a in amends
+                    if a['order_id'] in self._orders
+                    and self._orders[a['order_id']].status not in ['filled', 'cancelled']]
+        if not accepted:
+            return [False] * len(amends)
+
+        start_ns = time.monotonic_ns()
+        results = await self._rest_gateway.amend_batch_orders(accepted)
+        self._record_ack('rest', 'amend_batch', start_ns)
+
+        amended = {}
+        for amend, result in zip(accepted, results):
+            ok = result.get('sCode') == '0'
+            amended[amend['order_id']] = ok
+            if not ok:
+                logger.error(f"改单失败: {amend['order_id']} - sCode={result.get('sCode')}, sMsg={result.get('sMsg')}")
+                continue
+            order = self._orders[amend['order_id']]
+            if amend.get('new_price') is not None:
+                order.price = amend['new_price']
+            if amend.get('new_size') is not None:
+                order.size = amend['new_size']
+
+        return [amended.get(a['order_id'], False) for a in amends]
+
+    def _attach_protection(self, order_kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        🔥 [新增] 开仓单附带止损 / 止盈（attachAlgoOrds）
+
+        提供 stop_loss_price 的开仓单在同一个下单请求里带上止损（take_profit_price 同时带上止盈），
+        成交时交易所自动生成止损单，成交推送后不再需要单独的 REST 止损请求。
+        止损单、只减仓单和关闭 attach_stop_loss 时不附带，成交后走 _place_stop_loss_order。
+
+        Args:
+            order_kwargs (dict): 下单参数（原地添加 attachAlgoOrds，移除 take_profit_price）
+
+        Returns:
+            Optional[str]: 附带止损的 attachAlgoClOrdId，未附带时返回 None
+        """
+        take_profit_price = order_kwargs.pop('take_profit_price', None)
+        stop_loss_price = order_kwargs.get('stop_loss_price')
+        if (not self.attach_stop_loss or not stop_loss_price or stop_loss_price <= 0 or
+                order_kwargs.get('order_type') in STOP_ORDER_TYPES or
+                order_kwargs.get('reduce_only') or order_kwargs.get('reduceOnly')):
+            return None
+
+        algo_cl_ord_id = new_cl_ord_id(order_kwargs.get('strategy_id', 'default'))
+        order_kwargs['attachAlgoOrds'] = build_attach_algo(algo_cl_ord_id, stop_loss_price, take_profit_price)
+        return algo_cl_ord_id
+
+    def _validate_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        size: float,
+        price: Optional[float],
+        strategy_id: str,
+        stop_loss_price: Optional[float],
+        kwargs: dict
+    ) -> Optional[float]:
+        """
+        交易前风控（submit_order / submit_batch_orders 共用）
+
+        Returns:
+            Optional[float]: 风控通过后的下单数量（可能被 RiskGuardian 调整），拒绝时返回 None
         """
         # 🔥 修复：处理市价单的 price=None 问题（防止 NoneType 比较错误）
         # 1. 确定计算价值用的价格
@@ -220,18 +473,26 @@ class OrderManager:
         # - 检查持仓限制
         # - 检查风险参数
 
-        # 调用 Gateway 下单
-        response = await self._rest_gateway.place_order(
-            symbol=symbol,
-            side=side,
-            order_type=order_type,
-            size=size,
-            price=price,
-            strategy_id=strategy_id,
-            stop_loss_price=stop_loss_price,
-            **kwargs
-        )
+        return size
+
+    def _track_submitted(
+        self,
+        response: Optional[dict],
+        symbol: str,
+        side: str,
+        order_type: str,
+        size: float,
+        price: Optional[float],
+        strategy_id: str,
+        stop_loss_price: Optional[float],
+        attach_algo_cl_ord_id: Optional[str] = None
+    ) -> Optional[Order]:
+        """
+        记录交易所已接受的订单并推送 ORDER_SUBMITTED（submit_order / submit_batch_orders 共用）
 
+        Returns:
+            Optional[Order]: 本地订单，响应无效时返回 None
+        """
         if not response:
             logger.error(f"下单失败: {symbol} {side} {size:.4f}")
             return None
@@ -255,6 +516,7 @@ class OrderManager:
             status='live',
             strategy_id=strategy_id,
             stop_loss_price=stop_loss_price,  # 保存止损价格
+            attach_algo_cl_ord_id=attach_algo_cl_ord_id,
             raw=response  # raw字段已经包含了完整数据
         )
 
@@ -298,7 +560,8 @@ class OrderManager:
     async def cancel_order(
         self,
         order_id: str,
-        symbol: str
+        symbol: str,
+        transport: Optional[str] = None
     ) -> bool:
         """
         撤销订单
@@ -306,6 +569,7 @@ class OrderManager:
         Args:
             order_id (str): 订单 ID
             symbol (str): 交易对
+            transport (Optional[str]): 交易通道（rest / ws），None 使用 order_transport
 
         Returns:
             bool: 撤单是否成功
@@ -327,9 +591,10 @@ class OrderManager:
                 return False
 
             # 调用 Gateway 撤单
-            response = await self._rest_gateway.cancel_order(
-                order_id=order_id,
-                symbol=symbol
+            response = await self._send(
+                'cancel', transport,
+                lambda: self._private_ws.cancel_order(order_id=order_id, symbol=symbol),
+                lambda: self._rest_gateway.cancel_order(order_id=order_id, symbol=symbol)
             )
 
             if not response:
@@ -359,6 +624,168 @@ class OrderManager:
             logger.error(f"撤单异常: {e}")
             return False
 
+    async def amend_order(
+        self,
+        order_id: str,
+        symbol: str,
+        new_size: Optional[float] = None,
+        new_price: Optional[float] = None,
+        transport: Optional[str] = None,
+        stop_loss_price: Optional[float] = None
+    ) -> bool:
+        """
+        🔥 [新增] 改单（修改未成交订单的价格 / 数量，保留订单 ID）
+
+        Args:
+            order_id (str): 订单 ID
+            symbol (str): 交易对
+            new_size (Optional[float]): 新数量
+            new_price (Optional[float]): 新价格
+            transport (Optional[str]): 交易通道（rest / ws），None 使用 order_transport
+            stop_loss_price (Optional[float]): 新止损价格（随挂单价格调整；附带了止损的订单同时修改附带止损的触发价）
+
+        Returns:
+            bool: 交易所是否接受改单请求
+        """
+        order = self._orders.get(order_id)
+        if not order or order.status in ['filled', 'cancelled']:
+            logger.warning(f"订单不存在或已结束，无法改单: {order_id}")
+            return False
+
+        amend_kwargs = dict(order_id=order_id, symbol=symbol, new_size=new_size, new_price=new_price)
+        if stop_loss_price is not None and order.attach_algo_cl_ord_id:
+            amend_kwargs.update(new_stop_loss_price=stop_loss_price,
+                                attach_algo_cl_ord_id=order.attach_algo_cl_ord_id)
+
+        try:
+            response = await self._send(
+                'amend', transport,
+                lambda: self._private_ws.amend_order(**amend_kwargs),
+                lambda: self._rest_gateway.amend_order(**amend_kwargs)
+            )
+        except Exception as e:
+            logger.error(f"改单异常: {order_id} - {e}")
+            return False
+
+        if not response:
+            logger.error(f"改单失败: {order_id}")
+            return False
+
+        if new_price is not None:
+            order.price = new_price
+        if new_size is not None:
+            order.size = new_size
+        if stop_loss_price is not None:
+            order.stop_loss_price = stop_loss_price
+        logger.info(f"改单已受理: {order_id} price={order.price} size={order.size}")
+        return True
+
+    def _use_ws(self, transport: Optional[str]) -> bool:
+        """
+        本次调用是否走 WebSocket
+
+        Args:
+            transport (Optional[str]): 调用指定的通道，None 使用 order_transport
+
+        Returns:
+            bool: 选择 WebSocket 且私有 WebSocket 已登录
+        """
+        transport = transport or self.order_transport
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f"未知的交易通道: {transport}，可选: {self.TRANSPORTS}")
+        return transport == 'ws' and self._private_ws is not None and self._private_ws.is_trading_ready()
+
+    async def _send(
+        self,
+        op: str,
+        transport: Optional[str],
+        ws_call: Callable[[], Awaitable[Dict[str, Any]]],
+        rest_call: Callable[[], Awaitable[Dict[str, Any]]],
+        reconcile: Optional[Callable[[], Awaitable[Optional[Dict[str, Any]]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        按通道发送交易请求并记录确认延迟
+
+        WebSocket 请求未发出（未登录 / 发送失败）时直接回退到 REST。
+        已发出但超时或断连（请求可能已被执行）时，有 reconcile 则先等到 expTime 过去再查询：
+        查到结果直接返回，查不到才回退到 REST（撤单 / 改单重发无副作用，不需要 reconcile）。
+        交易所拒绝（ValueError）不回退，直接抛出。
+
+        Args:
+            op (str): place / cancel / amend
+            transport (Optional[str]): 交易通道
+            ws_call: WebSocket 请求
+            rest_call: REST 请求
+            reconcile: WebSocket 请求未确认时的查询（返回 None 表示请求未被执行）
+
+        Returns:
+            dict: 网关响应
+        """
+        if self._use_ws(transport):
+            start_ns = time.monotonic_ns()
+            try:
+                response = await ws_call()
+                self._record_ack('ws', op, start_ns)
+                return response
+            except (asyncio.TimeoutError, OrderOpUnconfirmed) as e:
+                logger.warning(f"⚠️ WS {op} 未确认（{type(e).__name__}: {e}）")
+                if reconcile is not None:
+                    await self._wait_for_op_expiry(e)
+                    response = await reconcile()
+                    if response is not None:
+                        self._ws_reconciled += 1
+                        return response
+                self._ws_fallbacks += 1
+                logger.warning(f"⚠️ WS {op} 未被执行，回退到 REST")
+            except ConnectionError as e:
+                self._ws_fallbacks += 1
+                logger.warning(f"⚠️ WS {op} 未发出（{e}），回退到 REST")
+
+        start_ns = time.monotonic_ns()
+        response = await rest_call()
+        self._record_ack('rest', op, start_ns)
+        return response
+
+    async def _wait_for_op_expiry(self, error: Exception):
+        """
+        等到未确认请求的 expTime 加余量过去，之后交易所不会再执行这个请求
+
+        超时：已等满 expTime 窗口，只需再等余量；断连：请求可能还在路上，等到 expTime 之后。
+
+        Args:
+            error (Exception): asyncio.TimeoutError 或带 exp_time_ms 的 OrderOpUnconfirmed
+        """
+        delay = self.exp_time_margin
+        exp_time_ms = getattr(error, 'exp_time_ms', None)
+        if exp_time_ms:
+            delay += exp_time_ms / 1000 - (time.time() + get_time_offset())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _record_ack(self, transport: str, op: str, start_ns: int):
+        """记录一次确认延迟"""
+        histogram = self._ack_latency[transport].get(op)
+        if histogram is None:
+            histogram = self._ack_latency[transport][op] = LatencyHistogram()
+        histogram.record(time.monotonic_ns() - start_ns)
+
+    def get_ack_latency_stats(self) -> Dict[str, Any]:
+        """
+        获取 REST / WebSocket 确认延迟对比（发送请求 -> 收到交易所响应）
+
+        Returns:
+            Dict[str, Any]: {op: {rest: 快照, ws: 快照}, ws_fallbacks: 回退次数,
+                ws_reconciled: 未确认但查询到订单已在交易所的次数}
+        """
+        stats: Dict[str, Any] = {}
+        for transport, histograms in self._ack_latency.items():
+            for op, histogram in histograms.items():
+                if histogram.count:
+                    stats.setdefault(op, {})[transport] = histogram.snapshot()
+        stats['ws_fallbacks'] = self._ws_fallbacks
+        stats['ws_reconciled'] = self._ws_reconciled
+        return stats
+
     async def cancel_all_orders(self, symbol: Optional[str] = None) -> int:
         """
         撤销所有订单
@@ -387,12 +814,8 @@ class OrderManager:
                     if order.status in ['pending', 'live']:
                         orders_to_cancel.append(order)
 
-            # 撤销订单
-            success_count = 0
-            for order in orders_to_cancel:
-                success = await self.cancel_order(order.order_id, order.symbol)
-                if success:
-                    success_count += 1
+            # 🔥 [优化] 批量撤单（每 20 个订单一次请求）
+            success_count = await self._cancel_batch(orders_to_cancel)
 
             logger.info(f"撤销订单完成: 成功 {success_count}/{len(orders_to_cancel)}")
             return success_count
@@ -401,6 +824,51 @@ class OrderManager:
             logger.error(f"撤销所有订单异常: {e}")
             return 0
 
+    async def _cancel_batch(self, orders: List[Order]) -> int:
+        """
+        批量撤单并逐单更新本地状态
+
+        订单已成交 / 已撤销 / 不存在（CANCEL_DONE_CODES）同样视为撤单成功。
+
+        Args:
+            orders (List[Order]): 待撤销的订单
+
+        Returns:
+            int: 成功撤销的订单数量
+        """
+        if not orders:
+            return 0
+
+        start_ns = time.monotonic_ns()
+        results = await self._rest_gateway.cancel_batch_orders([
+            {'order_id': order.order_id, 'symbol': order.symbol} for order in orders
+        ])
+        self._record_ack('rest', 'cancel_batch', start_ns)
+
+        success_count = 0
+        for order, result in zip(orders, results):
+            s_code = result.get('sCode')
+            if s_code != '0' and s_code not in CANCEL_DONE_CODES:
+                logger.error(f"撤单失败: {order.order_id} - sCode={s_code}, sMsg={result.get('sMsg')}")
+                continue
+
+            order.status = 'cancelled'
+            success_count += 1
+
+            if self._event_bus:
+                event = Event(
+                    type=EventType.ORDER_CANCELLED,
+                    data={
+                        'order_id': order.order_id,
+                        'symbol': order.symbol,
+                        'raw': result
+                    },
+                    source="order_manager"
+                )
+                self._event_bus.put_nowait(event, priority=5)  # ORDER_UPDATE 优先级
+
+        return success_count
+
     async def cancel_all_stop_loss_orders(self, symbol: str) -> int:
         """
         撤销指定交易对的所有止损单（幽灵单防护）
@@ -414,14 +882,16 @@ class OrderManager:
         注意：
             用于持仓归零时，撤销所有挂着的 reduce_only 止损单，
             防止止损单变成反向开仓单（幽灵单风险）。
+            🔥 [新增] 开仓单附带的止损（交易所侧的策略委托）同时撤销。
         """
         try:
             logger.info(f"撤销所有止损单: symbol={symbol}")
 
+            # 🔥 [新增] 附带止损按策略委托撤销
+            success_count = await self._cancel_attached_stop_losses(symbol)
+
             # 获取该交易对的所有订单
             orders = self._symbol_to_orders.get(symbol, {})
-            if not orders:
-                return 0
 
             # 筛选出所有止损单（order_type='stop_market'）
             stop_loss_orders_to_cancel = []
@@ -430,12 +900,9 @@ class OrderManager:
                     order.order_type == 'stop_market'):
                     stop_loss_orders_to_cancel.append(order)
 
-            # 撤销止损单
-            success_count = 0
-            for order in stop_loss_orders_to_cancel:
-                success = await self.cancel_order(order.order_id, order.symbol)
-                if success:
-                    success_count += 1
+            # 🔥 [优化] 批量撤销止损单
+            if stop_loss_orders_to_cancel:
+                success_count += await self._cancel_batch(stop_loss_orders_to_cancel)
 
             if success_count > 0:
                 logger.info(
@@ -448,6 +915,45 @@ class OrderManager:
             logger.error(f"撤销止损单异常: {e}", exc_info=True)
             return 0
 
+    async def _cancel_attached_stop_losses(self, symbol: str) -> int:
+        """
+        🔥 [新增] 撤销指定交易对已生效的附带止损
+
+        开仓单成交后交易所按 attachAlgoClOrdId 作为 algoClOrdId 生成策略委托（algoId 与 attachAlgoId 不同），
+        先查询未触发的策略委托取得 algoId，再通过 cancel-algos 撤销。已触发或已撤销的不在查询结果中。
+
+        Args:
+            symbol (str): 交易对
+
+        Returns:
+            int: 成功撤销的数量
+        """
+        attached = self._attached_stop_losses.pop(symbol, None)
+        if not attached:
+            return 0
+
+        cl_ord_ids = {order.attach_algo_cl_ord_id for order in attached.values()}
+        attach_ids = {order.attach_algo_id for order in attached.values() if order.attach_algo_id}
+        try:
+            pending = await self._rest_gateway.fetch_pending_algo_orders(symbol)
+            algo_ids = [algo['algoId'] for algo in pending
+                        if algo.get('algoClOrdId') in cl_ord_ids or algo.get('algoId') in attach_ids]
+            if not algo_ids:
+                return 0
+
+            results = await self._rest_gateway.cancel_algo_orders(
+                [{'algo_id': algo_id, 'symbol': symbol} for algo_id in algo_ids]
+            )
+        except Exception as e:
+            # 撤销失败：保留记录，下次持仓归零时重试
+            self._attached_stop_losses.setdefault(symbol, {}).update(attached)
+            logger.error(f"撤销附带止损失败: {symbol} - {e}")
+            return 0
+
+        success_count = sum(1 for r in results if r.get('sCode') == '0')
+        logger.info(f"撤销附带止损: {symbol} {success_count}/{len(algo_ids)}")
+        return success_count
+
     async def on_order_update(self, event: Event):
         """
         监听订单更新事件
@@ -490,6 +996,7 @@ class OrderManager:
                 order.filled_size = data.get('filled_size', order.filled_size)
                 order.status = data.get('status', order.status)
                 order.raw = data
+                self._link_attached_algo(order, data.get('raw'))
 
             logger.debug(
                 f"订单更新: {order_id} - status={order.status}, "
@@ -540,10 +1047,13 @@ class OrderManager:
                     f"{local_order.symbol} {local_order.side} {local_order.filled_size:.4f}"
                 )
 
-                # 硬止损执行：立即发送止损订单
-                # 只有开仓订单（买入/卖出）才需要止损
-                if local_order.order_id not in self._stop_loss_orders:
-                    await self._place_stop_loss_order(local_order, data)
+                # 硬止损执行：下单时已附带止损的订单由交易所在成交时生成止损单，
+                # 否则立即发送止损订单（只有开仓订单（买入/卖出）才需要止损）
+                if local_order.order_id not in self._stop_loss_orders and not local_order.stop_loss_order_id:
+                    if local_order.attach_algo_cl_ord_id:
+                        self._on_attached_stop_loss(local_order, data.get('raw'))
+                    else:
+                        await self._place_stop_loss_order(local_order, data)
 
                 # 清理已完成订单
                 self._cleanup_order(local_order.order_id)
@@ -551,6 +1061,41 @@ class OrderManager:
         except Exception as e:
             logger.error(f"处理订单成交事件失败: {e}", exc_info=True)
 
+    @staticmethod
+    def _link_attached_algo(order: Order, raw: Optional[dict]):
+        """
+        🔥 [新增] 从订单推送的 attachAlgoOrds 中记录交易所分配的 attachAlgoId
+
+        Args:
+            order (Order): 本地订单
+            raw (Optional[dict]): 订单推送原始数据
+        """
+        if not order.attach_algo_cl_ord_id or order.attach_algo_id or not isinstance(raw, dict):
+            return
+        for algo in raw.get('attachAlgoOrds') or ():
+            if algo.get('attachAlgoClOrdId') == order.attach_algo_cl_ord_id and algo.get('attachAlgoId'):
+                order.attach_algo_id = algo['attachAlgoId']
+                return
+
+    def _on_attached_stop_loss(self, open_order: Order, raw: Optional[dict]):
+        """
+        🔥 [新增] 附带止损的开仓单成交：止损单已由交易所生成，只记录关联关系
+
+        Args:
+            open_order (Order): 已成交的开仓订单
+            raw (Optional[dict]): 成交推送原始数据
+        """
+        self._link_attached_algo(open_order, raw)
+        stop_loss_id = open_order.attach_algo_id or open_order.attach_algo_cl_ord_id
+        self._stop_loss_orders[open_order.order_id] = stop_loss_id
+        open_order.stop_loss_order_id = stop_loss_id
+        self._attached_stop_losses.setdefault(open_order.symbol, {})[open_order.order_id] = open_order
+        logger.info(
+            f"✅ 硬止损已随开仓单生效: {stop_loss_id} - "
+            f"{open_order.symbol} {open_order.filled_size:.4f} @ {open_order.stop_loss_price} "
+            f"(关联开仓单: {open_order.order_id})"
+        )
+
     async def _place_stop_loss_order(self, open_order: Order, fill_data: dict, retry_count: int = 3):
         """
         放置止损订单（硬止损核心 + 重试机制 + 紧急平仓）
@@ -563,8 +1108,8 @@ class OrderManager:
         import asyncio
 
         try:
-            # 检查是否提供了止损价格
-            stop_loss_price = fill_data.get('stop_loss_price')
+            # 检查是否提供了止损价格（交易所成交推送不带止损价，回退到下单时保存的止损价）
+            stop_loss_price = fill_data.get('stop_loss_price') or open_order.stop_loss_price
 
             # 🔥 [Fix 3: 止损传播] 抑制平仓订单的警告
             # 平仓订单不需要止损，这是正常行为
@@ -881,4 +1426,5 @@ class OrderManager:
         self._orders.clear()
         self._symbol_to_orders.clear()
         self._stop_loss_orders.clear()
+        self._attached_stop_losses.clear()
         logger.info("订单管理器已重置")
@@ -16,6 +16,7 @@ from ..oms.order_manager import OrderManager
 from ..oms.capital_commander import CapitalCommander
 from ..config.risk_config import DEFAULT_RISK_CONFIG
 from ..config.risk_profile import RiskProfile, StopLossType, DEFAULT_CONSERVATIVE_PROFILE
+from ..gateways.okx.book_channels import BookRequirement
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +90,10 @@ class BaseStrategy(EventHandler):
         # [FIX] 冷却时间参数（默认 5.0 秒，可通过子类覆盖）
         self._cooldown_period = cooldown_seconds
 
+        # 🔥 [新增] 订单簿需求（所需档位数 + 延迟等级），Engine 据此选择订阅的订单簿频道
+        # None 表示不读取订单簿
+        self.book_requirement: Optional[BookRequirement] = None
+
         logger.info(
             f"策略初始化: {self.strategy_id}, symbol={symbol}, mode={mode}, cooldown={cooldown_seconds}s"
         )
@@ -113,6 +118,25 @@ class BaseStrategy(EventHandler):
         """
         pass
 
+    async def on_trade_batch(self, event: Event):
+        """
+        🔥 [新增] 处理成交聚合事件（TRADE_BATCH，TradeParser 聚合模式）
+
+        默认实现逐笔调用 on_tick，兼容只实现 on_tick 的策略；
+        子类可覆盖此方法，一次折叠整批成交（event.data.buy_notional / vwap 等）。
+
+        Args:
+            event (Event): TRADE_BATCH 事件，data 为 TradeBatchEvent
+        """
+        for tick in event.data.trades:
+            await self.on_tick(Event(
+                type=EventType.TICK,
+                data=tick,
+                source=event.source,
+                received_ns=event.received_ns,
+                exchange_ts=tick.timestamp
+            ))
+
     @abstractmethod
     async def on_signal(self, signal: Dict[str, Any]):
         """
@@ -429,6 +453,7 @@ class BaseStrategy(EventHandler):
         """
         # 注册核心事件处理器
         self.register(EventType.TICK, self.on_tick)
+        self.register(EventType.TRADE_BATCH, self.on_trade_batch)
         self.register(EventType.ORDER_FILLED, self.on_order_filled)
         self.register(EventType.ORDER_CANCELLED, self.on_order_cancelled)
         self.register(EventType.ORDER_SUBMITTED, self.on_order_submitted)
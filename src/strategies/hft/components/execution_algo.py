@@ -4,6 +4,7 @@ ExecutionAlgo - 执行算法
 负责 ScalperV1 策略的订单执行逻辑：
 - 挂单价格计算（Aggressive Maker / Conservative Maker）
 - 插队逻辑判断（Chasing Conditions）
+- 🔥 [新增] 追单方式：原地改价（amend）或撤单重挂（cancel_replace）
 - 模拟盘价格适配（Paper Trading Price Adjustment）
 
 设计原则：
@@ -32,6 +33,10 @@ class ExecutionConfig:
     min_order_life_seconds: float = 2.0
     aggressive_maker_spread_ticks: float = 2.0
     aggressive_maker_price_offset: float = 1.0
+    chase_mode: str = 'amend'  # 🔥 [新增] amend：原地改价（一次往返，无空档）；cancel_replace：撤单后重新挂单
+
+
+CHASE_MODES = ('amend', 'cancel_replace')
 
 
 @dataclass
@@ -78,6 +83,8 @@ class ExecutionAlgo:
         Args:
             config (ExecutionConfig): 执行配置
         """
+        if config.chase_mode not in CHASE_MODES:
+            raise ValueError(f"未知的追单方式: {config.chase_mode}，可选: {CHASE_MODES}")
         self.config = config
 
         logger.info(
@@ -85,7 +92,8 @@ class ExecutionAlgo:
             f"symbol={config.symbol}, "
             f"tick_size={config.tick_size}, "
             f"is_paper_trading={config.is_paper_trading}, "
-            f"enable_chasing={config.enable_chasing}"
+            f"enable_chasing={config.enable_chasing}, "
+            f"chase_mode={config.chase_mode}"
         )
 
     def calculate_maker_price(
@@ -208,7 +216,8 @@ class ExecutionAlgo:
         self,
         current_maker_price: float,
         current_price: float,
-        order_age: float
+        order_age: float,
+        side: str = 'buy'
     ) -> bool:
         """
         判断是否应该插队
@@ -219,8 +228,9 @@ class ExecutionAlgo:
 
         Args:
             current_maker_price (float): 当前挂单价格
-            current_price (float): 当前市场价格
+            current_price (float): 当前市场价格（买单为最优买价，卖单为最优卖价）
             order_age (float): 订单存活时间（秒）
+            side (str): 挂单方向 'buy'（价格上移时插队）或 'sell'（价格下移时插队）
 
         Returns:
             bool: 是否应该插队
@@ -247,9 +257,12 @@ class ExecutionAlgo:
             logger.debug(f"🛑 [ExecutionAlgo] {self.config.symbol}: 无有效挂单价格")
             return False
 
-        if current_price > current_maker_price:
+        if side == 'buy':
             chase_distance = (current_price - current_maker_price) / current_maker_price
+        else:
+            chase_distance = (current_maker_price - current_price) / current_maker_price
 
+        if chase_distance > 0:
             # 如果距离太小，跳过插队
             if chase_distance < self.config.min_chasing_distance_pct:
                 logger.debug(
@@ -265,7 +278,7 @@ class ExecutionAlgo:
                 logger.debug(
                     f"🛑 [ExecutionAlgo] {self.config.symbol}: "
                     f"价格偏差={chase_distance*100:.2f}% "
-                    f"> 最大限制 {self.config.max_chasing_distance_pct*100:.2f}%，"
+                    f"> 最大限制 {self.config.max_chase_distance_pct*100:.2f}%，"
                     f"放弃插队"
                 )
                 return False
@@ -279,6 +292,49 @@ class ExecutionAlgo:
         )
         return False
 
+    def chase_decision(
+        self,
+        current_maker_price: float,
+        best_bid: float,
+        best_ask: float,
+        order_age: float,
+        side: str = 'buy'
+    ) -> Optional[ExecutionDecision]:
+        """
+        🔥 [新增] 追单决策：是否追单、追到什么价格、用什么方式
+
+        买单跟随最优买价上移，卖单跟随最优卖价下移。
+
+        Args:
+            current_maker_price (float): 当前挂单价格
+            best_bid (float): 最优买价
+            best_ask (float): 最优卖价
+            order_age (float): 订单存活时间（秒）
+            side (str): 挂单方向 'buy' 或 'sell'
+
+        Returns:
+            Optional[ExecutionDecision]: 不需要追单时返回 None；
+                否则 price 为新挂单价格，reason 为追单方式（amend / cancel_replace）
+        """
+        if side not in ('buy', 'sell'):
+            raise ValueError(f"未知的挂单方向: {side}")
+
+        reference_price = best_bid if side == 'buy' else best_ask
+        if not self.should_chase(current_maker_price, reference_price, order_age, side):
+            return None
+
+        decision = self.calculate_maker_price(side, best_bid, best_ask, order_age)
+        if abs(decision.price - current_maker_price) < self.config.tick_size / 2:
+            return None
+
+        decision.metadata = {
+            **decision.metadata,
+            'pricing': decision.reason,
+            'from_price': current_maker_price
+        }
+        decision.reason = self.config.chase_mode
+        return decision
+
     def should_skip_execution(
         self,
         best_bid: float,
@@ -331,9 +387,10 @@ class ExecutionAlgo:
                 'is_paper_trading': self.config.is_paper_trading,
                 'enable_chasing': self.config.enable_chasing,
                 'min_chasing_distance_pct': self.config.min_chasing_distance_pct * 100,
-                'max_chasing_distance_pct': self.config.max_chasing_distance_pct * 100,
+                'max_chasing_distance_pct': self.config.max_chase_distance_pct * 100,
                 'aggressive_maker_spread_ticks': self.config.aggressive_maker_spread_ticks,
-                'aggressive_maker_price_offset': self.config.aggressive_maker_price_offset
+                'aggressive_maker_price_offset': self.config.aggressive_maker_price_offset,
+                'chase_mode': self.config.chase_mode
             },
             'mode': 'paper_trading' if self.config.is_paper_trading else 'production'
         }
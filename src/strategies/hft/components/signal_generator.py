@@ -157,6 +157,17 @@ class SignalGenerator:
         elif side == 'sell':
             self.sell_vol_increment += usdt_val
 
+    def update_volumes_batch(self, buy_usdt: float, sell_usdt: float):
+        """
+        🔥 [新增] 一次折叠一批成交的买卖成交量（TRADE_BATCH 事件）
+
+        Args:
+            buy_usdt (float): 本批主动买成交金额（USDT）
+            sell_usdt (float): 本批主动卖成交金额（USDT）
+        """
+        self.buy_vol_increment += buy_usdt
+        self.sell_vol_increment += sell_usdt
+
     def reset_volumes(self):
         """
         🔥 [新增] 重置成交量增量
@@ -260,6 +260,15 @@ class StateManager:
         """
         return self._order.maker_order_price
 
+    def get_maker_order_initial_price(self) -> float:
+        """
+        获取 Maker 订单首次挂单价格（追单改价后保持不变）
+
+        Returns:
+            float: 首次挂单价格
+        """
+        return self._order.maker_order_initial_price
+
     def has_active_maker_order(self) -> bool:
         """
         检查是否有活动的 Maker 订单
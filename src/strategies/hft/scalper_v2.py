@@ -42,17 +42,19 @@ import logging
 from typing import Dict, Any, Optional
 
 from ...core.event_types import Event
+from ...core.histogram import LatencyHistogram
 from ...core.event_bus import EventBus
 from ...oms.order_manager import OrderManager
 from ...oms.capital_commander import CapitalCommander
 from ...config.risk_profile import RiskProfile, StopLossType
 from ...utils.volatility import VolatilityEstimator
 from ..base_strategy import BaseStrategy
+from ...gateways.okx.book_channels import BookRequirement
 
 # 导入组件
 from .components import SignalGenerator, ExecutionAlgo, StateManager
 from .components.signal_generator import ScalperV1Config
-from .components.execution_algo import ExecutionConfig
+from .components.execution_algo import CHASE_MODES, ExecutionConfig, ExecutionDecision
 from .components.position_sizer import PositionSizer, PositionSizingConfig
 from .strategy_state import StrategyState
 from ..strategy_factory import StrategyFactory
@@ -168,7 +170,8 @@ class ScalperV2(BaseStrategy):
             max_chase_distance_pct=0.001,  # 0.1%
             min_order_life_seconds=2.0,
             aggressive_maker_spread_ticks=2.0,
-            aggressive_maker_price_offset=1.0
+            aggressive_maker_price_offset=1.0,
+            chase_mode=kwargs.get('execution_algo', {}).get('chase_mode', 'amend')
         )
         self.execution_algo = ExecutionAlgo(execution_config)
         self.execution_config = execution_config  #  [修复] 保存为实例属性
@@ -207,6 +210,9 @@ class ScalperV2(BaseStrategy):
         self._last_price = 0.0
         self._last_ask_snapshot = {}  # 用于深度感知撤单
 
+        # 🔥 [新增] 追单延迟（触发追单 -> 新价格挂单被交易所确认），按追单方式统计
+        self._chase_latency = {mode: LatencyHistogram() for mode in CHASE_MODES}
+
         logger.info(
             f"⚙️ [ExecutionAlgo 升级] {self.symbol}: "
             f"max_slippage={self.max_slippage_pct*100:.2%}, "
@@ -258,6 +264,17 @@ class ScalperV2(BaseStrategy):
             f"ctVal=0.01 (默认，将在 on_start 中更新)"
         )
 
+        # ========== 🔥 [新增] 订单簿需求 ==========
+        # 读取最优买卖价、深度比例（前 N 档）和前 5 档深度保护，延迟等级可通过 book_latency 配置
+        self.book_requirement = BookRequirement(
+            depth=max(
+                5 if self.enable_depth_protection else 1,
+                signal_generator_config.depth_check_levels,
+                position_sizing_kwargs.get('liquidity_depth_levels', 3)
+            ),
+            latency=kwargs.get('book_latency', 'standard')
+        )
+
         # ========== 保留的变量 ==========
         self.vol_window_start = 0.0
         self.buy_vol = 0.0
@@ -517,7 +534,8 @@ class ScalperV2(BaseStrategy):
                 max_chase_distance_pct=self.execution_config.max_chase_distance_pct,
                 min_order_life_seconds=self.execution_config.min_order_life_seconds,
                 aggressive_maker_spread_ticks=self.execution_config.aggressive_maker_spread_ticks,
-                aggressive_maker_price_offset=self.execution_config.aggressive_maker_price_offset
+                aggressive_maker_price_offset=self.execution_config.aggressive_maker_price_offset,
+                chase_mode=self.execution_config.chase_mode
             )
             self.execution_algo = ExecutionAlgo(self.execution_config)
 
@@ -545,24 +563,65 @@ class ScalperV2(BaseStrategy):
         Args:
             event (Event): TICK 事件
         """
+        try:
+            # 1. 解析 Tick 数据
+            tick_data = event.data
+            price = float(tick_data.get('price', 0))
+            size = float(tick_data.get('size', 0))
+            side = tick_data.get('side', '').lower()
+
+            # 计算交易价值
+            usdt_val = price * size * self.contract_val
+        except Exception as e:
+            logger.error(f"处理 Tick 事件失败: {e}", exc_info=True)
+            return
+
+        await self._on_trades(
+            tick_data,
+            usdt_val if side == 'buy' else 0.0,
+            usdt_val if side == 'sell' else 0.0
+        )
+
+    async def on_trade_batch(self, event: Event):
+        """
+        🔥 [新增] 处理成交聚合事件（TRADE_BATCH）
+
+        一帧成交只运行一次控制器逻辑：成交量按整批买卖金额一次折叠，
+        价格节流、状态路由以最后一笔成交为准。
+
+        Args:
+            event (Event): TRADE_BATCH 事件
+        """
+        batch = event.data
+        if batch.get('symbol') != self.symbol or not batch.trades:
+            return
+
+        await self._on_trades(
+            batch.trades[-1],
+            batch.buy_notional * self.contract_val,
+            batch.sell_notional * self.contract_val
+        )
+
+    async def _on_trades(self, tick_data, buy_usdt: float, sell_usdt: float):
+        """
+        控制器主逻辑（TICK 与 TRADE_BATCH 共用）
+
+        Args:
+            tick_data: 最新一笔成交（TickEvent，dict 兼容）
+            buy_usdt (float): 本次累加的主动买成交金额（USDT，已乘合约面值）
+            sell_usdt (float): 本次累加的主动卖成交金额（USDT，已乘合约面值）
+        """
         try:
             # 🔍 [调试] 检查 MarketDataManager 是否注入
             if not hasattr(self, '_market_data_manager') or self._market_data_manager is None:
                 logger.error(f"❌ [ScalperV2] MarketDataManager 未注入")
                 return
 
-            # 1. 解析 Tick 数据
-            tick_data = event.data
             now = time.time()
 
             # 提取基础数据
             symbol = tick_data.get('symbol', '')
             price = float(tick_data.get('price', 0))
-            size = float(tick_data.get('size', 0))
-            side = tick_data.get('side', '').lower()
-
-            # 计算交易价值
-            usdt_val = price * size * self.contract_val
 
             # 检查交易对是否匹配
             if symbol != self.symbol:
@@ -621,16 +680,11 @@ class ScalperV2(BaseStrategy):
                 self.sell_vol = 0.0
 
             # 累加成交量
-            if side == 'buy':
-                self.buy_vol += usdt_val
-                # 🔥 [优化 70] 使用增量更新买卖量
-                # 避免每次都重新计算 Imbalance
-                self.signal_generator.update_volumes_increment('buy', usdt_val)
-            elif side == 'sell':
-                self.sell_vol += usdt_val
-                # 🔥 [优化 70] 使用增量更新买卖量
-                # 避免每次都重新计算 Imbalance
-                self.signal_generator.update_volumes_increment('sell', usdt_val)
+            # 🔥 [优化 70] 使用增量更新买卖量，避免每次都重新计算 Imbalance
+            # 🔥 [优化] TRADE_BATCH 整批买卖金额一次折叠
+            self.buy_vol += buy_usdt
+            self.sell_vol += sell_usdt
+            self.signal_generator.update_volumes_batch(buy_usdt, sell_usdt)
 
             #  [修复 73] 重构 on_tick() 为 FSM 状态路由器
             # 根据当前状态调用不同的处理方法，实现模块化架构
@@ -641,7 +695,7 @@ class ScalperV2(BaseStrategy):
             # IDLE 状态：无持仓、无挂单
             if current_state == StrategyState.IDLE:
                 # 【轻量级】信号生成 + 开仓逻辑
-                await self._handle_idle_state(event.data)
+                await self._handle_idle_state(tick_data)
 
             # PENDING_OPEN 状态：有挂单，开仓中
             elif current_state == StrategyState.PENDING_OPEN:
@@ -652,7 +706,7 @@ class ScalperV2(BaseStrategy):
             # POSITION_HELD 状态：已开仓
             elif current_state == StrategyState.POSITION_HELD:
                 # 【轻量级】止损/止盈检查
-                await self._handle_position_held_state(event.data)
+                await self._handle_position_held_state(tick_data)
 
             # PENDING_CLOSE 状态：有平仓挂单，平仓中
             elif current_state == StrategyState.PENDING_CLOSE:
@@ -1419,7 +1473,10 @@ class ScalperV2(BaseStrategy):
             'has_maker_order': self.state_manager.has_active_maker_order(),
             'signal_generator': self.signal_generator.get_state(),
             'execution_algo': self.execution_algo.get_state(),
-            'state_manager': self.state_manager.get_full_state()
+            'state_manager': self.state_manager.get_full_state(),
+            'chase_latency': {
+                mode: histogram.snapshot() for mode, histogram in self._chase_latency.items() if histogram.count
+            }
         })
 
         return base_stats
@@ -1453,6 +1510,67 @@ class ScalperV2(BaseStrategy):
         """重置统计信息"""
         logger.info(f"重置统计信息: {self.symbol}")
 
+    async def _chase_maker_order(self, decision: ExecutionDecision, best_bid: float) -> bool:
+        """
+        🔥 [新增] 追单：按 decision.reason 原地改价或撤单重挂，记录追单延迟
+
+        Args:
+            decision (ExecutionDecision): ExecutionAlgo.chase_decision 的结果
+            best_bid (float): 当前最优买价（用于重新计算止损价格）
+
+        Returns:
+            bool: 追单是否成功
+        """
+        start_ns = time.monotonic_ns()
+        if decision.reason == 'amend':
+            success = await self._amend_maker_order(decision.price, best_bid)
+        else:
+            await self._cancel_maker_order()
+            success = await self._reorder_after_cancel()
+
+        if success:
+            self._chase_latency[decision.reason].record(time.monotonic_ns() - start_ns)
+        return success
+
+    async def _amend_maker_order(self, new_price: float, best_bid: float) -> bool:
+        """
+        🔥 [新增] 原地改价追单（amend-order）
+
+        相比撤单重挂：一次往返（撤单重挂需要撤单确认 + 新订单确认两次往返），
+        订单 ID 不变，改价期间旧价格的挂单仍在簿上，不会出现无挂单的空档。
+
+        Args:
+            new_price (float): 新挂单价格
+            best_bid (float): 当前最优买价
+
+        Returns:
+            bool: 改价是否被交易所受理
+        """
+        maker_order_id = self.state_manager.get_maker_order_id()
+        if not maker_order_id or maker_order_id == "pending":
+            return False
+
+        success = await self._order_manager.amend_order(
+            order_id=maker_order_id,
+            symbol=self.symbol,
+            new_price=new_price,
+            stop_loss_price=self._calculate_stop_loss(best_bid)
+        )
+
+        if success:
+            # 重置挂单时间：最小存活时间从改价后重新计算（与撤单重挂一致）
+            self.state_manager.set_maker_order(
+                order_id=maker_order_id,
+                price=new_price,
+                initial_price=self.state_manager.get_maker_order_initial_price()
+            )
+            logger.info(f"✅ [改价追单] {self.symbol}: order_id={maker_order_id}, 新价格={new_price:.6f}")
+        else:
+            # 改价被拒通常是订单已成交或已撤销，交给下一轮监控处理，不撤单重挂
+            logger.warning(f"⚠️ [改价失败] {self.symbol}: order_id={maker_order_id}")
+
+        return success
+
     async def _reorder_after_cancel(self):
         """
         🔥 [新增] 撤单后重新挂单（追单逻辑）
@@ -1663,26 +1781,24 @@ class ScalperV2(BaseStrategy):
                                 maker_order_price = self.state_manager.get_maker_order_price()
                                 maker_order_age = self.state_manager.get_maker_order_age()
 
-                                # 检查是否应该追单
-                                should_chase = self.execution_algo.should_chase(
+                                # 检查是否应该追单（🔥 [优化] 默认原地改价，不再撤单重挂）
+                                chase = self.execution_algo.chase_decision(
                                     current_maker_price=maker_order_price,
-                                    current_price=maker_price,
+                                    best_bid=best_bid,
+                                    best_ask=best_ask,
                                     order_age=maker_order_age
                                 )
 
-                                if should_chase:
+                                if chase:
                                     logger.info(
                                         f"🔥 [监控-触发追单] {self.symbol}: "
                                         f"挂单价={maker_order_price:.6f}, "
                                         f"当前价={maker_price:.6f}, "
-                                        f"存活时间={maker_order_age:.1f}s"
+                                        f"新价格={chase.price:.6f}, "
+                                        f"存活时间={maker_order_age:.1f}s, "
+                                        f"方式={chase.reason}"
                                     )
-
-                                    # 撤单
-                                    await self._cancel_maker_order()
-
-                                    # 重新计算价格并挂单
-                                    await self._reorder_after_cancel()
+                                    await self._chase_maker_order(chase, best_bid)
 
                                 # 🔥 [新增] 深度感知撤单
                                 # 场景：当我们的挂单处于队列中时
@@ -0,0 +1,175 @@
+"""
+追单方式对比基准：原地改价 (amend) vs 撤单重挂 (cancel_replace)
+
+在模拟市场中挂买单并按 ExecutionAlgo.chase_decision 追单：
+- 最优买价随机游走（点差 1 tick），卖方市价单按概率到达，逐个消耗买一档的排队量
+- 挂单价等于买一价时按排队位置成交；买一价跌破挂单价（挂单成为唯一买一）时下一笔卖单直接成交
+- 往返时延 RTT 约 30ms（带抖动），请求单程 RTT/2 到达交易所
+- cancel_replace：撤单到达后挂单离开订单簿，撤单确认后才发新单（2 次往返，中间有无挂单的空档）
+- amend：改价到达后直接生效（1 次往返，旧价格的挂单一直在簿上）
+- 两种方式改价后都排到新价格档位的队尾（交易所对改价同样重置时间优先级）
+
+每个回合的行情路径和卖单流对两种方式相同（成对比较），统计追单延迟（触发 -> 确认）、
+时限内成交率和平均成交时间。
+
+使用方法：
+    python tests/benchmark_chase.py
+"""
+
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.histogram import LatencyHistogram
+from src.strategies.hft.components.execution_algo import CHASE_MODES, ExecutionAlgo, ExecutionConfig
+
+EPISODES = 500
+HORIZON = 2.0  # 每回合时限（秒）
+DT = 0.005  # 模拟步长（秒）
+TICK = 0.01
+START_PRICE = 100.0
+RTT = 0.030
+RTT_JITTER = 0.008
+UP_PROB = 0.02  # 每步买一价上移一个 tick 的概率
+DOWN_PROB = 0.015  # 每步买一价下移一个 tick 的概率
+SELL_PROB = 0.03  # 每步到达一笔卖方市价单（消耗 1 单位排队量）的概率
+QUEUE_RANGE = (3, 12)  # 加入档位时前方排队量
+
+
+def make_path(seed: int):
+    """一个回合的行情路径：每步的买一价 tick 数和是否有卖单到达"""
+    rng = random.Random(seed)
+    steps = int(HORIZON / DT)
+    bid_ticks, sells = [], []
+    level = 0
+    for _ in range(steps):
+        roll = rng.random()
+        if roll < UP_PROB:
+            level += 1
+        elif roll < UP_PROB + DOWN_PROB:
+            level -= 1
+        bid_ticks.append(level)
+        sells.append(rng.random() < SELL_PROB)
+    return bid_ticks, sells
+
+
+def run_episode(algo: ExecutionAlgo, path, seed: int, chase_latency: LatencyHistogram):
+    """
+    单回合模拟
+
+    Returns:
+        tuple: (成交时间或 None, 追单次数, 无挂单空档时长)
+    """
+    rng = random.Random(seed)
+    bid_ticks, sells = path
+    mode = algo.config.chase_mode
+
+    resting = 0  # 挂单在交易所的价格（tick 数），None 表示不在簿上
+    queue_ahead = rng.randint(*QUEUE_RANGE)
+    order_time = 0.0
+    pending = []  # 在途动作：(生效时间, 动作, 参数)
+    chase_started = None
+    chases = 0
+    gap = 0.0
+    local_price = 0  # 本地记录的挂单价格（确认后更新）
+
+    for step, (bid, sell) in enumerate(zip(bid_ticks, sells)):
+        now = step * DT
+
+        # 1. 处理到期的在途动作
+        while pending and pending[0][0] <= now:
+            _, action, target = pending.pop(0)
+            if action == 'leave':
+                resting = None
+            elif action in ('rest', 'reprice'):
+                resting = target
+                queue_ahead = rng.randint(*QUEUE_RANGE) if target == bid else 0
+            elif action == 'send_new':  # 撤单确认后发送新订单
+                pending.append((now + rng.gauss(RTT, RTT_JITTER) / 2, 'rest', target))
+                pending.append((now + max(rng.gauss(RTT, RTT_JITTER), 0.01), 'ack', target))
+                pending.sort(key=lambda item: item[0])
+            elif action == 'ack':
+                local_price = target
+                order_time = now
+                chase_latency.record(int((now - chase_started) * 1e9))
+                chase_started = None
+
+        if resting is None:
+            gap += DT
+
+        # 2. 撮合
+        if resting is not None:
+            if resting > bid:  # 买一被吃穿，挂单成为最优买价
+                if sell:
+                    return now, chases, gap
+            elif resting == bid and sell:
+                if queue_ahead == 0:
+                    return now, chases, gap
+                queue_ahead -= 1
+
+        # 3. 追单决策（上一次追单确认前不再追单）
+        if chase_started is not None:
+            continue
+        best_bid = START_PRICE + bid * TICK
+        decision = algo.chase_decision(
+            current_maker_price=START_PRICE + local_price * TICK,
+            best_bid=best_bid,
+            best_ask=best_bid + TICK,
+            order_age=now - order_time
+        )
+        if decision is None:
+            continue
+
+        chases += 1
+        chase_started = now
+        target = round((decision.price - START_PRICE) / TICK)
+        arrive = now + rng.gauss(RTT, RTT_JITTER) / 2
+        ack = now + max(rng.gauss(RTT, RTT_JITTER), 0.01)
+        if mode == 'amend':
+            pending += [(arrive, 'reprice', target), (ack, 'ack', target)]
+        else:
+            pending += [(arrive, 'leave', None), (ack, 'send_new', target)]
+        pending.sort(key=lambda item: item[0])
+
+    return None, chases, gap
+
+
+def run_mode(mode: str):
+    algo = ExecutionAlgo(ExecutionConfig(
+        symbol='SIM-USDT-SWAP',
+        tick_size=TICK,
+        min_chasing_distance_pct=0.00005,
+        max_chase_distance_pct=0.01,
+        min_order_life_seconds=0.2,
+        chase_mode=mode
+    ))
+    chase_latency = LatencyHistogram()
+    fill_times, chases, gaps = [], 0, 0.0
+    for episode in range(EPISODES):
+        fill_time, episode_chases, gap = run_episode(algo, make_path(episode), episode + 10_000, chase_latency)
+        if fill_time is not None:
+            fill_times.append(fill_time)
+        chases += episode_chases
+        gaps += gap
+    return chase_latency.snapshot(), fill_times, chases, gaps
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(f"{EPISODES} episodes x {HORIZON:.0f}s, RTT={RTT * 1000:.0f}±{RTT_JITTER * 1000:.0f}ms, tick={TICK}")
+    print(f"{'mode':<16}{'chase p50':>11}{'chase p99':>11}{'fill rate':>11}{'avg fill':>10}"
+          f"{'chases':>9}{'gap/chase':>11}")
+    for mode in CHASE_MODES:
+        latency, fill_times, chases, gaps = run_mode(mode)
+        fill_rate = len(fill_times) / EPISODES
+        avg_fill = sum(fill_times) / len(fill_times) if fill_times else float('nan')
+        gap_per_chase = gaps / chases * 1000 if chases else 0.0
+        print(f"{mode:<16}{latency['p50_ms']:>9.1f}ms{latency['p99_ms']:>9.1f}ms{fill_rate:>10.1%}"
+              f"{avg_fill:>9.2f}s{chases:>9}{gap_per_chase:>9.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
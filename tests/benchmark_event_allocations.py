@@ -0,0 +1,110 @@
+"""
+Tick 事件内存分配基准（tracemalloc）
+
+对比：
+1. 旧版：@dataclass Event + dict 负载 + datetime.now() 时间戳
+2. 新版：__slots__ Event + TickEvent 有类型负载 + time.monotonic_ns() 接收时间
+
+测量每个 Tick 事件的内存分配字节数、分配块数和构造耗时。
+
+使用方法：
+    python tests/benchmark_event_allocations.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.event_types import Event, EventType, TickEvent
+
+TICKS = 100000
+
+
+@dataclass
+class LegacyEvent:
+    """旧版 Event（dataclass，每个实例带 __dict__）"""
+    type: EventType
+    data: dict
+    timestamp: datetime = field(default_factory=datetime.now)
+    source: str = "unknown"
+
+
+def make_legacy(i: int):
+    price = 50000.0 + i
+    size = 0.1
+    return LegacyEvent(
+        type=EventType.TICK,
+        data={
+            'symbol': 'BTC-USDT-SWAP',
+            'price': price,
+            'size': size,
+            'side': 'buy',
+            'timestamp': 1700000000000 + i,
+            'usdt_value': price * size
+        },
+        source="trade_parser"
+    )
+
+
+def make_current(i: int):
+    price = 50000.0 + i
+    size = 0.1
+    timestamp = 1700000000000 + i
+    return Event(
+        type=EventType.TICK,
+        data=TickEvent(
+            symbol='BTC-USDT-SWAP',
+            price=price,
+            size=size,
+            side='buy',
+            trade_id=None,
+            timestamp=timestamp,
+            usdt_value=price * size
+        ),
+        source="trade_parser",
+        exchange_ts=timestamp
+    )
+
+
+def measure_allocations(factory):
+    """保留所有事件，统计每个事件的分配字节数与分配块数"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [factory(i) for i in range(TICKS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del events
+    return size / TICKS, blocks / TICKS
+
+
+def measure_time(factory, repeat: int = 5) -> float:
+    """构造耗时（取多轮中的最小值，降低噪声）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for i in range(TICKS):
+            factory(i)
+        best = min(best, (time.perf_counter_ns() - start) / TICKS)
+    return best
+
+
+def main():
+    print(f"{'version':>8} {'bytes/tick':>11} {'blocks/tick':>12} {'ns/tick':>9}")
+    for name, factory in (('before', make_legacy), ('after', make_current)):
+        measure_time(factory)  # 预热
+        size, blocks = measure_allocations(factory)
+        elapsed = measure_time(factory)
+        print(f"{name:>8} {size:>11.1f} {blocks:>12.2f} {elapsed:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
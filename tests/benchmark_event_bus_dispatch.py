@@ -0,0 +1,102 @@
+"""
+EventBus 分发开销微基准
+
+对比：
+1. 旧版分发：每个事件、每个处理器调用 asyncio.iscoroutinefunction，再 await / 直接调用
+2. 新版分发：注册时预解析的分发表（sync 直接调用不创建协程，async / async_inline 创建协程并 await）
+
+分别测量 1 / 5 / 20 个处理器下，每个事件的分发耗时（μs/event）。
+tracked 列为开启延迟直方图（排队等待 / 处理器耗时 / 端到端）后的耗时。
+
+使用方法：
+    python tests/benchmark_event_bus_dispatch.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.event_bus import EventBus
+from src.core.event_types import Event, EventType
+
+EVENTS_PER_RUN = 20000
+HANDLER_COUNTS = (1, 5, 20)
+
+
+def make_handlers(count: int, kind: str):
+    """创建处理器（sync / async / mixed）"""
+    state = {'n': 0}
+
+    def sync_handler(event):
+        state['n'] += 1
+
+    async def async_handler(event):
+        state['n'] += 1
+
+    handlers = []
+    for i in range(count):
+        if kind == 'sync' or (kind == 'mixed' and i % 2 == 0):
+            handlers.append(sync_handler)
+        else:
+            handlers.append(async_handler)
+    return handlers
+
+
+async def legacy_process_event(handlers, event):
+    """旧版 _process_event 的处理器循环（每次分发都判断协程函数）"""
+    for handler in handlers:
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(event)
+            else:
+                handler(event)
+        except Exception:
+            pass
+
+
+async def bench_legacy(handlers, events) -> float:
+    start = time.perf_counter_ns()
+    for event in events:
+        await legacy_process_event(handlers, event)
+    return (time.perf_counter_ns() - start) / len(events) / 1000.0
+
+
+async def bench_current(handlers, events, tracking: bool = False) -> float:
+    bus = EventBus()
+    bus.enable_latency_tracking = tracking
+    for handler in handlers:
+        bus.register(EventType.TICK, handler)
+    start = time.perf_counter_ns()
+    for event in events:
+        await bus._process_event(event)
+    return (time.perf_counter_ns() - start) / len(events) / 1000.0
+
+
+async def main():
+    import logging
+    logging.disable(logging.INFO)
+
+    events = [
+        Event(type=EventType.TICK, data={'symbol': 'BTC-USDT-SWAP', 'price': 50000.0 + i}, source="bench")
+        for i in range(EVENTS_PER_RUN)
+    ]
+
+    print(f"{'handlers':>8} {'kind':>6} {'before μs':>10} {'after μs':>10} {'speedup':>8} {'tracked μs':>11}")
+    for kind in ('sync', 'async', 'mixed'):
+        for count in HANDLER_COUNTS:
+            handlers = make_handlers(count, kind)
+            # 预热
+            await bench_legacy(handlers, events[:1000])
+            await bench_current(handlers, events[:1000])
+
+            before = await bench_legacy(handlers, events)
+            after = await bench_current(handlers, events)
+            tracked = await bench_current(handlers, events, tracking=True)
+            print(f"{count:>8} {kind:>6} {before:>10.3f} {after:>10.3f} {before / after:>7.2f}x {tracked:>11.3f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+事件日志录制开销基准
+
+测量 EventJournal.record() 在热路径上的单事件耗时（序列化 + 追加到缓冲区），
+以及最快速度回放的吞吐。
+
+使用方法：
+    python tests/benchmark_event_journal.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.event_bus import EventBus, EventPriority
+from src.core.event_types import Event, EventType, TickEvent, BookEvent
+from src.core.journal import EventJournal, JournalReplayer
+
+EVENTS = 50000
+
+
+def make_events():
+    events = []
+    for i in range(EVENTS):
+        price = 50000.0 + i % 100
+        if i % 4 == 3:
+            data = BookEvent(
+                symbol='BTC-USDT-SWAP',
+                best_bid=price,
+                best_ask=price + 0.1,
+                bids=[(price - n * 0.1, 1.0) for n in range(5)],
+                asks=[(price + 0.1 + n * 0.1, 1.0) for n in range(5)]
+            )
+            events.append(Event(type=EventType.BOOK_EVENT, data=data, source="book_parser"))
+        else:
+            data = TickEvent(symbol='BTC-USDT-SWAP', price=price, size=0.1, side='buy',
+                             trade_id=str(i), timestamp=1700000000000 + i, usdt_value=price * 0.1)
+            events.append(Event(type=EventType.TICK, data=data, source="trade_parser",
+                                exchange_ts=1700000000000 + i))
+    return events
+
+
+async def measure_record(directory: str, events, repeat: int = 5) -> float:
+    """record() 单事件耗时（µs，取多轮中的最小值）"""
+    best = float('inf')
+    for _ in range(repeat):
+        journal = EventJournal(directory, max_buffer_bytes=1 << 30)
+        await journal.start()
+        record = journal.record
+        start = time.perf_counter_ns()
+        for event in events:
+            record(event, EventPriority.TICK)
+        best = min(best, (time.perf_counter_ns() - start) / len(events) / 1000)
+        await journal.stop()
+    return best
+
+
+async def measure_replay(directory: str) -> float:
+    """最快速度回放吞吐（事件/秒，只计发布，不计处理）"""
+    bus = EventBus(maxsize=EVENTS * 10)
+    result = await JournalReplayer(bus, speed=None).replay(directory)
+    return result['events'] / result['duration_s']
+
+
+async def main():
+    events = make_events()
+    with tempfile.TemporaryDirectory() as directory:
+        per_event_us = await measure_record(directory, events)
+        replay_rate = await measure_replay(directory)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        recorded = EVENTS * 5
+
+    print(f"record():   {per_event_us:.2f} µs/event (3:1 tick:book mix)")
+    print(f"journal:    {size / recorded:.1f} bytes/event")
+    print(f"replay:     {replay_rate:,.0f} events/s (max speed)")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+增量订单簿更新吞吐基准
+
+在 400 档深度的订单簿上随机施加修改 / 新增 / 删除档位的增量更新，
+测量 L2OrderBook.apply_update 的吞吐，以及加上 checksum 校验、BookParser 全流程后的吞吐。
+
+使用方法：
+    python tests/benchmark_order_book.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.event_bus import EventBus
+from src.gateways.okx.order_book import L2OrderBook
+from src.gateways.okx.parsers.book_parser import BookParser
+
+DEPTH = 400
+UPDATES = 20000
+LEVELS_PER_UPDATE = 4
+TICK = 0.1
+MID = 50000.0
+
+
+def fmt(price: float) -> str:
+    return f"{price:.1f}"
+
+
+def make_snapshot():
+    bids = [[fmt(MID - (n + 1) * TICK), "1.0", "0", "1"] for n in range(DEPTH)]
+    asks = [[fmt(MID + n * TICK), "1.0", "0", "1"] for n in range(DEPTH)]
+    return bids, asks
+
+
+def make_updates(seed: int = 42):
+    """随机增量：约 60% 修改已有档位、20% 新增、20% 删除（在 400 档范围内）"""
+    rng = random.Random(seed)
+    bid_live = set(range(DEPTH))
+    ask_live = set(range(DEPTH))
+    updates = []
+    for _ in range(UPDATES):
+        sides = ([], [])
+        for _ in range(LEVELS_PER_UPDATE):
+            is_bid = rng.random() < 0.5
+            live = bid_live if is_bid else ask_live
+            n = rng.randrange(DEPTH)
+            roll = rng.random()
+            if n in live and roll < 0.2:
+                live.discard(n)
+                size = "0"
+            else:
+                live.add(n)
+                size = f"{rng.uniform(0.1, 5):.3f}"
+            price = MID - (n + 1) * TICK if is_bid else MID + n * TICK
+            sides[0 if is_bid else 1].append([fmt(price), size, "0", "1"])
+        updates.append(sides)
+    return updates
+
+
+def measure_book(updates, with_checksum: bool, repeat: int = 5) -> float:
+    """apply_update（可选 checksum）吞吐（更新/秒，取多轮中的最大值）"""
+    bids, asks = make_snapshot()
+    best = 0.0
+    for _ in range(repeat):
+        book = L2OrderBook('BTC-USDT-SWAP')
+        book.apply_snapshot(bids, asks, seq_id=0)
+        apply_update = book.apply_update
+        checksum = book.checksum
+        start = time.perf_counter()
+        for seq, (update_bids, update_asks) in enumerate(updates, 1):
+            apply_update(update_bids, update_asks, seq)
+            if with_checksum:
+                checksum()
+        best = max(best, len(updates) / (time.perf_counter() - start))
+    return best
+
+
+async def measure_parser(updates, repeat: int = 3) -> float:
+    """BookParser 全流程（seq 检查 + checksum + 推送前 5 档）吞吐（更新/秒）"""
+    bids, asks = make_snapshot()
+
+    # 预先计算每条更新的 checksum，构造真实的推送消息
+    reference = L2OrderBook('BTC-USDT-SWAP')
+    reference.apply_snapshot(bids, asks, seq_id=0)
+    messages = []
+    for seq, (update_bids, update_asks) in enumerate(updates, 1):
+        reference.apply_update(update_bids, update_asks, seq)
+        messages.append({
+            "arg": {"channel": "books", "instId": "BTC-USDT-SWAP"},
+            "action": "update",
+            "data": [{"bids": update_bids, "asks": update_asks, "ts": "1700000000000",
+                      "checksum": reference.checksum(), "seqId": seq, "prevSeqId": seq - 1}]
+        })
+
+    best = 0.0
+    for _ in range(repeat):
+        bus = EventBus(maxsize=len(messages) * 2)
+        parser = BookParser('BTC-USDT-SWAP', bus)
+        await parser.process({"action": "snapshot",
+                              "data": [{"bids": bids, "asks": asks, "ts": "1700000000000", "seqId": 0}]})
+        start = time.perf_counter()
+        for message in messages:
+            await parser.process(message)
+        best = max(best, len(messages) / (time.perf_counter() - start))
+        assert parser.get_stats()['resyncs'] == 0
+    return best
+
+
+async def main():
+    updates = make_updates()
+    plain = measure_book(updates, with_checksum=False)
+    checked = measure_book(updates, with_checksum=True)
+    parsed = await measure_parser(updates)
+
+    print(f"depth={DEPTH} levels/side, {LEVELS_PER_UPDATE} level changes per update")
+    print(f"apply_update:             {plain:,.0f} updates/s ({1e6 / plain:.2f} µs/update)")
+    print(f"apply_update + checksum:  {checked:,.0f} updates/s ({1e6 / checked:.2f} µs/update)")
+    print(f"BookParser (full path):   {parsed:,.0f} updates/s ({1e6 / parsed:.2f} µs/update)")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+行情解析吞吐基准（快速解析 vs Pydantic 严格模式）
+
+对同一组 OKX 推送分别用快速解析和严格模式（strict=True）运行 TradeParser / BookParser，
+报告每种模式的消息吞吐（消息/秒）。JSON 解码在计时之外完成，只测量 Parser 本身。
+
+消息来源：
+- --frames 指定录制的原始推送文件（每行一个 WebSocket 文本帧，books 需从快照开始连续录制）
+- 未指定时使用按真实推送格式生成的消息（trades 每帧 1-3 笔；books 快照 400 档 + 增量，带正确 checksum）
+
+使用方法：
+    python tests/benchmark_parsers.py
+    python tests/benchmark_parsers.py --frames data/okx_public_frames.txt
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.event_bus import EventBus
+from src.gateways.okx.order_book import L2OrderBook
+from src.gateways.okx.parsers.trade_parser import TradeParser
+from src.gateways.okx.parsers.book_parser import BookParser
+
+SYMBOL = 'BTC-USDT-SWAP'
+TRADE_FRAMES = 20000
+BOOK_UPDATES = 20000
+BOOK_DEPTH = 400
+PARSERS = {'trades': TradeParser, 'books': BookParser}
+
+
+def generate_frames(seed: int = 7):
+    """按 OKX 推送格式生成 trades / books 帧"""
+    rng = random.Random(seed)
+    trades = []
+    trade_id = 1000000
+    for n in range(TRADE_FRAMES):
+        data = []
+        for _ in range(rng.choice((1, 1, 1, 2, 3))):
+            trade_id += 1
+            data.append({
+                "instId": SYMBOL, "tradeId": str(trade_id), "px": f"{50000 + rng.randint(-50, 50) / 10:.1f}",
+                "sz": f"{rng.uniform(0.001, 2):.3f}", "side": rng.choice(("buy", "sell")),
+                "ts": str(1700000000000 + n), "count": "1"
+            })
+        trades.append({"arg": {"channel": "trades", "instId": SYMBOL}, "data": data})
+
+    bids = [[f"{50000 - (n + 1) / 10:.1f}", "1.0", "0", "1"] for n in range(BOOK_DEPTH)]
+    asks = [[f"{50000 + n / 10:.1f}", "1.0", "0", "1"] for n in range(BOOK_DEPTH)]
+    reference = L2OrderBook(SYMBOL)
+    reference.apply_snapshot(bids, asks, seq_id=0)
+    books = [{"arg": {"channel": "books", "instId": SYMBOL}, "action": "snapshot",
+              "data": [{"bids": bids, "asks": asks, "ts": "1700000000000", "checksum": reference.checksum(),
+                        "seqId": 0, "prevSeqId": -1}]}]
+    for seq in range(1, BOOK_UPDATES + 1):
+        sides = ([], [])
+        for _ in range(rng.randint(1, 6)):
+            side = rng.randrange(2)
+            n = rng.randrange(BOOK_DEPTH)
+            price = 50000 - (n + 1) / 10 if side == 0 else 50000 + n / 10
+            size = "0" if rng.random() < 0.2 else f"{rng.uniform(0.1, 5):.3f}"
+            sides[side].append([f"{price:.1f}", size, "0", "1"])
+        reference.apply_update(sides[0], sides[1], seq)
+        books.append({"arg": {"channel": "books", "instId": SYMBOL}, "action": "update",
+                      "data": [{"bids": sides[0], "asks": sides[1], "ts": str(1700000000000 + seq),
+                                "checksum": reference.checksum(), "seqId": seq, "prevSeqId": seq - 1}]})
+    return [json.dumps(frame) for frame in trades + books]
+
+
+def load_frames(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line for line in (line.strip() for line in f) if line]
+
+
+def group_by_channel(raw_frames):
+    """解码并按频道分组（跳过订阅响应等非数据帧）"""
+    groups = {channel: [] for channel in PARSERS}
+    for raw in raw_frames:
+        message = json.loads(raw)
+        channel = message.get('arg', {}).get('channel')
+        if 'data' in message and channel in groups:
+            groups[channel].append(message)
+    return groups
+
+
+async def measure(channel: str, messages, strict: bool, repeat: int = 3) -> float:
+    """单个频道、单种模式的吞吐（消息/秒，取多轮中的最大值）"""
+    best = 0.0
+    for _ in range(repeat):
+        bus = EventBus(maxsize=len(messages) * 4)
+        parsers = {}
+        start = time.perf_counter()
+        for message in messages:
+            inst_id = message['arg'].get('instId')
+            parser = parsers.get(inst_id)
+            if parser is None:
+                parser = parsers[inst_id] = PARSERS[channel](inst_id, bus, strict=strict)
+            await parser.process(message)
+        best = max(best, len(messages) / (time.perf_counter() - start))
+    return best
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="行情解析吞吐基准")
+    parser.add_argument('--frames', default=None, help="录制的原始推送文件（每行一个文本帧）")
+    args = parser.parse_args()
+
+    raw_frames = load_frames(args.frames) if args.frames else generate_frames()
+    groups = group_by_channel(raw_frames)
+    source = args.frames or "generated"
+
+    print(f"frames: {source}")
+    for channel, messages in groups.items():
+        if not messages:
+            continue
+        fast = await measure(channel, messages, strict=False)
+        strict = await measure(channel, messages, strict=True)
+        print(f"{channel:7s} ({len(messages):,} msgs)  fast: {fast:>10,.0f} msg/s   "
+              f"strict: {strict:>10,.0f} msg/s   speedup: {fast / strict:.1f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+WebSocket 帧解码基准
+
+按 OKX 推送格式构造 trades / books（增量、400 档快照）/ orders 帧，
+测量每个可用 JSON 后端（json / orjson）的单帧解码耗时（µs），
+以及频道预判（sniff_arg）的耗时——未订阅频道的帧只付出这部分开销。
+
+使用方法：
+    python tests/benchmark_ws_decode.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gateways.okx.ws_codec import DECODERS, sniff_arg
+
+SYMBOL = 'BTC-USDT-SWAP'
+
+
+def dumps(payload: dict) -> str:
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def make_frames():
+    trades = dumps({
+        "arg": {"channel": "trades", "instId": SYMBOL},
+        "data": [{"instId": SYMBOL, "tradeId": str(130639474 + n), "px": "42219.9", "sz": "0.12060306",
+                  "side": "buy", "ts": "1630048897897", "count": "3"} for n in range(2)]
+    })
+    books_update = dumps({
+        "arg": {"channel": "books", "instId": SYMBOL},
+        "action": "update",
+        "data": [{"asks": [["8476.98", "415", "0", "13"], ["8477", "7", "0", "2"]],
+                  "bids": [["8476.97", "256", "0", "12"], ["8475.55", "101", "0", "1"]],
+                  "ts": "1597026383085", "checksum": -855196043, "prevSeqId": 123456, "seqId": 123457}]
+    })
+    books_snapshot = dumps({
+        "arg": {"channel": "books", "instId": SYMBOL},
+        "action": "snapshot",
+        "data": [{"asks": [[f"{8477 + n / 100:.2f}", "415", "0", "13"] for n in range(400)],
+                  "bids": [[f"{8476 - n / 100:.2f}", "256", "0", "12"] for n in range(400)],
+                  "ts": "1597026383085", "checksum": -855196043, "prevSeqId": -1, "seqId": 123456}]
+    })
+    orders = dumps({
+        "arg": {"channel": "orders", "instType": "SWAP", "uid": "77982378738415879"},
+        "data": [{
+            "accFillSz": "0.001", "algoClOrdId": "", "algoId": "", "amendResult": "", "amendSource": "",
+            "avgPx": "31527.1", "cancelSource": "", "category": "normal", "ccy": "", "clOrdId": "",
+            "code": "0", "cTime": "1654084334977", "execType": "M", "fee": "-0.02522168", "feeCcy": "USDT",
+            "fillFee": "-0.02522168", "fillFeeCcy": "USDT", "fillNotionalUsd": "31.50818374",
+            "fillPx": "31527.1", "fillSz": "0.001", "fillTime": "1654084353263", "instId": SYMBOL,
+            "instType": "SWAP", "lever": "10", "msg": "", "notionalUsd": "31.50818374",
+            "ordId": "452197707845865472", "ordType": "limit", "pnl": "0", "posSide": "long",
+            "px": "31527.1", "rebate": "0", "rebateCcy": "USDT", "reduceOnly": "false", "reqId": "",
+            "side": "buy", "slOrdPx": "", "slTriggerPx": "", "slTriggerPxType": "last", "source": "",
+            "state": "filled", "sz": "0.001", "tag": "", "tdMode": "cross", "tgtCcy": "",
+            "tpOrdPx": "", "tpTriggerPx": "", "tpTriggerPxType": "last", "tradeId": "242589207",
+            "uTime": "1654084353264"
+        }]
+    })
+    return {
+        'trades': trades,
+        'books (update)': books_update,
+        'books (400 snapshot)': books_snapshot,
+        'orders': orders,
+    }
+
+
+def per_call_us(func, arg, iterations: int, repeat: int = 5) -> float:
+    """单次调用耗时（µs，取多轮中的最小值）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func(arg)
+        best = min(best, (time.perf_counter_ns() - start) / iterations / 1000)
+    return best
+
+
+def main():
+    frames = make_frames()
+    backends = sorted(DECODERS)
+
+    header = f"{'frame':22s} {'bytes':>7s}" + ''.join(f" {name + ' µs':>11s}" for name in backends) + f" {'sniff µs':>10s}"
+    print(header)
+    print('-' * len(header))
+    for label, raw in frames.items():
+        iterations = 500 if 'snapshot' in label else 20000
+        row = f"{label:22s} {len(raw):>7d}"
+        for name in backends:
+            row += f" {per_call_us(DECODERS[name], raw, iterations):>11.2f}"
+        row += f" {per_call_us(sniff_arg, raw, 20000):>10.3f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
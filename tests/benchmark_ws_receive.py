@@ -0,0 +1,137 @@
+"""
+WebSocket 接收循环基准
+
+用本地 WebSocket 替身（按 aiohttp ClientWebSocketResponse 的 receive() / _reader 语义实现，
+不经过网络）测量接收循环本身的开销：
+
+- before：旧循环，每帧 asyncio.wait_for(ws.receive(), timeout=30.0) + 两次时钟读取
+- after：WsBaseGateway._message_loop，无超时定时器，一次唤醒处理完全部已缓冲的帧
+
+生产者每次唤醒推送 burst 帧（模拟一个 TCP 读取里解析出多帧），_on_message 为空操作，
+输出帧/秒和每帧开销（µs）。
+
+使用方法：
+    python tests/benchmark_ws_receive.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+import aiohttp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gateways.okx.ws_base import WsBaseGateway
+
+FRAME = aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, '{"arg":{"channel":"trades","instId":"BTC-USDT-SWAP"},"data":[]}', None)
+TOTAL_FRAMES = 200_000
+
+
+class _FrameQueue:
+    """帧队列（与 aiohttp DataQueue 一样：有缓冲帧时 read() 不挂起，len() 为缓冲帧数）"""
+
+    def __init__(self):
+        self._buffer = deque()
+        self._waiter = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, frames):
+        self._buffer.extend(frames)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def read(self):
+        if not self._buffer:
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+            self._waiter = None
+        return self._buffer.popleft()
+
+
+class StandInWebSocket:
+    """本地 WebSocket 替身"""
+
+    closed = False
+
+    def __init__(self):
+        self._reader = _FrameQueue()
+
+    async def receive(self):
+        return await self._reader.read()
+
+
+class CountingGateway(WsBaseGateway):
+    """_on_message 只计数，收满后通知"""
+
+    def __init__(self, total: int):
+        super().__init__(name="benchmark")
+        self.total = total
+        self.done = asyncio.get_running_loop().create_future()
+
+    async def _on_message(self, message):
+        if self._rx_messages >= self.total and not self.done.done():
+            self.done.set_result(None)
+
+
+async def legacy_loop(gateway: CountingGateway):
+    """旧接收循环的热路径（每帧一个超时定时器、两次墙钟读取）"""
+    while True:
+        msg = await asyncio.wait_for(gateway._ws.receive(), timeout=30.0)
+        # 旧循环每帧更新两个时间戳（消息时间、心跳时间），这里保留两次时钟读取，写入现有的 _last_msg_ns
+        gateway._last_msg_ns = time.time_ns()
+        gateway._rx_messages += 1
+        gateway._last_msg_ns = time.time_ns()
+        await gateway._on_message(msg)
+
+
+async def produce(ws: StandInWebSocket, total: int, burst: int):
+    """每次唤醒推送 burst 帧，然后让出事件循环"""
+    frames = [FRAME] * burst
+    for _ in range(total // burst):
+        ws._reader.feed(frames)
+        await asyncio.sleep(0)
+
+
+async def run(loop_name: str, burst: int) -> float:
+    """返回每帧耗时（µs）"""
+    gateway = CountingGateway(TOTAL_FRAMES)
+    gateway._ws = StandInWebSocket()
+    gateway._running = True
+
+    start = time.perf_counter_ns()
+    consumer = asyncio.create_task(legacy_loop(gateway) if loop_name == 'before' else gateway._message_loop())
+    await produce(gateway._ws, TOTAL_FRAMES, burst)
+    await gateway.done
+    elapsed_ns = time.perf_counter_ns() - start
+
+    consumer.cancel()
+    try:
+        await consumer
+    except asyncio.CancelledError:
+        pass
+    return elapsed_ns / TOTAL_FRAMES / 1000
+
+
+async def main():
+    import logging
+    logging.disable(logging.INFO)
+
+    header = f"{'burst':>6s} {'loop':>7s} {'frames/s':>12s} {'µs/frame':>9s}"
+    print(header)
+    print('-' * len(header))
+    for burst in (1, 10, 100):
+        results = {}
+        for loop_name in ('before', 'after'):
+            results[loop_name] = min([await run(loop_name, burst) for _ in range(3)])
+            per_frame_us = results[loop_name]
+            print(f"{burst:>6d} {loop_name:>7s} {1e6 / per_frame_us:>12,.0f} {per_frame_us:>9.3f}")
+        print(f"{'':>6s} {'speedup':>7s} {results['before'] / results['after']:>11.2f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -56,6 +56,9 @@ def mock_rest_gateway():
         'avgPx': '0'
     })
 
+    # Mock get_order_by_cl_ord_id (order not found by default, can be overridden in tests)
+    gateway.get_order_by_cl_ord_id = AsyncMock(return_value=None)
+
     # 🔥 [修复] Mock get_instrument_details 方法（返回正确的仪器详情）
     # 针对 DOGE-USDT-SWAP 返回合理的合约面值
     async def mock_get_instrument_details(symbol):
@@ -0,0 +1,141 @@
+"""
+Test Suite for Stop-Loss Attached at Entry
+
+Validates:
+- Entry orders with stop_loss_price carry attachAlgoOrds (SL, optional TP) in the same request
+- A fill of an order with an attached stop-loss links the attachAlgoId and sends no extra REST order
+- Orders without an attached stop-loss fall back to the post-fill stop order
+- Amending an entry order moves the attached stop-loss trigger price
+- A flat position cancels the attached stop-loss through cancel-algos
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.core.event_types import Event, EventType
+from src.gateways.okx.order_params import build_amend_body, build_order_body
+from src.oms.position_manager import Position
+
+
+def fill_event(order, raw=None) -> Event:
+    return Event(
+        type=EventType.ORDER_FILLED,
+        data={'order_id': order.order_id, 'symbol': order.symbol, 'side': order.side,
+              'filled_size': order.size, 'status': 'filled', 'raw': raw or {}},
+        source='test'
+    )
+
+
+@pytest.fixture
+def entry_manager(order_manager):
+    order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+    return order_manager
+
+
+class TestAttachAtEntry:
+    """Test attachAlgoOrds on entry orders"""
+
+    @pytest.mark.asyncio
+    async def test_entry_order_carries_stop_loss_and_take_profit(self, entry_manager, mock_rest_gateway):
+        order = await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0,
+                                                 stop_loss_price=49900.0, take_profit_price=50200.0)
+
+        kwargs = mock_rest_gateway.place_order.await_args.kwargs
+        [attach] = kwargs['attachAlgoOrds']
+        assert attach['slTriggerPx'] == '49900' and attach['slOrdPx'] == '-1'
+        assert attach['tpTriggerPx'] == '50200'
+        assert 'take_profit_price' not in kwargs
+        assert order.attach_algo_cl_ord_id == attach['attachAlgoClOrdId']
+
+        body = build_order_body(**kwargs)
+        assert body['attachAlgoOrds'] == kwargs['attachAlgoOrds']
+
+    @pytest.mark.asyncio
+    async def test_no_attach_without_stop_loss_or_for_reduce_only(self, entry_manager, mock_rest_gateway):
+        await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0)
+        assert 'attachAlgoOrds' not in mock_rest_gateway.place_order.await_args.kwargs
+
+        await entry_manager.submit_order('BTC-USDT-SWAP', 'sell', 'limit', 1.0, 50000.0,
+                                         stop_loss_price=50100.0, reduce_only=True)
+        assert 'attachAlgoOrds' not in mock_rest_gateway.place_order.await_args.kwargs
+
+
+class TestFillPath:
+    """Test fill handling with and without an attached stop-loss"""
+
+    @pytest.mark.asyncio
+    async def test_fill_links_attached_algo_without_rest_call(self, entry_manager, mock_rest_gateway):
+        order = await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0,
+                                                 stop_loss_price=49900.0)
+        raw = {'attachAlgoOrds': [{'attachAlgoId': 'algo_1', 'attachAlgoClOrdId': order.attach_algo_cl_ord_id}]}
+
+        await entry_manager.on_order_filled(fill_event(order, raw))
+
+        mock_rest_gateway.place_order.assert_awaited_once()
+        assert order.attach_algo_id == 'algo_1'
+        assert order.stop_loss_order_id == 'algo_1'
+
+    @pytest.mark.asyncio
+    async def test_fallback_places_stop_after_fill(self, entry_manager, mock_rest_gateway):
+        entry_manager.attach_stop_loss = False
+        order = await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0,
+                                                 stop_loss_price=49900.0)
+        assert order.attach_algo_cl_ord_id is None
+
+        await entry_manager.on_order_filled(fill_event(order))
+
+        stop_kwargs = mock_rest_gateway.place_order.await_args.kwargs
+        assert stop_kwargs['order_type'] == 'stop_market'
+        assert stop_kwargs['price'] == 49900.0 and stop_kwargs['reduce_only'] is True
+
+
+class TestAmendAttached:
+    """Test moving the attached stop-loss with the entry order"""
+
+    @pytest.mark.asyncio
+    async def test_amend_moves_attached_stop_loss(self, entry_manager, mock_rest_gateway):
+        order = await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0,
+                                                 stop_loss_price=49900.0)
+        mock_rest_gateway.amend_order = AsyncMock(return_value={'ordId': order.order_id, 'sCode': '0'})
+
+        assert await entry_manager.amend_order(order.order_id, 'BTC-USDT-SWAP', new_price=50010.0,
+                                               stop_loss_price=49910.0)
+
+        kwargs = mock_rest_gateway.amend_order.await_args.kwargs
+        assert build_amend_body(**kwargs) == {
+            'instId': 'BTC-USDT-SWAP', 'ordId': order.order_id, 'newPx': '50010',
+            'attachAlgoOrds': [{'attachAlgoClOrdId': order.attach_algo_cl_ord_id, 'newSlTriggerPx': '49910'}]
+        }
+        assert order.stop_loss_price == 49910.0
+
+
+class TestGhostOrderProtection:
+    """Test that the attached stop-loss is cancelled when the position goes flat"""
+
+    @pytest.mark.asyncio
+    async def test_flat_position_cancels_attached_stop_loss(self, entry_manager, mock_rest_gateway, position_manager):
+        order = await entry_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0,
+                                                 stop_loss_price=49900.0)
+        await entry_manager.on_order_filled(fill_event(order))
+        mock_rest_gateway.fetch_pending_algo_orders = AsyncMock(return_value=[
+            {'algoId': 'algo_9', 'algoClOrdId': order.attach_algo_cl_ord_id, 'instId': 'BTC-USDT-SWAP'},
+            {'algoId': 'other', 'algoClOrdId': 'manual1', 'instId': 'BTC-USDT-SWAP'}
+        ])
+        mock_rest_gateway.cancel_algo_orders = AsyncMock(return_value=[{'algoId': 'algo_9', 'sCode': '0'}])
+
+        position_manager._order_manager = entry_manager
+        position_manager._positions['BTC-USDT-SWAP'] = Position(
+            symbol='BTC-USDT-SWAP', side='long', size=1.0, entry_price=50000.0, unrealized_pnl=0.0
+        )
+        await position_manager._update_position({'symbol': 'BTC-USDT-SWAP', 'size': 0.0, 'entry_price': 0.0})
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        mock_rest_gateway.fetch_pending_algo_orders.assert_awaited_once_with('BTC-USDT-SWAP')
+        mock_rest_gateway.cancel_algo_orders.assert_awaited_once_with(
+            [{'algo_id': 'algo_9', 'symbol': 'BTC-USDT-SWAP'}]
+        )
+        # 已撤销的附带止损不再重复撤销
+        assert await entry_manager.cancel_all_stop_loss_orders('BTC-USDT-SWAP') == 0
+        mock_rest_gateway.cancel_algo_orders.assert_awaited_once()
@@ -0,0 +1,115 @@
+"""
+Test Suite for Batch Order Endpoints
+
+Validates:
+- OkxRestGateway chunks batch-orders / cancel-batch-orders / amend-batch-orders to 20 orders per request
+- Per-order result mapping, including partially failed and failed chunks
+- OrderManager mass cancels and batch submission through the batch endpoints
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.gateways.okx.rest_api import OkxRestGateway
+
+
+def make_gateway(fail_ids=(), fail_chunk: int = None):
+    """REST 网关替身：_request 按 OKX 批量接口格式逐单响应"""
+    gateway = OkxRestGateway(api_key="k", secret_key="s", passphrase="p", use_demo=True)
+    requests = []
+
+    async def fake_request(method, endpoint, data=None, params=None, batch=False):
+        requests.append((endpoint, data))
+        if fail_chunk is not None and len(requests) == fail_chunk:
+            raise ValueError("API 错误: 50011 - Too Many Requests")
+        results = []
+        for body in reversed(data):  # 打乱顺序，验证按 clOrdId / ordId 映射
+            ord_id = body.get('ordId') or f"o{body['clOrdId']}"
+            s_code = '51402' if ord_id in fail_ids else '0'
+            results.append({'ordId': ord_id, 'clOrdId': body.get('clOrdId', ''), 'sCode': s_code, 'sMsg': ''})
+        return {'code': '2' if fail_ids else '0', 'msg': '', 'data': results}
+
+    gateway._request = fake_request
+    return gateway, requests
+
+
+class TestRestBatchOrders:
+    """Test chunking and per-order result mapping"""
+
+    @pytest.mark.asyncio
+    async def test_place_batch_chunks_and_maps_results(self):
+        gateway, requests = make_gateway()
+        orders = [{'symbol': 'BTC-USDT-SWAP', 'side': 'buy', 'order_type': 'limit', 'size': 1, 'price': 100.0 + i,
+                   'strategy_id': 'rebal'} for i in range(45)]
+
+        results = await gateway.place_batch_orders(orders)
+
+        assert [len(data) for _, data in requests] == [20, 20, 5]
+        assert {endpoint for endpoint, _ in requests} == {'/api/v5/trade/batch-orders'}
+        sent = [body for _, data in requests for body in data]
+        assert len({body['clOrdId'] for body in sent}) == 45
+        assert [r['clOrdId'] for r in results] == [body['clOrdId'] for body in sent]
+        assert all(r['sCode'] == '0' for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancel_batch_marks_failed_chunk(self):
+        gateway, requests = make_gateway(fail_ids={'3'}, fail_chunk=2)
+        orders = [{'order_id': str(i), 'symbol': 'ETH-USDT-SWAP'} for i in range(25)]
+
+        results = await gateway.cancel_batch_orders(orders)
+
+        assert [r['ordId'] for r in results] == [str(i) for i in range(25)]
+        assert results[3]['sCode'] == '51402'
+        assert {r['sCode'] for r in results[20:]} == {'-1'}
+        assert requests[0][1][0] == {'instId': 'ETH-USDT-SWAP', 'ordId': '0'}
+
+    @pytest.mark.asyncio
+    async def test_amend_batch_builds_amend_bodies(self):
+        gateway, requests = make_gateway()
+
+        results = await gateway.amend_batch_orders([
+            {'order_id': '1', 'symbol': 'BTC-USDT-SWAP', 'new_price': 101.5},
+            {'order_id': '2', 'symbol': 'BTC-USDT-SWAP', 'new_size': 3}
+        ])
+
+        assert requests == [('/api/v5/trade/amend-batch-orders', [
+            {'instId': 'BTC-USDT-SWAP', 'ordId': '1', 'newPx': '101.5'},
+            {'instId': 'BTC-USDT-SWAP', 'ordId': '2', 'newSz': '3'}
+        ])]
+        assert [r['sCode'] for r in results] == ['0', '0']
+
+
+class TestOrderManagerBatch:
+    """Test OrderManager batch paths"""
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_orders_uses_one_batch_call(self, order_manager, mock_rest_gateway):
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        orders = [await order_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 50000.0) for _ in range(3)]
+        mock_rest_gateway.cancel_batch_orders = AsyncMock(return_value=[
+            {'ordId': orders[0].order_id, 'sCode': '0'},
+            {'ordId': orders[1].order_id, 'sCode': '51401'},
+            {'ordId': orders[2].order_id, 'sCode': '50011'}
+        ])
+
+        assert await order_manager.cancel_all_orders() == 2
+
+        mock_rest_gateway.cancel_batch_orders.assert_awaited_once()
+        mock_rest_gateway.cancel_order.assert_not_awaited()
+        assert [o.status for o in orders] == ['cancelled', 'cancelled', 'live']
+
+    @pytest.mark.asyncio
+    async def test_submit_batch_orders_maps_each_result(self, order_manager, mock_rest_gateway):
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        mock_rest_gateway.place_batch_orders = AsyncMock(return_value=[
+            {'ordId': 'b1', 'clOrdId': 'c1', 'sCode': '0'},
+            {'ordId': '', 'clOrdId': 'c2', 'sCode': '51008', 'sMsg': 'Insufficient balance'}
+        ])
+
+        submitted = await order_manager.submit_batch_orders([
+            {'symbol': 'BTC-USDT-SWAP', 'side': 'buy', 'order_type': 'limit', 'size': 1.0, 'price': 50000.0},
+            {'symbol': 'ETH-USDT-SWAP', 'side': 'sell', 'order_type': 'limit', 'size': 2.0, 'price': 3000.0}
+        ])
+
+        assert submitted[0].order_id == 'b1' and submitted[1] is None
+        assert order_manager.get_order('b1').symbol == 'BTC-USDT-SWAP'
+        assert order_manager.get_ack_latency_stats()['place_batch']['rest']['count'] == 1
@@ -0,0 +1,728 @@
+"""
+Test Suite for EventBus - Dispatch Pipeline
+
+Validates the lane-based dispatcher:
+- Strict priority draining with FIFO order inside a priority
+- Per-lane depth statistics
+- Queue capacity handling for put_nowait / put
+- Slow-handler detection and offload
+"""
+import asyncio
+import time
+import pytest
+from src.core.event_bus import EventBus, EventPriority
+from src.core.event_types import Event, EventType
+
+
+def make_event(event_type=EventType.TICK, **data):
+    return Event(type=event_type, data=data, source="test")
+
+
+class TestPriorityLanes:
+    """Test per-priority lanes"""
+
+    @pytest.mark.asyncio
+    async def test_drains_high_priority_first_and_fifo_within_lane(self):
+        """Queued events are dispatched by priority, then in publish order"""
+        bus = EventBus()
+        seen = []
+
+        async def on_event(event):
+            seen.append(event.data['n'])
+
+        bus.register(EventType.TICK, on_event)
+        bus.register(EventType.ORDER_FILLED, on_event)
+        bus.register(EventType.ORDER_UPDATE, on_event)
+
+        for n in range(3):
+            bus.put_nowait(make_event(n=f"tick{n}"))
+        bus.put_nowait(make_event(EventType.ORDER_UPDATE, n="update"), priority=EventPriority.ORDER_UPDATE)
+        bus.put_nowait(make_event(EventType.ORDER_FILLED, n="fill0"), priority=EventPriority.ORDER_FILLED)
+        bus.put_nowait(make_event(EventType.ORDER_FILLED, n="fill1"), priority=EventPriority.ORDER_FILLED)
+
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        assert seen == ["fill0", "fill1", "update", "tick0", "tick1", "tick2"]
+
+    def test_lane_stats_report_depth_and_peak(self):
+        """get_stats() exposes depth per lane"""
+        bus = EventBus()
+        for _ in range(5):
+            bus.put_nowait(make_event())
+        bus.put_nowait(make_event(EventType.ORDER_FILLED), priority=EventPriority.ORDER_FILLED)
+
+        stats = bus.get_stats()
+        assert stats['queue_size'] == 6
+        assert stats['lanes']['TICK']['depth'] == 5
+        assert stats['lanes']['TICK']['peak'] == 5
+        assert stats['lanes']['ORDER_FILLED']['depth'] == 1
+        assert stats['lanes']['EMERGENCY_CLOSE']['depth'] == 0
+
+    def test_unknown_priority_gets_its_own_lane(self):
+        """Priorities outside EventPriority are ordered among the known lanes"""
+        bus = EventBus()
+        bus.put_nowait(make_event(n="p4"), priority=4)
+        bus.put_nowait(make_event(n="p3"), priority=EventPriority.POSITION_UPDATE)
+
+        assert bus._dequeue().data['n'] == "p3"
+        assert bus._dequeue().data['n'] == "p4"
+        assert bus.get_lane_stats()['PRIORITY_4']['enqueued'] == 1
+
+
+class TestQueueCapacity:
+    """Test bounded queue behaviour"""
+
+    def test_put_nowait_drops_when_full(self):
+        """put_nowait drops a block-policy event and counts an error when full"""
+        bus = EventBus(maxsize=2)
+        for _ in range(3):
+            bus.put_nowait(make_event(EventType.SIGNAL_BUY))
+
+        stats = bus.get_stats()
+        assert stats['queue_size'] == 2
+        assert stats['published'] == 2
+        assert stats['errors'] == 1
+
+    @pytest.mark.asyncio
+    async def test_put_waits_for_space(self):
+        """put blocks until the dispatcher frees a slot"""
+        bus = EventBus(maxsize=1)
+        bus.put_nowait(make_event(EventType.SIGNAL_BUY, n=0))
+
+        producer = asyncio.create_task(bus.put(make_event(EventType.SIGNAL_BUY, n=1)))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+
+        bus._dequeue()
+        await asyncio.wait_for(producer, timeout=1.0)
+        assert bus.qsize() == 1
+
+
+class TestBackpressure:
+    """Test per-event-type backpressure policies"""
+
+    def test_ticks_drop_oldest(self):
+        """A full queue sheds the oldest tick and keeps the newest"""
+        bus = EventBus(maxsize=3, reserved_capacity=0)
+        for n in range(5):
+            bus.put_nowait(make_event(n=n))
+
+        assert [bus._dequeue().data['n'] for _ in range(3)] == [2, 3, 4]
+        stats = bus.get_stats()
+        assert stats['errors'] == 0
+        assert stats['backpressure']['drop_oldest'] == {'evicted': 2, 'dropped': 0}
+
+    def test_tick_dropped_when_no_tick_is_queued(self):
+        """If only other event types fill the queue, the incoming tick is shed"""
+        bus = EventBus(maxsize=2, reserved_capacity=0)
+        bus.put_nowait(make_event(EventType.SIGNAL_BUY, n=0))
+        bus.put_nowait(make_event(EventType.SIGNAL_SELL, n=1))
+        bus.put_nowait(make_event(n=2))
+
+        assert bus.qsize() == 2
+        assert bus.get_backpressure_stats()['drop_oldest'] == {'evicted': 0, 'dropped': 1}
+
+    def test_book_conflates_same_symbol_first(self):
+        """The conflate policy evicts the stale book of the same symbol"""
+        bus = EventBus(maxsize=3, reserved_capacity=0)
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=0))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='ETH', seq=0))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=1))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='ETH', seq=1))
+
+        queued = [(e.data['symbol'], e.data['seq']) for e in (bus._dequeue() for _ in range(3))]
+        assert queued == [('BTC', 0), ('BTC', 1), ('ETH', 1)]
+        assert bus.get_backpressure_stats()['conflate']['evicted'] == 1
+
+    def test_evicting_conflation_slot_frees_symbol(self):
+        """Evicting a conflation slot lets the symbol take a new slot"""
+        bus = EventBus(maxsize=1, reserved_capacity=0, conflate_event_types=[EventType.BOOK_EVENT])
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=0))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='ETH', seq=0))
+
+        assert bus.qsize() == 1
+        assert list(bus._pending_slots) == [(EventType.BOOK_EVENT, 'ETH')]
+        assert bus._dequeue().data['symbol'] == 'ETH'
+
+    def test_fills_use_reserved_headroom_and_never_drop(self):
+        """A tick storm cannot push out order fills"""
+        bus = EventBus(maxsize=10, reserved_capacity=2)
+        for n in range(50):
+            bus.put_nowait(make_event(n=n))
+        assert bus.qsize() == 8
+
+        for n in range(5):
+            bus.put_nowait(make_event(EventType.ORDER_FILLED, order_id=n), priority=EventPriority.ORDER_FILLED)
+
+        assert bus.qsize() == 13
+        counters = bus.get_backpressure_stats()['never_drop']
+        assert counters == {'headroom': 2, 'overflow': 3}
+        fills = [bus._dequeue().data['order_id'] for _ in range(5)]
+        assert fills == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_put_does_not_block_on_droppable_events(self):
+        """put sheds ticks immediately and blocks only internal events"""
+        bus = EventBus(maxsize=1, reserved_capacity=0)
+        await bus.put(make_event(n=0))
+        await asyncio.wait_for(bus.put(make_event(n=1)), timeout=0.1)
+        assert bus._dequeue().data['n'] == 1
+
+        await bus.put(make_event(EventType.SIGNAL_BUY, n=0))
+        producer = asyncio.create_task(bus.put(make_event(EventType.SIGNAL_BUY, n=1)))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert bus.get_backpressure_stats()['block']['blocked'] == 1
+
+        bus._dequeue()
+        await asyncio.wait_for(producer, timeout=1.0)
+
+    def test_policy_overrides(self):
+        """Policies can be overridden per event type and are validated"""
+        bus = EventBus(backpressure_policies={EventType.SIGNAL_BUY: 'never_drop'})
+        assert bus.get_backpressure_policy(EventType.SIGNAL_BUY) == 'never_drop'
+        assert bus.get_backpressure_policy(EventType.SHUTDOWN) == 'block'
+
+        with pytest.raises(ValueError):
+            bus.set_backpressure_policy(EventType.TICK, 'drop_newest')
+        with pytest.raises(ValueError):
+            EventBus(maxsize=10, reserved_capacity=10)
+
+
+class TestExecutionLanes:
+    """Test concurrent execution lanes"""
+
+    @pytest.mark.asyncio
+    async def test_slow_tick_handler_does_not_block_fills(self):
+        """In lanes mode an ORDER_FILLED is handled while a TICK handler is awaiting"""
+        bus = EventBus(execution_mode='lanes')
+        tick_started = asyncio.Event()
+        release_tick = asyncio.Event()
+        fills = []
+
+        async def slow_on_tick(event):
+            tick_started.set()
+            await release_tick.wait()
+
+        async def on_fill(event):
+            fills.append(event.data['order_id'])
+
+        bus.register(EventType.TICK, slow_on_tick)
+        bus.register(EventType.ORDER_FILLED, on_fill)
+        await bus.start()
+
+        bus.put_nowait(make_event(symbol='BTC-USDT-SWAP'))
+        await asyncio.wait_for(tick_started.wait(), timeout=1.0)
+        bus.put_nowait(
+            make_event(EventType.ORDER_FILLED, symbol='BTC-USDT-SWAP', order_id='1'),
+            priority=EventPriority.ORDER_FILLED
+        )
+        await asyncio.sleep(0.01)
+
+        assert fills == ['1']
+        release_tick.set()
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_serial_mode_blocks_behind_slow_handler(self):
+        """Serial mode keeps the single-dispatcher behaviour"""
+        bus = EventBus(execution_mode='serial')
+        release_tick = asyncio.Event()
+        fills = []
+
+        async def slow_on_tick(event):
+            await release_tick.wait()
+
+        async def on_fill(event):
+            fills.append(event.data['order_id'])
+
+        bus.register(EventType.TICK, slow_on_tick)
+        bus.register(EventType.ORDER_FILLED, on_fill)
+        await bus.start()
+
+        bus.put_nowait(make_event(symbol='BTC-USDT-SWAP'))
+        await asyncio.sleep(0.01)
+        bus.put_nowait(make_event(EventType.ORDER_FILLED, order_id='1'), priority=EventPriority.ORDER_FILLED)
+        await asyncio.sleep(0.01)
+        assert fills == []
+
+        release_tick.set()
+        await asyncio.sleep(0.01)
+        assert fills == ['1']
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_per_symbol_order_is_preserved_under_concurrency(self):
+        """Events of one symbol run in order while other symbols run concurrently"""
+        bus = EventBus(execution_mode='lanes')
+        seen = {'BTC': [], 'ETH': []}
+        active = set()
+        overlap = []
+
+        async def on_tick(event):
+            symbol = event.data['symbol']
+            if symbol in active:
+                overlap.append(symbol)
+            active.add(symbol)
+            await asyncio.sleep(0)
+            seen[symbol].append(event.data['n'])
+            active.discard(symbol)
+
+        bus.register(EventType.TICK, on_tick)
+        for n in range(20):
+            bus.put_nowait(make_event(symbol='BTC', n=n))
+            bus.put_nowait(make_event(symbol='ETH', n=n))
+
+        await bus.start()
+        await bus.stop()
+
+        assert overlap == []
+        assert seen['BTC'] == list(range(20))
+        assert seen['ETH'] == list(range(20))
+        assert bus.get_stats()['execution_lanes']['market_data']['dispatched'] == 40
+
+
+class TestConflation:
+    """Test latest-value-wins conflation"""
+
+    @pytest.mark.asyncio
+    async def test_pending_book_is_replaced_in_place(self):
+        """A newer book for the same symbol replaces the queued one"""
+        bus = EventBus(conflate_event_types=[EventType.BOOK_EVENT])
+        seen = []
+
+        async def on_book(event):
+            seen.append((event.data['symbol'], event.data['seq']))
+
+        bus.register(EventType.BOOK_EVENT, on_book)
+        for seq in range(5):
+            bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=seq))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='ETH', seq=0))
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=5))
+
+        assert bus.qsize() == 2
+        assert bus.get_conflation_stats() == {'book_event': 5}
+        assert bus.get_stats()['conflated'] == 5
+
+        await bus.start()
+        await bus.stop()
+
+        # BTC keeps its original queue position but delivers the freshest book
+        assert seen == [('BTC', 5), ('ETH', 0)]
+
+    def test_symbol_requeues_after_dispatch(self):
+        """Once the slot is dispatched a new book takes a new slot"""
+        bus = EventBus(conflate_event_types=[EventType.BOOK_EVENT])
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=0))
+        assert bus._dequeue().data['seq'] == 0
+
+        bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=1))
+        assert bus.qsize() == 1
+        assert bus.get_conflation_stats() == {}
+
+    def test_conflation_is_opt_in(self):
+        """Without enabling, every book is queued"""
+        bus = EventBus()
+        for seq in range(3):
+            bus.put_nowait(make_event(EventType.BOOK_EVENT, symbol='BTC', seq=seq))
+        assert bus.qsize() == 3
+
+
+class TestBatchDispatch:
+    """Test register_batch delivery"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_delivered_in_batches(self):
+        """A queued burst is split by max_batch, remainder flushed when the lane drains"""
+        bus = EventBus()
+        batches = []
+        singles = []
+
+        async def on_ticks(events):
+            batches.append([event.data['n'] for event in events])
+
+        def on_tick(event):
+            singles.append(event.data['n'])
+
+        bus.register_batch(EventType.TICK, on_ticks, max_batch=4)
+        bus.register(EventType.TICK, on_tick)
+        for n in range(10):
+            bus.put_nowait(make_event(symbol='BTC', n=n))
+
+        await bus.start()
+        await bus.stop()
+
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert singles == list(range(10))
+        assert bus.get_batch_stats()['tick:on_ticks'] == {'delivered': 3, 'pending': 0}
+
+    @pytest.mark.asyncio
+    async def test_batches_in_concurrent_lane_keep_order(self):
+        """Batches for one handler never run concurrently and stay in order"""
+        bus = EventBus(execution_mode='lanes')
+        batches = []
+        running = []
+
+        async def on_ticks(events):
+            assert not running
+            running.append(True)
+            await asyncio.sleep(0)
+            batches.extend(event.data['n'] for event in events)
+            running.pop()
+
+        bus.register_batch(EventType.TICK, on_ticks, max_batch=3)
+        for n in range(10):
+            bus.put_nowait(make_event(symbol=f"S{n % 3}", n=n))
+
+        await bus.start()
+        await bus.stop()
+
+        assert batches == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_batch_handler_errors_are_counted(self):
+        """A failing batch handler does not stop the dispatcher"""
+        bus = EventBus()
+
+        def on_ticks(events):
+            raise ValueError("boom")
+
+        bus.register_batch(EventType.TICK, on_ticks)
+        bus.put_nowait(make_event(symbol='BTC'))
+
+        await bus.start()
+        await bus.stop()
+
+        assert bus.get_stats()['errors'] == 1
+
+
+class TestDispatchTable:
+    """Test pre-resolved handler dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_handler_kinds_are_resolved_at_registration(self):
+        """Handlers are classified once into sync / async / async_inline"""
+        bus = EventBus()
+        seen = []
+
+        def on_sync(event):
+            seen.append('sync')
+
+        async def on_inline(event):
+            seen.append('inline')
+
+        async def on_async(event):
+            await asyncio.sleep(0)
+            seen.append('async')
+
+        bus.register(EventType.TICK, on_sync)
+        bus.register(EventType.TICK, on_inline)
+        bus.register(EventType.TICK, on_async)
+        assert bus.get_handler_kinds() == {'sync': 1, 'async': 1, 'async_inline': 1}
+
+        await bus._process_event(make_event())
+        assert seen == ['sync', 'inline', 'async']
+
+    def test_bound_methods_are_classified(self):
+        """Bound coroutine methods without awaits are async_inline"""
+        class Consumer:
+            async def on_book(self, event):
+                self.last = event
+
+        bus = EventBus()
+        bus.register(EventType.BOOK_EVENT, Consumer().on_book)
+        assert bus.get_handler_kinds()['async_inline'] == 1
+        assert EventType.BOOK_EVENT not in bus._suspending_types
+
+    @pytest.mark.asyncio
+    async def test_non_code_callables_are_async(self):
+        """Async callables without a real code object (AsyncMock) fall back to async"""
+        from unittest.mock import AsyncMock
+
+        bus = EventBus()
+        handler = AsyncMock()
+        bus.register(EventType.TICK, handler)
+        assert bus.get_handler_kinds()['async'] == 1
+
+        await bus._process_event(make_event())
+        handler.assert_awaited_once()
+
+    def test_unregister_rebuilds_table(self):
+        """Unregistered handlers are removed from the dispatch table"""
+        bus = EventBus()
+
+        async def on_tick(event):
+            await asyncio.sleep(0)
+
+        bus.register(EventType.TICK, on_tick)
+        assert EventType.TICK in bus._suspending_types
+
+        bus.unregister(EventType.TICK, on_tick)
+        assert EventType.TICK not in bus._dispatch_table
+        assert EventType.TICK not in bus._suspending_types
+        assert not bus._handler_kinds
+
+    def test_reused_handler_key_is_reclassified(self):
+        """A handler whose id matches a stale entry gets its own classification"""
+        bus = EventBus()
+
+        async def on_tick(event):
+            await asyncio.sleep(0)
+
+        bus._handler_kinds[(id(on_tick), id(on_tick))] = 0  # 已回收处理器留下的同 id 分类（sync）
+        bus.register(EventType.TICK, on_tick)
+        assert bus.get_handler_kinds()['async'] == 1
+        assert EventType.TICK in bus._suspending_types
+
+    @pytest.mark.asyncio
+    async def test_inline_events_skip_task_creation_in_concurrent_lane(self):
+        """Non-suspending handlers (sync and awaited async_inline) run directly in the concurrent dispatcher"""
+        bus = EventBus(execution_mode='lanes')
+        seen = []
+        awaited = []
+
+        def on_tick(event):
+            seen.append(event.data['n'])
+
+        async def on_tick_inline(event):
+            awaited.append(event.data['n'])
+
+        bus.register(EventType.TICK, on_tick)
+        bus.register(EventType.TICK, on_tick_inline)
+        for n in range(5):
+            bus.put_nowait(make_event(symbol='BTC', n=n))
+
+        await bus.start()
+        await bus.stop()
+
+        assert seen == awaited == list(range(5))
+        assert not bus._executors[-1].runners
+
+
+class TestLatencyTracking:
+    """Test queue-wait / handler / end-to-end histograms"""
+
+    @pytest.mark.asyncio
+    async def test_records_queue_wait_handler_and_end_to_end(self):
+        """Queue wait, per-handler time and end-to-end time are tracked per event type"""
+        bus = EventBus()
+        bus.enable_latency_tracking = True
+
+        async def slow_handler(event):
+            await asyncio.sleep(0.005)
+
+        def fast_handler(event):
+            pass
+
+        bus.register(EventType.ORDER_FILLED, slow_handler)
+        bus.register(EventType.ORDER_FILLED, fast_handler)
+        for n in range(3):
+            bus.put_nowait(make_event(EventType.ORDER_FILLED, n=n))
+
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        snapshot = bus.get_latency_snapshot()
+        fills = snapshot['event_types']['order_filled']
+        assert fills['queue_wait']['count'] == 3
+        assert fills['end_to_end']['count'] == 3
+        # 第三个事件排在两个慢事件之后
+        assert fills['queue_wait']['max_ms'] >= 9.0
+        assert fills['end_to_end']['max_ms'] >= fills['queue_wait']['max_ms']
+
+        handlers = snapshot['handlers']
+        slow = handlers['order_filled:TestLatencyTracking.test_records_queue_wait_handler_and_end_to_end.<locals>.slow_handler']
+        fast = handlers['order_filled:TestLatencyTracking.test_records_queue_wait_handler_and_end_to_end.<locals>.fast_handler']
+        assert slow['count'] == 3 and slow['min_ms'] >= 4.0
+        assert fast['max_ms'] < slow['min_ms']
+
+    @pytest.mark.asyncio
+    async def test_legacy_latency_stats_keys(self):
+        """get_latency_stats keeps the count/avg/max/min/p99 keys"""
+        bus = EventBus()
+        bus.enable_latency_tracking = True
+        bus.register(EventType.TICK, lambda event: None)
+
+        for n in range(10):
+            await bus._process_event(make_event(n=n))
+
+        stats = bus.get_latency_stats('tick')
+        assert stats['event_type'] == 'tick'
+        assert stats['count'] == 10
+        for key in ('avg_ms', 'max_ms', 'min_ms', 'p99_ms'):
+            assert key in stats
+        assert bus.get_latency_stats('order_filled') == {}
+        assert bus.get_latency_stats('unknown') == {}
+        assert set(bus.get_latency_stats()) == {'tick'}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reset_and_batch_handlers(self):
+        """Batch handlers report per-batch time; reset=True starts a new interval"""
+        bus = EventBus()
+        bus.enable_latency_tracking = True
+        batches = []
+
+        def on_batch(events):
+            batches.append(len(events))
+
+        bus.register_batch(EventType.TICK, on_batch, max_batch=10)
+        for n in range(20):
+            bus.put_nowait(make_event(symbol="BTC", n=n))
+
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        snapshot = bus.get_latency_snapshot(reset=True)
+        assert snapshot['event_types']['tick']['queue_wait']['count'] == 20
+        batch_label = 'tick:TestLatencyTracking.test_snapshot_reset_and_batch_handlers.<locals>.on_batch'
+        assert snapshot['handlers'][batch_label]['count'] == len(batches)
+
+        assert bus.get_latency_snapshot() == {'event_types': {}, 'handlers': {}}
+
+    @pytest.mark.asyncio
+    async def test_tracking_can_be_disabled(self):
+        """With tracking disabled no histograms are recorded"""
+        bus = EventBus()
+        bus.enable_latency_tracking = False
+        bus.register(EventType.TICK, lambda event: None)
+        bus.put_nowait(make_event(n=1))
+
+        await bus.start()
+        await asyncio.sleep(0.01)
+        await bus.stop()
+
+        assert bus.get_latency_snapshot() == {'event_types': {}, 'handlers': {}}
+
+
+class TestSlowHandlers:
+    """Test per-handler budgets, slow-handler flagging and offload"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_overruns_flag_handler_and_rank_offenders(self):
+        """Handlers over budget are flagged by qualified name and ranked by overrun time"""
+        bus = EventBus(handler_budget_ms=1.0, offload_slow_handlers=False)
+        bus.enable_latency_tracking = False
+
+        def slow(event):
+            time.sleep(0.003)
+
+        def slower(event):
+            time.sleep(0.006)
+
+        bus.register(EventType.TICK, slow)
+        bus.register(EventType.TICK, slower)
+        bus.register(EventType.TICK, lambda event: None)
+        for n in range(3):
+            bus.put_nowait(make_event(n=n))
+
+        await bus.start()
+        await asyncio.sleep(0.1)
+        await bus.stop()
+
+        offenders = bus.get_stats()['slow_handlers']
+        assert [o['handler'] for o in offenders] == [
+            'tick:TestSlowHandlers.test_repeated_overruns_flag_handler_and_rank_offenders.<locals>.slower',
+            'tick:TestSlowHandlers.test_repeated_overruns_flag_handler_and_rank_offenders.<locals>.slow',
+        ]
+        assert offenders[0]['overruns'] == 3
+        assert offenders[0]['flagged'] is True
+        assert offenders[0]['offloaded'] is False
+        assert offenders[0]['max_ms'] >= 6.0
+
+    @pytest.mark.asyncio
+    async def test_per_handler_budget_overrides_default(self):
+        """A handler registered with its own budget is judged against it"""
+        bus = EventBus(handler_budget_ms=1.0)
+
+        def slow(event):
+            time.sleep(0.003)
+
+        bus.register(EventType.TICK, slow, budget_ms=50.0)
+        for n in range(3):
+            bus.put_nowait(make_event(n=n))
+
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        assert bus.get_slow_handlers() == []
+
+    @pytest.mark.asyncio
+    async def test_flagged_handler_is_offloaded_and_stops_blocking_dispatch(self):
+        """Once offloaded, a slow handler runs on its own task in event order"""
+        bus = EventBus(handler_budget_ms=1.0, offload_slow_handlers=True)
+        fast_seen, slow_seen = [], []
+
+        async def slow(event):
+            await asyncio.sleep(0.005)
+            slow_seen.append(event.data['n'])
+
+        bus.register(EventType.TICK, slow)
+        bus.register(EventType.TICK, lambda event: fast_seen.append(event.data['n']))
+
+        await bus.start()
+        for n in range(3):
+            await bus.put(make_event(n=n))
+            await asyncio.sleep(0.02)
+        assert bus.get_slow_handlers()[0]['offloaded'] is True
+
+        for n in range(3, 23):
+            bus.put_nowait(make_event(n=n))
+        await asyncio.sleep(0.01)
+        assert fast_seen == list(range(23))
+        assert len(slow_seen) < 23
+
+        await bus.stop()
+        assert slow_seen == list(range(23))
+        assert bus.get_handler_kinds()['async'] == 1
+
+    @pytest.mark.asyncio
+    async def test_never_drop_handlers_are_flagged_but_not_offloaded(self):
+        """Order/position handlers keep their ordering and stay inline"""
+        bus = EventBus(handler_budget_ms=1.0, offload_slow_handlers=True)
+
+        def slow(event):
+            time.sleep(0.002)
+
+        bus.register(EventType.ORDER_FILLED, slow)
+        for n in range(3):
+            bus.put_nowait(make_event(EventType.ORDER_FILLED, n=n), priority=EventPriority.ORDER_FILLED)
+
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        report = bus.get_slow_handlers()[0]
+        assert report['flagged'] is True
+        assert report['offloaded'] is False
+
+    @pytest.mark.asyncio
+    async def test_manual_offload_and_restore(self):
+        """offload_handler / restore_handler move a handler off and back onto the dispatch loop"""
+        bus = EventBus()
+        seen = []
+
+        def handler(event):
+            seen.append(event.data['n'])
+
+        bus.register(EventType.TICK, handler)
+        assert bus.offload_handler(EventType.TICK, handler) is True
+        assert bus.offload_handler(EventType.BAR, handler) is False
+        bus.put_nowait(make_event(n=0))
+
+        await bus.start()
+        await asyncio.sleep(0.02)
+        assert seen == [0]
+
+        assert bus.restore_handler(EventType.TICK, handler) is True
+        assert bus.restore_handler(EventType.TICK, handler) is False
+        bus.put_nowait(make_event(n=1))
+        await asyncio.sleep(0.02)
+        await bus.stop()
+
+        assert seen == [0, 1]
+        assert bus.get_stats()['processed'] == 2
@@ -0,0 +1,118 @@
+"""
+Test Suite for Event Types
+
+Validates the slotted event representation:
+- Event carries monotonic receive / exchange timestamps without __dict__
+- TickEvent / BookEvent payloads stay dict-compatible for existing handlers
+- Parsers publish typed payloads
+"""
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from src.core.event_types import Event, EventType, TickEvent, BookEvent
+from src.gateways.okx.parsers.trade_parser import TradeParser
+from src.gateways.okx.parsers.book_parser import BookParser
+
+
+class TestEvent:
+    """Test slotted Event"""
+
+    def test_event_is_slotted_with_monotonic_stamp(self):
+        """Events have no __dict__ and carry a monotonic receive stamp"""
+        before = time.monotonic_ns()
+        event = Event(type=EventType.TICK, data={}, source="test", exchange_ts=1700000000000)
+
+        assert not hasattr(event, '__dict__')
+        assert before <= event.received_ns <= time.monotonic_ns()
+        assert event.exchange_ts == 1700000000000
+        assert event.enqueued_ns == 0
+
+    def test_timestamp_compatibility(self):
+        """timestamp is derived lazily, or kept when passed explicitly"""
+        event = Event(type=EventType.TICK, data={})
+        assert isinstance(event.timestamp, datetime)
+        assert abs((datetime.now() - event.timestamp).total_seconds()) < 1.0
+
+        fixed = datetime(2024, 1, 1)
+        assert Event(EventType.TICK, {}, fixed).timestamp == fixed
+
+
+class TestTypedPayloads:
+    """Test dict-compatible payloads"""
+
+    def test_tick_payload_reads_like_a_dict(self):
+        """Existing .get / [] / in access keeps working"""
+        tick = TickEvent(symbol='BTC', price=50000.0, size=0.1, side='buy', timestamp=1, usdt_value=5000.0)
+
+        assert tick['price'] == 50000.0
+        assert tick.get('side', '') == 'buy'
+        assert tick.get('missing', 7) == 7
+        assert 'symbol' in tick
+        assert dict(tick) == {
+            'symbol': 'BTC', 'price': 50000.0, 'size': 0.1, 'side': 'buy',
+            'timestamp': 1, 'usdt_value': 5000.0
+        }
+        with pytest.raises(KeyError):
+            tick['missing']
+
+    def test_none_fields_behave_as_missing_keys(self):
+        """Ticker ticks have no side; handlers see the .get default"""
+        tick = TickEvent(symbol='BTC', price=1.0, size=2.0, timestamp=1)
+
+        assert tick.get('side', '') == ''
+        assert 'side' not in tick
+        assert 'usdt_value' not in tick.keys()
+
+    def test_extra_keys_can_be_injected(self):
+        """Strategies may inject extra keys such as order_book"""
+        tick = TickEvent(symbol='BTC', price=1.0, size=2.0)
+        tick['order_book'] = {'bids': []}
+        tick['price'] = 3.0
+
+        assert tick.get('order_book') == {'bids': []}
+        assert tick.price == 3.0
+        assert not hasattr(tick, '__dict__')
+
+    def test_book_payload(self):
+        """BookEvent exposes the standard book keys"""
+        book = BookEvent(symbol='BTC', best_bid=1.0, best_ask=2.0, bids=[(1.0, 1.0)], asks=[(2.0, 1.0)])
+
+        assert book.get('bids') == [(1.0, 1.0)]
+        assert book == {'symbol': 'BTC', 'best_bid': 1.0, 'best_ask': 2.0,
+                        'bids': [(1.0, 1.0)], 'asks': [(2.0, 1.0)]}
+
+
+class TestParsersPublishTypedPayloads:
+    """Test parser output"""
+
+    @pytest.mark.asyncio
+    async def test_trade_parser_publishes_tick_event(self):
+        """Trades become TICK events with a TickEvent payload and exchange ts"""
+        bus = MagicMock()
+        parser = TradeParser(symbol='BTC-USDT-SWAP', event_bus=bus)
+        await parser.process({'data': [{
+            'instId': 'BTC-USDT-SWAP', 'tradeId': '42', 'px': '50000', 'sz': '2', 'side': 'sell', 'ts': '1700000000000'
+        }]})
+
+        event = bus.put_nowait.call_args[0][0]
+        assert isinstance(event.data, TickEvent)
+        assert event.exchange_ts == 1700000000000
+        assert event.data['trade_id'] == '42'
+        assert event.data.get('usdt_value') == 100000.0
+
+    @pytest.mark.asyncio
+    async def test_book_parser_publishes_book_event(self):
+        """Books become BOOK_EVENT events with a BookEvent payload"""
+        bus = MagicMock()
+        parser = BookParser(symbol='BTC-USDT-SWAP', event_bus=bus)
+        await parser.process({'data': [{
+            'bids': [['49999', '1', '0', '1']], 'asks': [['50001', '2', '0', '1']], 'ts': '1700000000000'
+        }]})
+
+        event = bus.put_nowait.call_args[0][0]
+        assert isinstance(event.data, BookEvent)
+        assert event.exchange_ts == 1700000000000
+        assert event.data['best_bid'] == 49999.0
+        assert event.data.get('asks') == [(50001.0, 2.0)]
@@ -0,0 +1,73 @@
+"""
+Test Suite for ExecutionAlgo Chasing
+
+Validates:
+- chase_decision returns the new maker price and the configured chase mode
+- Sell orders chase the best ask down, buy orders the best bid up
+- No chase when the repriced order would land on the same tick or the order is too young
+- Unknown chase modes are rejected
+- OrderManager.amend_order moves price and stop-loss in place, keeping the order ID
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.strategies.hft.components.execution_algo import ExecutionAlgo, ExecutionConfig
+
+
+def make_algo(**overrides) -> ExecutionAlgo:
+    config = dict(symbol='BTC-USDT-SWAP', tick_size=0.01, min_chasing_distance_pct=0.00005,
+                  max_chase_distance_pct=0.01, min_order_life_seconds=1.0)
+    config.update(overrides)
+    return ExecutionAlgo(ExecutionConfig(**config))
+
+
+class TestChaseDecision:
+    """Test chase price and mode selection"""
+
+    def test_chase_decision_uses_configured_mode(self):
+        for mode in ('amend', 'cancel_replace'):
+            decision = make_algo(chase_mode=mode).chase_decision(
+                current_maker_price=100.0, best_bid=100.03, best_ask=100.04, order_age=2.0
+            )
+            assert decision.reason == mode
+            assert decision.price == pytest.approx(100.03)
+            assert decision.metadata['pricing'] == 'conservative_maker'
+            assert decision.metadata['from_price'] == 100.0
+
+    def test_sell_chases_best_ask_down(self):
+        algo = make_algo()
+        decision = algo.chase_decision(100.05, best_bid=100.01, best_ask=100.02, order_age=2.0, side='sell')
+        assert decision.price == pytest.approx(100.02) and decision.side == 'sell'
+        # 卖一上移不追单
+        assert algo.chase_decision(100.05, best_bid=100.07, best_ask=100.08, order_age=2.0, side='sell') is None
+        # 买单方向不受卖单逻辑影响：买一下移不追单
+        assert algo.chase_decision(100.05, best_bid=100.01, best_ask=100.02, order_age=2.0) is None
+        with pytest.raises(ValueError, match="挂单方向"):
+            algo.chase_decision(100.05, best_bid=100.01, best_ask=100.02, order_age=2.0, side='long')
+
+    def test_no_chase_for_young_order_or_same_price(self):
+        algo = make_algo()
+        assert algo.chase_decision(100.0, best_bid=100.03, best_ask=100.04, order_age=0.5) is None
+        # 点差较大时挂在买一 + 1 tick：新价格与当前挂单价相同，不追单
+        assert algo.chase_decision(100.03, best_bid=100.02, best_ask=100.10, order_age=2.0) is None
+
+    def test_unknown_chase_mode_rejected(self):
+        with pytest.raises(ValueError, match="追单方式"):
+            make_algo(chase_mode='replace')
+
+
+class TestAmendInPlace:
+    """Test OrderManager local state after an amend"""
+
+    @pytest.mark.asyncio
+    async def test_amend_updates_price_and_stop_loss(self, order_manager, mock_rest_gateway):
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        order = await order_manager.submit_order('BTC-USDT-SWAP', 'buy', 'limit', 1.0, 100.0, stop_loss_price=99.0)
+        mock_rest_gateway.amend_order = AsyncMock(return_value={'ordId': order.order_id, 'sCode': '0'})
+
+        assert await order_manager.amend_order(order.order_id, 'BTC-USDT-SWAP', new_price=100.5,
+                                               stop_loss_price=99.5)
+
+        assert order_manager.get_order(order.order_id) is order
+        assert (order.price, order.stop_loss_price) == (100.5, 99.5)
+        mock_rest_gateway.cancel_order.assert_not_awaited()
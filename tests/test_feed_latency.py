@@ -0,0 +1,110 @@
+"""
+Test Suite for FeedLatencyTracker - Exchange-to-Strategy Latency
+
+Validates:
+- Parsers stamp events with the frame receive time and record per-channel/per-symbol histograms
+- Clock offset correction of the exchange-to-receive leg
+- Publish-to-handler latency recorded by a probe right before the strategy handler is called
+"""
+import time
+
+import pytest
+
+from src.core.event_bus import EventBus
+from src.core.event_types import BookEvent, Event, EventType
+from src.gateways.okx.ws_public_gateway import OkxPublicWsGateway
+from src.market.feed_latency import FeedLatencyTracker
+from src.utils.auth import get_time_offset, set_time_offset
+
+
+def trade_push(inst_id: str, ts_ms: int) -> dict:
+    return {
+        "arg": {"channel": "trades", "instId": inst_id},
+        "data": [{"instId": inst_id, "tradeId": "1", "px": "100", "sz": "1", "side": "buy", "ts": str(ts_ms)}]
+    }
+
+
+@pytest.fixture
+def clock_offset():
+    original = get_time_offset()
+    yield set_time_offset
+    set_time_offset(original)
+
+
+class TestFeedLatency:
+    """Test latency stamping and histograms"""
+
+    @pytest.mark.asyncio
+    async def test_parser_stamps_receive_time_and_records_per_symbol(self):
+        bus = EventBus()
+        tracker = FeedLatencyTracker()
+        gateway = OkxPublicWsGateway(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"], event_bus=bus,
+                                     latency_tracker=tracker)
+        received_ns = time.monotonic_ns() - 2_000_000  # frame arrived 2ms ago
+        exchange_ts = time.time_ns() // 1_000_000 - 50  # exchange stamped it ~50ms earlier
+
+        await gateway._parsers["ETH-USDT-SWAP"]["trades"].process(trade_push("ETH-USDT-SWAP", exchange_ts), received_ns)
+
+        event = bus._dequeue()
+        assert event.received_ns == received_ns
+        stats = tracker.get_stats()
+        assert list(stats["trades"]) == ["ETH-USDT-SWAP"]
+        eth = stats["trades"]["ETH-USDT-SWAP"]
+        assert eth["receive_to_publish"]["min_ms"] >= 2.0
+        assert 45.0 <= eth["exchange_to_receive"]["max_ms"] <= 60.0
+
+    @pytest.mark.asyncio
+    async def test_clock_offset_corrects_exchange_to_receive(self, clock_offset):
+        tracker = FeedLatencyTracker()
+        stream = tracker.stream("trades", "BTC-USDT-SWAP")
+        now_ms = time.time_ns() // 1_000_000
+
+        # Local clock runs 1s behind the exchange: uncorrected samples would be negative
+        clock_offset(1.0)
+        assert tracker.sync_clock() == 1.0
+        stream.on_publish(now_ms + 990, time.monotonic_ns())
+
+        assert stream.clock_skew == 0
+        assert 0.0 < stream.exchange_to_receive.max_ns / 1e6 < 50.0
+
+        clock_offset(0.0)
+        tracker.sync_clock()
+        stream.on_publish(now_ms + 990, time.monotonic_ns())
+        assert stream.clock_skew == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_records_publish_to_strategy_handler(self):
+        bus = EventBus()
+        tracker = FeedLatencyTracker()
+        stream = tracker.stream("books", "BTC-USDT-SWAP", source="book_parser")
+        dispatched = []
+
+        def on_book(event):
+            dispatched.append(time.monotonic_ns())
+
+        def slow_first(event):
+            time.sleep(0.002)
+
+        bus.register(EventType.BOOK_EVENT, slow_first)
+        bus.register(EventType.BOOK_EVENT, on_book, probe=tracker.on_dispatch)
+        assert not bus.enable_latency_tracking
+        bus.put_nowait(_book_event("BTC-USDT-SWAP"))
+        bus.put_nowait(_book_event("SOL-USDT-SWAP"))
+
+        for _ in range(2):
+            await bus._process_event(bus._dequeue())
+
+        # 探针在策略处理器前执行：包含前一个处理器的耗时
+        assert stream.publish_to_handler.count == 1
+        assert stream.publish_to_handler.max_ns >= 2_000_000
+        assert len(dispatched) == 2
+        tracker.reset()
+        assert tracker.get_stats() == {}
+
+        bus.unregister(EventType.BOOK_EVENT, on_book)
+        assert not bus._handler_probes
+
+
+def _book_event(symbol: str):
+    return Event(type=EventType.BOOK_EVENT, data=BookEvent(symbol=symbol, best_bid=1.0, best_ask=2.0,
+                                                           bids=[], asks=[]), source="book_parser")
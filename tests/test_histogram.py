@@ -0,0 +1,86 @@
+"""
+Test Suite for LatencyHistogram
+
+Validates the log-bucketed latency histogram:
+- Bucket precision within the configured relative error
+- Percentile queries, snapshot and reset
+- Merging histograms
+"""
+import pytest
+from src.core.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Test log-bucketed histogram"""
+
+    def test_small_values_are_exact(self):
+        """Values below the first power-of-two range land in exact buckets"""
+        histogram = LatencyHistogram()
+        for value in range(64):
+            histogram.record(value)
+
+        assert histogram.count == 64
+        assert histogram.percentile(50) == 31
+        assert histogram.percentile(100) == 63
+
+    def test_relative_error_is_bounded(self):
+        """Percentiles of large values stay within 1 / 2^sub_bucket_bits"""
+        histogram = LatencyHistogram(sub_bucket_bits=5)
+        for value in (1_000, 50_000, 3_000_000, 250_000_000):
+            histogram.reset()
+            histogram.record(value - 1)
+            histogram.record(value)
+            assert abs(histogram.percentile(1) - value) <= value / 32
+
+    def test_percentiles_over_uniform_samples(self):
+        """p50 / p99 of 1..10000 microseconds land near the true values"""
+        histogram = LatencyHistogram()
+        for us in range(1, 10001):
+            histogram.record(us * 1000)
+
+        values = histogram.percentiles((50, 99))
+        assert values[50] == pytest.approx(5_000_000, rel=0.04)
+        assert values[99] == pytest.approx(9_900_000, rel=0.04)
+        assert histogram.min_ns == 1000
+        assert histogram.max_ns == 10_000_000
+
+    def test_memory_is_fixed(self):
+        """Recording does not grow the bucket array"""
+        histogram = LatencyHistogram()
+        buckets = len(histogram.counts)
+        for value in range(0, 10 ** 12, 10 ** 9 + 7):
+            histogram.record(value)
+
+        assert len(histogram.counts) == buckets
+        assert histogram.max_ns == histogram.percentile(100)
+
+    def test_snapshot_and_reset(self):
+        """snapshot reports milliseconds; reset clears all samples"""
+        histogram = LatencyHistogram()
+        histogram.record(2_000_000)
+        histogram.record(4_000_000)
+
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 2
+        assert snapshot['avg_ms'] == pytest.approx(3.0)
+        assert snapshot['min_ms'] == pytest.approx(2.0)
+        assert snapshot['max_ms'] == pytest.approx(4.0)
+        assert snapshot['p99_ms'] == pytest.approx(4.0, rel=0.04)
+
+        histogram.reset()
+        assert histogram.count == 0
+        assert histogram.snapshot()['p99_ms'] == 0.0
+
+    def test_merge(self):
+        """Merged histogram equals recording all samples into one"""
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(0, 1_000_000, 997):
+            (left if value % 2 else right).record(value)
+            combined.record(value)
+
+        left.merge(right)
+        assert left.counts == combined.counts
+        assert left.snapshot() == combined.snapshot()
+
+        with pytest.raises(ValueError):
+            left.merge(LatencyHistogram(sub_bucket_bits=3))
@@ -0,0 +1,221 @@
+"""
+Test Suite for EventJournal - Capture and Replay
+
+Validates the binary event journal:
+- Round trip of dict / typed payloads with sequence, priority and timestamps
+- Segment rotation, truncated tails and sequence continuity across restarts
+- EventBus hook records every published event before backpressure
+- Replay preserves publish order and priority, with optional pacing
+- Paced replay re-anchors at each recording session (monotonic clocks differ across restarts)
+"""
+import asyncio
+import os
+import time
+import pytest
+from src.core.event_bus import EventBus, EventPriority
+from src.core.event_types import Event, EventType, TickEvent, BookEvent
+from src.core.journal import EventJournal, JournalReplayer, list_segments, read_journal
+
+
+def make_tick(n, symbol="BTC-USDT-SWAP"):
+    return Event(
+        type=EventType.TICK,
+        data=TickEvent(symbol=symbol, price=50000.0 + n, size=0.1, side='buy', trade_id=str(n), timestamp=n),
+        source="trade_parser",
+        exchange_ts=1700000000000 + n
+    )
+
+
+class TestJournalFormat:
+    """Test record encoding and segment files"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_fields(self, tmp_path):
+        """Every recorded field is read back unchanged"""
+        journal = EventJournal(str(tmp_path))
+        await journal.start()
+
+        tick = make_tick(1)
+        book = Event(
+            type=EventType.BOOK_EVENT,
+            data=BookEvent(symbol="ETH-USDT-SWAP", best_bid=3000.0, best_ask=3000.5,
+                           bids=[(3000.0, 1.0)], asks=[(3000.5, 2.0)]),
+            source="book_parser"
+        )
+        signal = Event(type=EventType.SIGNAL_BUY, data={'symbol': 'BTC-USDT-SWAP', 'reason': 'test'}, source="strategy")
+        journal.record(tick, EventPriority.TICK)
+        journal.record(book, EventPriority.TICK)
+        journal.record(signal, EventPriority.ORDER_UPDATE)
+        await journal.stop()
+
+        records = list(read_journal(str(tmp_path)))
+        assert [r.seq for r in records] == [1, 2, 3]
+        assert [r.event_type for r in records] == [EventType.TICK, EventType.BOOK_EVENT, EventType.SIGNAL_BUY]
+        assert [r.priority for r in records] == [EventPriority.TICK, EventPriority.TICK, EventPriority.ORDER_UPDATE]
+        assert records[0].received_ns == tick.received_ns
+        assert records[0].exchange_ts == tick.exchange_ts
+        assert records[0].source == "trade_parser"
+        assert isinstance(records[0].data, TickEvent)
+        assert records[0].data == tick.data
+        assert isinstance(records[1].data, BookEvent)
+        assert records[1].data['bids'] == [(3000.0, 1.0)]
+        assert records[2].data == signal.data
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_payload_is_kept_as_repr(self, tmp_path):
+        """A payload that cannot be pickled does not break recording"""
+        journal = EventJournal(str(tmp_path))
+        await journal.start()
+        journal.record(Event(type=EventType.SIGNAL_BUY, data={'callback': lambda: None}), EventPriority.TICK)
+        await journal.stop()
+
+        records = list(read_journal(str(tmp_path)))
+        assert len(records) == 1
+        assert isinstance(records[0].data, str)
+        assert journal.get_stats()['unpicklable'] == 1
+
+    @pytest.mark.asyncio
+    async def test_segments_rotate_and_sequence_continues(self, tmp_path):
+        """Segments rotate by size and a restarted journal continues the sequence"""
+        journal = EventJournal(str(tmp_path), segment_bytes=512, flush_interval=0.01)
+        await journal.start()
+        for n in range(10):
+            journal.record(make_tick(n), EventPriority.TICK)
+            await asyncio.sleep(0.02)
+        await journal.stop()
+
+        assert len(list_segments(str(tmp_path))) > 1
+
+        journal = EventJournal(str(tmp_path), segment_bytes=512)
+        await journal.start()
+        journal.record(make_tick(10), EventPriority.TICK)
+        await journal.stop()
+
+        assert [r.seq for r in read_journal(str(tmp_path))] == list(range(1, 12))
+
+    @pytest.mark.asyncio
+    async def test_truncated_tail_is_ignored(self, tmp_path):
+        """A record cut short by a crash is skipped"""
+        journal = EventJournal(str(tmp_path))
+        await journal.start()
+        for n in range(3):
+            journal.record(make_tick(n), EventPriority.TICK)
+        await journal.stop()
+
+        segment = list_segments(str(tmp_path))[-1]
+        with open(segment, 'r+b') as f:
+            f.truncate(os.path.getsize(segment) - 5)
+
+        assert [r.seq for r in read_journal(str(tmp_path))] == [1, 2]
+
+
+class TestJournalCapture:
+    """Test the EventBus hook"""
+
+    @pytest.mark.asyncio
+    async def test_records_events_dropped_by_backpressure(self, tmp_path):
+        """Events are journaled at publish time, even if the queue drops them"""
+        bus = EventBus(maxsize=10, reserved_capacity=0)
+        journal = EventJournal(str(tmp_path))
+        await journal.start()
+        bus.attach_journal(journal)
+
+        for n in range(15):
+            bus.put_nowait(make_tick(n))
+        await bus.put(make_tick(15))
+        bus.detach_journal()
+        bus.put_nowait(make_tick(16))
+        await journal.stop()
+
+        assert bus.get_backpressure_stats()['drop_oldest']['evicted'] > 0
+        records = list(read_journal(str(tmp_path)))
+        assert [r.data['timestamp'] for r in records] == list(range(16))
+
+
+class TestJournalReplay:
+    """Test the replay driver"""
+
+    async def _capture(self, tmp_path, events):
+        journal = EventJournal(str(tmp_path))
+        await journal.start()
+        for event, priority in events:
+            journal.record(event, priority)
+        await journal.stop()
+
+    @pytest.mark.asyncio
+    async def test_replay_preserves_order_and_priority(self, tmp_path):
+        """Replayed events arrive on a fresh bus in their recorded order and priority"""
+        events = [(make_tick(n), EventPriority.TICK) for n in range(5)]
+        events.append((Event(type=EventType.ORDER_FILLED, data={'order_id': 'x'}), EventPriority.ORDER_FILLED))
+        await self._capture(tmp_path, events)
+
+        bus = EventBus()
+        seen = []
+
+        async def on_event(event):
+            seen.append((event.type, event.data.get('timestamp'), event.exchange_ts))
+
+        bus.register(EventType.TICK, on_event)
+        bus.register(EventType.ORDER_FILLED, on_event)
+
+        # 回放在总线启动前完成，按优先级出队可验证优先级被保留
+        result = await JournalReplayer(bus, speed=None).replay(str(tmp_path))
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.stop()
+
+        assert result['events'] == 6
+        assert (result['first_seq'], result['last_seq']) == (1, 6)
+        assert seen[0][0] == EventType.ORDER_FILLED
+        assert seen[1:] == [(EventType.TICK, n, 1700000000000 + n) for n in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_replay_sequence_range(self, tmp_path):
+        """start_seq / end_seq select a slice of the journal"""
+        await self._capture(tmp_path, [(make_tick(n), EventPriority.TICK) for n in range(10)])
+
+        bus = EventBus()
+        result = await JournalReplayer(bus, speed=0).replay(str(tmp_path), start_seq=3, end_seq=5)
+
+        assert result['events'] == 3
+        assert bus.qsize() == 3
+
+    @pytest.mark.asyncio
+    async def test_paced_replay_scales_recorded_gaps(self, tmp_path):
+        """Replay at Nx speed compresses the recorded inter-event gaps by N"""
+        first = make_tick(0)
+        second = make_tick(1)
+        second.received_ns = first.received_ns + 200_000_000  # 200ms 间隔
+        await self._capture(tmp_path, [(first, EventPriority.TICK), (second, EventPriority.TICK)])
+
+        bus = EventBus()
+        started = time.monotonic()
+        result = await JournalReplayer(bus, speed=4.0).replay(str(tmp_path))
+        elapsed = time.monotonic() - started
+
+        assert result['recorded_span_s'] == pytest.approx(0.2)
+        assert 0.04 <= elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_paced_replay_reanchors_across_sessions(self, tmp_path):
+        """A restart between sessions is not replayed as a gap of monotonic clock difference"""
+        events = [make_tick(n) for n in range(4)]
+        events[1].received_ns = events[0].received_ns + 100_000_000
+        # 重启后的进程单调时钟与上一个会话无关（这里比上一个会话早 1 小时）
+        events[2].received_ns = events[0].received_ns - 3600 * 10**9
+        events[3].received_ns = events[2].received_ns + 100_000_000
+        await self._capture(tmp_path, [(event, EventPriority.TICK) for event in events[:2]])
+        await self._capture(tmp_path, [(event, EventPriority.TICK) for event in events[2:]])
+
+        records = list(read_journal(str(tmp_path)))
+        assert [r.seq for r in records] == [1, 2, 3, 4]
+        assert records[0].session == records[1].session != records[2].session == records[3].session
+
+        bus = EventBus()
+        started = time.monotonic()
+        result = await asyncio.wait_for(JournalReplayer(bus, speed=1.0).replay(str(tmp_path)), timeout=2.0)
+        elapsed = time.monotonic() - started
+
+        assert result['events'] == 4 and result['sessions'] == 2
+        assert result['recorded_span_s'] == pytest.approx(0.2)
+        assert 0.2 <= elapsed < 1.0
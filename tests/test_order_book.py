@@ -0,0 +1,180 @@
+"""
+Test Suite for the incremental L2 order book
+
+Validates:
+- Snapshot + delta application with sorted price levels
+- OKX checksum (interleaved top-25 CRC32, signed)
+- seqId gap / checksum mismatch handling in BookParser (resync, publishing suppressed)
+- Top-N views served to MarketDataManager from the full-depth book
+"""
+import zlib
+import pytest
+from src.core.event_bus import EventBus
+from src.gateways.okx.order_book import L2OrderBook
+from src.gateways.okx.parsers.book_parser import BookParser
+from src.market.market_data_manager import MarketDataManager
+
+SYMBOL = "BTC-USDT-SWAP"
+
+
+def signed_crc32(text: str) -> int:
+    value = zlib.crc32(text.encode())
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def level(px: str, sz: str) -> list:
+    return [px, sz, "0", "1"]
+
+
+def book_push(action: str, bids, asks, seq_id: int, prev_seq_id: int, checksum=None) -> dict:
+    entry = {"bids": bids, "asks": asks, "ts": "1700000000000", "seqId": seq_id, "prevSeqId": prev_seq_id}
+    if checksum is not None:
+        entry["checksum"] = checksum
+    return {"arg": {"channel": "books", "instId": SYMBOL}, "action": action, "data": [entry]}
+
+
+def drain(bus: EventBus):
+    events = []
+    while bus.qsize():
+        events.append(bus._dequeue())
+    return events
+
+
+class TestL2OrderBook:
+    """Test snapshot / delta application"""
+
+    def test_snapshot_then_deltas_keep_levels_sorted(self):
+        book = L2OrderBook(SYMBOL)
+        book.apply_snapshot(
+            [level("100", "1"), level("99", "2"), level("98", "3")],
+            [level("101", "1"), level("102", "2")],
+            seq_id=10
+        )
+        book.apply_update(
+            [level("99.5", "4"), level("98", "0"), level("100", "1.5")],
+            [level("100.5", "7"), level("102", "0")],
+            seq_id=11
+        )
+
+        bids, asks = book.top(5)
+        assert bids == [(100.0, 1.5), (99.5, 4.0), (99.0, 2.0)]
+        assert asks == [(100.5, 7.0), (101.0, 1.0)]
+        assert (book.best_bid, book.best_ask) == (100.0, 100.5)
+        assert (book.seq_id, book.depth) == (11, (3, 2))
+
+    def test_deleting_unknown_level_is_ignored(self):
+        book = L2OrderBook(SYMBOL)
+        book.apply_snapshot([level("100", "1")], [level("101", "1")], seq_id=1)
+        book.apply_update([level("90", "0")], [], seq_id=2)
+        assert book.top(5) == ([(100.0, 1.0)], [(101.0, 1.0)])
+
+    def test_checksum_interleaves_original_strings(self):
+        """Checksum uses raw strings, bid/ask interleaved, continuing on the longer side"""
+        book = L2OrderBook(SYMBOL)
+        book.apply_snapshot(
+            [level("3366.1", "7"), level("3366", "6"), level("3365.9", "1")],
+            [level("3366.8", "9")],
+            seq_id=1
+        )
+        expected = signed_crc32("3366.1:7:3366.8:9:3366:6:3365.9:1")
+        assert book.checksum() == expected
+
+    def test_checksum_only_covers_top_25_levels(self):
+        book = L2OrderBook(SYMBOL)
+        bids = [level(str(1000 - n), "1") for n in range(40)]
+        book.apply_snapshot(bids, [], seq_id=1)
+        expected = signed_crc32(":".join(f"{1000 - n}:1" for n in range(25)))
+        assert book.checksum() == expected
+
+
+class TestBookParser:
+    """Test sequence and checksum validation in BookParser"""
+
+    @pytest.mark.asyncio
+    async def test_valid_update_publishes_top_levels(self):
+        bus = EventBus()
+        parser = BookParser(SYMBOL, bus, depth=2)
+        await parser.process(book_push("snapshot", [level("100", "1"), level("99", "1")], [level("101", "1")], 5, -1))
+
+        book = L2OrderBook(SYMBOL)
+        book.apply_snapshot([level("100", "1"), level("99", "1")], [level("101", "1")])
+        book.apply_update([level("100.5", "2")], [], seq_id=6)
+        await parser.process(book_push("update", [level("100.5", "2")], [], 6, 5, checksum=book.checksum()))
+
+        events = drain(bus)
+        assert len(events) == 2
+        assert events[-1].data['bids'] == [(100.5, 2.0), (100.0, 1.0)]
+        assert events[-1].data['best_ask'] == 101.0
+        assert parser.get_stats()['resyncs'] == 0
+
+    @pytest.mark.asyncio
+    async def test_seq_gap_triggers_resync_and_suppresses_updates(self):
+        bus = EventBus()
+        parser = BookParser(SYMBOL, bus)
+        resyncs = []
+
+        async def on_resync():
+            resyncs.append(parser.book.synced)
+
+        parser.on_resync = on_resync
+        await parser.process(book_push("snapshot", [level("100", "1")], [level("101", "1")], 5, -1))
+        await parser.process(book_push("update", [level("100", "2")], [], 8, 7))
+        await parser.process(book_push("update", [level("100", "3")], [], 9, 8))
+
+        assert resyncs == [False]
+        assert len(drain(bus)) == 1
+        stats = parser.get_stats()
+        assert (stats['seq_gaps'], stats['dropped'], stats['synced']) == (1, 1, False)
+
+        # A new snapshot restores publishing
+        await parser.process(book_push("snapshot", [level("100", "4")], [level("101", "1")], 20, -1))
+        assert drain(bus)[0].data['bids'] == [(100.0, 4.0)]
+
+    @pytest.mark.asyncio
+    async def test_checksum_mismatch_triggers_resync(self):
+        bus = EventBus()
+        parser = BookParser(SYMBOL, bus)
+        calls = []
+
+        async def on_resync():
+            calls.append(1)
+
+        parser.on_resync = on_resync
+        await parser.process(book_push("snapshot", [level("100", "1")], [level("101", "1")], 5, -1, checksum=123))
+
+        assert calls == [1]
+        assert drain(bus) == []
+        assert parser.get_stats()['checksum_errors'] == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_update_keeps_sequence(self):
+        """OKX sends prevSeqId == seqId when the book did not change"""
+        bus = EventBus()
+        parser = BookParser(SYMBOL, bus)
+        await parser.process(book_push("snapshot", [level("100", "1")], [level("101", "1")], 5, -1))
+        await parser.process(book_push("update", [], [], 5, 5))
+        await parser.process(book_push("update", [level("100", "2")], [], 6, 5))
+        assert parser.get_stats()['seq_gaps'] == 0
+        assert parser.book.top(1)[0] == [(100.0, 2.0)]
+
+
+class TestMarketDataDepth:
+    """Test MarketDataManager depth views backed by the full-depth book"""
+
+    def test_depth_reads_from_book_source(self):
+        class Source:
+            def __init__(self, book):
+                self.book = book
+
+            def get_l2_book(self, symbol):
+                return self.book if symbol == SYMBOL else None
+
+        book = L2OrderBook(SYMBOL)
+        book.apply_snapshot([level(str(100 - n), "1") for n in range(20)], [level("101", "1")], seq_id=1)
+        manager = MarketDataManager(EventBus())
+        manager.set_book_source(Source(book))
+
+        depth = manager.get_order_book_depth(SYMBOL, levels=10)
+        assert len(depth['bids']) == 10
+        assert depth['bids'][-1] == (91.0, 1.0)
+        assert manager.get_order_book_depth("ETH-USDT-SWAP") == {'bids': [], 'asks': []}
@@ -0,0 +1,136 @@
+"""
+Test Suite for trade / book parser decoding modes
+
+Validates:
+- The fast path and the Pydantic strict mode publish identical events
+- Malformed trades are skipped without affecting the rest of the push
+- Malformed book levels invalidate the book and trigger a resync
+- OKX_STRICT_PARSING selects the default mode
+- Aggregation mode publishes one TRADE_BATCH event per frame
+"""
+import pytest
+from unittest.mock import MagicMock
+from src.core.event_bus import EventBus
+from src.core.event_types import EventType
+from src.market.market_data_manager import MarketDataManager
+from src.gateways.okx.parsers.trade_parser import TradeParser
+from src.gateways.okx.parsers.book_parser import BookParser
+
+SYMBOL = "BTC-USDT-SWAP"
+
+TRADES = {
+    "arg": {"channel": "trades", "instId": SYMBOL},
+    "data": [
+        {"instId": SYMBOL, "tradeId": "1", "px": "50000.1", "sz": "0.5", "side": "buy", "ts": "1700000000000"},
+        {"instId": SYMBOL, "tradeId": "2", "px": "oops", "sz": "0.5", "side": "buy", "ts": "1700000000001"},
+        {"instId": SYMBOL, "tradeId": "3", "sz": "0.5", "side": "sell", "ts": "1700000000002"},
+        {"instId": SYMBOL, "tradeId": "4", "px": "49999.9", "sz": "2", "side": "sell", "ts": "1700000000003"},
+    ]
+}
+
+
+def published(bus: MagicMock):
+    return [call.args[0] for call in bus.put_nowait.call_args_list]
+
+
+class TestTradeDecoding:
+    """Test fast vs strict trade decoding"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strict", [False, True])
+    async def test_modes_publish_same_ticks(self, strict):
+        bus = MagicMock()
+        parser = TradeParser(SYMBOL, bus, strict=strict)
+        await parser.process(TRADES)
+
+        ticks = [(e.data['trade_id'], e.data['price'], e.data['size'], e.data['side'], e.exchange_ts)
+                 for e in published(bus)]
+        assert ticks == [
+            ("1", 50000.1, 0.5, "buy", 1700000000000),
+            ("4", 49999.9, 2.0, "sell", 1700000000003),
+        ]
+
+    def test_env_selects_default_mode(self, monkeypatch):
+        monkeypatch.setenv("OKX_STRICT_PARSING", "true")
+        assert TradeParser(SYMBOL, None).strict is True
+        monkeypatch.delenv("OKX_STRICT_PARSING")
+        assert TradeParser(SYMBOL, None).strict is False
+        assert TradeParser(SYMBOL, None, strict=True).strict is True
+
+
+class TestBookDecoding:
+    """Test fast vs strict book decoding"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strict", [False, True])
+    async def test_modes_publish_same_book(self, strict):
+        bus = MagicMock()
+        parser = BookParser(SYMBOL, bus, strict=strict)
+        await parser.process({"action": "snapshot", "data": [{
+            "bids": [["100", "1", "0", "2"], ["99", "3", "0", "1"]],
+            "asks": [["101", "2", "0", "1"]],
+            "ts": "1700000000000", "seqId": 1, "prevSeqId": -1
+        }]})
+
+        event = published(bus)[0]
+        assert event.data['bids'] == [(100.0, 1.0), (99.0, 3.0)]
+        assert event.data['asks'] == [(101.0, 2.0)]
+        assert event.exchange_ts == 1700000000000
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strict", [False, True])
+    async def test_malformed_level_resyncs(self, strict):
+        bus = MagicMock()
+        parser = BookParser(SYMBOL, bus, strict=strict)
+        await parser.process({"action": "snapshot", "data": [{
+            "bids": [["100", "1", "0", "1"], ["bad", "1", "0", "1"]], "asks": [], "ts": "1", "seqId": 1
+        }]})
+
+        assert published(bus) == []
+        stats = parser.get_stats()
+        assert (stats['invalid'], stats['resyncs'], stats['synced']) == (1, 1, False)
+
+
+class TestTradeAggregation:
+    """Test one-event-per-frame trade aggregation"""
+
+    @pytest.mark.asyncio
+    async def test_frame_becomes_single_batch_event(self):
+        bus = MagicMock()
+        parser = TradeParser(SYMBOL, bus, aggregate=True)
+        await parser.process(TRADES)
+
+        events = published(bus)
+        assert [e.type for e in events] == [EventType.TRADE_BATCH]
+        batch = events[0].data
+        assert [t.trade_id for t in batch.trades] == ["1", "4"]
+        assert batch.count == 2
+        assert batch.buy_notional == pytest.approx(25000.05)
+        assert batch.sell_notional == pytest.approx(99999.8)
+        assert (batch.buy_size, batch.sell_size) == (0.5, 2.0)
+        assert batch.vwap == pytest.approx((25000.05 + 99999.8) / 2.5)
+        assert batch.last_price == 49999.9
+        assert events[0].exchange_ts == batch['timestamp'] == 1700000000003
+
+    @pytest.mark.asyncio
+    async def test_aggregation_is_not_capped_at_50_trades(self):
+        bus = MagicMock()
+        trades = [{"tradeId": str(n), "px": "100", "sz": "1", "side": "buy", "ts": str(1700000000000 + n)}
+                  for n in range(80)]
+        await TradeParser(SYMBOL, bus, aggregate=True).process({"data": trades})
+        assert published(bus)[0].data.count == 80
+
+    @pytest.mark.asyncio
+    async def test_frame_with_no_valid_trades_publishes_nothing(self):
+        bus = MagicMock()
+        await TradeParser(SYMBOL, bus, aggregate=True).process({"data": [{"px": "bad"}]})
+        assert published(bus) == []
+
+    @pytest.mark.asyncio
+    async def test_market_data_manager_folds_batch(self):
+        bus = EventBus()
+        manager = MarketDataManager(bus)
+        await TradeParser(SYMBOL, bus, aggregate=True).process(TRADES)
+
+        await bus._process_event(bus._dequeue())
+        assert manager.get_ticker_snapshot(SYMBOL).last_price == 49999.9
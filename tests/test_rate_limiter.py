@@ -0,0 +1,106 @@
+"""
+Test Suite for the OKX REST Rate Limiter
+
+Validates:
+- Token buckets keyed by endpoint, and by instId for per-instrument limits
+- Queued requests are served by priority (emergency > cancel > entry > query)
+- OkxRestGateway re-queues requests rejected with 50011 and exposes wait-time metrics
+"""
+import asyncio
+
+import pytest
+
+from src.gateways.okx.rate_limiter import EndpointLimit, RateLimiter, RequestPriority
+from src.gateways.okx.rest_api import OkxRestGateway
+
+ORDER = ('POST', '/api/v5/trade/order')
+BALANCE = ('GET', '/api/v5/account/balance')
+
+
+def make_limiter(limit: int = 2, window: float = 0.1) -> RateLimiter:
+    return RateLimiter(limits={
+        ORDER: EndpointLimit(limit, window, per_instrument=True, priority=RequestPriority.ENTRY),
+        BALANCE: EndpointLimit(limit, window)
+    }, headroom=1.0)
+
+
+class TestRateLimiter:
+    """Test token buckets and priority scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_queued_requests_served_by_priority(self):
+        limiter = make_limiter(limit=1)
+        await limiter.acquire(*ORDER, inst_id='BTC-USDT-SWAP')  # 用完令牌
+        served = []
+
+        async def request(priority):
+            await limiter.acquire(*ORDER, inst_id='BTC-USDT-SWAP', priority=priority)
+            served.append(priority)
+
+        tasks = [asyncio.create_task(request(p)) for p in (RequestPriority.QUERY, RequestPriority.ENTRY,
+                                                           RequestPriority.CANCEL, RequestPriority.EMERGENCY)]
+        await asyncio.gather(*tasks)
+
+        assert served == [RequestPriority.EMERGENCY, RequestPriority.CANCEL,
+                          RequestPriority.ENTRY, RequestPriority.QUERY]
+        stats = limiter.get_stats()
+        assert stats['requests'] == 5 and stats['queued'] == 4 and stats['queued_now'] == 0
+        assert stats['wait_by_priority']['QUERY']['min_ms'] > stats['wait_by_priority']['EMERGENCY']['max_ms']
+
+    @pytest.mark.asyncio
+    async def test_per_instrument_buckets_are_independent(self):
+        limiter = make_limiter(limit=2, window=10.0)
+
+        for inst_id in ('BTC-USDT-SWAP', 'BTC-USDT-SWAP', 'ETH-USDT-SWAP', 'ETH-USDT-SWAP'):
+            await limiter.acquire(*ORDER, inst_id=inst_id)
+        for inst_id in ('BTC-USDT-SWAP', 'ETH-USDT-SWAP'):
+            await limiter.acquire(*BALANCE, inst_id=inst_id)
+        assert limiter.get_stats()['queued'] == 0
+
+        # 余额接口不按 instId 限频：第三个请求排队
+        third = asyncio.create_task(limiter.acquire(*BALANCE))
+        await asyncio.sleep(0.01)
+        assert not third.done()
+        third.cancel()
+
+
+class TestRestGatewayRateLimit:
+    """Test limiter integration in OkxRestGateway._request"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_is_requeued(self):
+        gateway = OkxRestGateway(api_key="k", secret_key="s", passphrase="p", use_demo=True)
+        gateway._rate_limiter = make_limiter(limit=5, window=0.05)
+        responses = [ValueError("API 错误: 50011 - Too Many Requests"), {'code': '0', 'data': [{'ordId': '1'}]}]
+        sent = []
+
+        async def fake_send(method, request_path, body_str, batch):
+            sent.append(request_path)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        gateway._send_request = fake_send
+
+        response = await gateway._request("POST", "/api/v5/trade/cancel-order",
+                                          data={'instId': 'BTC-USDT-SWAP', 'ordId': '1'})
+
+        assert response['data'][0]['ordId'] == '1'
+        assert len(sent) == 2
+        stats = gateway.get_rate_limit_stats()
+        assert stats['rate_limited'] == 1
+        assert stats['wait_by_endpoint']['/api/v5/trade/cancel-order']['count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self):
+        gateway = OkxRestGateway(api_key="k", secret_key="s", passphrase="p", use_demo=True)
+
+        async def fake_send(method, request_path, body_str, batch):
+            raise ValueError("API 错误: 51008 - Insufficient balance")
+
+        gateway._send_request = fake_send
+
+        with pytest.raises(ValueError, match="51008"):
+            await gateway._request("POST", "/api/v5/trade/order", data={'instId': 'BTC-USDT-SWAP'})
+        assert gateway.get_rate_limit_stats()['rate_limited'] == 0
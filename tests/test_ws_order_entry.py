@@ -0,0 +1,231 @@
+"""
+Test Suite for WebSocket Order Entry
+
+Validates:
+- Private WebSocket order / cancel-order / amend-order requests correlated by request id
+- Timeouts and disconnects fail the pending request
+- OrderManager transport selection, REST fallback with the same clOrdId, and ack latency stats
+- Unconfirmed WS orders are looked up by clOrdId before any REST resend, only after the request's expTime
+"""
+import asyncio
+import json
+import time
+from typing import Tuple
+
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.gateways.okx.ws_private_gateway import OkxPrivateWsGateway, OrderOpUnconfirmed
+
+
+class FakeExchange:
+    """记录发出的请求，按 id 回写 OKX 格式的响应"""
+
+    def __init__(self, gateway: OkxPrivateWsGateway, code: str = "0", s_code: str = "0", respond: bool = True):
+        self.gateway = gateway
+        self.code = code
+        self.s_code = s_code
+        self.respond = respond
+        self.requests = []
+
+    async def send_message(self, message: str) -> bool:
+        request = json.loads(message)
+        self.requests.append(request)
+        if self.respond:
+            response = {
+                "id": request["id"],
+                "op": request["op"],
+                "code": self.code,
+                "msg": "",
+                "data": [{"ordId": f"ws{len(self.requests)}", "clOrdId": request["args"][0].get("clOrdId", ""),
+                          "sCode": self.s_code, "sMsg": ""}]
+            }
+            asyncio.get_running_loop().call_soon(
+                asyncio.ensure_future,
+                self.gateway._on_message(aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, json.dumps(response), None))
+            )
+        return True
+
+
+def make_gateway(**kwargs) -> Tuple[OkxPrivateWsGateway, FakeExchange]:
+    gateway = OkxPrivateWsGateway(api_key="k", secret_key="s", passphrase="p", use_demo=True)
+    gateway.is_connected = lambda: True
+    gateway._is_logged_in = True
+    exchange = FakeExchange(gateway, **kwargs)
+    gateway.send_message = exchange.send_message
+    return gateway, exchange
+
+
+class TestPrivateWsOrderOps:
+    """Test request-id correlation on the private WebSocket"""
+
+    @pytest.mark.asyncio
+    async def test_ops_resolve_on_matching_response(self):
+        gateway, exchange = make_gateway()
+
+        placed, amended = await asyncio.gather(
+            gateway.place_order("BTC-USDT-SWAP", "buy", "limit", 2, 50000.5, clOrdId="abc123"),
+            gateway.amend_order("42", "BTC-USDT-SWAP", new_price=50001.0)
+        )
+
+        assert placed["clOrdId"] == "abc123"
+        order_request, amend_request = exchange.requests
+        assert order_request["op"] == "order" and amend_request["op"] == "amend-order"
+        assert order_request["id"] != amend_request["id"]
+        assert order_request["args"][0] == {"instId": "BTC-USDT-SWAP", "tdMode": "cross", "side": "buy", "sz": "2",
+                                            "ordType": "limit", "px": "50000.5", "clOrdId": "abc123"}
+        assert amend_request["args"][0] == {"instId": "BTC-USDT-SWAP", "ordId": "42", "newPx": "50001"}
+        assert int(order_request["expTime"]) > 0
+        assert amended["sCode"] == "0"
+        assert gateway.get_order_entry_stats() == {"requests": 2, "pending": 0, "timeouts": 0}
+
+    @pytest.mark.asyncio
+    async def test_rejection_raises_and_cancel_tolerates_missing_order(self):
+        gateway, _ = make_gateway(code="1", s_code="51402")
+
+        with pytest.raises(ValueError, match="51402"):
+            await gateway.place_order("BTC-USDT-SWAP", "buy", "market", 1)
+        assert (await gateway.cancel_order("42", "BTC-USDT-SWAP"))["sCode"] == "51402"
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_disconnect_fail_pending(self):
+        gateway, _ = make_gateway(respond=False)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await gateway.place_order("BTC-USDT-SWAP", "buy", "market", 1, timeout=0.01)
+        assert gateway.get_order_entry_stats()["timeouts"] == 1
+
+        pending = asyncio.ensure_future(gateway.cancel_order("42", "BTC-USDT-SWAP", timeout=5.0))
+        await asyncio.sleep(0)
+        await gateway._on_message(aiohttp.WSMessage(aiohttp.WSMsgType.CLOSED, None, None))
+        with pytest.raises(OrderOpUnconfirmed):
+            await pending
+        assert not gateway.is_trading_ready()
+
+
+class TestOrderManagerTransport:
+    """Test per-call transport selection and REST fallback"""
+
+    @pytest.mark.asyncio
+    async def test_ws_transport_records_ack_latency(self, order_manager, mock_rest_gateway):
+        gateway, exchange = make_gateway()
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+
+        order = await order_manager.submit_order("BTC-USDT-SWAP", "buy", "limit", 1.0, 50000.0, transport="ws")
+        assert order.order_id == "ws1"
+        assert await order_manager.amend_order(order.order_id, "BTC-USDT-SWAP", new_price=50010.0, transport="ws")
+        assert order.price == 50010.0
+        await order_manager.submit_order("BTC-USDT-SWAP", "buy", "limit", 1.0, 50000.0)
+
+        mock_rest_gateway.place_order.assert_awaited_once()
+        stats = order_manager.get_ack_latency_stats()
+        assert stats["place"]["ws"]["count"] == 1 and stats["place"]["rest"]["count"] == 1
+        assert stats["amend"]["ws"]["count"] == 1
+        assert stats["ws_fallbacks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ws_timeout_falls_back_to_rest_with_same_clordid(self, order_manager, mock_rest_gateway):
+        gateway, exchange = make_gateway(respond=False)
+        gateway.order_timeout = 0.01
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager.order_transport = "ws"
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+
+        order = await order_manager.submit_order("BTC-USDT-SWAP", "buy", "limit", 1.0, 50000.0)
+
+        assert order is not None
+        ws_clordid = exchange.requests[0]["args"][0]["clOrdId"]
+        mock_rest_gateway.get_order_by_cl_ord_id.assert_awaited_once_with("BTC-USDT-SWAP", ws_clordid)
+        assert mock_rest_gateway.place_order.await_args.kwargs["clOrdId"] == ws_clordid
+        assert order_manager.get_ack_latency_stats()["ws_fallbacks"] == 1
+
+        # 未登录时直接走 REST，不计为回退
+        gateway._is_logged_in = False
+        assert await order_manager.cancel_order(order.order_id, "BTC-USDT-SWAP")
+        mock_rest_gateway.cancel_order.assert_awaited_once()
+        assert len(exchange.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_ws_timeout_with_order_on_exchange_does_not_resend(self, order_manager, mock_rest_gateway):
+        gateway, exchange = make_gateway(respond=False)
+        gateway.order_timeout = 0.01
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager.order_transport = "ws"
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        mock_rest_gateway.get_order_by_cl_ord_id = AsyncMock(side_effect=lambda symbol, cl_ord_id: {
+            "ordId": "landed1", "clOrdId": cl_ord_id, "state": "live", "accFillSz": "0"
+        })
+
+        order = await order_manager.submit_order("BTC-USDT-SWAP", "buy", "limit", 1.0, 50000.0)
+
+        assert order.order_id == "landed1" and order.status == "live"
+        assert order_manager.get_order("landed1") is order
+        mock_rest_gateway.place_order.assert_not_awaited()
+        stats = order_manager.get_ack_latency_stats()
+        assert stats["ws_reconciled"] == 1 and stats["ws_fallbacks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ws_disconnect_after_fill_tracks_filled_order(self, order_manager, mock_rest_gateway):
+        gateway, exchange = make_gateway(respond=False)
+        gateway.order_timeout = 0.05
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        mock_rest_gateway.get_order_by_cl_ord_id = AsyncMock(side_effect=lambda symbol, cl_ord_id: {
+            "ordId": "landed2", "clOrdId": cl_ord_id, "state": "filled", "accFillSz": "1"
+        })
+
+        submit = asyncio.ensure_future(order_manager.submit_order(
+            "BTC-USDT-SWAP", "buy", "market", 1.0, stop_loss_price=49900.0, transport="ws"
+        ))
+        await asyncio.sleep(0)
+        gateway._fail_pending_ops("test disconnect")
+        order = await submit
+
+        assert order.order_id == "landed2" and order.status == "filled"
+        assert order.stop_loss_order_id == order.attach_algo_cl_ord_id
+        mock_rest_gateway.place_order.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_ws_disconnect_waits_for_exptime_before_lookup(self, order_manager, mock_rest_gateway):
+        gateway, exchange = make_gateway(respond=False)
+        gateway.order_timeout = 0.2
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+
+        def lookup(symbol, cl_ord_id):
+            # 断连时订单还在路上，expTime 之前查询不到
+            if time.time() * 1000 < int(exchange.requests[0]["expTime"]):
+                return None
+            return {"ordId": "late1", "clOrdId": cl_ord_id, "state": "filled", "accFillSz": "1"}
+        mock_rest_gateway.get_order_by_cl_ord_id = AsyncMock(side_effect=lookup)
+
+        submit = asyncio.ensure_future(order_manager.submit_order(
+            "BTC-USDT-SWAP", "buy", "market", 1.0, transport="ws"
+        ))
+        await asyncio.sleep(0)
+        gateway._fail_pending_ops("test disconnect")
+        order = await submit
+
+        assert order.order_id == "late1"
+        mock_rest_gateway.get_order_by_cl_ord_id.assert_awaited_once()
+        mock_rest_gateway.place_order.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_ws_lookup_failure_does_not_resend(self, order_manager, mock_rest_gateway):
+        gateway, _ = make_gateway(respond=False)
+        gateway.order_timeout = 0.01
+        order_manager._private_ws = gateway
+        order_manager.exp_time_margin = 0.01
+        order_manager._capital_commander.check_buying_power = Mock(return_value=True)
+        mock_rest_gateway.get_order_by_cl_ord_id = AsyncMock(side_effect=ValueError("API 错误: 50001 - busy"))
+
+        with pytest.raises(ValueError, match="50001"):
+            await order_manager.submit_order("BTC-USDT-SWAP", "buy", "limit", 1.0, 50000.0, transport="ws")
+        mock_rest_gateway.place_order.assert_not_awaited()
@@ -0,0 +1,107 @@
+"""
+Test Suite for OkxPublicWsPool - Sharded Public Subscriptions
+
+Validates the connection pool:
+- Round-robin initial assignment and least-loaded placement of new symbols
+- Per-shard message / byte rates from sampled counters
+- Rate-based rebalancing moves symbols off a hot shard
+"""
+import json
+import time
+import aiohttp
+import pytest
+from src.gateways.okx.ws_pool import OkxPublicWsPool
+
+
+def trade_frame(inst_id: str) -> aiohttp.WSMessage:
+    payload = {
+        "arg": {"channel": "trades", "instId": inst_id},
+        "data": [{"instId": inst_id, "tradeId": "1", "px": "100", "sz": "1", "side": "buy", "ts": "1700000000000"}]
+    }
+    return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, json.dumps(payload), None)
+
+
+class TestAssignment:
+    """Test symbol placement"""
+
+    def test_round_robin_initial_assignment(self):
+        pool = OkxPublicWsPool([f"S{n}" for n in range(5)], shards=2)
+        assert pool.get_status()['shards'] == 2
+        assert pool._shards[0].symbols == ["S0", "S2", "S4"]
+        assert pool._shards[1].symbols == ["S1", "S3"]
+
+    def test_shard_count_never_exceeds_symbols(self):
+        pool = OkxPublicWsPool(["S0"], shards=4)
+        assert len(pool._shards) == 1
+
+    @pytest.mark.asyncio
+    async def test_new_symbols_open_shards_then_fill_least_loaded(self):
+        """New symbols create shards up to the limit, then go to the least-loaded shard"""
+        pool = OkxPublicWsPool(["S0", "S1"], shards=3)
+        pool._symbol_rates = {"S0": 50.0, "S1": 5.0}
+
+        await pool.add_symbols(["S2"])
+        assert len(pool._shards) == 3
+        pool._symbol_rates["S2"] = 20.0
+
+        await pool.add_symbols(["S3"])
+        assert pool._owner["S3"] == pool._owner["S1"]
+
+        await pool.remove_symbols(["S3"])
+        assert "S3" not in pool.symbols
+
+
+class TestRatesAndRebalance:
+    """Test sampling and rebalancing"""
+
+    @pytest.mark.asyncio
+    async def test_sample_reports_per_shard_rates(self):
+        pool = OkxPublicWsPool(["S0", "S1"], shards=2, rebalance_interval=0)
+        for _ in range(10):
+            pool._shards[0]._rx_messages += 1
+            pool._shards[0]._rx_bytes += 100
+            await pool._shards[0]._on_message(trade_frame("S0"))
+        time.sleep(0.01)
+        pool.sample()
+
+        stats = pool.get_shard_stats()
+        assert stats[0]['msg_rate'] > 0
+        assert stats[0]['bytes_rate'] == pytest.approx(stats[0]['msg_rate'] * 100)
+        assert stats[1]['msg_rate'] == 0
+        assert pool._symbol_rates["S0"] > 0
+
+    def test_plan_moves_relieves_hot_shard(self):
+        """The symbol closest to half the load gap moves from the hottest to the coolest shard"""
+        pool = OkxPublicWsPool(["A", "B", "C", "D"], shards=2)
+        # shard 0: A, C ; shard 1: B, D
+        pool._symbol_rates = {"A": 300.0, "C": 120.0, "B": 10.0, "D": 10.0}
+
+        moves = pool.plan_moves()
+        assert moves[0] == ("C", 0, 1)
+
+    def test_balanced_or_idle_pool_does_not_move(self):
+        pool = OkxPublicWsPool(["A", "B", "C", "D"], shards=2)
+        pool._symbol_rates = {"A": 50.0, "C": 50.0, "B": 45.0, "D": 45.0}
+        assert pool.plan_moves() == []
+
+        pool._symbol_rates = {"A": 3.0, "C": 3.0, "B": 0.0, "D": 0.0}
+        assert pool.plan_moves() == []
+
+    @pytest.mark.asyncio
+    async def test_rebalance_moves_subscription_between_shards(self):
+        pool = OkxPublicWsPool(["A", "B", "C", "D"], shards=2, rebalance_interval=0)
+        for _ in range(40):
+            await pool._shards[0]._on_message(trade_frame("A"))
+        for _ in range(20):
+            await pool._shards[0]._on_message(trade_frame("C"))
+        for _ in range(5):
+            await pool._shards[1]._on_message(trade_frame("B"))
+        time.sleep(0.01)
+
+        moved = await pool.rebalance()
+
+        assert moved >= 1
+        assert pool._owner["C"] == 1
+        assert "C" in pool._shards[1].symbols
+        assert "C" not in pool._shards[0].symbols
+        assert pool.get_status()['moves'] == moved
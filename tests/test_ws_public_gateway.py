@@ -0,0 +1,267 @@
+"""
+Test Suite for OkxPublicWsGateway - Multi-instrument Routing
+
+Validates the multiplexed public gateway:
+- Pushes are routed by arg.instId to per-symbol parser state
+- Runtime subscribe / unsubscribe without reconnecting
+- Resubscription of every tracked instrument on (re)connect
+- Selection and switching of the order book channel (bbo-tbt / books5 / books / books-l2-tbt)
+"""
+import json
+import aiohttp
+import pytest
+from src.core.event_bus import EventBus
+from src.core.event_types import EventType
+from src.gateways.okx.ws_public_gateway import OkxPublicWsGateway
+from src.gateways.okx.book_channels import BookRequirement, select_book_channel
+from src.gateways.okx.ws_codec import get_decoder, sniff_arg, DECODERS
+
+
+def text_message(payload: dict) -> aiohttp.WSMessage:
+    return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, json.dumps(payload, separators=(',', ':')), None)
+
+
+def trade_push(inst_id: str, px: str, trade_id: str = "1") -> dict:
+    return {
+        "arg": {"channel": "trades", "instId": inst_id},
+        "data": [{"instId": inst_id, "tradeId": trade_id, "px": px, "sz": "1", "side": "buy", "ts": "1700000000000"}]
+    }
+
+
+class RecordingGateway(OkxPublicWsGateway):
+    """Gateway that records outgoing frames instead of writing to a socket"""
+
+    def __init__(self, *args, connected: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+        self.connected = connected
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def send_message(self, message: str):
+        self.sent.append(json.loads(message))
+        return True
+
+
+def drain(bus: EventBus):
+    events = []
+    while bus.qsize():
+        events.append(bus._dequeue())
+    return events
+
+
+class TestRouting:
+    """Test per-instId routing"""
+
+    @pytest.mark.asyncio
+    async def test_pushes_are_routed_by_inst_id(self):
+        """Each instrument's pushes reach its own parser and keep their symbol"""
+        bus = EventBus()
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"], event_bus=bus)
+
+        await gateway._on_message(text_message(trade_push("ETH-USDT-SWAP", "3000")))
+        await gateway._on_message(text_message(trade_push("BTC-USDT-SWAP", "50000")))
+        await gateway._on_message(text_message(trade_push("SOL-USDT-SWAP", "100")))
+
+        events = drain(bus)
+        assert [(e.type, e.data['symbol'], e.data['price']) for e in events] == [
+            (EventType.TICK, "ETH-USDT-SWAP", 3000.0),
+            (EventType.TICK, "BTC-USDT-SWAP", 50000.0),
+        ]
+        assert gateway.get_status()['unrouted'] == 1
+        assert gateway.trade_parser is gateway._parsers["BTC-USDT-SWAP"]["trades"]
+
+    def test_single_symbol_constructor_is_compatible(self):
+        """The legacy symbol argument still defines the primary instrument"""
+        gateway = OkxPublicWsGateway("BTC-USDT-SWAP")
+        assert gateway.symbol == "BTC-USDT-SWAP"
+        assert gateway.symbols == ["BTC-USDT-SWAP"]
+        assert gateway.book_parser.symbol == "BTC-USDT-SWAP"
+
+    def test_requires_at_least_one_symbol(self):
+        with pytest.raises(ValueError):
+            OkxPublicWsGateway()
+
+
+class TestRuntimeSubscriptions:
+    """Test subscribe / unsubscribe while connected"""
+
+    @pytest.mark.asyncio
+    async def test_add_and_remove_symbols_without_reconnect(self):
+        """Adding/removing instruments sends only the delta"""
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP"], channels=["trades"])
+
+        added = await gateway.add_symbols(["ETH-USDT-SWAP", "BTC-USDT-SWAP"])
+        removed = await gateway.remove_symbols(["BTC-USDT-SWAP"])
+
+        assert (added, removed) == (1, 1)
+        assert gateway.sent == [
+            {"op": "subscribe", "args": [{"channel": "trades", "instId": "ETH-USDT-SWAP"}]},
+            {"op": "unsubscribe", "args": [{"channel": "trades", "instId": "BTC-USDT-SWAP"}]},
+        ]
+        assert gateway.symbols == ["ETH-USDT-SWAP"]
+        assert "BTC-USDT-SWAP" not in gateway._parsers
+
+    @pytest.mark.asyncio
+    async def test_symbols_added_while_disconnected_are_subscribed_on_connect(self):
+        """Connecting subscribes every tracked instrument, batched by SUBSCRIBE_BATCH_SIZE"""
+        symbols = [f"COIN{n}-USDT-SWAP" for n in range(120)]
+        gateway = RecordingGateway(symbols=symbols[:1], connected=False)
+        await gateway.add_symbols(symbols[1:])
+        assert gateway.sent == []
+
+        gateway.connected = True
+        await gateway._on_connected()
+
+        assert [len(frame['args']) for frame in gateway.sent] == [100, 100, 40]
+        subscribed = {(arg['instId'], arg['channel']) for frame in gateway.sent for arg in frame['args']}
+        assert subscribed == {(symbol, channel) for symbol in symbols for channel in ("trades", "books")}
+
+    @pytest.mark.asyncio
+    async def test_unknown_channel_is_rejected(self):
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP"])
+        with pytest.raises(ValueError):
+            await gateway.add_symbols(["ETH-USDT-SWAP"], channels=["nope"])
+
+    @pytest.mark.asyncio
+    async def test_book_sequence_gap_resubscribes_channel(self):
+        """A seqId gap on the books channel re-requests a snapshot for that instrument only"""
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"], event_bus=EventBus())
+        snapshot = {"arg": {"channel": "books", "instId": "ETH-USDT-SWAP"}, "action": "snapshot",
+                    "data": [{"bids": [["3000", "1", "0", "1"]], "asks": [], "ts": "1", "seqId": 5, "prevSeqId": -1}]}
+        update = {"arg": {"channel": "books", "instId": "ETH-USDT-SWAP"}, "action": "update",
+                  "data": [{"bids": [], "asks": [], "ts": "2", "seqId": 9, "prevSeqId": 8}]}
+
+        await gateway._on_message(text_message(snapshot))
+        await gateway._on_message(text_message(update))
+
+        arg = {"channel": "books", "instId": "ETH-USDT-SWAP"}
+        assert gateway.sent == [{"op": "unsubscribe", "args": [arg]}, {"op": "subscribe", "args": [arg]}]
+        assert gateway.get_status()['book_resyncs'] == 1
+        assert gateway.get_l2_book("ETH-USDT-SWAP").synced is False
+
+
+class TestFrameDecoding:
+    """Test decoder selection and channel pre-dispatch"""
+
+    def test_sniff_reads_channel_and_inst_id_from_prefix(self):
+        raw = json.dumps(trade_push("ETH-USDT-SWAP", "3000"), separators=(',', ':'))
+        assert sniff_arg(raw) == ("trades", "ETH-USDT-SWAP")
+        assert sniff_arg('{"arg":{"channel":"orders","instType":"SWAP","uid":"1"},"data":[]}') == ("orders", None)
+        assert sniff_arg('{"event":"subscribe","arg":{"channel":"trades","instId":"BTC-USDT-SWAP"}}') is None
+        assert sniff_arg('{"data":[],"arg":{"channel":"trades"}}') is None
+
+    def test_decoder_selection(self, monkeypatch):
+        assert get_decoder("json")[0] == "json"
+        assert get_decoder("auto")[0] == ("orjson" if "orjson" in DECODERS else "json")
+        monkeypatch.setenv("OKX_JSON_DECODER", "json")
+        assert OkxPublicWsGateway("BTC-USDT-SWAP").get_status()['json_decoder'] == "json"
+        with pytest.raises(ValueError):
+            get_decoder("simdjson")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("decoder", sorted(DECODERS))
+    async def test_unrouted_frames_are_discarded_before_decoding(self, decoder):
+        bus = EventBus()
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP"], event_bus=bus, json_decoder=decoder)
+        decoded = []
+        loads = gateway._loads
+        gateway._loads = lambda raw: decoded.append(raw) or loads(raw)
+
+        await gateway._on_message(text_message(trade_push("SOL-USDT-SWAP", "100")))
+        await gateway._on_message(text_message(trade_push("BTC-USDT-SWAP", "50000")))
+
+        assert len(decoded) == 1
+        assert [e.data['price'] for e in drain(bus)] == [50000.0]
+        status = gateway.get_status()
+        assert (status['sniff_discarded'], status['unrouted']) == (1, 1)
+
+
+class TestBookChannels:
+    """Test order book channel selection and switching"""
+
+    def test_cheapest_channel_satisfying_every_consumer(self):
+        assert select_book_channel([BookRequirement(1, 'tick')]) == 'bbo-tbt'
+        assert select_book_channel([BookRequirement(1), BookRequirement(5)]) == 'books5'
+        assert select_book_channel([BookRequirement(5), BookRequirement(1, 'tick')]) == 'books-l2-tbt'
+        assert select_book_channel([BookRequirement(20)]) == 'books'
+        assert select_book_channel([]) == 'books'
+        with pytest.raises(ValueError):
+            select_book_channel([BookRequirement(1, 'instant')])
+        with pytest.raises(ValueError):
+            select_book_channel([BookRequirement(1000)])
+
+    @pytest.mark.asyncio
+    async def test_switch_subscribes_new_channel_before_dropping_old(self):
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"])
+
+        switched = await gateway.set_book_channel("bbo-tbt")
+
+        assert switched == 2
+        assert gateway.book_channel == "bbo-tbt"
+        assert [frame['op'] for frame in gateway.sent] == ["subscribe", "unsubscribe"]
+        assert {arg['channel'] for arg in gateway.sent[0]['args']} == {"bbo-tbt"}
+        assert {arg['channel'] for arg in gateway.sent[1]['args']} == {"books"}
+        assert gateway.get_subscriptions()["ETH-USDT-SWAP"] == ["bbo-tbt", "trades"]
+        await gateway.add_symbols(["SOL-USDT-SWAP"])
+        assert gateway.get_subscriptions()["SOL-USDT-SWAP"] == ["bbo-tbt", "trades"]
+        with pytest.raises(ValueError):
+            await gateway.set_book_channel("trades")
+
+    @pytest.mark.asyncio
+    async def test_snapshot_channel_feeds_same_book_event(self):
+        """bbo-tbt pushes carry no action and are applied as snapshots"""
+        bus = EventBus()
+        gateway = RecordingGateway(symbols=["BTC-USDT-SWAP"], channels=["bbo-tbt"], event_bus=bus)
+        push = {"arg": {"channel": "bbo-tbt", "instId": "BTC-USDT-SWAP"},
+                "data": [{"bids": [["50000", "2", "0", "1"]], "asks": [["50001", "3", "0", "1"]],
+                          "ts": "1700000000000", "seqId": 7}]}
+
+        await gateway._on_message(text_message(push))
+        await gateway._on_message(text_message(dict(push, data=[dict(push['data'][0], seqId=8)])))
+
+        events = drain(bus)
+        assert [(e.type, e.data.best_bid, e.data.best_ask) for e in events] == [
+            (EventType.BOOK_EVENT, 50000.0, 50001.0)
+        ] * 2
+        assert gateway.get_l2_book().seq_id == 8
+        assert gateway.get_status()['book_resyncs'] == 0
+
+
+class TestReceiveLoop:
+    """Test the timer-free receive loop"""
+
+    @pytest.mark.asyncio
+    async def test_buffered_frames_are_drained_in_one_wakeup(self):
+        import asyncio
+        from collections import deque
+
+        class BufferedWs:
+            closed = False
+
+            def __init__(self, frames):
+                self._reader = deque(frames)
+
+            async def receive(self):
+                if not self._reader:
+                    await asyncio.Event().wait()
+                return self._reader.popleft()
+
+        bus = EventBus()
+        gateway = OkxPublicWsGateway(symbols=["BTC-USDT-SWAP"], event_bus=bus)
+        frames = [text_message(trade_push("BTC-USDT-SWAP", str(50000 + n), str(n))) for n in range(3)]
+        gateway._ws = BufferedWs(frames + [aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, "pong", None)])
+        gateway._running = True
+
+        task = asyncio.create_task(gateway._message_loop())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        events = drain(bus)
+        assert [e.data['price'] for e in events] == [50000.0, 50001.0, 50002.0]
+        assert len({e.received_ns for e in events}) == 1
+        stats = gateway.get_receive_stats()
+        assert (stats['messages'], stats['wakeups']) == (4, 1)
+        assert gateway.get_status()['last_heartbeat'] > 0
@@ -0,0 +1,136 @@
+"""
+Test Suite for OkxRedundantPublicFeed - A/B First-arrival Arbitration
+
+Validates:
+- Trades are deduplicated by tradeId across feeds (first copy wins)
+- Book updates are deduplicated by seqId and the merged sequence stays contiguous
+- A stalled feed is invisible: the other feed keeps the book in sync
+- Per-feed win-rate and lag statistics
+"""
+import json
+import aiohttp
+import pytest
+from src.core.event_bus import EventBus
+from src.core.event_types import EventType
+from src.gateways.okx.order_book import L2OrderBook
+from src.gateways.okx.ws_redundant import OkxRedundantPublicFeed
+
+SYMBOL = "BTC-USDT-SWAP"
+
+
+def text_message(payload: dict) -> aiohttp.WSMessage:
+    return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, json.dumps(payload, separators=(',', ':')), None)
+
+
+def trade_push(*trade_ids: str) -> dict:
+    return {
+        "arg": {"channel": "trades", "instId": SYMBOL},
+        "data": [{"instId": SYMBOL, "tradeId": trade_id, "px": "50000", "sz": "1", "side": "buy",
+                  "ts": "1700000000000"} for trade_id in trade_ids]
+    }
+
+
+class BookStream:
+    """Generates a contiguous OKX books stream with valid checksums"""
+
+    def __init__(self):
+        self.book = L2OrderBook(SYMBOL)
+        self.seq = 100
+
+    def snapshot(self) -> dict:
+        bids, asks = [["100", "1", "0", "1"]], [["101", "1", "0", "1"]]
+        self.book.apply_snapshot(bids, asks, self.seq)
+        return self._push("snapshot", bids, asks, -1)
+
+    def update(self, bid_size: str) -> dict:
+        prev, self.seq = self.seq, self.seq + 1
+        bids = [["100", bid_size, "0", "1"]]
+        self.book.apply_update(bids, [], self.seq)
+        return self._push("update", bids, [], prev)
+
+    def _push(self, action, bids, asks, prev) -> dict:
+        return {"arg": {"channel": "books", "instId": SYMBOL}, "action": action,
+                "data": [{"bids": bids, "asks": asks, "ts": "1700000000000", "checksum": self.book.checksum(),
+                          "seqId": self.seq, "prevSeqId": prev}]}
+
+
+def drain(bus: EventBus):
+    events = []
+    while bus.qsize():
+        events.append(bus._dequeue())
+    return events
+
+
+@pytest.fixture
+def setup():
+    bus = EventBus()
+    feed = OkxRedundantPublicFeed([SYMBOL], event_bus=bus)
+    a, b = feed._feeds
+    return bus, feed, a, b
+
+
+class TestTradeArbitration:
+    """Test tradeId deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_first_copy_wins_and_duplicates_are_dropped(self, setup):
+        bus, feed, a, b = setup
+        await a._on_message(text_message(trade_push("1", "2")))
+        await b._on_message(text_message(trade_push("1", "2", "3")))
+        await a._on_message(text_message(trade_push("3")))
+
+        ticks = [e.data['trade_id'] for e in drain(bus) if e.type == EventType.TICK]
+        assert ticks == ["1", "2", "3"]
+
+        stats = {s['name']: s for s in feed.get_feed_stats()}
+        assert (stats['okx_ws_public_a']['wins'], stats['okx_ws_public_a']['duplicates']) == (2, 1)
+        assert (stats['okx_ws_public_b']['wins'], stats['okx_ws_public_b']['duplicates']) == (1, 2)
+        assert stats['okx_ws_public_b']['win_rate'] == pytest.approx(1 / 3)
+        assert stats['okx_ws_public_b']['lag_max_ms'] >= 0
+
+
+class TestBookArbitration:
+    """Test seqId deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_merged_book_stream_stays_contiguous(self, setup):
+        bus, feed, a, b = setup
+        stream = BookStream()
+        pushes = [stream.snapshot(), stream.update("2"), stream.update("3"), stream.update("4")]
+
+        # A delivers snapshot + first update, then stalls; B delivers everything later
+        await a._on_message(text_message(pushes[0]))
+        await a._on_message(text_message(pushes[1]))
+        for push in pushes:
+            await b._on_message(text_message(push))
+
+        books = [e for e in drain(bus) if e.type == EventType.BOOK_EVENT]
+        assert [e.data['bids'][0][1] for e in books] == [1.0, 2.0, 3.0, 4.0]
+        parser_stats = a.book_parser.get_stats()
+        assert (parser_stats['seq_gaps'], parser_stats['checksum_errors'], parser_stats['synced']) == (0, 0, True)
+        assert feed.get_l2_book(SYMBOL).seq_id == stream.seq
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_accepted_after_resync(self, setup):
+        bus, feed, a, b = setup
+        stream = BookStream()
+        await a._on_message(text_message(stream.snapshot()))
+        a.book_parser.book.reset()
+
+        # Snapshot with the same seqId as an already forwarded one still resyncs the book
+        await b._on_message(text_message(stream._push("snapshot", [["100", "1", "0", "1"]], [["101", "1", "0", "1"]], -1)))
+        assert feed.get_l2_book(SYMBOL).synced is True
+
+
+class TestStatus:
+    """Test gateway-compatible surface"""
+
+    def test_requires_two_feeds(self):
+        with pytest.raises(ValueError):
+            OkxRedundantPublicFeed([SYMBOL], ws_urls=["wss://a"])
+
+    def test_status_reports_each_feed(self, setup):
+        _, feed, _, _ = setup
+        status = feed.get_status()
+        assert (status['feeds'], status['symbols']) == (2, 1)
+        assert [s['name'] for s in status['feed_stats']] == ['okx_ws_public_a', 'okx_ws_public_b']